@@ -27,6 +27,9 @@ def create_app(test_config=None):
         static_folder=static_dir,
     )
 
+    from services.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+
     app.config.from_object('config')
 
     import config as config_module
@@ -38,11 +41,25 @@ def create_app(test_config=None):
     if test_config:
         app.config.from_mapping(test_config)
 
+    from services.logging_config import init_logging
+    init_logging(app)
+
     from routes.blog_routes import blog_bp
     from routes.auth_routes import auth_bp
     app.register_blueprint(blog_bp)
     app.register_blueprint(auth_bp)
 
+    from services.static_assets import init_static_assets
+    from services.compression import init_compression
+    from services.timing import init_timing
+    from services.metrics import init_metrics
+    from services.tracing import init_tracing
+    init_static_assets(app)
+    init_compression(app)
+    init_timing(app)
+    init_metrics(app)
+    init_tracing(app)
+
     return app
 
 
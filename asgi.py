@@ -0,0 +1,11 @@
+"""
+ASGI 진입점 (uvicorn)
+/generate, /regenerate는 이벤트 루프에서 비동기로 처리하고 나머지 라우트는 기존 Flask 앱을 스레드 풀에서 실행합니다.
+
+실행: uvicorn asgi:app --host 0.0.0.0 --port 8000 --workers 2
+"""
+from app import app as flask_app
+from routes.async_routes import ASYNC_VIEWS
+from services.asgi_bridge import ASGIBridge
+
+app = ASGIBridge(flask_app, ASYNC_VIEWS)
@@ -0,0 +1,4 @@
+"""
+성능 측정 스크립트 패키지
+실행 예: python -m benchmarks.bench_transcript_parser
+"""
@@ -0,0 +1,181 @@
+"""
+content_service 파싱/캐시 경로 마이크로 벤치마크
+수 MB watch 페이지, 3시간 분량 VTT/TimedText, 1만 개 파일 캐시 디렉터리로 hot path를 측정하고
+--record로 커밋별 결과를 쌓아 이전 커밋과 비교합니다.
+
+실행: python -m benchmarks.bench_content_service [--repeat N] [--only 이름] [--record] [--compare]
+"""
+import argparse
+import html
+import os
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Tuple
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks import history  # noqa: E402
+from benchmarks.bench_transcript_parser import build_vtt, build_watch_page  # noqa: E402
+from services import content_service  # noqa: E402
+
+SUITE = 'content_service'
+CACHE_VIDEOS = 5000  # 영상당 transcript/comments 2개 → 파일 1만 개
+
+
+# ==================== Legacy Implementations ====================
+
+def _legacy_order_transcript_tracks(tracks):
+    ordered = []
+    for is_generated in [False, True]:
+        for lang in content_service.PREFERRED_LANGUAGES:
+            ordered.extend([
+                t for t in tracks
+                if getattr(t, 'is_generated', False) == is_generated
+                and getattr(t, 'language_code', '') == lang
+                and t not in ordered
+            ])
+        ordered.extend([
+            t for t in tracks
+            if getattr(t, 'is_generated', False) == is_generated
+            and t not in ordered
+        ])
+    return ordered
+
+
+def _legacy_truncate_text(text, max_tokens):
+    tokens = text.split()
+    if len(tokens) > max_tokens:
+        return " ".join(tokens[:max_tokens]) + "..."
+    return text
+
+
+# ==================== Fixtures ====================
+
+def build_timedtext_xml(hours=3):
+    """약 2초 간격 항목으로 구성된 hours 시간 분량의 TimedText XML"""
+    parts = ['<?xml version="1.0" encoding="utf-8" ?><transcript>']
+    for i in range(hours * 1800):
+        text = html.escape(f"자막 문장 {i} &amp; 이어지는 내용입니다")
+        parts.append(f'<text start="{i * 2}.0" dur="2.0">{text}</text>')
+    parts.append('</transcript>')
+    return "".join(parts)
+
+
+def build_tracks(count=2000):
+    """언어/자동 생성 여부가 섞인 자막 트랙 목록"""
+    languages = ('de', 'en', 'fr', 'ja', 'ko', 'es', 'pt', 'it')
+    return [SimpleNamespace(language_code=languages[i % len(languages)], is_generated=bool(i % 3 == 0))
+            for i in range(count)]
+
+
+def build_cache_dir(path, videos=CACHE_VIDEOS, transcript=None):
+    """영상마다 자막/댓글 캐시 파일을 만든 디렉터리"""
+    transcript = transcript or ("캐시된 자막 문장입니다. " * 400)
+    comments = [f"댓글 {i}" for i in range(50)]
+    with patch.object(content_service, 'CACHE_DIR', path):
+        for i in range(videos):
+            content_service._save_cache(f"v{i:010d}", 'transcript', transcript)
+            content_service._save_cache(f"v{i:010d}", 'comments', comments)
+
+
+# ==================== Runner ====================
+
+def _measure(label, func, repeat, number=1):
+    """number회 실행을 repeat번 반복한 최솟값 (1회당 초)"""
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    print(f"  {label:<40} {best * 1000:10.3f} ms")
+    return best
+
+
+def _parsing_cases() -> List[Tuple[str, Callable, int]]:
+    vtt = build_vtt(hours=3)
+    xml = build_timedtext_xml(hours=3)
+    page = build_watch_page(size_mb=4)
+    assert content_service._parse_vtt(vtt)
+    assert content_service._parse_timedtext_xml(xml)
+    assert content_service._extract_yt_initial_player_response(page) is not None
+    print(f"fixtures: VTT {len(vtt) / 1e6:.1f} MB, XML {len(xml) / 1e6:.1f} MB, watch page {len(page) / 1e6:.1f} MB")
+    return [
+        ('_parse_vtt (3h)', lambda: content_service._parse_vtt(vtt), 1),
+        ('_parse_timedtext_xml (3h)', lambda: content_service._parse_timedtext_xml(xml), 1),
+        ('_extract_yt_initial_player_response (4MB)',
+         lambda: content_service._extract_yt_initial_player_response(page), 1),
+    ]
+
+
+def _ordering_cases() -> List[Tuple[str, Callable, int]]:
+    tracks = build_tracks()
+    assert _legacy_order_transcript_tracks(tracks) == content_service._order_transcript_tracks(tracks)
+    few = build_tracks(12)
+    return [
+        ('_order_transcript_tracks (12)', lambda: content_service._order_transcript_tracks(few), 1000),
+        ('_order_transcript_tracks (2000)', lambda: content_service._order_transcript_tracks(tracks), 1),
+        ('legacy _order_transcript_tracks (2000)', lambda: _legacy_order_transcript_tracks(tracks), 1),
+    ]
+
+
+def _truncate_cases() -> List[Tuple[str, Callable, int]]:
+    text = content_service._parse_vtt(build_vtt(hours=3))
+    tokens = len(text.split())
+    assert _legacy_truncate_text(text, 8000) == content_service.truncate_text(text, 8000)
+    print(f"truncate_text 입력: {tokens:,} 토큰")
+    return [
+        ('truncate_text (3h → 8k tokens)', lambda: content_service.truncate_text(text, 8000), 10),
+        ('legacy truncate_text (3h → 8k tokens)', lambda: _legacy_truncate_text(text, 8000), 10),
+        ('truncate_text (3h, within limit)', lambda: content_service.truncate_text(text, tokens + 1), 10),
+    ]
+
+
+def _cache_cases(cache_dir) -> List[Tuple[str, Callable, int]]:
+    build_cache_dir(cache_dir)
+    print(f"캐시 디렉터리: 파일 {CACHE_VIDEOS * 2:,}개")
+    counter = iter(range(10 ** 9))
+    return [
+        ('_load_cache hit', lambda: content_service._load_cache('v0000002500', 'transcript'), 200),
+        ('_load_cache miss', lambda: content_service._load_cache('missing0000', 'transcript'), 200),
+        ('_save_cache (new file)',
+         lambda: content_service._save_cache(f"n{next(counter):010d}", 'transcript', "새 자막 " * 400), 200),
+        ('clear_cache(video_id) (10k files)', lambda: content_service.clear_cache('nonexistent'), 5),
+    ]
+
+
+GROUPS = {
+    'parsing': _parsing_cases,
+    'ordering': _ordering_cases,
+    'truncate': _truncate_cases,
+    'cache': _cache_cases,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='반복 횟수 (최솟값 사용)')
+    parser.add_argument('--only', action='append', choices=sorted(GROUPS), help='측정할 그룹 (기본 전체)')
+    parser.add_argument('--record', action='store_true', help='결과를 benchmarks/results에 커밋별로 기록')
+    parser.add_argument('--compare', action='store_true', help='이전 커밋 기록과 비교')
+    args = parser.parse_args(argv)
+
+    results: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for group in args.only or list(GROUPS):
+            print(f"[{group}]")
+            cases = GROUPS[group](cache_dir) if group == 'cache' else GROUPS[group]()
+            with patch.object(content_service, 'CACHE_DIR', cache_dir):
+                for label, func, number in cases:
+                    results[label] = _measure(label, func, args.repeat, number)
+
+    commit = history.current_commit()
+    if args.compare:
+        print()
+        history.print_comparison(results, history.baseline(SUITE, commit))
+    if args.record:
+        path = history.record(SUITE, results, commit)
+        print(f"기록: {os.path.relpath(path)} ({commit})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+앱 기동(import) 시간 벤치마크
+새 인터프리터에서 `import app`(create_app 포함)과 지연 로딩 대상 SDK 각각의 import 시간을 재고,
+`import app` 직후 불러와진 무거운 SDK가 없는지 확인합니다. --record/--compare는 커밋별 기록과 비교.
+
+실행: python -m benchmarks.bench_import_time [--repeat N] [--record] [--compare]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks import history  # noqa: E402
+from services.lazy_imports import HEAVY_MODULES  # noqa: E402
+
+SUITE = 'import_time'
+ROOT = Path(__file__).resolve().parent.parent
+
+# 새 프로세스에서 실행: import 시간(초)과 이미 불러와진 SDK 목록을 JSON으로 출력
+_SNIPPET = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module: str, repeat: int) -> Dict:
+    """module을 새 인터프리터에서 repeat번 import한 시간 (중앙값/최솟값, 초)"""
+    env = dict(os.environ, PREWARM='0', METRICS_ENABLED='0', TRACING_EXPORTER='',
+               LITELLM_LOCAL_MODEL_COST_MAP='True')
+    code = _SNIPPET.format(module=module, heavy=tuple(HEAVY_MODULES))
+    samples: List[float] = []
+    loaded: List[str] = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        samples.append(result['seconds'])
+        loaded = result['loaded']
+    return {'median': statistics.median(samples), 'min': min(samples), 'loaded': loaded}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='모듈별 새 프로세스 실행 횟수 (중앙값 사용)')
+    parser.add_argument('--modules', action='store_true', help='SDK별 import 시간도 측정')
+    parser.add_argument('--record', action='store_true', help='결과를 benchmarks/results에 커밋별로 기록')
+    parser.add_argument('--compare', action='store_true', help='이전 커밋 기록과 비교')
+    args = parser.parse_args(argv)
+
+    results: Dict[str, float] = {}
+    targets = ['app'] + (list(HEAVY_MODULES) if args.modules else [])
+    for module in targets:
+        measured = measure_import(module, args.repeat)
+        label = f'import {module}'
+        results[label] = measured['median']
+        print(f"  {label:<40} {measured['median'] * 1000:10.1f} ms  (최소 {measured['min'] * 1000:.1f} ms)")
+        if module == 'app':
+            eager = measured['loaded']
+            print(f"  {'import 직후 불러와진 SDK':<40} {', '.join(eager) if eager else '없음'}")
+
+    commit = history.current_commit()
+    if args.compare:
+        print()
+        history.print_comparison(results, history.baseline(SUITE, commit))
+    if args.record:
+        path = history.record(SUITE, results, commit)
+        print(f"기록: {os.path.relpath(path)} ({commit})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+자막 파서 마이크로 벤치마크
+기존 정규식 구현과 services.transcript_parser 구현을 비교합니다.
+
+실행: python -m benchmarks.bench_transcript_parser [--repeat N]
+"""
+import argparse
+import json
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services import transcript_parser  # noqa: E402
+
+
+# ==================== Legacy Implementations ====================
+
+def _legacy_parse_vtt(vtt_text):
+    lines = []
+    for raw in vtt_text.splitlines():
+        line = raw.strip('\ufeff').strip()
+        if not line or line.upper().startswith('WEBVTT') or '-->' in line:
+            continue
+        if re.match(r'^\d+$', line):
+            continue
+        line = re.sub(r'<[^>]+>', '', line).strip()
+        if line:
+            lines.append(line)
+    return " ".join(lines)
+
+
+def _legacy_extract_player_response(html_text):
+    patterns = [
+        r"ytInitialPlayerResponse\s*=\s*(\{.*?\})\s*;",
+        r"var\s+ytInitialPlayerResponse\s*=\s*(\{.*?\})\s*;",
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, html_text, flags=re.DOTALL)
+        if match:
+            try:
+                return json.loads(match.group(1))
+            except json.JSONDecodeError:
+                continue
+    return None
+
+
+# ==================== Fixtures ====================
+
+def build_vtt(hours=3):
+    """약 2초 간격 큐로 구성된 hours 시간 분량의 VTT를 생성합니다."""
+    parts = ["WEBVTT", "Kind: captions", "Language: ko", ""]
+    for i in range(hours * 1800):
+        start = i * 2
+        parts.append(str(i + 1))
+        parts.append(f"{start // 3600:02d}:{start // 60 % 60:02d}:{start % 60:02d}.000 --> "
+                     f"{(start + 2) // 3600:02d}:{(start + 2) // 60 % 60:02d}:{(start + 2) % 60:02d}.000")
+        parts.append(f"<c>자막 문장 {i}</c><00:00:01.000><c> 이어지는 내용입니다</c>")
+        parts.append("")
+    return "\n".join(parts)
+
+
+def build_watch_page(size_mb=2, tricky=False):
+    """수 MB 크기의 watch 페이지 HTML을 생성합니다.
+
+    tricky=True면 설명 문자열에 '};'를 넣어 비탐욕 정규식이 잘리는 경우를 재현합니다.
+    """
+    description = "설명 }; 포함 " if tricky else "설명 문장 "
+    player = {
+        "videoDetails": {"title": "벤치마크 영상", "shortDescription": description * 200},
+        "captions": {"playerCaptionsTracklistRenderer": {"captionTracks": [
+            {"languageCode": "ko", "baseUrl": "https://example.com/timedtext?lang=ko"},
+            {"languageCode": "en", "kind": "asr", "baseUrl": "https://example.com/timedtext?lang=en"},
+        ]}},
+        "microformat": {"items": [{"id": i, "text": "가나다라" * 20} for i in range(2000)]},
+    }
+    filler = "<div class=\"filler\">" + ("x" * 1000) + "</div>\n"
+    head = filler * (size_mb * 512)
+    tail = filler * (size_mb * 512)
+    return (f"<html><head>{head}</head><body><script>var ytInitialPlayerResponse = "
+            f"{json.dumps(player, ensure_ascii=False)};var meta = {{}};</script>{tail}</body></html>")
+
+
+# ==================== Runner ====================
+
+def _measure(label, func, arg, repeat):
+    best = min(timeit.repeat(lambda: func(arg), number=1, repeat=repeat))
+    print(f"  {label:<28} {best * 1000:10.2f} ms")
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='반복 횟수 (최솟값 사용)')
+    args = parser.parse_args(argv)
+
+    vtt = build_vtt()
+    assert _legacy_parse_vtt(vtt) == transcript_parser.parse_vtt(vtt)
+
+    print(f"VTT ({len(vtt) / 1024 / 1024:.1f} MB, 3시간)")
+    legacy = _measure('legacy _parse_vtt', _legacy_parse_vtt, vtt, args.repeat)
+    current = _measure('transcript_parser.parse_vtt', transcript_parser.parse_vtt, vtt, args.repeat)
+    print(f"  speedup: {legacy / current:.2f}x")
+
+    for tricky in (False, True):
+        page = build_watch_page(tricky=tricky)
+        assert transcript_parser.extract_yt_initial_player_response(page) is not None
+        legacy_ok = _legacy_extract_player_response(page) is not None
+
+        label = "문자열 내 '};' 포함" if tricky else "일반"
+        print(f"watch page ({len(page) / 1024 / 1024:.1f} MB, {label})")
+        legacy = _measure('legacy regex extract', _legacy_extract_player_response, page, args.repeat)
+        current = _measure('brace-matching extract', transcript_parser.extract_yt_initial_player_response,
+                           page, args.repeat)
+        print(f"  speedup: {legacy / current:.2f}x")
+        if not legacy_ok:
+            print("  (legacy: 매치가 잘려 추출 실패 -> None 반환)")
+
+if __name__ == '__main__':
+    main()
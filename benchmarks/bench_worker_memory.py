@@ -0,0 +1,124 @@
+"""
+gunicorn 워커 메모리 벤치마크
+같은 워커 수로 기본 모드와 preload 모드(GUNICORN_PRELOAD=1)를 띄우고, 모든 워커가 SDK를 사용하도록
+생성 요청을 보낸 뒤 프로세스별 RSS/PSS/USS를 비교합니다 (Linux /proc/<pid>/smaps_rollup).
+
+- RSS: 공유 페이지까지 모두 센 값 (워커끼리 겹침)
+- PSS: 공유 페이지를 공유하는 프로세스 수로 나눈 값 (합계가 실제 사용량)
+- USS: 그 프로세스만 쓰는 페이지 (워커 하나를 더 띄울 때 늘어나는 양)
+
+실행: python -m benchmarks.bench_worker_memory [--workers N] [--threads N] [--mode default|preload] [--json 경로]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.load_test import (  # noqa: E402
+    SCENARIOS, _proc_children, cleanup_cache, run_scenario, start_gunicorn, stop_gunicorn
+)
+from benchmarks.stub_servers import StubConfig, StubServer  # noqa: E402
+
+MODES = {'default': '0', 'preload': '1'}
+MB = 1024 * 1024
+
+
+def process_memory(pid: int) -> Dict[str, Optional[float]]:
+    """프로세스 메모리 (MB): rss, pss, uss (smaps_rollup이 없으면 rss만)"""
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            fields = {line.split(':')[0]: int(line.split()[1]) * 1024 for line in f if line.split()[-1] == 'kB'}
+        return {
+            'rss': fields['Rss'] / MB,
+            'pss': fields['Pss'] / MB,
+            'uss': (fields['Private_Clean'] + fields['Private_Dirty']) / MB,
+        }
+    except (OSError, KeyError):
+        with open(f'/proc/{pid}/statm') as f:
+            rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        return {'rss': rss / MB, 'pss': None, 'uss': None}
+
+
+def _average(values: List[Optional[float]]) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+
+def measure_mode(mode: str, stub: StubServer, workers: int, threads: int, warm_seconds: float,
+                 run_id: str) -> Dict:
+    """모드 하나를 띄워 예열 요청 후 마스터/워커 메모리 측정"""
+    env = {'GUNICORN_PRELOAD': MODES[mode], 'PREWARM_DELAY': '0'}
+    process, base_url = start_gunicorn(f'{workers}x{threads}', stub, env)
+    try:
+        # 모든 워커가 SDK를 실제로 쓰도록 워커 수 x 스레드 수만큼 동시에 생성 요청
+        warm = run_scenario(base_url, SCENARIOS['generate-warm'], workers * threads, warm_seconds, 1.0,
+                            run_id, mode, process.pid)
+        time.sleep(1.0)
+        master = process_memory(process.pid)
+        worker_stats = [process_memory(pid) for pid in _proc_children(process.pid)]
+    finally:
+        stop_gunicorn(process)
+
+    total_pss = (master['pss'] or 0) + sum(w['pss'] or 0 for w in worker_stats)
+    return {
+        'mode': mode,
+        'workers': len(worker_stats),
+        'warm_requests': warm.requests,
+        'warm_errors': warm.errors,
+        'master': master,
+        'worker_avg': {key: _average([w[key] for w in worker_stats]) for key in ('rss', 'pss', 'uss')},
+        'total_pss': total_pss if master['pss'] is not None else None,
+    }
+
+
+def _fmt(value: Optional[float]) -> str:
+    return f"{value:8.1f}" if value is not None else f"{'-':>8}"
+
+
+def print_results(results: List[Dict]) -> None:
+    print(f"{'mode':<10}{'workers':>8}{'errors':>8}{'master RSS':>12}{'worker RSS':>12}{'worker PSS':>12}"
+          f"{'worker USS':>12}{'total PSS':>12}{'workers/GB':>12}  (MB)")
+    for r in results:
+        uss = r['worker_avg']['uss']
+        per_gb = f"{1024 / uss:12.1f}" if uss else f"{'-':>12}"
+        print(f"{r['mode']:<10}{r['workers']:>8}{r['warm_errors']:>8}    {_fmt(r['master']['rss'])}"
+              f"    {_fmt(r['worker_avg']['rss'])}    {_fmt(r['worker_avg']['pss'])}    {_fmt(uss)}"
+              f"    {_fmt(r['total_pss'])}{per_gb}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4, help='워커 수')
+    parser.add_argument('--threads', type=int, default=2, help='워커당 스레드 수')
+    parser.add_argument('--mode', action='append', choices=sorted(MODES), help='측정할 모드 (기본 둘 다)')
+    parser.add_argument('--warm', type=float, default=5.0, help='측정 전 생성 요청을 보내는 시간 (초)')
+    parser.add_argument('--json', help='결과를 JSON으로 저장할 경로')
+    args = parser.parse_args(argv)
+
+    stub = StubServer(config=StubConfig(llm_latency=50, youtube_latency=5, supabase_latency=5)).start()
+    run_id = uuid.uuid4().hex[:4]
+    started = time.time()
+    results = []
+    try:
+        for mode in args.mode or list(MODES):
+            print(f"[{mode}] 워커 {args.workers} x 스레드 {args.threads}")
+            results.append(measure_mode(mode, stub, args.workers, args.threads, args.warm, run_id))
+    finally:
+        stub.shutdown()
+        cleanup_cache(run_id, started, args.workers * args.threads)
+
+    print()
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
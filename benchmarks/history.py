@@ -0,0 +1,82 @@
+"""
+벤치마크 결과 기록
+커밋별 측정값을 benchmarks/results/<suite>.jsonl에 한 줄씩 쌓고, 이전 커밋 결과와 비교합니다.
+측정값은 장비마다 다르므로 저장소에는 커밋하지 않습니다 (.gitignore).
+"""
+import json
+import platform
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+ROOT = RESULTS_DIR.parent.parent
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def current_commit() -> str:
+    """현재 커밋 (작업 트리에 변경이 있으면 '-dirty' 접미사)"""
+    commit = _git('rev-parse', '--short', 'HEAD') or 'unknown'
+    return f'{commit}-dirty' if _git('status', '--porcelain', '--untracked-files=no') else commit
+
+
+def _results_path(suite: str) -> Path:
+    return RESULTS_DIR / f'{suite}.jsonl'
+
+
+def load(suite: str) -> list:
+    """기록된 결과 목록 (오래된 순)"""
+    try:
+        with open(_results_path(suite), encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except (OSError, ValueError):
+        return []
+
+
+def baseline(suite: str, commit: str) -> Optional[Dict]:
+    """비교 기준: 현재와 다른 커밋의 가장 최근 결과"""
+    for entry in reversed(load(suite)):
+        if entry.get('commit') != commit:
+            return entry
+    return None
+
+
+def record(suite: str, results: Dict[str, float], commit: str) -> Path:
+    """측정값(초)을 커밋 정보와 함께 추가합니다."""
+    RESULTS_DIR.mkdir(exist_ok=True)
+    entry = {
+        'commit': commit,
+        'subject': _git('log', '-1', '--format=%s'),
+        'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    path = _results_path(suite)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    return path
+
+
+def print_comparison(results: Dict[str, float], base: Optional[Dict], threshold: float = 0.10) -> None:
+    """기준 커밋 대비 변화율 출력 (threshold 이상 느려지면 표시)"""
+    if not base:
+        print("비교할 이전 커밋 결과가 없습니다 (--record로 기록).")
+        return
+    print(f"기준: {base['commit']} {base.get('subject', '')} ({base.get('recorded_at', '')})")
+    previous = base.get('results', {})
+    for name, seconds in results.items():
+        before = previous.get(name)
+        if not before:
+            print(f"  {name:<40} {seconds * 1000:10.2f} ms  (새 항목)")
+            continue
+        change = seconds / before - 1
+        flag = '  ← 느려짐' if change >= threshold else ''
+        print(f"  {name:<40} {before * 1000:10.2f} → {seconds * 1000:10.2f} ms  {change:+7.1%}{flag}")
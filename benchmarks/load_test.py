@@ -0,0 +1,431 @@
+"""
+부하 테스트 하네스
+외부 서비스를 대역 서버(benchmarks/stub_servers.py)로 바꾼 gunicorn 앱에 시나리오별 부하를 걸고
+지연 시간 p50/p95/p99, RPS, 오류 수, CPU/메모리 사용량을 gunicorn 설정별로 출력합니다.
+
+실행 예:
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --gunicorn 2x4 --gunicorn 4x2 --scenario generate-cold --concurrency 16
+    python -m benchmarks.load_test --target http://127.0.0.1:5000 --scenario providers   # 이미 실행 중인 서버
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import jwt
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.stub_servers import StubConfig, StubServer  # noqa: E402
+
+try:
+    import psutil
+except ModuleNotFoundError:
+    psutil = None
+
+_PROCESS_ERRORS = (psutil.Error, OSError) if psutil is not None else (OSError, ValueError, IndexError)
+
+JWT_SECRET = 'load-test-jwt-secret-for-local-benchmarks'
+CACHE_DIR = ROOT / 'cache'
+BATCH_SIZE = 5
+DEFAULT_PROFILES = ('2x4',)
+DEFAULT_SCENARIOS = ('providers', 'generate-warm', 'generate-cold', 'batch')
+
+RequestSpec = Tuple[str, str, Optional[dict]]  # (method, path, json)
+
+
+# ==================== 시나리오 ====================
+
+@dataclass
+class Scenario:
+    """부하 시나리오: 요청 번호와 실행 ID로 요청을 만듦"""
+    name: str
+    description: str
+    build: Callable[[int, str], RequestSpec]
+    auth: bool = True
+
+
+def _video_id(run_id: str, index: int) -> str:
+    """실행마다 겹치지 않는 11자 video_id (캐시 미스 유도)"""
+    return f"{run_id}{index:07d}"[-11:].rjust(11, 'x')
+
+
+def _watch_url(video_id: str) -> str:
+    return f'https://www.youtube.com/watch?v={video_id}'
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario for scenario in (
+        Scenario('providers', 'GET /api/providers (프레임워크 기본 비용)',
+                 lambda i, run: ('GET', '/api/providers', None), auth=False),
+        Scenario('generate-warm', 'POST /generate, 같은 영상 반복 (자막/댓글 파일 캐시 적중)',
+                 lambda i, run: ('POST', '/generate', {
+                     'url': _watch_url(f'{run}warm00'[:11].ljust(11, '0')), 'model': 'gpt-4o-mini', 'style': 'blog'})),
+        Scenario('generate-cold', 'POST /generate, 요청마다 새 영상 (Supadata/YouTube API/LLM 전체 경로)',
+                 lambda i, run: ('POST', '/generate', {
+                     'url': _watch_url(_video_id(run, i)), 'model': 'gpt-4o-mini', 'style': 'blog'})),
+        Scenario('batch', f'POST /generate-batch, 새 영상 {BATCH_SIZE}개',
+                 lambda i, run: ('POST', '/generate-batch', {
+                     'urls': [_watch_url(_video_id(run, i * BATCH_SIZE + k)) for k in range(BATCH_SIZE)],
+                     'model': 'gpt-4o-mini', 'style': 'blog'})),
+    )
+}
+
+
+def user_id(user_index: int) -> str:
+    """가상 사용자 ID (실행마다 같음, 결과 아티팩트 정리에 사용)"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f'load-test-user-{user_index}'))
+
+
+def make_token(user_index: int) -> str:
+    """가상 사용자별 HS256 액세스 토큰 (앱은 SUPABASE_JWT_SECRET으로 로컬 검증)"""
+    now = int(time.time())
+    return jwt.encode({
+        'sub': user_id(user_index),
+        'aud': 'authenticated',
+        'role': 'authenticated',
+        'iat': now,
+        'exp': now + 3600,
+    }, JWT_SECRET, algorithm='HS256')
+
+
+# ==================== 측정 ====================
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _proc_children(pid: int) -> List[int]:
+    children = []
+    for stat_path in glob.glob('/proc/[0-9]*/stat'):
+        try:
+            with open(stat_path) as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(stat_path.split('/')[2]))
+    return children
+
+
+def _proc_usage(pid: int) -> Tuple[float, int]:
+    """(누적 CPU 초, RSS 바이트) - /proc 기반 (psutil이 없을 때)"""
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    with open(f'/proc/{pid}/statm') as f:
+        rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    return cpu, rss
+
+
+class ResourceSampler:
+    """gunicorn 마스터와 워커의 CPU 시간/RSS 합계를 주기적으로 기록"""
+
+    def __init__(self, pid: Optional[int], interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.supported = pid is not None and (psutil is not None or os.path.exists(f'/proc/{pid}/stat'))
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _pids(self) -> List[int]:
+        if psutil is not None:
+            parent = psutil.Process(self.pid)
+            return [self.pid] + [child.pid for child in parent.children(recursive=True)]
+        return [self.pid] + _proc_children(self.pid)
+
+    def totals(self) -> Tuple[float, int]:
+        cpu_total, rss_total = 0.0, 0
+        for pid in self._pids():
+            try:
+                if psutil is not None:
+                    process = psutil.Process(pid)
+                    times = process.cpu_times()
+                    cpu, rss = times.user + times.system, process.memory_info().rss
+                else:
+                    cpu, rss = _proc_usage(pid)
+            except _PROCESS_ERRORS:
+                continue
+            cpu_total += cpu
+            rss_total += rss
+        return cpu_total, rss_total
+
+    def __enter__(self) -> 'ResourceSampler':
+        if not self.supported:
+            return self
+        self._started = time.perf_counter()
+        self._cpu_start, self.peak_rss = self.totals()
+        self._thread = threading.Thread(target=self._run, name='resource-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, self.totals()[1])
+
+    def __exit__(self, *exc) -> None:
+        if not self.supported:
+            return
+        self._stop.set()
+        self._thread.join()
+        cpu_end, rss = self.totals()
+        self.peak_rss = max(self.peak_rss, rss)
+        self.cpu_percent = (cpu_end - self._cpu_start) / (time.perf_counter() - self._started) * 100
+
+
+@dataclass
+class ScenarioResult:
+    """시나리오 하나의 측정 결과 (지연 단위: ms)"""
+    profile: str
+    scenario: str
+    concurrency: int
+    requests: int = 0
+    errors: int = 0
+    duration: float = 0.0
+    rps: float = 0.0
+    p50: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+    max: float = 0.0
+    cpu_percent: Optional[float] = None
+    peak_rss_mb: Optional[float] = None
+    status_codes: Dict[str, int] = field(default_factory=dict)
+
+
+def run_scenario(base_url: str, scenario: Scenario, concurrency: int, duration: float, warmup: float,
+                 run_id: str, profile: str, server_pid: Optional[int]) -> ScenarioResult:
+    """closed-loop 부하: 가상 사용자 concurrency명이 응답을 받는 즉시 다음 요청을 보냄"""
+    latencies: List[float] = []
+    status_codes: Dict[str, int] = {}
+    errors = 0
+    counter = iter(range(10 ** 9))
+    lock = threading.Lock()
+    measuring = threading.Event()
+    stop = threading.Event()
+
+    def user(user_index: int) -> None:
+        nonlocal errors
+        session = requests.Session()
+        if scenario.auth:
+            session.headers['Authorization'] = f'Bearer {make_token(user_index)}'
+        while not stop.is_set():
+            with lock:
+                index = next(counter)
+            method, path, body = scenario.build(index, run_id)
+            started = time.perf_counter()
+            try:
+                response = session.request(method, base_url + path, json=body, timeout=300)
+                code, ok = str(response.status_code), response.status_code < 400
+                response.content  # noqa: B018 - 본문 수신까지 측정
+            except requests.RequestException:
+                code, ok = 'exception', False
+            elapsed = (time.perf_counter() - started) * 1000
+            if not measuring.is_set():
+                continue
+            with lock:
+                status_codes[code] = status_codes.get(code, 0) + 1
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors += 1
+
+    threads = [threading.Thread(target=user, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    time.sleep(warmup)
+
+    with ResourceSampler(server_pid) as sampler:
+        measuring.set()
+        started = time.perf_counter()
+        time.sleep(duration)
+        measuring.clear()
+        elapsed = time.perf_counter() - started
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    result = ScenarioResult(profile=profile, scenario=scenario.name, concurrency=concurrency,
+                            requests=len(latencies) + errors, errors=errors, duration=round(elapsed, 2),
+                            rps=round(len(latencies) / elapsed, 2), status_codes=status_codes)
+    for name, pct in (('p50', 50), ('p95', 95), ('p99', 99), ('max', 100)):
+        setattr(result, name, round(percentile(latencies, pct), 1))
+    if sampler.supported:
+        result.cpu_percent = round(sampler.cpu_percent, 1)
+        result.peak_rss_mb = round(sampler.peak_rss / 1024 / 1024, 1)
+    return result
+
+
+# ==================== gunicorn ====================
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def parse_profile(profile: str) -> Tuple[int, int]:
+    """'2x4' → (workers=2, threads=4)"""
+    workers, _, threads = profile.lower().partition('x')
+    return int(workers), int(threads or 1)
+
+
+def start_gunicorn(profile: str, stub: StubServer, extra_env: Dict[str, str]) -> Tuple[subprocess.Popen, str]:
+    """대역 서버를 바라보는 gunicorn 실행 후 응답할 때까지 대기"""
+    workers, threads = parse_profile(profile)
+    port = _free_port()
+    env = {
+        **os.environ,
+        **stub.app_environment(),
+        'SUPABASE_JWT_SECRET': JWT_SECRET,
+        'GUNICORN_THREADS': str(threads),
+        'LITELLM_LOCAL_MODEL_COST_MAP': 'True',  # 시작 시 원격 가격표 조회 안 함
+        **extra_env,
+    }
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app',
+         '--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--threads', str(threads),
+         '--timeout', '120', '--log-level', 'warning'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 90
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn 시작 실패 (종료 코드 {process.returncode})')
+        try:
+            if requests.get(base_url + '/api/providers', timeout=2).status_code == 200:
+                return process, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError('gunicorn이 90초 안에 응답하지 않았습니다.')
+
+
+def stop_gunicorn(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def cleanup_cache(run_id: str, started: float, concurrency: int) -> int:
+    """이번 실행이 만든 자막/댓글 캐시와 가상 사용자의 결과 아티팩트 삭제"""
+    paths = glob.glob(str(CACHE_DIR / f'{run_id}*_*.json'))
+    users = {user_id(i) for i in range(concurrency)}
+    for path in glob.glob(str(CACHE_DIR / 'reports' / '*.json')):
+        try:
+            if os.path.getmtime(path) < started:
+                continue
+            with open(path, 'rb') as f:
+                if json.loads(f.read()).get('user_id') in users:
+                    paths.append(path)
+        except (OSError, ValueError, AttributeError):
+            continue
+
+    removed = 0
+    for path in paths:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+# ==================== 출력 ====================
+
+def print_results(results: List[ScenarioResult]) -> None:
+    header = (f"{'profile':<8} {'scenario':<14} {'conc':>4} {'reqs':>6} {'err':>4} {'rps':>8} "
+              f"{'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'cpu%':>6} {'rss MB':>7}")
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        cpu = f'{r.cpu_percent:6.0f}' if r.cpu_percent is not None else f"{'n/a':>6}"
+        rss = f'{r.peak_rss_mb:7.0f}' if r.peak_rss_mb is not None else f"{'n/a':>7}"
+        print(f"{r.profile:<8} {r.scenario:<14} {r.concurrency:>4} {r.requests:>6} {r.errors:>4} {r.rps:>8.1f} "
+              f"{r.p50:>8.1f} {r.p95:>8.1f} {r.p99:>8.1f} {r.max:>8.1f} {cpu} {rss}")
+    print("(지연 단위 ms, cpu%는 마스터+워커 합계로 100%가 코어 1개)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--gunicorn', action='append', metavar='WxT',
+                        help=f'워커x스레드 설정, 여러 번 지정 가능 (기본 {DEFAULT_PROFILES[0]})')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='실행할 시나리오, 여러 번 지정 가능 (기본 전체)')
+    parser.add_argument('--concurrency', type=int, default=8, help='가상 사용자 수')
+    parser.add_argument('--duration', type=float, default=20.0, help='시나리오별 측정 시간 (초)')
+    parser.add_argument('--warmup', type=float, default=3.0, help='측정 전 예열 시간 (초)')
+    parser.add_argument('--target', help='이미 실행 중인 서버 주소 (gunicorn을 띄우지 않고 대역 서버만 사용)')
+    parser.add_argument('--llm-latency', type=float, default=StubConfig.llm_latency, help='LLM 응답 지연 (ms)')
+    parser.add_argument('--llm-tokens', type=int, default=StubConfig.llm_tokens, help='LLM 응답 토큰 수')
+    parser.add_argument('--llm-tps', type=float, default=0.0, help='LLM 스트리밍 토큰/초 (0이면 즉시)')
+    parser.add_argument('--youtube-latency', type=float, default=StubConfig.youtube_latency, help='ms')
+    parser.add_argument('--supabase-latency', type=float, default=StubConfig.supabase_latency, help='ms')
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE',
+                        help='gunicorn에 추가할 환경변수 (예: HISTORY_WRITE_BEHIND=0)')
+    parser.add_argument('--json', help='결과를 JSON으로 저장할 경로')
+    args = parser.parse_args(argv)
+
+    stub = StubServer(config=StubConfig(
+        llm_latency=args.llm_latency, llm_tokens=args.llm_tokens, llm_tokens_per_second=args.llm_tps,
+        youtube_latency=args.youtube_latency, supabase_latency=args.supabase_latency
+    )).start()
+    extra_env = dict(item.split('=', 1) for item in args.env)
+    scenarios = [SCENARIOS[name] for name in (args.scenario or DEFAULT_SCENARIOS)]
+    profiles = ['external'] if args.target else (args.gunicorn or list(DEFAULT_PROFILES))
+    run_id = uuid.uuid4().hex[:4]
+    started = time.time()
+
+    print(f"대역 서버 {stub.base_url} (LLM {args.llm_latency:.0f}ms, YouTube {args.youtube_latency:.0f}ms, "
+          f"Supabase {args.supabase_latency:.0f}ms)")
+    results: List[ScenarioResult] = []
+    try:
+        for profile in profiles:
+            process, base_url = (None, args.target) if args.target else start_gunicorn(profile, stub, extra_env)
+            try:
+                for scenario in scenarios:
+                    print(f"[{profile}] {scenario.name}: {scenario.description}")
+                    results.append(run_scenario(
+                        base_url, scenario, args.concurrency, args.duration, args.warmup,
+                        run_id, profile, process.pid if process else None
+                    ))
+            finally:
+                if process:
+                    stop_gunicorn(process)
+    finally:
+        stub.shutdown()
+        cleanup_cache(run_id, started, args.concurrency)
+
+    print()
+    print_results(results)
+    print(f"대역 서버 요청 수: {stub.counts()}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([asdict(r) for r in results], f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+"""
+부하 테스트용 외부 서비스 대역 서버
+LiteLLM(OpenAI 호환 chat completions), YouTube(watch/timedtext/Data API), Supadata, Supabase(REST/Auth)를
+로컬 HTTP 서버 하나로 흉내 냅니다. 응답 지연과 스트리밍 속도를 설정할 수 있습니다.
+
+실행: python -m benchmarks.stub_servers [--port 8900] [--llm-latency 800] [--llm-tokens 400]
+"""
+import argparse
+import base64
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_transcript_parser import build_vtt  # noqa: E402
+
+TRANSCRIPT_SENTENCE = "오늘은 성능 측정 방법과 병목을 찾는 과정을 단계별로 살펴보겠습니다. "
+LLM_REPLY = "# 부하 테스트 요약\n\n" + "측정 결과를 바탕으로 병목 구간을 정리했습니다. " * 40
+
+
+@dataclass
+class StubConfig:
+    """대역 서버 응답 설정 (지연 단위: ms)"""
+    llm_latency: float = 800.0  # 첫 토큰까지
+    llm_tokens: int = 400  # 응답 토큰 수 (usage.completion_tokens)
+    llm_tokens_per_second: float = 0.0  # 스트리밍 속도, 0이면 지연 없이 전송
+    youtube_latency: float = 150.0
+    transcript_minutes: int = 20
+    supabase_latency: float = 20.0
+    comments: int = 50
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """경로로 대상 서비스를 구분하는 요청 핸들러"""
+
+    protocol_version = 'HTTP/1.1'
+    server: 'StubServer'
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler 시그니처
+        pass
+
+    # ==================== 응답 헬퍼 ====================
+
+    def _read_json(self) -> Optional[object]:
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return None
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return None
+
+    def _send(self, status: int, body, content_type: str = 'application/json') -> None:
+        if not isinstance(body, (bytes, str)):
+            body = json.dumps(body, ensure_ascii=False)
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _delay(self, milliseconds: float) -> None:
+        if milliseconds > 0:
+            time.sleep(milliseconds / 1000)
+
+    # ==================== 라우팅 ====================
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PATCH(self):
+        self._dispatch('PATCH')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _dispatch(self, method: str) -> None:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path
+
+        if path.endswith('/chat/completions') and method == 'POST':
+            self.server.count('llm')
+            return self._chat_completions()
+        if path == '/supadata/transcript':
+            self.server.count('supadata')
+            return self._supadata(query)
+        if path == '/watch':
+            self.server.count('youtube_watch')
+            return self._watch_page(query)
+        if path == '/api/timedtext':
+            self.server.count('youtube_timedtext')
+            return self._timedtext(query)
+        if path.startswith('/youtube/v3/'):
+            self.server.count('youtube_api')
+            return self._youtube_data(path.rsplit('/', 1)[-1], query)
+        if path.startswith('/auth/v1/'):
+            self.server.count('supabase_auth')
+            return self._supabase_auth(path)
+        if path.startswith('/rest/v1/'):
+            self.server.count('supabase_rest')
+            return self._supabase_rest(method, path[len('/rest/v1/'):])
+        self.server.count('unknown')
+        self._send(404, {'error': f'stub: {method} {path}'})
+
+    # ==================== LiteLLM (OpenAI 호환) ====================
+
+    def _chat_completions(self) -> None:
+        config = self.server.config
+        payload = self._read_json() or {}
+        prompt_chars = sum(len(str(m.get('content', ''))) for m in payload.get('messages', []))
+        usage = {
+            'prompt_tokens': max(1, prompt_chars // 3),
+            'completion_tokens': config.llm_tokens,
+            'total_tokens': max(1, prompt_chars // 3) + config.llm_tokens,
+        }
+        model = payload.get('model', 'stub')
+        self._delay(config.llm_latency)
+
+        if not payload.get('stream'):
+            return self._send(200, {
+                'id': 'chatcmpl-stub', 'object': 'chat.completion', 'created': int(time.time()), 'model': model,
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': LLM_REPLY}}],
+                'usage': usage,
+            })
+
+        # SSE 스트리밍: 토큰 속도에 맞춰 청크 전송
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        chunks = [LLM_REPLY[i:i + 16] for i in range(0, len(LLM_REPLY), 16)]
+        interval = (config.llm_tokens / len(chunks)) / config.llm_tokens_per_second \
+            if config.llm_tokens_per_second > 0 else 0
+        for index, chunk in enumerate(chunks):
+            event = {'id': 'chatcmpl-stub', 'object': 'chat.completion.chunk', 'model': model,
+                     'choices': [{'index': 0, 'delta': {'content': chunk}, 'finish_reason': None}]}
+            if index == len(chunks) - 1:
+                event['choices'][0]['finish_reason'] = 'stop'
+                event['usage'] = usage
+            self.wfile.write(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            if interval:
+                time.sleep(interval)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+    # ==================== YouTube / Supadata ====================
+
+    def _supadata(self, query: Dict) -> None:
+        self._delay(self.server.config.youtube_latency)
+        self._send(200, {'content': self.server.transcript_text, 'lang': 'ko'})
+
+    def _watch_page(self, query: Dict) -> None:
+        self._delay(self.server.config.youtube_latency)
+        video_id = query.get('v', [''])[0]
+        base = f"http://{self.headers.get('Host')}/api/timedtext?v={video_id}"
+        player = {
+            'videoDetails': {'videoId': video_id, 'title': f'부하 테스트 영상 {video_id}'},
+            'captions': {'playerCaptionsTracklistRenderer': {'captionTracks': [
+                {'languageCode': 'ko', 'baseUrl': f'{base}&lang=ko'},
+                {'languageCode': 'en', 'kind': 'asr', 'baseUrl': f'{base}&lang=en'},
+            ]}},
+        }
+        filler = '<div class="filler">' + 'x' * 1000 + '</div>\n'
+        html = (f"<html><head>{filler * 256}</head><body><script>var ytInitialPlayerResponse = "
+                f"{json.dumps(player, ensure_ascii=False)};</script>{filler * 256}</body></html>")
+        self._send(200, html, 'text/html; charset=utf-8')
+
+    def _timedtext(self, query: Dict) -> None:
+        self._delay(self.server.config.youtube_latency)
+        self._send(200, self.server.vtt_text, 'text/vtt; charset=utf-8')
+
+    def _youtube_data(self, resource: str, query: Dict) -> None:
+        self._delay(self.server.config.youtube_latency)
+        if resource == 'videos':
+            video_id = query.get('id', [''])[0]
+            return self._send(200, {'items': [{'id': video_id, 'snippet': {'title': f'부하 테스트 영상 {video_id}'}}]})
+        if resource == 'commentThreads':
+            return self._send(200, {'items': [
+                {'snippet': {'topLevelComment': {'snippet': {'textDisplay': f'유익한 영상입니다 {i}'}}}}
+                for i in range(self.server.config.comments)
+            ]})
+        self._send(404, {'error': {'code': 404, 'message': resource}})
+
+    # ==================== Supabase ====================
+
+    def _bearer_subject(self) -> str:
+        """검증 없이 JWT의 sub만 읽음 (대역 서버이므로 서명 확인 안 함)"""
+        token = self.headers.get('Authorization', '').partition(' ')[2]
+        try:
+            payload = token.split('.')[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+            return claims.get('sub', 'stub-user')
+        except (IndexError, ValueError):
+            return 'stub-user'
+
+    def _supabase_auth(self, path: str) -> None:
+        self._delay(self.server.config.supabase_latency)
+        if path.endswith('/.well-known/jwks.json'):
+            return self._send(200, {'keys': []})
+        if path.endswith('/user'):
+            user_id = self._bearer_subject()
+            return self._send(200, {'id': user_id, 'aud': 'authenticated', 'role': 'authenticated',
+                                    'email': f'{user_id}@example.com'})
+        if path.endswith('/logout'):
+            return self._send(204, b'')
+        self._send(404, {'msg': path})
+
+    def _supabase_rest(self, method: str, resource: str) -> None:
+        self._delay(self.server.config.supabase_latency)
+        body = self._read_json()
+
+        if resource.startswith('rpc/'):
+            name = resource[len('rpc/'):]
+            if name in ('consume_usage', 'refund_usage'):
+                return self._send(200, {'consumed': True, 'is_admin': False, 'usage_count': 1,
+                                        'max_usage': 1_000_000, 'can_use': True})
+            if name == 'get_metered_usage':
+                return self._send(200, {'used_tokens': 0, 'used_cost': 0, 'usage_count': 0})
+            return self._send(200, None)
+
+        if method == 'GET':
+            return self._send(200, [])
+        if method == 'DELETE':
+            return self._send(200, [])
+        # insert/upsert/update: Prefer return=representation에 맞춰 요청 행을 그대로 반환
+        rows = body if isinstance(body, list) else [body] if body else []
+        self._send(201 if method == 'POST' else 200, rows)
+
+
+class StubServer(ThreadingHTTPServer):
+    """대역 서버 (요청마다 스레드, 대상 서비스별 요청 수 집계)"""
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, address=('127.0.0.1', 0), config: Optional[StubConfig] = None):
+        super().__init__(address, _StubHandler)
+        self.config = config or StubConfig()
+        self.vtt_text = build_vtt(hours=1)
+        sentences = max(1, self.config.transcript_minutes * 12)
+        self.transcript_text = TRANSCRIPT_SENTENCE * sentences
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def count(self, service: str) -> None:
+        with self._lock:
+            self._counts[service] = self._counts.get(service, 0) + 1
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def app_environment(self) -> Dict[str, str]:
+        """앱이 대역 서버를 사용하도록 하는 환경변수"""
+        base = self.base_url
+        return {
+            'OPENAI_API_KEY': 'sk-stub',
+            'OPENAI_API_BASE': f'{base}/v1',
+            'OPENAI_BASE_URL': f'{base}/v1',
+            'SUPADATA_API_KEY': 'stub',
+            'SUPADATA_API_URL': f'{base}/supadata/transcript',
+            'YOUTUBE_WATCH_URL': f'{base}/watch',
+            'YOUTUBE_API_KEY': 'stub',
+            'YOUTUBE_API_ENDPOINT': base,
+            'SUPABASE_URL': base,
+            'SUPABASE_ANON_KEY': 'stub-anon-key',
+        }
+
+    def start(self) -> 'StubServer':
+        threading.Thread(target=self.serve_forever, name='stub-server', daemon=True).start()
+        return self
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--llm-latency', type=float, default=StubConfig.llm_latency, help='첫 토큰까지 지연 (ms)')
+    parser.add_argument('--llm-tokens', type=int, default=StubConfig.llm_tokens, help='응답 토큰 수')
+    parser.add_argument('--llm-tps', type=float, default=0.0, help='스트리밍 토큰/초 (0이면 즉시)')
+    parser.add_argument('--youtube-latency', type=float, default=StubConfig.youtube_latency, help='ms')
+    parser.add_argument('--supabase-latency', type=float, default=StubConfig.supabase_latency, help='ms')
+    args = parser.parse_args(argv)
+
+    config = StubConfig(llm_latency=args.llm_latency, llm_tokens=args.llm_tokens,
+                        llm_tokens_per_second=args.llm_tps, youtube_latency=args.youtube_latency,
+                        supabase_latency=args.supabase_latency)
+    server = StubServer((args.host, args.port), config)
+    print(f"대역 서버: {server.base_url}")
+    for key, value in server.app_environment().items():
+        print(f"  export {key}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
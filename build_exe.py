@@ -2,6 +2,8 @@ import os
 import subprocess
 import sys
 
+from services.lazy_imports import HEAVY_MODULES
+
 def build_exe():
     """PyInstaller를 사용하여 EXE 파일을 생성합니다."""
     # 현재 디렉토리 설정
@@ -25,6 +27,8 @@ def build_exe():
         "--hidden-import=google.generativeai",
         "--hidden-import=markdown",
         "--hidden-import=dotenv",
+        # 지연 로딩하는 SDK는 정적 분석에서 보이지 않으므로 명시
+        *[f"--hidden-import={module}" for module in HEAVY_MODULES],
         "run_app_hidden.py"
     ]
     
@@ -29,6 +29,28 @@ MAX_TRANSCRIPT_TOKENS: int = 100000
 MAX_COMMENTS_TOKENS: int = 5000
 MAX_CONTENT_TOKENS: int = 100000  # 기본 fallback 값
 
+# HTTP 응답 압축 (gzip, brotli 설치 시 br)
+COMPRESSION_ENABLED: bool = os.getenv('COMPRESSION_ENABLED', '1') != '0'
+COMPRESSION_MIN_SIZE: int = 1024  # 바이트, 이보다 작은 응답은 압축하지 않음
+COMPRESSION_LEVEL: int = 6
+
+# /generate-batch에서 URL을 동시에 처리하는 스레드 수 (Supabase 연결 풀 크기 계산에도 사용)
+MAX_BATCH_WORKERS: int = 5
+
+# 사용량 한도 기준: count(하루 횟수, 기본) | tokens(하루 토큰) | cost(하루 추정 비용, USD)
+USAGE_QUOTA_MODE: str = os.getenv('USAGE_QUOTA_MODE', 'count')
+DAILY_TOKEN_QUOTA: int = int(os.getenv('DAILY_TOKEN_QUOTA', 500000))
+DAILY_COST_QUOTA: float = float(os.getenv('DAILY_COST_QUOTA', 0.5))
+# tokens/cost 모드에서 LLM 호출 전에 예약하는 예상 사용량 (실제 사용량이 기록되면 정산)
+USAGE_RESERVE_TOKENS: int = int(os.getenv('USAGE_RESERVE_TOKENS', 8000))
+USAGE_RESERVE_COST: float = float(os.getenv('USAGE_RESERVE_COST', 0.02))
+USAGE_RESERVATION_TTL: int = 900  # 초, 정산/해제되지 않은 예약의 만료 시간
+
+# 모델별 가격 (USD / 1M 토큰). 여기 없는 모델은 LiteLLM 가격표로 추정
+MODEL_PRICING: Dict[str, Dict[str, float]] = {
+    'gemini/gemini-2.5-flash-lite-preview-09-2025': {'prompt': 0.10, 'completion': 0.40},
+}
+
 # 지원 AI 서비스 정의 (max_input_tokens: 컨텍스트 윈도우의 ~75% 할당)
 SUPPORTED_PROVIDERS: Dict[str, Dict[str, Any]] = {
     'gemini': {
@@ -129,6 +151,9 @@ __all__ = [
     'MAX_TRANSCRIPT_TOKENS',
     'MAX_COMMENTS_TOKENS',
     'MAX_CONTENT_TOKENS',
+    'COMPRESSION_ENABLED',
+    'COMPRESSION_MIN_SIZE',
+    'COMPRESSION_LEVEL',
     'SUPPORTED_PROVIDERS',
     'STYLE_OPTIONS',
     'STYLE_MODIFIERS',
@@ -0,0 +1,60 @@
+"""
+gunicorn 설정 (Procfile/railway.json의 명령줄 옵션과 함께 자동으로 읽힘)
+Prometheus 멀티프로세스 모드: 워커마다 지표를 공유 디렉터리에 기록하고 /metrics에서 합산
+preload 모드(GUNICORN_PRELOAD=1): 마스터가 앱과 무거운 SDK를 한 번 불러온 뒤 fork해 워커들이
+copy-on-write로 메모리를 공유 (프로세스별 연결/스레드는 각 모듈이 fork 후 새로 만듦)
+"""
+import gc
+import os
+import shutil
+import tempfile
+
+if os.getenv('METRICS_ENABLED', '1') != '0':
+    # 워커가 prometheus_client를 import하기 전에 설정되어야 함
+    os.environ.setdefault(
+        'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'insight-engine-metrics')
+    )
+
+preload_app = os.getenv('GUNICORN_PRELOAD', '0') == '1'
+
+
+def on_starting(server):
+    """이전 실행의 지표 파일 정리"""
+    metrics_dir = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    if metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """종료된 워커의 gauge(livesum) 값을 합산에서 제외"""
+    if not os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        return
+    try:
+        from prometheus_client import multiprocess
+    except ModuleNotFoundError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def when_ready(server):
+    """preload 모드: 워커를 fork하기 전에 마스터에서 SDK를 불러오고 GC 대상에서 제외
+
+    gc.freeze()로 옮긴 객체는 워커의 GC가 건드리지 않아 공유 페이지가 덜 복사됨
+    """
+    if not server.cfg.preload_app:
+        return
+    from services import lazy_imports
+    elapsed = lazy_imports.prewarm()
+    gc.collect()
+    gc.freeze()
+    server.log.info("preload: SDK %d개 불러옴 (%.1f초), 객체 %d개 고정",
+                    len(elapsed), sum(elapsed.values()), gc.get_freeze_count())
+
+
+def post_worker_init(worker):
+    """워커가 요청을 받기 시작할 때 무거운 SDK를 백그라운드에서 미리 불러옴 (PREWARM=0이면 생략)"""
+    if worker.cfg.preload_app:
+        return  # 마스터에서 이미 불러옴
+    from services import lazy_imports
+    lazy_imports.start_prewarm()
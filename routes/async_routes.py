@@ -0,0 +1,114 @@
+"""
+ASGI 모드 비동기 라우트 (asgi.py에서 사용)
+/generate, /regenerate를 이벤트 루프에서 처리해 LLM 응답과 자막 요청을 기다리는 동안 스레드를 점유하지 않습니다.
+URL 규칙과 검증/응답 구성은 blog_routes와 같고, 비동기 API가 없는 SDK 호출만 스레드 풀에서 실행합니다.
+"""
+import asyncio
+import time
+
+from flask import request, jsonify, current_app
+
+from config import get_model_max_tokens
+from routes.blog_routes import (
+    _combine_content, _generate_response, _get_request_data, _get_requested_fields, _get_style_prompt,
+    _handle_error_response, _regenerate_response, _validate_youtube_url, _wants_field
+)
+from services import ai_service, content_service, metrics
+from services.supabase_service import require_auth
+from services.usage import require_usage
+
+
+async def _fetch_youtube_content_async(video_id):
+    """blog_routes._fetch_youtube_content의 비동기 버전 (자막과 댓글을 동시에 가져옴)
+
+    Returns:
+        tuple: (combined_content, error, raw_transcript)
+    """
+    transcript, comments = await asyncio.gather(
+        content_service.get_transcript_async(video_id),
+        asyncio.to_thread(content_service.get_top_comments, video_id)
+    )
+    if isinstance(transcript, dict) and transcript.get('error'):
+        return None, transcript['error'], None
+    return _combine_content(transcript, comments), None, transcript
+
+
+@require_auth
+@require_usage
+async def generate():
+    """blog.generate의 비동기 버전"""
+    with metrics.track_generation('generate'):
+        try:
+            start_time = time.time()
+            params = _get_request_data(request)
+            fields = _get_requested_fields(request)
+            url = params['url']
+
+            video_id, error_response = _validate_youtube_url(url)
+            if error_response:
+                return error_response
+
+            # YouTube 원본 제목 (googleapiclient는 동기 전용)
+            title_task = asyncio.create_task(asyncio.to_thread(content_service.get_content_title, url))
+            content, error, raw_transcript = await _fetch_youtube_content_async(video_id)
+            youtube_title = await title_task or 'YouTube 영상'
+            if error:
+                return jsonify({'error': error}), 400
+
+            max_tokens = get_model_max_tokens(params['model'])
+            truncated_content = content_service.truncate_text(content, max_tokens)
+
+            style_prompt = _get_style_prompt(params['style'], params['custom_prompt'])
+            result, used_prompt = await ai_service.create_content_async(
+                truncated_content,
+                params['model'],
+                style_prompt,
+                return_prompt=True,
+                modifiers=params['modifiers'],
+                render_html=_wants_field(fields, 'html')
+            )
+            return await asyncio.to_thread(_generate_response, params, fields, url, video_id, youtube_title,
+                                           raw_transcript, result, used_prompt, start_time)
+
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            current_app.logger.error(f"Generate failed: {e}")
+            return _handle_error_response(str(e))
+
+
+@require_auth
+@require_usage
+async def regenerate():
+    """blog.regenerate의 비동기 버전"""
+    with metrics.track_generation('regenerate'):
+        try:
+            params = _get_request_data(request)
+            fields = _get_requested_fields(request)
+            content = params['content']
+
+            if not content:
+                return jsonify({'error': '재생성할 콘텐츠가 없습니다'}), 400
+
+            style_prompt = _get_style_prompt(params['style'])
+            result, used_prompt = await ai_service.create_content_async(
+                content,
+                params['model'],
+                style_prompt,
+                return_prompt=True,
+                render_html=_wants_field(fields, 'html')
+            )
+            return await asyncio.to_thread(_regenerate_response, params, fields, result, used_prompt)
+
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            current_app.logger.error(f"Regenerate failed: {e}")
+            return _handle_error_response(str(e))
+
+
+# 엔드포인트 이름 → 비동기 뷰 (나머지 라우트는 기존 WSGI 앱이 스레드 풀에서 처리)
+ASYNC_VIEWS = {
+    'blog.generate': generate,
+    'blog.regenerate': regenerate,
+}
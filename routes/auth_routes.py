@@ -4,12 +4,17 @@
 """
 from flask import Blueprint, request, jsonify, g
 from services.supabase_service import (
-    get_supabase, is_supabase_enabled, require_auth,
+    get_supabase_auth, is_supabase_enabled, require_auth, revoke_token,
     save_api_keys, get_api_keys,
-    get_histories, delete_history, update_history,
-    save_custom_style, get_custom_styles, delete_custom_style,
-    get_usage, is_admin, get_all_users_usage, reset_user_usage, get_usage_stats
+    list_histories, get_history, delete_history, update_history, resolve_history_transcript,
+    delete_histories, update_histories_mindmap,
+    save_custom_style, get_custom_styles, delete_custom_style, save_custom_styles, delete_custom_styles,
+    get_usage, is_admin, list_users_usage, reset_user_usage, get_usage_stats, get_usage_timeseries,
+    get_usage_ledger
 )
+from services import profiler, timing
+from services.exceptions import ValidationError
+from services.markdown_renderer import render_markdown
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -39,6 +44,31 @@ def _error_response(message, status_code=400):
     return jsonify({'error': message}), status_code
 
 
+BULK_MAX_ITEMS = 100  # bulk API 한 번에 처리하는 최대 항목 수
+
+
+def _bulk_list(data, key):
+    """bulk 요청 본문의 목록 필드 검증
+
+    Raises:
+        ValidationError: 목록이 아니거나 BULK_MAX_ITEMS 초과
+    """
+    items = data.get(key) or []
+    if not isinstance(items, list):
+        raise ValidationError(f'{key}는 목록이어야 합니다.', field=key)
+    if len(items) > BULK_MAX_ITEMS:
+        raise ValidationError(f'{key}는 최대 {BULK_MAX_ITEMS}개까지 처리할 수 있습니다.', field=key)
+    return items
+
+
+def _bulk_ids(data, key):
+    """bulk 요청 본문의 ID 목록 검증 (중복 제거, 순서 유지)"""
+    ids = _bulk_list(data, key)
+    if not all(isinstance(i, str) and i for i in ids):
+        raise ValidationError(f'{key}에 잘못된 ID가 있습니다.', field=key)
+    return list(dict.fromkeys(ids))
+
+
 @auth_bp.route('/api/auth/status', methods=['GET'])
 def auth_status():
     """Supabase 활성화 상태 확인"""
@@ -80,7 +110,7 @@ def signup():
         return _error_response('비밀번호는 최소 6자 이상이어야 합니다.')
 
     try:
-        result = get_supabase().auth.sign_up({'email': email, 'password': password})
+        result = get_supabase_auth().auth.sign_up({'email': email, 'password': password})
 
         if result.user:
             return _success_response({
@@ -108,7 +138,7 @@ def reset_password():
         return _error_response('이메일을 입력해주세요.')
 
     try:
-        get_supabase().auth.reset_password_email(email)
+        get_supabase_auth().auth.reset_password_email(email)
         return _success_response({
             'message': '비밀번호 재설정 이메일을 발송했습니다. 이메일을 확인해주세요.'
         })
@@ -134,7 +164,7 @@ def oauth_login(provider):
         # 현재 요청의 호스트에서 redirect URL 생성
         redirect_url = request.args.get('redirect_url', request.host_url.rstrip('/'))
 
-        result = get_supabase().auth.sign_in_with_oauth({
+        result = get_supabase_auth().auth.sign_in_with_oauth({
             'provider': provider,
             'options': {
                 'redirect_to': redirect_url
@@ -159,7 +189,7 @@ def oauth_callback():
 
     try:
         # Supabase에서 코드를 세션으로 교환
-        result = get_supabase().auth.exchange_code_for_session({'auth_code': code})
+        result = get_supabase_auth().auth.exchange_code_for_session({'auth_code': code})
 
         if result.user and result.session:
             return _success_response({
@@ -189,7 +219,7 @@ def login():
         return validation_error
 
     try:
-        result = get_supabase().auth.sign_in_with_password({'email': email, 'password': password})
+        result = get_supabase_auth().auth.sign_in_with_password({'email': email, 'password': password})
 
         if result.user and result.session:
             return _success_response({
@@ -214,7 +244,8 @@ def login():
 def logout():
     """로그아웃"""
     try:
-        get_supabase().auth.sign_out()
+        revoke_token(g.get('access_token'))
+        get_supabase_auth().auth.admin.sign_out(g.access_token)
         return _success_response()
     except Exception as e:
         return _error_response(str(e))
@@ -232,7 +263,7 @@ def refresh_token():
         return _error_response('Refresh token이 필요합니다.')
 
     try:
-        result = get_supabase().auth.refresh_session(refresh_token_value)
+        result = get_supabase_auth().auth.refresh_session(refresh_token_value)
 
         if result.session:
             return _success_response({
@@ -253,7 +284,7 @@ def refresh_token():
 def get_current_user():
     """현재 사용자 정보 조회"""
     try:
-        user = get_supabase().auth.get_user(g.access_token)
+        user = get_supabase_auth().auth.get_user(g.access_token)
         return jsonify({
             'user': {
                 'id': user.user.id,
@@ -314,8 +345,8 @@ def _format_history(h):
         'title': h['title'],
         'style': h['style'],
         'content': h['content'],
-        'html': h['html'],
-        'transcript': h.get('transcript'),
+        'html': h['html'] or render_markdown(h['content']),
+        'transcript': resolve_history_transcript(h),
         'mindmapMarkdown': h.get('mindmap_markdown'),
         'usage': h.get('usage'),
         'elapsed_time': h.get('elapsed_time'),
@@ -324,12 +355,47 @@ def _format_history(h):
     }
 
 
+def _format_history_summary(h):
+    """히스토리 목록용 요약 (본문/자막 제외)"""
+    return {
+        'id': h['report_id'],
+        'url': h['url'],
+        'title': h['title'],
+        'style': h['style'],
+        'time': h['created_at'],
+        'timestamp': h['created_at']
+    }
+
+
 @auth_bp.route('/api/user/histories', methods=['GET'])
 @require_auth
 def get_user_histories():
-    """사용자 히스토리 조회"""
-    histories = get_histories(g.user_id)
-    return jsonify({'histories': [_format_history(h) for h in histories]})
+    """사용자 히스토리 요약 목록 (keyset 페이지네이션)
+
+    Query:
+        limit: 페이지 크기 (기본 20, 최대 100)
+        cursor: 이전 응답의 nextCursor
+    """
+    limit = request.args.get('limit', 20, type=int)
+    try:
+        page = list_histories(g.user_id, limit=limit, cursor=request.args.get('cursor'))
+    except ValidationError as e:
+        return e.to_response()
+
+    return jsonify({
+        'histories': [_format_history_summary(h) for h in page['items']],
+        'nextCursor': page['next_cursor']
+    })
+
+
+@auth_bp.route('/api/user/histories/<report_id>', methods=['GET'])
+@require_auth
+def get_user_history(report_id):
+    """사용자 히스토리 전체 본문 조회"""
+    history = get_history(g.user_id, report_id)
+    if not history:
+        return _error_response('히스토리를 찾을 수 없습니다.', 404)
+    return jsonify({'history': _format_history(history)})
 
 
 @auth_bp.route('/api/user/histories/<report_id>', methods=['DELETE'])
@@ -356,6 +422,33 @@ def update_user_history(report_id):
     return _error_response('업데이트에 실패했습니다.', 500)
 
 
+@auth_bp.route('/api/user/histories/batch', methods=['POST'])
+@require_auth
+def batch_user_histories():
+    """히스토리 일괄 삭제/마인드맵 업데이트 (각각 단일 DB 문)
+
+    Body:
+        delete: [report_id, ...]
+        update: [{id, mindmapMarkdown}, ...]
+    """
+    data = _get_json_data()
+    try:
+        delete_ids = _bulk_ids(data, 'delete')
+        updates = {}
+        for item in _bulk_list(data, 'update'):
+            if not isinstance(item, dict) or not isinstance(item.get('id'), str) or 'mindmapMarkdown' not in item:
+                raise ValidationError('update 항목에는 id와 mindmapMarkdown이 필요합니다.', field='update')
+            updates[item['id']] = item['mindmapMarkdown']
+    except ValidationError as e:
+        return e.to_response()
+
+    if not update_histories_mindmap(g.user_id, updates):
+        return _error_response('업데이트에 실패했습니다.', 500)
+    if not delete_histories(g.user_id, delete_ids):
+        return _error_response('삭제에 실패했습니다.', 500)
+    return _success_response({'deleted': len(delete_ids), 'updated': len(updates)})
+
+
 # =============================================
 # 커스텀 스타일 관리
 # =============================================
@@ -385,6 +478,31 @@ def delete_user_style(style_id):
     return _error_response('삭제에 실패했습니다.', 500)
 
 
+@auth_bp.route('/api/user/styles/batch', methods=['POST'])
+@require_auth
+def batch_user_styles():
+    """커스텀 스타일 일괄 저장/삭제 (각각 단일 DB 문)
+
+    Body:
+        upsert: [{id, name, icon, prompt}, ...]
+        delete: [style_id, ...]
+    """
+    data = _get_json_data()
+    try:
+        styles = _bulk_list(data, 'upsert')
+        if not all(isinstance(st, dict) and st.get('id') and st.get('name') and st.get('prompt') for st in styles):
+            raise ValidationError('upsert 항목에는 id, name, prompt가 필요합니다.', field='upsert')
+        delete_ids = _bulk_ids(data, 'delete')
+    except ValidationError as e:
+        return e.to_response()
+
+    if not save_custom_styles(g.user_id, styles):
+        return _error_response('스타일 저장에 실패했습니다.', 500)
+    if not delete_custom_styles(g.user_id, delete_ids):
+        return _error_response('삭제에 실패했습니다.', 500)
+    return _success_response({'upserted': len(styles), 'deleted': len(delete_ids)})
+
+
 # =============================================
 # 사용량 조회
 # =============================================
@@ -392,10 +510,16 @@ def delete_user_style(style_id):
 @auth_bp.route('/api/user/usage', methods=['GET'])
 @require_auth
 def get_user_usage():
-    """사용자 사용량 조회 (남은 횟수, 최대 횟수)"""
-    usage = get_usage(g.user_id)
+    """사용자 사용량 조회 (남은 횟수, 최대 횟수)
+
+    USAGE_QUOTA_MODE가 tokens/cost면 오늘 누적 토큰/비용 기준으로 남은 비율(%)을 반환합니다.
+    """
+    from services.usage.usage_service import UsageService
+
+    admin = is_admin(g.user_id)
+    usage = (not admin and UsageService.get_metered(g.user_id)) or get_usage(g.user_id)
     # 관리자 여부 추가
-    usage['is_admin'] = is_admin(g.user_id)
+    usage['is_admin'] = admin
     return jsonify(usage)
 
 
@@ -420,13 +544,29 @@ def check_admin():
 @auth_bp.route('/api/admin/users', methods=['GET'])
 @require_auth
 def get_admin_users():
-    """모든 사용자의 사용량 조회 (관리자 전용)"""
+    """사용자 사용량 목록 조회 (관리자 전용, keyset 페이지네이션)
+
+    Query:
+        limit: 페이지 크기 (기본 50, 최대 200)
+        cursor: 이전 응답의 nextCursor
+        status: active | available | exhausted
+        user_id: 특정 사용자만 조회
+    """
     error = _require_admin()
     if error:
         return error
 
-    users = get_all_users_usage()
-    return jsonify({'users': users})
+    try:
+        page = list_users_usage(
+            limit=request.args.get('limit', 50, type=int),
+            cursor=request.args.get('cursor'),
+            status=request.args.get('status'),
+            user_id=request.args.get('user_id')
+        )
+    except ValidationError as e:
+        return e.to_response()
+
+    return jsonify({'users': page['items'], 'nextCursor': page['next_cursor']})
 
 
 @auth_bp.route('/api/admin/users/<user_id>/reset', methods=['POST'])
@@ -452,3 +592,139 @@ def get_admin_stats():
 
     stats = get_usage_stats()
     return jsonify(stats)
+
+
+@auth_bp.route('/api/admin/stats/usage', methods=['GET'])
+@require_auth
+def get_admin_usage_timeseries():
+    """일자/스타일/모델별 사용량 추이 (관리자 전용)
+
+    Query:
+        days: 조회할 최근 일수 (기본 30, 최대 366)
+        style: 특정 스타일만 조회
+        model: 특정 모델만 조회
+    """
+    error = _require_admin()
+    if error:
+        return error
+
+    return jsonify(get_usage_timeseries(
+        days=request.args.get('days', 30, type=int),
+        style=request.args.get('style'),
+        model=request.args.get('model')
+    ))
+
+
+@auth_bp.route('/api/admin/stats/timings', methods=['GET'])
+@require_auth
+def get_admin_timings():
+    """단계별/라우트별 소요 시간 집계 (관리자 전용, 현재 워커 프로세스 기준)
+
+    Query:
+        reset: 1이면 조회 후 집계 초기화
+    """
+    error = _require_admin()
+    if error:
+        return error
+
+    stats = timing.snapshot()
+    if request.args.get('reset') == '1':
+        timing.reset_stats()
+    return jsonify(stats)
+
+
+@auth_bp.route('/api/admin/profile', methods=['POST'])
+@require_auth
+def admin_profile_cpu():
+    """샘플링 프로파일 (관리자 전용, 요청을 받은 워커 프로세스 기준)
+
+    seconds 동안 응답이 지연되며, 결과는 flamegraph collapsed stack 형식입니다.
+
+    Query:
+        seconds: 측정 시간 (기본 10, 최대 60)
+        interval: 샘플 간격 ms (기본 5)
+        idle: 1이면 대기 중인 스레드도 포함
+        format: collapsed (기본, text/plain) | json (상위 함수 요약 포함)
+    """
+    error = _require_admin()
+    if error:
+        return error
+
+    seconds = request.args.get('seconds', 10, type=float)
+    interval_ms = request.args.get('interval', profiler.DEFAULT_INTERVAL * 1000, type=float)
+    if not 0 < seconds <= profiler.MAX_SECONDS or interval_ms <= 0:
+        return _error_response(f'seconds는 0~{profiler.MAX_SECONDS:g}, interval은 0보다 커야 합니다.')
+
+    result = profiler.sample(seconds, interval_ms / 1000, include_idle=request.args.get('idle') == '1')
+    if result is None:
+        return _error_response('이미 프로파일이 실행 중입니다.', 409)
+
+    if request.args.get('format') == 'json':
+        stacks = result.pop('stacks')
+        return jsonify({**result, 'top': profiler.top_functions(stacks), 'collapsed': profiler.to_collapsed(stacks)})
+
+    return profiler.to_collapsed(result['stacks']), 200, {
+        'Content-Type': 'text/plain; charset=utf-8',
+        'X-Profile-Pid': str(result['pid']),
+        'X-Profile-Samples': str(result['samples']),
+    }
+
+
+@auth_bp.route('/api/admin/profile/memory', methods=['GET', 'POST'])
+@require_auth
+def admin_profile_memory():
+    """tracemalloc 할당 위치 상위 항목 (관리자 전용, 요청을 받은 워커 프로세스 기준)
+
+    Query:
+        action: start | stop (POST, 추적 시작/중지) - 없으면 스냅샷 조회
+        frames: start 시 보관할 스택 깊이 (기본 10)
+        top: 상위 항목 수 (기본 25)
+        group: lineno (기본) | filename | traceback
+        compare: 1이면 이전 스냅샷 대비 증가량 순
+    """
+    error = _require_admin()
+    if error:
+        return error
+
+    action = request.args.get('action')
+    if action and request.method != 'POST':
+        return _error_response('start/stop은 POST로 요청해주세요.', 405)
+    if action == 'start':
+        return jsonify(profiler.start_tracemalloc(request.args.get('frames', 10, type=int)))
+    if action == 'stop':
+        return jsonify(profiler.stop_tracemalloc())
+    if action:
+        return _error_response('action은 start 또는 stop이어야 합니다.')
+
+    snapshot = profiler.memory_snapshot(
+        limit=request.args.get('top', 25, type=int),
+        key_type=request.args.get('group', 'lineno'),
+        compare=request.args.get('compare') == '1'
+    )
+    if snapshot is None:
+        return _error_response('tracemalloc이 꺼져 있습니다. 먼저 action=start로 추적을 시작해주세요.', 409)
+    return jsonify(snapshot)
+
+
+@auth_bp.route('/api/admin/usage/ledger', methods=['GET'])
+@require_auth
+def get_admin_usage_ledger():
+    """사용자/일자/모델/스타일별 토큰과 추정 비용 원장 (관리자 전용)
+
+    Query:
+        days: 조회할 최근 일수 (기본 7)
+        user_id: 특정 사용자만 조회
+    """
+    error = _require_admin()
+    if error:
+        return error
+
+    try:
+        ledger = get_usage_ledger(
+            days=request.args.get('days', 7, type=int),
+            user_id=request.args.get('user_id')
+        )
+    except ValidationError as e:
+        return e.to_response()
+
+    return jsonify({'ledger': ledger})
@@ -8,13 +8,13 @@ from typing import Dict
 
 from flask import Blueprint, request, jsonify, current_app, render_template, g
 
-from config import get_model_max_tokens
-from services import ai_service, content_service
+from config import MAX_BATCH_WORKERS, get_model_max_tokens
+from services import ai_service, content_service, logging_config, metrics, report_artifacts, timing, tracing
 from services.content_service import clear_cache
 from services.supabase_service import (
-    require_auth, is_supabase_enabled, save_history
+    require_auth, is_supabase_enabled, queue_history
 )
-from services.usage import require_usage
+from services.usage import require_usage, metering
 from services.usage.usage_decorator import get_usage_for_response
 import uuid
 
@@ -24,9 +24,12 @@ _CLIENT_TRACKER: Dict[str, float] = {}
 DEFAULT_MODEL = 'gpt-4o'
 DEFAULT_STYLE = 'detailed'
 MAX_BATCH_URLS = 10
-MAX_BATCH_WORKERS = 5
 BATCH_CONTENT_TOKEN_LIMIT = 3000
 
+# 응답 필드 선택: fields=all(또는 *)이면 전체, 지정하지 않으면 대용량 아티팩트를 제외한 compact 응답
+ALL_FIELDS_TOKENS = frozenset({'all', '*'})
+ALWAYS_INCLUDED_FIELDS = frozenset({'id', 'artifacts', 'success', 'url', 'error'})
+
 
 def _extract_client_id(req) -> str:
     """요청에서 클라이언트 ID를 추출합니다."""
@@ -85,6 +88,51 @@ def _get_style_prompt(style, custom_prompt=None):
     return style_prompts.get(style, '')
 
 
+def _get_requested_fields(req):
+    """요청한 응답 필드를 반환합니다.
+
+    쿼리스트링 fields=a,b 또는 JSON 본문 "fields"(문자열/리스트)를 지원합니다.
+
+    Returns:
+        None: 전체 필드 (fields=all)
+        빈 frozenset: compact 기본 응답
+        frozenset: 지정한 필드만
+    """
+    raw = req.args.get('fields')
+    if raw is None:
+        data = req.get_json(silent=True)
+        if isinstance(data, dict):
+            raw = data.get('fields')
+    if not raw:
+        return frozenset()
+
+    if isinstance(raw, str):
+        raw = raw.split(',')
+    fields = frozenset(str(f).strip() for f in raw if str(f).strip())
+    if fields & ALL_FIELDS_TOKENS:
+        return None
+    return fields
+
+
+def _wants_field(fields, name):
+    """응답에 해당 필드가 포함되는지 여부 (필요할 때만 계산하기 위함)"""
+    return fields is None or not fields or name in fields
+
+
+def _select_fields(payload, fields, stored_artifacts):
+    """fields 선택에 맞춰 응답 페이로드를 줄입니다.
+
+    서버에 저장된 아티팩트만 compact 응답에서 제외되며,
+    저장되지 않은 아티팩트는 데이터 유실을 막기 위해 그대로 포함됩니다.
+    """
+    payload['artifacts'] = list(stored_artifacts)
+    if fields is None:
+        return payload
+    if not fields:
+        return {k: v for k, v in payload.items() if k not in stored_artifacts}
+    return {k: v for k, v in payload.items() if k in fields or k in ALWAYS_INCLUDED_FIELDS}
+
+
 def _handle_error_response(error_msg):
     """에러 메시지에 따른 적절한 HTTP 상태 코드를 반환합니다."""
     if 'API 키' in error_msg or 'authentication' in error_msg.lower():
@@ -104,10 +152,92 @@ def _fetch_youtube_content(video_id):
         return None, transcript['error'], None
 
     comments = content_service.get_top_comments(video_id)
+    return _combine_content(transcript, comments), None, transcript
+
+
+def _combine_content(transcript, comments):
+    """자막과 댓글을 LLM 입력 하나로 합칩니다."""
     comments_text = '\n'.join(comments[:20]) if comments else '(댓글 없음)'
+    return f"[영상 자막]\n{transcript}\n\n[시청자 댓글]\n{comments_text}"
 
-    final_content = f"[영상 자막]\n{transcript}\n\n[시청자 댓글]\n{comments_text}"
-    return final_content, None, transcript
+
+def _validate_youtube_url(url):
+    """생성 요청 URL 검증
+
+    Returns:
+        tuple: (video_id, error_response) - 둘 중 하나는 None
+    """
+    if not url:
+        return None, (jsonify({'error': 'YouTube URL이 필요합니다.'}), 400)
+    if not content_service.is_youtube_url(url):
+        return None, (jsonify({'error': '유효한 YouTube URL을 입력해주세요.'}), 400)
+
+    video_id = content_service.get_video_id(url)
+    if not video_id:
+        return None, (jsonify({'error': '유효하지 않은 YouTube URL입니다.'}), 400)
+    return video_id, None
+
+
+def _generate_response(params, fields, url, video_id, youtube_title, raw_transcript, result, used_prompt,
+                       start_time):
+    """생성 결과를 기록(토큰 원장, 히스토리, 아티팩트)하고 응답을 만듭니다."""
+    metering.record(g.user_id, params['model'], params['style'], result.get('usage'))
+
+    elapsed_time = round(time.time() - start_time, 2)
+
+    # 히스토리 저장 (클라우드, 응답을 기다리지 않고 백그라운드 저장)
+    report_id = str(uuid.uuid4())
+    if g.user_id:
+        queue_history(g.user_id, {
+            'id': report_id,
+            'url': url,
+            'title': result.get('title', youtube_title),
+            'style': params['style'],
+            'content': result.get('content', ''),
+            'html': result.get('html', ''),
+            'transcript': raw_transcript,
+            'video_id': video_id,
+            'model': params['model'],
+            'usage': result.get('usage'),
+            'elapsed_time': elapsed_time
+        })
+
+    with timing.span('artifacts'):
+        stored = report_artifacts.save_artifacts(report_id, g.user_id, {
+            'prompt': used_prompt,
+            'transcript': raw_transcript
+        })
+
+    return jsonify(_select_fields({
+        **result,
+        "id": report_id,
+        "prompt": used_prompt,
+        "elapsed_time": elapsed_time,
+        "youtube_title": youtube_title,
+        "transcript": raw_transcript,
+        "usage": get_usage_for_response(),
+        "timings": timing.get_timings()
+    }, fields, stored))
+
+
+def _regenerate_response(params, fields, result, used_prompt):
+    """재생성 결과를 기록하고 응답을 만듭니다.
+
+    재생성 결과는 히스토리에 저장하지 않으므로 응답 id는 프롬프트 아티팩트 조회에만 쓰입니다.
+    """
+    metering.record(g.user_id, params['model'], params['style'], result.get('usage'), kind='regenerate')
+
+    report_id = str(uuid.uuid4())
+    with timing.span('artifacts'):
+        stored = report_artifacts.save_artifacts(report_id, g.user_id, {'prompt': used_prompt})
+
+    return jsonify(_select_fields({
+        **result,
+        "id": report_id,
+        "prompt": used_prompt,
+        "usage": get_usage_for_response(),
+        "timings": timing.get_timings()
+    }, fields, stored))
 
 
 @blog_bp.route('/')
@@ -223,7 +353,8 @@ def recommend_style():
         response = ai_service.create_content(
             prompt,
             model,
-            style_prompt=""
+            style_prompt="",
+            render_html=False
         )
 
         import re
@@ -295,7 +426,8 @@ def generate_style():
         response = ai_service.create_content(
             prompt,
             model,
-            style_prompt=""
+            style_prompt="",
+            render_html=False
         )
 
         import re
@@ -324,24 +456,22 @@ def generate_style():
 @blog_bp.route('/generate', methods=['POST'])
 @require_auth
 @require_usage
+@metrics.track_generation('generate')
 def generate():
     """단일 YouTube URL에서 콘텐츠를 생성합니다.
     API 키는 서버 환경변수에서 자동으로 로드됩니다.
     로그인 필수, 하루 5회 제한 적용 (관리자는 무제한).
+    prompt/transcript는 기본 응답에서 제외되며 /api/reports/<id>/<artifact>로 조회합니다.
     """
     try:
         start_time = time.time()
         params = _get_request_data(request)
+        fields = _get_requested_fields(request)
         url = params['url']
 
-        if not url:
-            return jsonify({'error': 'YouTube URL이 필요합니다.'}), 400
-        if not content_service.is_youtube_url(url):
-            return jsonify({'error': '유효한 YouTube URL을 입력해주세요.'}), 400
-
-        video_id = content_service.get_video_id(url)
-        if not video_id:
-            return jsonify({'error': '유효하지 않은 YouTube URL입니다.'}), 400
+        video_id, error_response = _validate_youtube_url(url)
+        if error_response:
+            return error_response
 
         # YouTube 원본 제목 가져오기
         youtube_title = content_service.get_content_title(url) or 'YouTube 영상'
@@ -359,35 +489,11 @@ def generate():
             params['model'],
             style_prompt,
             return_prompt=True,
-            modifiers=params['modifiers']
+            modifiers=params['modifiers'],
+            render_html=_wants_field(fields, 'html')
         )
-
-        elapsed_time = round(time.time() - start_time, 2)
-
-        # 히스토리 저장 (클라우드)
-        report_id = str(uuid.uuid4())
-        if g.user_id:
-            save_history(g.user_id, {
-                'id': report_id,
-                'url': url,
-                'title': result.get('title', youtube_title),
-                'style': params['style'],
-                'content': result.get('content', ''),
-                'html': result.get('html', ''),
-                'transcript': raw_transcript,
-                'usage': result.get('usage'),
-                'elapsed_time': elapsed_time
-            })
-
-        return jsonify({
-            **result,
-            "id": report_id,
-            "prompt": used_prompt,
-            "elapsed_time": elapsed_time,
-            "youtube_title": youtube_title,
-            "transcript": raw_transcript,
-            "usage": get_usage_for_response()
-        })
+        return _generate_response(params, fields, url, video_id, youtube_title, raw_transcript, result,
+                                  used_prompt, start_time)
 
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
@@ -399,6 +505,7 @@ def generate():
 @blog_bp.route('/regenerate', methods=['POST'])
 @require_auth
 @require_usage
+@metrics.track_generation('regenerate')
 def regenerate():
     """기존 콘텐츠를 새로운 스타일로 재생성합니다.
     API 키는 서버 환경변수에서 자동으로 로드됩니다.
@@ -406,6 +513,7 @@ def regenerate():
     """
     try:
         params = _get_request_data(request)
+        fields = _get_requested_fields(request)
         content = params['content']
 
         if not content:
@@ -416,10 +524,10 @@ def regenerate():
             content,
             params['model'],
             style_prompt,
-            return_prompt=True
+            return_prompt=True,
+            render_html=_wants_field(fields, 'html')
         )
-
-        return jsonify({**result, "prompt": used_prompt, "usage": get_usage_for_response()})
+        return _regenerate_response(params, fields, result, used_prompt)
 
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
@@ -428,13 +536,23 @@ def regenerate():
         return _handle_error_response(str(e))
 
 
-def _process_single_url(app, url, model, style, modifiers, custom_prompt):
+def _process_single_url(app, url, model, style, modifiers, custom_prompt, render_html=True):
     """배치 처리에서 단일 URL을 처리하는 헬퍼 함수입니다.
     API 키는 서버 환경변수에서 자동으로 로드됩니다.
+    작업 스레드에서 따로 측정한 단계별 시간을 결과의 timings에 담습니다.
     """
+    with timing.collect() as timings, tracing.span('batch.url', {'url.full': str(url), 'gen_ai.request.model': model}):
+        result = _process_single_url_timed(app, url, model, style, modifiers, custom_prompt, render_html)
+        tracing.annotate({'batch.success': result.get('success')})
+    result['timings'] = timings.as_dict()
+    return result
+
+
+def _process_single_url_timed(app, url, model, style, modifiers, custom_prompt, render_html):
+    """_process_single_url 본문 (측정 범위 안에서 실행)"""
     with app.app_context():
         try:
-            current_app.logger.info(f"Processing URL: {url}")
+            current_app.logger.info("Processing URL: %s", url)
 
             if not content_service.is_youtube_url(url):
                 return {
@@ -454,7 +572,7 @@ def _process_single_url(app, url, model, style, modifiers, custom_prompt):
                 }
 
             title = content_service.get_content_title(url) or 'YouTube 영상'
-            current_app.logger.info(f"Content title: {title}")
+            current_app.logger.debug("Content title: %s", title)
 
             content, error, raw_transcript = _fetch_youtube_content(video_id)
             if error:
@@ -471,7 +589,8 @@ def _process_single_url(app, url, model, style, modifiers, custom_prompt):
 
             result, used_prompt = ai_service.create_content(
                 content, model, style_prompt,
-                return_prompt=True, modifiers=modifiers
+                return_prompt=True, modifiers=modifiers,
+                render_html=render_html
             )
 
             return {
@@ -480,7 +599,8 @@ def _process_single_url(app, url, model, style, modifiers, custom_prompt):
                 'title': result.get('title', title),
                 'content': result.get('content', ''),
                 'html': result.get('html', ''),
-                'prompt': used_prompt
+                'prompt': used_prompt,
+                'token_usage': result.get('usage')
             }
 
         except Exception as e:
@@ -495,6 +615,7 @@ def _process_single_url(app, url, model, style, modifiers, custom_prompt):
 
 @blog_bp.route('/generate-batch', methods=['POST'])
 @require_auth
+@metrics.track_generation('batch')
 def generate_batch():
     """여러 URL을 배치로 처리합니다.
     API 키는 서버 환경변수에서 자동으로 로드됩니다.
@@ -502,58 +623,64 @@ def generate_batch():
     """
     from services.usage.usage_service import UsageService
 
+    usage = None
     try:
-        # 사용량 체크
-        can_use, usage = UsageService.check_can_use(g.user_id)
-        if not can_use:
-            return jsonify({
-                'error': '오늘 사용 가능 횟수를 모두 소진했습니다. 내일 다시 시도해주세요.',
-                'code': 'USAGE_LIMIT_EXCEEDED',
-                'usage': usage
-            }), 429
-
         current_app.logger.info("Batch generate request received")
 
         data = request.get_json()
-        current_app.logger.info(f"Request data: {data}")
 
         if not data:
             current_app.logger.error("No JSON data received")
             return jsonify({'error': 'JSON 데이터가 제공되지 않았습니다'}), 400
 
+        fields = _get_requested_fields(request)
+
         urls = data.get('urls', [])
         model = data.get('model', DEFAULT_MODEL)
         style = data.get('style', DEFAULT_STYLE)
         modifiers = data.get('modifiers')
         custom_prompt = data.get('customPrompt')
 
-        current_app.logger.info(f"URLs to process: {urls}, Model: {model}, Style: {style}")
+        current_app.logger.info("Batch URLs: %d, Model: %s, Style: %s",
+                                len(urls) if isinstance(urls, list) else 0, model, style)
 
         if not urls or not isinstance(urls, list):
             return jsonify({'error': 'URL 목록이 제공되지 않았습니다'}), 400
         if len(urls) > MAX_BATCH_URLS:
             return jsonify({'error': f'최대 {MAX_BATCH_URLS}개의 URL만 처리할 수 있습니다'}), 400
 
+        # 사용량 확인 + 차감 (배치 전체가 1회, 성공 결과가 없으면 복구)
+        with timing.span('usage'):
+            consumed, usage = UsageService.consume(g.user_id)
+        if not consumed:
+            return jsonify({
+                'error': '오늘 사용 가능 횟수를 모두 소진했습니다. 내일 다시 시도해주세요.',
+                'code': 'USAGE_LIMIT_EXCEEDED',
+                'usage': usage
+            }), 429
+
         app = current_app._get_current_object()
         results = [None] * len(urls)
         combined_content = []
 
-        current_app.logger.info(f"Starting to process {len(urls)} URLs concurrently")
+        current_app.logger.info("Starting to process %d URLs concurrently", len(urls))
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_BATCH_WORKERS) as executor:
+        metrics.batch_urls_pending(len(urls))
+        with timing.span('urls'), concurrent.futures.ThreadPoolExecutor(max_workers=MAX_BATCH_WORKERS) as executor:
             future_to_index = {
                 executor.submit(
-                    _process_single_url, app, url, model, style,
-                    modifiers, custom_prompt
+                    tracing.bind(logging_config.bind_request_id(_process_single_url)), app, url, model, style,
+                    modifiers, custom_prompt, _wants_field(fields, 'html')
                 ): i for i, url in enumerate(urls)
             }
 
             for future in concurrent.futures.as_completed(future_to_index):
                 index = future_to_index[future]
+                metrics.batch_urls_pending(-1)
                 try:
                     result = future.result()
                     results[index] = result
-                    current_app.logger.info(f"Completed processing URL {index + 1}: {result.get('success', False)}")
+                    current_app.logger.info("Completed processing URL %d: %s", index + 1, result.get('success', False))
 
                     if result['success'] and isinstance(result.get('content', ''), str):
                         combined_content.append(result['content'])
@@ -576,52 +703,95 @@ def generate_batch():
         success_count = sum(1 for r in ordered_results if r.get('success'))
         fail_count = len(ordered_results) - success_count
 
-        current_app.logger.info(f"Batch processing completed. Success: {success_count}, Failed: {fail_count}")
+        current_app.logger.info("Batch processing completed. Success: %d, Failed: %d", success_count, fail_count)
 
-        # 성공한 결과가 1개 이상이면 사용량 차감 (배치 전체가 1회로 계산)
+        # 성공한 결과가 없으면 차감분 복구
         updated_usage = usage
-        if success_count > 0:
-            updated_usage = UsageService.decrement(g.user_id)
-
-        # 성공한 결과들 히스토리 저장 (클라우드)
+        if success_count == 0:
+            updated_usage = UsageService.refund(g.user_id, usage)
+            usage = None
+
+        # 성공한 결과에 ID 부여, 토큰 사용량 원장 기록 및 프롬프트 아티팩트 저장
+        # (토큰/비용 기준이면 첫 기록에서 consume이 잡아 둔 예약분을 정산)
+        reservation_id = (usage or {}).get('reservation_id')
+        for result in ordered_results:
+            if result.get('success'):
+                metering.record(g.user_id, model, style, result.get('token_usage'), kind='batch',
+                                reservation_id=reservation_id)
+                reservation_id = None
+                result['id'] = str(uuid.uuid4())
+                with timing.span('artifacts'):
+                    result['stored_artifacts'] = report_artifacts.save_artifacts(
+                        result['id'], g.user_id, {'prompt': result.get('prompt')}
+                    )
+
+        # 성공한 결과들 히스토리 저장 (클라우드, 다중 행 insert로 묶어서 백그라운드 저장)
         if g.user_id:
             for result in ordered_results:
                 if result.get('success'):
-                    report_id = str(uuid.uuid4())
-                    result['id'] = report_id  # 결과에 ID 추가
-                    save_history(g.user_id, {
-                        'id': report_id,
+                    queue_history(g.user_id, {
+                        'id': result['id'],
                         'url': result.get('url'),
                         'title': result.get('title'),
                         'style': style,
                         'content': result.get('content', ''),
                         'html': result.get('html', ''),
                         'transcript': None,  # 배치에서는 자막 저장 생략
-                        'usage': None,
+                        'model': model,
+                        'usage': result.get('token_usage'),
                         'elapsed_time': None
                     })
 
+        for result in ordered_results:
+            result.pop('token_usage', None)
+
+        shaped_results = [
+            _select_fields(result, fields, result.pop('stored_artifacts', []))
+            if result.get('success') else result
+            for result in ordered_results
+        ]
+
         return jsonify({
             'success': True,
-            'results': ordered_results,
+            'results': shaped_results,
             'content': final_combined_content,
             'total_processed': len(urls),
             'successful': success_count,
             'failed': fail_count,
-            'usage': updated_usage
+            'usage': updated_usage,
+            'timings': timing.get_timings()
         })
 
     except ValueError as e:
         current_app.logger.error(f"ValueError in batch generate: {e}")
+        if usage is not None:
+            UsageService.refund(g.user_id, usage)
         return jsonify({'error': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Batch generate failed: {e}", exc_info=True)
+        if usage is not None:
+            UsageService.refund(g.user_id, usage)
         return _handle_error_response(f'배치 처리 중 오류: {str(e)}')
 
 
+@blog_bp.route('/api/reports/<report_id>/<artifact>', methods=['GET'])
+@require_auth
+def get_report_artifact(report_id, artifact):
+    """리포트의 대용량 아티팩트(prompt, transcript)를 필요할 때 조회합니다."""
+    if artifact not in report_artifacts.ARTIFACT_FIELDS:
+        return jsonify({'error': f'지원하지 않는 아티팩트입니다: {artifact}'}), 400
+
+    value = report_artifacts.load_artifact(report_id, artifact, g.user_id)
+    if value is None:
+        return jsonify({'error': '요청한 리포트 데이터를 찾을 수 없습니다.'}), 404
+
+    return jsonify({'id': report_id, 'artifact': artifact, 'content': value})
+
+
 @blog_bp.route('/api/mindmap', methods=['POST'])
 @require_auth
 @require_usage
+@metrics.track_generation('mindmap')
 def generate_mindmap():
     """기존 콘텐츠를 마인드맵 형식의 마크다운으로 변환합니다.
     API 키는 서버 환경변수에서 자동으로 로드됩니다.
@@ -650,8 +820,10 @@ def generate_mindmap():
         result = ai_service.create_content(
             truncated_content,
             model,
-            mindmap_prompt
+            mindmap_prompt,
+            render_html=False
         )
+        metering.record(g.user_id, model, 'mindmap', result.get('usage'), kind='mindmap')
 
         elapsed_time = round(time.time() - start_time, 2)
 
@@ -660,7 +832,8 @@ def generate_mindmap():
             'success': True,
             'markdown': result.get('content', ''),
             'elapsed_time': elapsed_time,
-            'usage': get_usage_for_response()
+            'usage': get_usage_for_response(),
+            'timings': timing.get_timings()
         })
 
     except ValueError as e:
@@ -4,10 +4,11 @@ import subprocess
 import webbrowser
 import time
 import threading
-import traceback
 import logging
 from werkzeug.serving import make_server
 
+from services.logging_config import configure_logging
+
 # 로그 설정
 def _get_app_dir():
     if getattr(sys, 'frozen', False):
@@ -16,8 +17,8 @@ def _get_app_dir():
 
 
 log_file = os.path.join(_get_app_dir(), 'app_error.log')
-logging.basicConfig(filename=log_file, level=logging.DEBUG, 
-                    format='%(asctime)s - %(levelname)s - %(message)s')
+# 파일 쓰기는 QueueListener 스레드에서 처리 (기본 INFO, LOG_LEVEL/LOG_FORMAT으로 변경)
+configure_logging(fmt=os.getenv('LOG_FORMAT') or 'text', log_file=log_file)
 
 HEARTBEAT_TTL_SECONDS = 15
 IDLE_SHUTDOWN_SECONDS = 25
@@ -29,8 +30,7 @@ def open_browser():
         webbrowser.open('http://127.0.0.1:5000')
         logging.info("브라우저가 열렸습니다.")
     except Exception as e:
-        logging.error(f"브라우저 열기 실패: {e}")
-        traceback.print_exc(file=open(log_file, 'a'))
+        logging.exception(f"브라우저 열기 실패: {e}")
 
 def run_flask_app():
     """Flask 앱을 백그라운드에서 실행합니다."""
@@ -47,8 +47,11 @@ def run_flask_app():
 
         from app import app
         from routes import blog_routes
+        from services import lazy_imports
 
         server = make_server('127.0.0.1', 5000, app)
+        # 소켓을 연 뒤 litellm 등은 백그라운드에서 불러옴 (첫 화면은 바로 표시)
+        lazy_imports.start_prewarm()
 
         def _monitor_idle_shutdown():
             had_client = False
@@ -75,8 +78,7 @@ def run_flask_app():
         server.serve_forever()
         
     except Exception as e:
-        logging.error(f"앱 실행 중 오류 발생: {e}")
-        traceback.print_exc(file=open(log_file, 'a'))
+        logging.exception(f"앱 실행 중 오류 발생: {e}")
         print(f"오류 발생: {e}")
         input("계속하려면 아무 키나 누르세요...")
 
@@ -85,7 +87,6 @@ if __name__ == "__main__":
         logging.info("애플리케이션 시작")
         run_flask_app()
     except Exception as e:
-        logging.error(f"메인 실행 오류: {e}")
-        traceback.print_exc(file=open(log_file, 'a'))
+        logging.exception(f"메인 실행 오류: {e}")
         print(f"오류 발생: {e}")
         input("계속하려면 아무 키나 누르세요...")
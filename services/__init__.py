@@ -2,4 +2,5 @@
 서비스 모듈 패키지
 - ai_service: LiteLLM 기반 AI 콘텐츠 생성
 - content_service: YouTube 자막/댓글 추출
+- transcript_parser: 자막(VTT/XML) 및 플레이어 응답 파싱
 """
@@ -2,13 +2,51 @@
 AI 콘텐츠 생성 서비스
 LiteLLM을 사용한 다중 AI 프로바이더 지원
 """
-import markdown
+import os
+import sys
+import time
+
 from flask import current_app
-from litellm import completion
+
+from config import get_provider_from_model
+from services import lazy_imports, metrics, timing, tracing
+from services.markdown_renderer import render_markdown
 
 DEFAULT_LANGUAGE_INSTRUCTION = '결과는 반드시 한국어로 작성해주세요.'
 
 
+def completion(*args, **kwargs):
+    """litellm.completion (litellm은 첫 호출 때 불러옴)"""
+    return lazy_imports.load('litellm').completion(*args, **kwargs)
+
+
+async def acompletion(*args, **kwargs):
+    """litellm.acompletion (litellm은 첫 호출 때 불러옴)"""
+    return await lazy_imports.load('litellm').acompletion(*args, **kwargs)
+
+
+def reset_llm_clients() -> None:
+    """LiteLLM이 캐시한 HTTP 클라이언트를 버립니다 (fork 직후 자식 프로세스용).
+
+    gunicorn preload 모드에서는 마스터가 litellm을 불러온 뒤 fork하므로,
+    워커가 부모의 연결 풀을 공유하지 않고 처음 사용할 때 새로 만들게 합니다.
+    """
+    litellm = sys.modules.get('litellm')
+    if litellm is None:
+        return
+    cache = getattr(litellm, 'in_memory_llm_clients_cache', None)
+    if cache is not None and hasattr(cache, 'flush_cache'):
+        cache.flush_cache()
+    # 모듈 수준 클라이언트를 지연 생성하는 버전은 지우면 다음 접근 때 다시 만듦
+    if '__getattr__' in vars(litellm):
+        for name in ('module_level_client', 'module_level_aclient'):
+            vars(litellm).pop(name, None)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_llm_clients)
+
+
 def _build_modifier_instructions(modifiers, style_modifiers):
     """세부 옵션에서 추가 지시사항을 생성합니다."""
     instructions = []
@@ -74,7 +112,51 @@ def _convert_error_message(error_msg):
     return f"콘텐츠 생성 중 오류 발생: {error_msg}"
 
 
-def create_content(content, model, style_prompt=None, return_prompt=False, modifiers=None):
+def _llm_span(model):
+    """LLM 호출 구간 (Server-Timing llm + OpenTelemetry client span)"""
+    return timing.span('llm', description=model), tracing.client_span(f'chat {model}', {
+        'gen_ai.operation.name': 'chat',
+        'gen_ai.system': get_provider_from_model(model or ''),
+        'gen_ai.request.model': model
+    })
+
+
+def _annotate_usage(response):
+    usage = getattr(response, 'usage', None)
+    tracing.annotate({
+        'gen_ai.usage.input_tokens': getattr(usage, 'prompt_tokens', None),
+        'gen_ai.usage.output_tokens': getattr(usage, 'completion_tokens', None)
+    })
+    return usage
+
+
+def _build_result(response, usage, model, llm_seconds, render_html):
+    """LLM 응답을 결과 딕셔너리로 변환하고 지표를 기록합니다."""
+    markdown_content = response.choices[0].message.content
+    title, body = _extract_title_and_content(markdown_content)
+
+    # 토큰 사용량 정보 추출
+    token_usage = None
+    if usage:
+        token_usage = {
+            'prompt_tokens': getattr(usage, 'prompt_tokens', 0),
+            'completion_tokens': getattr(usage, 'completion_tokens', 0),
+            'total_tokens': getattr(usage, 'total_tokens', 0)
+        }
+    metrics.observe_llm(model, llm_seconds, token_usage)
+
+    result = {
+        'title': title,
+        'content': body,
+        'usage': token_usage
+    }
+    if render_html:
+        with timing.span('render'):
+            result['html'] = render_markdown(body)
+    return result
+
+
+def create_content(content, model, style_prompt=None, return_prompt=False, modifiers=None, render_html=True):
     """
     LiteLLM을 사용하여 AI 콘텐츠를 생성합니다.
     API 키는 환경변수에서 자동으로 로드됩니다 (OPENAI_API_KEY, ANTHROPIC_API_KEY 등).
@@ -85,6 +167,7 @@ def create_content(content, model, style_prompt=None, return_prompt=False, modif
         style_prompt: 스타일 프롬프트
         return_prompt: 사용된 프롬프트 반환 여부
         modifiers: 세부 옵션 딕셔너리 (length, tone, language, emoji)
+        render_html: HTML 렌더링 여부 (False면 결과에 html 필드 없음)
 
     Returns:
         dict 또는 tuple: 생성 결과 (return_prompt=True면 (result, prompt) 튜플)
@@ -93,31 +176,52 @@ def create_content(content, model, style_prompt=None, return_prompt=False, modif
         prompt = _build_prompt(content, style_prompt, modifiers)
 
         # LiteLLM이 환경변수에서 자동으로 API 키 로드
-        response = completion(
-            model=model,
-            messages=[{"role": "user", "content": prompt}]
-        )
-
-        markdown_content = response.choices[0].message.content
-        title, body = _extract_title_and_content(markdown_content)
-
-        # 토큰 사용량 정보 추출
-        usage = getattr(response, 'usage', None)
-        token_usage = None
-        if usage:
-            token_usage = {
-                'prompt_tokens': getattr(usage, 'prompt_tokens', 0),
-                'completion_tokens': getattr(usage, 'completion_tokens', 0),
-                'total_tokens': getattr(usage, 'total_tokens', 0)
-            }
-
-        result = {
-            'title': title,
-            'content': body,
-            'html': markdown.markdown(body, extensions=['tables', 'fenced_code']),
-            'usage': token_usage
-        }
+        started = time.perf_counter()
+        try:
+            timing_span, trace_span = _llm_span(model)
+            with timing_span, trace_span:
+                response = completion(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}]
+                )
+                usage = _annotate_usage(response)
+        except Exception:
+            metrics.observe_llm(model, time.perf_counter() - started, None, outcome='error')
+            raise
+
+        result = _build_result(response, usage, model, time.perf_counter() - started, render_html)
+        if return_prompt:
+            return result, prompt
+        return result
+
+    except Exception as e:
+        current_app.logger.error(f"AI content generation failed: {e}")
+        raise Exception(_convert_error_message(str(e))) from e
+
+
+async def create_content_async(content, model, style_prompt=None, return_prompt=False, modifiers=None,
+                               render_html=True):
+    """create_content의 비동기 버전 (ASGI 라우트용, LLM 응답을 기다리는 동안 스레드를 점유하지 않음)
+
+    인자와 반환값은 create_content와 같습니다.
+    """
+    try:
+        prompt = _build_prompt(content, style_prompt, modifiers)
 
+        started = time.perf_counter()
+        try:
+            timing_span, trace_span = _llm_span(model)
+            with timing_span, trace_span:
+                response = await acompletion(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}]
+                )
+                usage = _annotate_usage(response)
+        except Exception:
+            metrics.observe_llm(model, time.perf_counter() - started, None, outcome='error')
+            raise
+
+        result = _build_result(response, usage, model, time.perf_counter() - started, render_html)
         if return_prompt:
             return result, prompt
         return result
@@ -0,0 +1,257 @@
+"""
+ASGI 브리지
+Flask 앱을 uvicorn 등 ASGI 서버에서 실행합니다 (asgi.py).
+- async_views에 등록한 엔드포인트: 이벤트 루프에서 Flask 요청 컨텍스트 안에 실행
+  (before/after_request 훅, 에러 핸들러는 WSGI 실행과 동일)
+- 나머지 라우트: 기존 WSGI 앱을 스레드 풀에서 실행
+- lifespan: 시작 시 스레드 풀 크기 설정(ASGI_THREADS)과 SDK 미리 불러오기, 종료 시 비동기 HTTP 클라이언트 정리
+요청 본문은 모두 읽은 뒤 처리하고 응답도 한 번에 보냅니다 (스트리밍 응답 없음). WebSocket은 지원하지 않습니다.
+본문은 ASGI_MAX_BODY(없으면 Flask MAX_CONTENT_LENGTH, 기본 16MB)까지만 받고 넘으면 바로 413으로 응답합니다.
+"""
+import asyncio
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from flask import Flask, request
+from flask.signals import request_started
+from werkzeug.exceptions import HTTPException
+
+from services import content_service, lazy_imports
+from services.logging_config import ServiceLogger
+
+logger = ServiceLogger('ASGI')
+
+AsyncView = Callable[..., Awaitable[Any]]
+WSGIResult = Tuple[int, List[Tuple[str, str]], List[bytes]]
+
+# 요청 본문 최대 크기 기본값 (바이트)
+DEFAULT_MAX_BODY = 16 * 1024 * 1024
+
+
+class _BodyTooLarge(Exception):
+    """요청 본문이 최대 크기를 넘음"""
+
+
+def build_environ(scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+    """ASGI HTTP scope를 WSGI environ으로 변환합니다 (PEP 3333)."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path.encode('utf-8').decode('latin-1'),
+        'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope.get('headers', []):
+        name = raw_name.decode('latin-1').lower()
+        if name == 'content-length':
+            continue  # 실제로 읽은 본문 길이 사용
+        key = 'CONTENT_TYPE' if name == 'content-type' else 'HTTP_' + name.upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        if key in environ:
+            value = environ[key] + ('; ' if key == 'HTTP_COOKIE' else ',') + value
+        environ[key] = value
+    return environ
+
+
+def run_wsgi(wsgi_app: Callable, environ: Dict[str, Any]) -> WSGIResult:
+    """WSGI 호출 가능 객체를 실행하고 (상태 코드, 헤더, 본문 조각)을 반환합니다."""
+    started: Dict[str, Any] = {}
+    chunks: List[bytes] = []
+
+    def start_response(status, headers, exc_info=None):
+        started['status'] = status
+        started['headers'] = headers
+        return chunks.append
+
+    result = wsgi_app(environ, start_response)
+    try:
+        for chunk in result:
+            if chunk:
+                chunks.append(chunk)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return int(started['status'].split(' ', 1)[0]), list(started['headers']), chunks
+
+
+class ASGIBridge:
+    """Flask 앱을 감싸는 ASGI 애플리케이션"""
+
+    def __init__(self, flask_app: Flask, async_views: Optional[Dict[str, AsyncView]] = None,
+                 threads: Optional[int] = None, max_body: Optional[int] = None):
+        """
+        Args:
+            flask_app: Flask 앱
+            async_views: 엔드포인트 이름 → async 뷰 (같은 URL 규칙의 WSGI 뷰 대신 실행)
+            threads: 스레드 풀 크기 (None이면 ASGI_THREADS, 없으면 asyncio 기본값)
+            max_body: 요청 본문 최대 바이트 (None이면 ASGI_MAX_BODY, 없으면 MAX_CONTENT_LENGTH 또는 16MB)
+        """
+        self.flask_app = flask_app
+        self.async_views = dict(async_views or {})
+        if threads is None and os.getenv('ASGI_THREADS'):
+            threads = int(os.getenv('ASGI_THREADS'))
+        self.threads = threads
+        if max_body is None:
+            max_body = int(os.getenv('ASGI_MAX_BODY') or flask_app.config.get('MAX_CONTENT_LENGTH') or DEFAULT_MAX_BODY)
+        self.max_body = max_body
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            if scope['type'] == 'websocket':
+                await send({'type': 'websocket.close', 'code': 1000})
+            return
+
+        try:
+            body = await _read_body(receive, self.max_body, _content_length(scope))
+        except _BodyTooLarge:
+            await send({
+                'type': 'http.response.start',
+                'status': 413,
+                'headers': [(b'content-type', b'text/plain; charset=utf-8'), (b'connection', b'close')],
+            })
+            await send({'type': 'http.response.body', 'body': b'request body too large\n'})
+            return
+        if body is None:
+            return  # 본문을 다 받기 전에 연결이 끊김
+
+        environ = build_environ(scope, body)
+        view = self._match_async_view(environ)
+        if view is None:
+            status, headers, chunks = await asyncio.to_thread(run_wsgi, self.flask_app, environ)
+        else:
+            status, headers, chunks = await self._dispatch_async(view, environ)
+
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers],
+        })
+        await send({'type': 'http.response.body', 'body': b''.join(chunks)})
+
+    def _match_async_view(self, environ: Dict[str, Any]) -> Optional[AsyncView]:
+        """요청이 async 뷰로 처리할 엔드포인트인지 확인 (라우팅 오류/리다이렉트는 WSGI 앱이 처리)"""
+        if not self.async_views:
+            return None
+        adapter = self.flask_app.url_map.bind_to_environ(
+            environ, server_name=self.flask_app.config['SERVER_NAME'])
+        try:
+            endpoint, _ = adapter.match()
+        except HTTPException:
+            return None
+        return self.async_views.get(endpoint)
+
+    async def _dispatch_async(self, view: AsyncView, environ: Dict[str, Any]) -> WSGIResult:
+        """Flask.wsgi_app과 같은 순서로 요청 컨텍스트를 열고 async 뷰를 실행합니다."""
+        app = self.flask_app
+        ctx = app.request_context(environ)
+        error: Optional[BaseException] = None
+        try:
+            ctx.push()
+            try:
+                response = await self._full_dispatch(view)
+            except Exception as e:
+                error = e
+                response = app.handle_exception(e)
+            return run_wsgi(response, environ)
+        finally:
+            ctx.pop(error)
+
+    async def _full_dispatch(self, view: AsyncView):
+        """Flask.full_dispatch_request의 async 버전"""
+        app = self.flask_app
+        try:
+            request_started.send(app, _async_wrapper=app.ensure_sync)
+            rv = app.preprocess_request()
+            if rv is None:
+                rv = await view(**request.view_args)
+        except Exception as e:
+            rv = app.handle_user_exception(e)
+        return app.finalize_request(rv)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    self._startup()
+                except Exception as e:
+                    logger.error(f"ASGI 시작 실패: {e}")
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await content_service.aclose_async_clients()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _startup(self) -> None:
+        if self.threads:
+            asyncio.get_running_loop().set_default_executor(
+                ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='asgi'))
+        lazy_imports.start_prewarm()
+        logger.info(f"ASGI 시작 (async 뷰 {len(self.async_views)}개, 스레드 {self.threads or '기본값'})")
+
+
+def _content_length(scope: Dict[str, Any]) -> Optional[int]:
+    """Content-Length 헤더 값 (없거나 잘못되면 None)"""
+    for raw_name, raw_value in scope.get('headers', []):
+        if raw_name.lower() == b'content-length':
+            try:
+                return int(raw_value)
+            except ValueError:
+                return None
+    return None
+
+
+async def _read_body(receive, max_body: int, content_length: Optional[int] = None) -> Optional[bytes]:
+    """요청 본문 전체 (연결이 끊기면 None, max_body를 넘으면 _BodyTooLarge)
+
+    Content-Length가 이미 max_body를 넘으면 본문을 읽지 않고, 받는 중에 넘어도 그 즉시 중단합니다.
+    """
+    if content_length is not None and content_length > max_body:
+        raise _BodyTooLarge()
+    chunks = []
+    received = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunk = message.get('body', b'')
+        received += len(chunk)
+        if received > max_body:
+            raise _BodyTooLarge()
+        chunks.append(chunk)
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+__all__ = [
+    'ASGIBridge',
+    'build_environ',
+    'run_wsgi',
+]
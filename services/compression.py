@@ -0,0 +1,144 @@
+"""
+HTTP 응답 압축 미들웨어
+JSON/HTML/정적 파일/SSE 응답을 gzip(또는 brotli 설치 시 br)으로 압축
+"""
+import zlib
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from flask import Flask, request
+
+try:
+    import brotli
+except ModuleNotFoundError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = frozenset({
+    'application/json',
+    'application/javascript',
+    'text/javascript',
+    'text/css',
+    'text/html',
+    'text/plain',
+    'text/markdown',
+    'text/event-stream',
+    'image/svg+xml',
+})
+
+# 정적 파일 압축 결과 캐시 (ETag 기준, 요청마다 다시 압축하지 않음)
+_STATIC_CACHE_MAX_ENTRIES = 256
+_static_cache: Dict[Tuple[str, str, str], bytes] = {}
+
+
+def _choose_encoding() -> Optional[str]:
+    """Accept-Encoding에 따라 사용할 인코딩을 선택합니다."""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_bytes(data: bytes, encoding: str, level: int = 6) -> bytes:
+    """바이트를 지정한 인코딩으로 압축합니다."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=min(level, 11))
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip 헤더
+    return compressor.compress(data) + compressor.flush()
+
+
+def _iter_compressed(chunks: Iterable, encoding: str, level: int) -> Iterator[bytes]:
+    """스트리밍 응답(SSE 등)을 청크 단위로 압축합니다 (청크마다 flush)."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=min(level, 11))
+        process, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        process = compressor.compress
+        flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)  # noqa: E731
+        finish = compressor.flush
+
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = process(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close:
+            close()
+
+
+def _compress_static(response, encoding: str, level: int) -> Optional[bytes]:
+    """정적 파일 응답 본문을 압축하고 ETag 기준으로 캐시합니다."""
+    etag, _weak = response.get_etag()
+    key = (request.path, etag, encoding) if etag else None
+    if key and key in _static_cache:
+        return _static_cache[key]
+
+    data = response.get_data()
+    compressed = compress_bytes(data, encoding, level)
+    if key:
+        if len(_static_cache) >= _STATIC_CACHE_MAX_ENTRIES:
+            _static_cache.clear()
+        _static_cache[key] = compressed
+    return compressed
+
+
+def init_compression(app: Flask) -> None:
+    """앱에 응답 압축 after_request 훅을 등록합니다.
+
+    설정:
+        COMPRESSION_ENABLED: 압축 사용 여부
+        COMPRESSION_MIN_SIZE: 이 크기(바이트) 미만 응답은 압축하지 않음
+        COMPRESSION_LEVEL: 압축 레벨 (gzip 1-9, brotli는 최대 11)
+    """
+
+    @app.after_request
+    def _compress_response(response):
+        if not app.config.get('COMPRESSION_ENABLED', True):
+            return response
+        if response.status_code < 200 or response.status_code >= 300 or response.status_code in (204, 206):
+            return response
+        if 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = _choose_encoding()
+        if not encoding:
+            return response
+
+        level = app.config.get('COMPRESSION_LEVEL', 6)
+        min_size = app.config.get('COMPRESSION_MIN_SIZE', 1024)
+
+        if response.direct_passthrough:
+            # send_file로 전송되는 정적 파일
+            if (response.content_length or 0) < min_size:
+                return response
+            response.direct_passthrough = False
+            response.set_data(_compress_static(response, encoding, level))
+        elif response.is_streamed:
+            response.response = _iter_compressed(response.response, encoding, level)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            response.set_data(compress_bytes(data, encoding, level))
+
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            # 압축본은 원본과 바이트가 다르므로 약한 ETag로 표시 (조건부 요청은 그대로 동작)
+            response.set_etag(etag, weak=True)
+        return response
+
+
+__all__ = [
+    'COMPRESSIBLE_MIMETYPES',
+    'compress_bytes',
+    'init_compression',
+]
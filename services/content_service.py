@@ -4,52 +4,31 @@ YouTube 콘텐츠 서비스
 """
 from __future__ import annotations
 
-import html as html_module
-import json
+import asyncio
 import os
 import re
+import sys
 import time
+import weakref
+from types import SimpleNamespace
 from typing import Any, Dict, List, Optional, Union
-from xml.etree import ElementTree
 
+import httpx
 import requests
 from flask import current_app
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from youtube_transcript_api import (
-    YouTubeTranscriptApi,
-    TranscriptsDisabled,
-    NoTranscriptFound,
-    VideoUnavailable,
-)
 
-# 버전 호환: 일부 예외는 구버전에는 존재하지 않을 수 있음
-try:
-    from youtube_transcript_api import (
-        RequestBlocked,
-        IpBlocked,
-        AgeRestricted,
-        PoTokenRequired,
-        VideoUnplayable,
-        YouTubeRequestFailed,
-        InvalidVideoId,
-        CouldNotRetrieveTranscript,
-    )
-except ImportError:
-    try:
-        from youtube_transcript_api import YouTubeTranscriptApiException as _YTBase
-    except ImportError:
-        class _YTBase(Exception):
-            pass
-    RequestBlocked = IpBlocked = AgeRestricted = PoTokenRequired = _YTBase
-    VideoUnplayable = InvalidVideoId = YouTubeRequestFailed = CouldNotRetrieveTranscript = _YTBase
+from services import json_provider as fast_json
+from services import lazy_imports, metrics, timing, tracing, transcript_parser
 
 # Type aliases
 TranscriptResult = Union[str, Dict[str, str]]
 CaptionTrack = Dict[str, Any]
 
 # Constants
-SUPADATA_API_URL: str = "https://api.supadata.ai/v1/youtube/transcript"
+# 외부 엔드포인트 (부하 테스트에서는 benchmarks/stub_servers.py 주소로 교체)
+SUPADATA_API_URL: str = os.getenv('SUPADATA_API_URL', "https://api.supadata.ai/v1/youtube/transcript")
+YOUTUBE_WATCH_URL: str = os.getenv('YOUTUBE_WATCH_URL', "https://www.youtube.com/watch")
+YOUTUBE_API_ENDPOINT: str = os.getenv('YOUTUBE_API_ENDPOINT', '')
 PREFERRED_LANGUAGES: tuple[str, ...] = ("ko", "en")
 MAX_RETRY_ATTEMPTS: int = 3
 HTTP_TIMEOUT: int = 30
@@ -85,13 +64,14 @@ def _get_cache_path(video_id: str, cache_type: str) -> str:
 def _load_cache(video_id: str, cache_type: str) -> Optional[Any]:
     """캐시에서 데이터를 로드합니다."""
     cache_path = _get_cache_path(video_id, cache_type)
-    if os.path.exists(cache_path):
-        try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return None
-    return None
+    try:
+        with open(cache_path, 'rb') as f:
+            data = fast_json.loads(f.read())
+    except (ValueError, IOError):
+        metrics.cache_lookup(f'{cache_type}_file', False)
+        return None
+    metrics.cache_lookup(f'{cache_type}_file', True)
+    return data
 
 
 def _save_cache(video_id: str, cache_type: str, data: Any) -> None:
@@ -99,9 +79,9 @@ def _save_cache(video_id: str, cache_type: str, data: Any) -> None:
     _ensure_cache_dir()
     cache_path = _get_cache_path(video_id, cache_type)
     try:
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    except IOError:
+        with open(cache_path, 'wb') as f:
+            f.write(fast_json.dumps_bytes(data))
+    except (TypeError, IOError):
         pass  # 캐시 저장 실패는 무시
 
 
@@ -177,6 +157,37 @@ def _get_proxy_config(proxy_type: str) -> Optional[str]:
     return proxy or os.getenv(config_key) or os.getenv(env_key)
 
 
+# 이벤트 루프별 비동기 HTTP 클라이언트 (ASGI 모드, 연결 재사용)
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _async_http_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프의 httpx.AsyncClient (프록시 설정은 _create_http_session과 같음)"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        mounts = {}
+        for scheme in ('http', 'https'):
+            proxy = _get_proxy_config(scheme.upper())
+            if proxy:
+                mounts[f'{scheme}://'] = httpx.AsyncHTTPTransport(proxy=proxy)
+        client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT, "Accept-Language": "en-US,en;q=0.9"},
+            mounts=mounts or None,
+            follow_redirects=True,
+            timeout=HTTP_TIMEOUT,
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def aclose_async_clients() -> None:
+    """현재 이벤트 루프의 비동기 HTTP 클라이언트를 닫습니다 (ASGI lifespan 종료 시)."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
 # ==================== Supadata API ====================
 
 def get_transcript_via_supadata(video_id: str, api_key: str) -> Optional[TranscriptResult]:
@@ -185,74 +196,120 @@ def get_transcript_via_supadata(video_id: str, api_key: str) -> Optional[Transcr
         return None
 
     try:
-        response = requests.get(
-            SUPADATA_API_URL,
-            params={"video_id": video_id, "text": "true"},
-            headers={"x-api-key": api_key},
-            timeout=HTTP_TIMEOUT
-        )
+        with tracing.client_span('GET supadata transcript', {'youtube.video_id': video_id}):
+            response = requests.get(
+                SUPADATA_API_URL,
+                params={"video_id": video_id, "text": "true"},
+                headers={"x-api-key": api_key},
+                timeout=HTTP_TIMEOUT
+            )
+            tracing.annotate({'http.response.status_code': response.status_code})
+        return _parse_supadata_response(response)
 
-        if response.status_code == 200:
-            data = response.json()
-            content = data.get("content", "")
-            if content:
-                return content
+    except (requests.exceptions.Timeout, requests.exceptions.RequestException):
+        return None
 
-            transcript = data.get("transcript", [])
-            if transcript:
-                texts = [item.get("text", "") for item in transcript if item.get("text")]
-                return " ".join(texts)
-            return None
 
-        if response.status_code == 401:
-            return {'error': 'Supadata API 키가 유효하지 않습니다.'}
-        if response.status_code == 402:
-            return {'error': 'Supadata API 사용량이 초과되었습니다. 플랜을 업그레이드하세요.'}
+async def get_transcript_via_supadata_async(video_id: str, api_key: str) -> Optional[TranscriptResult]:
+    """get_transcript_via_supadata의 비동기 버전"""
+    if not api_key:
+        return None
 
+    try:
+        with tracing.client_span('GET supadata transcript', {'youtube.video_id': video_id}):
+            response = await _async_http_client().get(
+                SUPADATA_API_URL,
+                params={"video_id": video_id, "text": "true"},
+                headers={"x-api-key": api_key},
+                timeout=HTTP_TIMEOUT
+            )
+            tracing.annotate({'http.response.status_code': response.status_code})
+        return _parse_supadata_response(response)
+
+    except (httpx.HTTPError, ValueError):
         return None
 
-    except (requests.exceptions.Timeout, requests.exceptions.RequestException):
+
+def _parse_supadata_response(response: Any) -> Optional[TranscriptResult]:
+    """Supadata 응답(requests/httpx)을 자막 텍스트 또는 에러 딕셔너리로 변환합니다."""
+    if response.status_code == 200:
+        data = response.json()
+        content = data.get("content", "")
+        if content:
+            return content
+
+        transcript = data.get("transcript", [])
+        if transcript:
+            texts = [item.get("text", "") for item in transcript if item.get("text")]
+            return " ".join(texts)
         return None
 
+    if response.status_code == 401:
+        return {'error': 'Supadata API 키가 유효하지 않습니다.'}
+    if response.status_code == 402:
+        return {'error': 'Supadata API 사용량이 초과되었습니다. 플랜을 업그레이드하세요.'}
+
+    return None
+
 
 # ==================== YouTube Transcript API ====================
 
-def _build_ytt_api() -> YouTubeTranscriptApi:
+# 구버전에는 없을 수 있는 예외 (없으면 공통 기반 예외로 대체)
+_YT_OPTIONAL_ERRORS: tuple[str, ...] = (
+    'RequestBlocked', 'IpBlocked', 'AgeRestricted', 'PoTokenRequired',
+    'VideoUnplayable', 'YouTubeRequestFailed', 'InvalidVideoId', 'CouldNotRetrieveTranscript',
+)
+_yt: Optional[SimpleNamespace] = None
+
+
+def _transcript_api() -> SimpleNamespace:
+    """youtube_transcript_api의 API 클래스와 예외 (첫 호출 때 불러옴)"""
+    global _yt
+    if _yt is None:
+        module = lazy_imports.load('youtube_transcript_api')
+        base = getattr(module, 'YouTubeTranscriptApiException', None) or type('_YTBase', (Exception,), {})
+        names = {name: getattr(module, name) for name in (
+            'YouTubeTranscriptApi', 'TranscriptsDisabled', 'NoTranscriptFound', 'VideoUnavailable'
+        )}
+        names.update({name: getattr(module, name, base) for name in _YT_OPTIONAL_ERRORS})
+        _yt = SimpleNamespace(**names)
+    return _yt
+
+
+def _build_ytt_api() -> Any:
     """YouTubeTranscriptApi 인스턴스를 생성합니다."""
+    api_class = _transcript_api().YouTubeTranscriptApi
     try:
         http_client = _create_http_session()
-        return YouTubeTranscriptApi(http_client=http_client)
+        return api_class(http_client=http_client)
     except Exception:
-        return YouTubeTranscriptApi()
+        return api_class()
+
+
+_LANGUAGE_RANK: Dict[str, int] = {lang: rank for rank, lang in enumerate(PREFERRED_LANGUAGES)}
 
 
 def _order_transcript_tracks(tracks: List[Any]) -> List[Any]:
-    """자막 트랙을 우선순위에 따라 정렬합니다."""
-    ordered: List[Any] = []
-    for is_generated in [False, True]:
-        for lang in PREFERRED_LANGUAGES:
-            ordered.extend([
-                t for t in tracks
-                if getattr(t, 'is_generated', False) == is_generated
-                and getattr(t, 'language_code', '') == lang
-                and t not in ordered
-            ])
-        ordered.extend([
-            t for t in tracks
-            if getattr(t, 'is_generated', False) == is_generated
-            and t not in ordered
-        ])
-    return ordered
-
-
-def _fetch_transcript_with_api(ytt_api: YouTubeTranscriptApi, video_id: str) -> Optional[Any]:
+    """자막 트랙을 우선순위에 따라 정렬합니다.
+
+    수동 자막 → 자동 생성 자막 순, 각 그룹 안에서는 선호 언어 순서 뒤에 나머지를 원래 순서대로 둡니다.
+    """
+    other = len(PREFERRED_LANGUAGES)
+    return sorted(tracks, key=lambda t: (
+        bool(getattr(t, 'is_generated', False)),
+        _LANGUAGE_RANK.get(getattr(t, 'language_code', ''), other)
+    ))
+
+
+def _fetch_transcript_with_api(ytt_api: Any, video_id: str) -> Optional[Any]:
     """youtube-transcript-api를 사용하여 자막을 가져옵니다."""
+    yt = _transcript_api()
     fetched = None
 
     if hasattr(ytt_api, "fetch") and hasattr(ytt_api, "list"):
         try:
             fetched = ytt_api.fetch(video_id, languages=PREFERRED_LANGUAGES)
-        except (NoTranscriptFound, PoTokenRequired, YouTubeRequestFailed, CouldNotRetrieveTranscript):
+        except (yt.NoTranscriptFound, yt.PoTokenRequired, yt.YouTubeRequestFailed, yt.CouldNotRetrieveTranscript):
             transcript_list = ytt_api.list(video_id)
             ordered_tracks = _order_transcript_tracks(list(transcript_list))
 
@@ -260,12 +317,12 @@ def _fetch_transcript_with_api(ytt_api: YouTubeTranscriptApi, video_id: str) ->
                 try:
                     fetched = track.fetch()
                     break
-                except (PoTokenRequired, YouTubeRequestFailed, CouldNotRetrieveTranscript):
+                except (yt.PoTokenRequired, yt.YouTubeRequestFailed, yt.CouldNotRetrieveTranscript):
                     continue
     else:
         # 구버전 폴백
         try:
-            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+            transcript_list = yt.YouTubeTranscriptApi.list_transcripts(video_id)
             ordered_tracks = _order_transcript_tracks(list(transcript_list))
 
             for track in ordered_tracks:
@@ -276,7 +333,7 @@ def _fetch_transcript_with_api(ytt_api: YouTubeTranscriptApi, video_id: str) ->
                     continue
         except Exception:
             try:
-                fetched = YouTubeTranscriptApi.get_transcript(video_id, languages=PREFERRED_LANGUAGES)
+                fetched = yt.YouTubeTranscriptApi.get_transcript(video_id, languages=PREFERRED_LANGUAGES)
             except Exception:
                 fetched = None
 
@@ -307,22 +364,7 @@ def _extract_text_from_transcript(fetched: Any) -> Optional[str]:
 
 def _extract_yt_initial_player_response(html_text: str) -> Optional[Dict[str, Any]]:
     """HTML에서 ytInitialPlayerResponse를 추출합니다."""
-    if not isinstance(html_text, str) or not html_text:
-        return None
-
-    patterns = [
-        r"ytInitialPlayerResponse\s*=\s*(\{.*?\})\s*;",
-        r"var\s+ytInitialPlayerResponse\s*=\s*(\{.*?\})\s*;",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, html_text, flags=re.DOTALL)
-        if match:
-            try:
-                return json.loads(match.group(1))
-            except json.JSONDecodeError:
-                continue
-    return None
+    return transcript_parser.extract_yt_initial_player_response(html_text)
 
 
 def _extract_caption_tracks(player_response: Optional[Dict[str, Any]]) -> List[CaptionTrack]:
@@ -360,39 +402,27 @@ def _pick_caption_track(
 
 def _parse_vtt(vtt_text: str) -> str:
     """VTT 형식의 자막을 파싱합니다."""
-    if not isinstance(vtt_text, str) or not vtt_text.strip():
-        return ""
-
-    lines: List[str] = []
-    for raw in vtt_text.splitlines():
-        line = raw.strip('\ufeff').strip()
-        if not line or line.upper().startswith('WEBVTT') or '-->' in line:
-            continue
-        if re.match(r'^\d+$', line):
-            continue
-        line = re.sub(r'<[^>]+>', '', line).strip()
-        if line:
-            lines.append(line)
-
-    return " ".join(lines)
+    return transcript_parser.parse_vtt(vtt_text)
 
 
 def _parse_timedtext_xml(xml_text: str) -> str:
     """TimedText XML을 파싱합니다."""
-    if not isinstance(xml_text, str) or not xml_text.strip():
-        return ""
+    return transcript_parser.parse_timedtext_xml(xml_text)
 
-    try:
-        root = ElementTree.fromstring(xml_text)
-    except ElementTree.ParseError:
-        return ""
 
-    texts: List[str] = []
-    for node in root.findall('.//text'):
-        if node.text:
-            texts.append(html_module.unescape(node.text).replace('\n', ' ').strip())
+# watch 페이지/자막 다운로드 요청 헤더
+_WATCH_HEADERS: Dict[str, str] = {
+    "User-Agent": USER_AGENT,
+    "Accept-Language": "ko,en-US;q=0.9,en;q=0.8",
+}
+WATCH_TIMEOUT: int = 15
+
 
-    return " ".join(filter(None, texts))
+def _caption_url(base_url: str) -> str:
+    """자막 다운로드 URL (형식이 없으면 VTT 요청)"""
+    if 'fmt=' in base_url:
+        return base_url
+    return base_url + ('&' if '?' in base_url else '?') + 'fmt=vtt'
 
 
 def _download_caption_from_url(base_url: str) -> str:
@@ -400,25 +430,24 @@ def _download_caption_from_url(base_url: str) -> str:
     if not isinstance(base_url, str) or not base_url:
         return ""
 
-    url = base_url
-    if 'fmt=' not in url:
-        url += ('&' if '?' in url else '?') + 'fmt=vtt'
-
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Accept-Language": "ko,en-US;q=0.9,en;q=0.8",
-    }
-
-    response = requests.get(url, headers=headers, timeout=15)
+    with tracing.client_span('GET youtube timedtext'):
+        response = requests.get(_caption_url(base_url), headers=_WATCH_HEADERS, timeout=WATCH_TIMEOUT)
+        tracing.annotate({'http.response.status_code': response.status_code})
     response.raise_for_status()
-    text = response.text or ""
+    return transcript_parser.parse_caption_text(response.text or "")
 
-    if text.lstrip().startswith('WEBVTT'):
-        return _parse_vtt(text)
-    if '<transcript' in text or '<text' in text:
-        return _parse_timedtext_xml(text)
 
-    return text.strip()
+async def _download_caption_from_url_async(base_url: str) -> str:
+    """_download_caption_from_url의 비동기 버전"""
+    if not isinstance(base_url, str) or not base_url:
+        return ""
+
+    with tracing.client_span('GET youtube timedtext'):
+        response = await _async_http_client().get(_caption_url(base_url), headers=_WATCH_HEADERS,
+                                                  timeout=WATCH_TIMEOUT)
+        tracing.annotate({'http.response.status_code': response.status_code})
+    response.raise_for_status()
+    return transcript_parser.parse_caption_text(response.text or "")
 
 
 def _get_transcript_from_watch_page(video_id: str) -> TranscriptResult:
@@ -427,19 +456,13 @@ def _get_transcript_from_watch_page(video_id: str) -> TranscriptResult:
         return {'error': '유효하지 않은 YouTube video_id입니다.'}
 
     try:
-        headers = {
-            "User-Agent": USER_AGENT,
-            "Accept-Language": "ko,en-US;q=0.9,en;q=0.8",
-        }
-        watch_url = f"https://www.youtube.com/watch?v={video_id}"
-
-        response = requests.get(watch_url, headers=headers, timeout=15)
+        with tracing.client_span('GET youtube watch', {'youtube.video_id': video_id}):
+            response = requests.get(f"{YOUTUBE_WATCH_URL}?v={video_id}", headers=_WATCH_HEADERS,
+                                    timeout=WATCH_TIMEOUT)
+            tracing.annotate({'http.response.status_code': response.status_code})
         response.raise_for_status()
 
-        player = _extract_yt_initial_player_response(response.text)
-        tracks = _extract_caption_tracks(player)
-        track = _pick_caption_track(tracks)
-
+        track = _pick_caption_track(_extract_caption_tracks(_extract_yt_initial_player_response(response.text)))
         if not track:
             return {'error': 'watch 페이지에서 자막 트랙(captionTracks)을 찾지 못했습니다.'}
 
@@ -453,6 +476,32 @@ def _get_transcript_from_watch_page(video_id: str) -> TranscriptResult:
         return {'error': f'watch 페이지 자막 폴백 실패: {str(e)}'}
 
 
+async def _get_transcript_from_watch_page_async(video_id: str) -> TranscriptResult:
+    """_get_transcript_from_watch_page의 비동기 버전"""
+    if not video_id:
+        return {'error': '유효하지 않은 YouTube video_id입니다.'}
+
+    try:
+        with tracing.client_span('GET youtube watch', {'youtube.video_id': video_id}):
+            response = await _async_http_client().get(f"{YOUTUBE_WATCH_URL}?v={video_id}",
+                                                      headers=_WATCH_HEADERS, timeout=WATCH_TIMEOUT)
+            tracing.annotate({'http.response.status_code': response.status_code})
+        response.raise_for_status()
+
+        track = _pick_caption_track(_extract_caption_tracks(_extract_yt_initial_player_response(response.text)))
+        if not track:
+            return {'error': 'watch 페이지에서 자막 트랙(captionTracks)을 찾지 못했습니다.'}
+
+        text = await _download_caption_from_url_async(track.get('baseUrl', ''))
+        if not text:
+            return {'error': 'watch 페이지 자막 다운로드에 실패했습니다.'}
+
+        return text
+
+    except Exception as e:
+        return {'error': f'watch 페이지 자막 폴백 실패: {str(e)}'}
+
+
 # ==================== Main Transcript Function ====================
 
 def _log_info(message: str) -> None:
@@ -488,78 +537,211 @@ def get_transcript(video_id: str) -> TranscriptResult:
     2. youtube-transcript-api 라이브러리
     3. watch 페이지 직접 파싱
     """
-    # 0순위: 캐시 확인
+    with timing.span('transcript'), tracing.span('transcript', {'youtube.video_id': video_id}):
+        return _get_transcript(video_id)
+
+
+async def get_transcript_async(video_id: str) -> TranscriptResult:
+    """get_transcript의 비동기 버전 (ASGI 라우트용)
+
+    Supadata와 watch 페이지는 httpx 비동기 요청으로, youtube-transcript-api는 비동기 API가 없어
+    시도마다 스레드 풀에서 실행합니다 (재시도 대기는 스레드를 점유하지 않음).
+    """
+    with timing.span('transcript'), tracing.span('transcript', {'youtube.video_id': video_id}):
+        return await _get_transcript_async(video_id)
+
+
+def _record_transcript_source(source: str, success: bool) -> None:
+    """자막 출처별 결과를 지표에 기록하고, 성공한 출처를 Server-Timing/trace에 표시합니다."""
+    metrics.transcript_result(source, success)
+    if success:
+        timing.describe('transcript', source)
+        tracing.annotate({'transcript.source': source})
+
+
+def _cached_transcript(video_id: str) -> Optional[TranscriptResult]:
+    """0순위: 캐시"""
     cached = _load_cache(video_id, 'transcript')
     if cached:
         _log_info(f"Transcript loaded from cache for video_id={video_id}")
-        return cached
+        _record_transcript_source('cache', True)
+    return cached
+
+
+def _accept_supadata(video_id: str, result: Optional[TranscriptResult]) -> Optional[TranscriptResult]:
+    """Supadata 결과 처리 (None이면 다음 출처로)"""
+    _record_transcript_source('supadata', isinstance(result, str) and bool(result.strip()))
+    if isinstance(result, str) and result.strip():
+        _log_info(f"Transcript fetched via Supadata for video_id={video_id}")
+        _save_cache(video_id, 'transcript', result)
+        return result
+    if isinstance(result, dict) and result.get('error'):
+        return result
+    return None
 
-    # 1순위: Supadata API (환경변수에서 키 로드)
-    supadata_api_key = os.getenv('SUPADATA_API_KEY', '')
-    if supadata_api_key:
-        result = get_transcript_via_supadata(video_id, supadata_api_key)
-        if isinstance(result, str) and result.strip():
-            _log_info(f"Transcript fetched via Supadata for video_id={video_id}")
-            _save_cache(video_id, 'transcript', result)
-            return result
-        if isinstance(result, dict) and result.get('error'):
-            return result
 
-    # 2순위: youtube-transcript-api
-    try:
-        ytt_api = _build_ytt_api()
-        fetched = None
-
-        for attempt in range(MAX_RETRY_ATTEMPTS):
-            fetched = _fetch_transcript_with_api(ytt_api, video_id)
-            if fetched:
-                break
-            time.sleep(0.5 * (2 ** attempt))
-
-        if not fetched:
-            watch_result = _get_transcript_from_watch_page(video_id)
-            if isinstance(watch_result, str) and watch_result.strip():
-                _log_info(f"Transcript fallback succeeded from watch page for video_id={video_id}")
-                _save_cache(video_id, 'transcript', watch_result)
-                return watch_result
-            if isinstance(watch_result, dict) and watch_result.get('error'):
-                _log_warning(f"Transcript fallback failed for video_id={video_id}: {watch_result.get('error')}")
-                return watch_result
-            return {'error': '자막을 찾을 수 없습니다.'}
-
-        text = _extract_text_from_transcript(fetched)
-        if text:
-            _save_cache(video_id, 'transcript', text)
-            return text
-        return {'error': '자막을 가져오지 못했습니다.'}
-
-    except TranscriptsDisabled:
+def _fetch_attempt(ytt_api: Any, video_id: str, attempt: int) -> Optional[Any]:
+    with tracing.client_span('youtube_transcript_api fetch',
+                             {'youtube.video_id': video_id, 'retry.attempt': attempt}):
+        return _fetch_transcript_with_api(ytt_api, video_id)
+
+
+def _retry_delay(attempt: int) -> float:
+    return 0.5 * (2 ** attempt)
+
+
+def _accept_api(video_id: str, fetched: Any) -> TranscriptResult:
+    """youtube-transcript-api 결과 처리"""
+    text = _extract_text_from_transcript(fetched)
+    _record_transcript_source('youtube_transcript_api', bool(text))
+    if text:
+        _save_cache(video_id, 'transcript', text)
+        return text
+    return {'error': '자막을 가져오지 못했습니다.'}
+
+
+def _accept_watch_page(video_id: str, watch_result: TranscriptResult) -> TranscriptResult:
+    """watch 페이지 폴백 결과 처리"""
+    _record_transcript_source('watch_page', isinstance(watch_result, str) and bool(watch_result.strip()))
+    if isinstance(watch_result, str) and watch_result.strip():
+        _log_info(f"Transcript fallback succeeded from watch page for video_id={video_id}")
+        _save_cache(video_id, 'transcript', watch_result)
+        return watch_result
+    if isinstance(watch_result, dict) and watch_result.get('error'):
+        _log_warning(f"Transcript fallback failed for video_id={video_id}: {watch_result.get('error')}")
+        return watch_result
+    return {'error': '자막을 찾을 수 없습니다.'}
+
+
+def _transcript_error(yt: SimpleNamespace, e: Exception) -> Dict[str, str]:
+    """youtube-transcript-api 예외를 사용자 메시지로 변환합니다."""
+    if isinstance(e, yt.TranscriptsDisabled):
         return {'error': '자막을 가져올 수 없습니다. 이 영상은 자막이 비활성화되어 있습니다.'}
-    except NoTranscriptFound:
+    if isinstance(e, yt.NoTranscriptFound):
         return {'error': '자막을 찾을 수 없습니다. 이 영상에 제공되는 자막 트랙이 없습니다.'}
-    except PoTokenRequired:
+    if isinstance(e, yt.PoTokenRequired):
         return {'error': '자막을 가져올 수 없습니다. YouTube가 봇 차단 상태로 판단하여 요청이 거부되었습니다.'}
-    except (IpBlocked, RequestBlocked):
+    if isinstance(e, (yt.IpBlocked, yt.RequestBlocked)):
         return {'error': '자막을 가져올 수 없습니다. 네트워크/IP 차단으로 YouTube 요청이 거부되었습니다.'}
-    except AgeRestricted:
+    if isinstance(e, yt.AgeRestricted):
         return {'error': '자막을 가져올 수 없습니다. 연령 제한 콘텐츠입니다.'}
-    except VideoUnplayable:
+    if isinstance(e, yt.VideoUnplayable):
         return {'error': '자막을 가져올 수 없습니다. 재생 불가 영상입니다.'}
-    except VideoUnavailable:
+    if isinstance(e, yt.VideoUnavailable):
         return {'error': '자막을 가져올 수 없습니다. 비공개/삭제/지역 제한 영상입니다.'}
-    except InvalidVideoId:
+    if isinstance(e, yt.InvalidVideoId):
         return {'error': '유효하지 않은 YouTube video_id 입니다.'}
-    except (YouTubeRequestFailed, CouldNotRetrieveTranscript) as e:
+    if isinstance(e, (yt.YouTubeRequestFailed, yt.CouldNotRetrieveTranscript)):
         msg = str(e)
         if '429' in msg or 'Too Many Requests' in msg:
             return {'error': '자막을 가져올 수 없습니다. 요청이 너무 많아 일시적으로 차단되었습니다.'}
         return {'error': f'자막을 가져올 수 없습니다. YouTube 요청 실패: {msg}'}
+    return {'error': f'자막 처리 중 오류 발생: {str(e)}'}
+
+
+def _get_transcript(video_id: str) -> TranscriptResult:
+    """get_transcript 본문 (자막 출처를 Server-Timing 설명으로 기록)"""
+    cached = _cached_transcript(video_id)
+    if cached:
+        return cached
+
+    # 1순위: Supadata API (환경변수에서 키 로드)
+    supadata_api_key = os.getenv('SUPADATA_API_KEY', '')
+    if supadata_api_key:
+        result = _accept_supadata(video_id, get_transcript_via_supadata(video_id, supadata_api_key))
+        if result:
+            return result
+
+    # 2순위: youtube-transcript-api
+    yt = _transcript_api()
+    try:
+        try:
+            ytt_api = _build_ytt_api()
+            fetched = None
+
+            for attempt in range(MAX_RETRY_ATTEMPTS):
+                fetched = _fetch_attempt(ytt_api, video_id, attempt)
+                if fetched:
+                    break
+                time.sleep(_retry_delay(attempt))
+
+            if not fetched:
+                # 3순위: watch 페이지
+                _record_transcript_source('youtube_transcript_api', False)
+                return _accept_watch_page(video_id, _get_transcript_from_watch_page(video_id))
+
+            return _accept_api(video_id, fetched)
+        except Exception:
+            # 출처별 실패 집계 후 아래에서 사용자 메시지로 변환
+            _record_transcript_source('youtube_transcript_api', False)
+            raise
+
     except Exception as e:
-        return {'error': f'자막 처리 중 오류 발생: {str(e)}'}
+        return _transcript_error(yt, e)
+
+
+async def _get_transcript_async(video_id: str) -> TranscriptResult:
+    """_get_transcript의 비동기 버전 (캐시 파일 읽기/쓰기는 작아 이벤트 루프에서 바로 처리)"""
+    cached = _cached_transcript(video_id)
+    if cached:
+        return cached
+
+    supadata_api_key = os.getenv('SUPADATA_API_KEY', '')
+    if supadata_api_key:
+        result = _accept_supadata(video_id, await get_transcript_via_supadata_async(video_id, supadata_api_key))
+        if result:
+            return result
+
+    # 첫 호출이면 SDK import가 수 초 걸리므로 스레드에서
+    yt = await asyncio.to_thread(_transcript_api)
+    try:
+        try:
+            ytt_api = await asyncio.to_thread(_build_ytt_api)
+            fetched = None
+
+            for attempt in range(MAX_RETRY_ATTEMPTS):
+                fetched = await asyncio.to_thread(_fetch_attempt, ytt_api, video_id, attempt)
+                if fetched:
+                    break
+                await asyncio.sleep(_retry_delay(attempt))
+
+            if not fetched:
+                _record_transcript_source('youtube_transcript_api', False)
+                return _accept_watch_page(video_id, await _get_transcript_from_watch_page_async(video_id))
+
+            return _accept_api(video_id, fetched)
+        except Exception:
+            _record_transcript_source('youtube_transcript_api', False)
+            raise
+
+    except Exception as e:
+        return _transcript_error(yt, e)
 
 
 # ==================== YouTube API Functions ====================
 
+def _build_youtube_client(api_key: str):
+    """YouTube Data API 클라이언트 (YOUTUBE_API_ENDPOINT가 있으면 해당 주소 사용)"""
+    build = lazy_imports.load('googleapiclient.discovery').build
+    if YOUTUBE_API_ENDPOINT:
+        return build('youtube', 'v3', developerKey=api_key,
+                     client_options={'api_endpoint': YOUTUBE_API_ENDPOINT})
+    return build('youtube', 'v3', developerKey=api_key)
+
+
+class _NotRaised(Exception):
+    pass
+
+
+def _http_error() -> type:
+    """except 절용 googleapiclient HttpError
+
+    googleapiclient를 아직 불러오지 않았다면 HttpError도 발생할 수 없으므로 새로 불러오지 않습니다.
+    """
+    errors = sys.modules.get('googleapiclient.errors')
+    return getattr(errors, 'HttpError', _NotRaised)
+
+
 def get_youtube_title(video_id: str) -> Optional[str]:
     """YouTube 영상 제목을 가져옵니다."""
     try:
@@ -567,15 +749,16 @@ def get_youtube_title(video_id: str) -> Optional[str]:
         if not api_key:
             return None
 
-        youtube = build('youtube', 'v3', developerKey=api_key)
-        results = youtube.videos().list(part="snippet", id=video_id).execute()
+        youtube = _build_youtube_client(api_key)
+        with tracing.client_span('youtube.videos.list', {'youtube.video_id': video_id}):
+            results = youtube.videos().list(part="snippet", id=video_id).execute()
 
         items = results.get("items", [])
         if items:
             return items[0]["snippet"]["title"]
         return None
 
-    except HttpError as e:
+    except _http_error() as e:
         _log_warning(f"YouTube API error getting title: {e}")
         return None
     except Exception as e:
@@ -583,6 +766,7 @@ def get_youtube_title(video_id: str) -> Optional[str]:
         return None
 
 
+@timing.timed('title')
 def get_content_title(url: str) -> Optional[str]:
     """URL에서 콘텐츠 제목을 가져옵니다."""
     if not is_youtube_url(url):
@@ -594,6 +778,7 @@ def get_content_title(url: str) -> Optional[str]:
     return None
 
 
+@timing.timed('comments')
 def get_top_comments(video_id: str) -> List[str]:
     """YouTube 영상의 인기 댓글을 가져옵니다."""
     # 캐시 확인
@@ -608,14 +793,15 @@ def get_top_comments(video_id: str) -> List[str]:
             _log_warning("YouTube API key not configured, skipping comments")
             return []
 
-        youtube = build('youtube', 'v3', developerKey=api_key)
-        results = youtube.commentThreads().list(
-            part="snippet",
-            videoId=video_id,
-            textFormat="plainText",
-            order="relevance",
-            maxResults=50
-        ).execute()
+        youtube = _build_youtube_client(api_key)
+        with tracing.client_span('youtube.commentThreads.list', {'youtube.video_id': video_id}):
+            results = youtube.commentThreads().list(
+                part="snippet",
+                videoId=video_id,
+                textFormat="plainText",
+                order="relevance",
+                maxResults=50
+            ).execute()
 
         comments: List[str] = []
         for item in results.get("items", []):
@@ -628,7 +814,7 @@ def get_top_comments(video_id: str) -> List[str]:
 
         return comments
 
-    except HttpError as e:
+    except _http_error() as e:
         if e.resp.status == 403:
             _log_warning("YouTube API quota exceeded or comments disabled")
         else:
@@ -641,12 +827,18 @@ def get_top_comments(video_id: str) -> List[str]:
 
 # ==================== Utilities ====================
 
+@timing.timed('truncate')
 def truncate_text(text: str, max_tokens: int) -> str:
     """텍스트를 최대 토큰 수로 자릅니다."""
     if not isinstance(text, str):
         return ""
 
-    tokens = text.split()
+    # 문자 수가 한도 이하면 토큰 수도 한도 이하
+    if len(text) <= max_tokens:
+        return text
+
+    # 앞쪽 max_tokens개만 분리 (나머지는 한 덩어리로 남아 긴 자막도 전체를 나누지 않음)
+    tokens = text.split(None, max_tokens)
     if len(tokens) > max_tokens:
         return " ".join(tokens[:max_tokens]) + "..."
     return text
@@ -0,0 +1,285 @@
+"""
+히스토리 write-behind 큐
+응답을 DB 쓰기와 분리: 백그라운드 스레드가 히스토리 행을 모아 다중 행 insert로 저장하고,
+재시도 후에도 실패한 행은 로컬 스풀(cache/history_spool)에 보관했다가 다시 전송
+"""
+import os
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from services import json_provider as fast_json
+from services import metrics
+from services.logging_config import supabase_logger as logger
+
+HISTORY_BATCH_SIZE: int = 20
+HISTORY_FLUSH_INTERVAL: float = 0.5  # 초, 첫 행 도착 후 배치를 모으는 최대 시간
+HISTORY_MAX_RETRIES: int = 3
+HISTORY_RETRY_BACKOFF: float = 0.5  # 초, 재시도마다 2배
+SPOOL_REPLAY_INTERVAL: float = 60.0  # 초
+SPOOL_MAX_AGE: float = 7 * 24 * 3600  # 초, 이보다 오래된 스풀은 폐기
+SPOOL_MAX_ATTEMPTS: int = 5  # 다른 파일은 전송되는데 이만큼 실패한 스풀은 격리
+SPOOL_OUTAGE_FAILURES: int = 3  # 전송 성공 없이 연달아 실패하면 DB 장애로 보고 중단
+
+SPOOL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cache', 'history_spool')
+# 스풀 파일 이름: <시각>-<uuid>[.r<재전송 실패 횟수>].json
+_SPOOL_ATTEMPT_RE = re.compile(r'^(.*?)(?:\.r(\d+))?\.json$')
+
+
+class HistoryWriter:
+    """행을 비동기로 모아 저장하는 write-behind 큐 (히스토리, 사용량 원장)"""
+
+    def __init__(self, insert_rows: Callable[[List[Dict]], None], spool_dir: str = SPOOL_DIR,
+                 batch_size: int = HISTORY_BATCH_SIZE, flush_interval: float = HISTORY_FLUSH_INTERVAL,
+                 max_retries: int = HISTORY_MAX_RETRIES, retry_backoff: float = HISTORY_RETRY_BACKOFF,
+                 label: str = '히스토리'):
+        self._insert_rows = insert_rows
+        self.label = label  # 로그/스레드 이름 구분 (같은 큐를 사용량 원장 등에도 사용)
+        self.spool_dir = spool_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._pending: deque = deque()
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stopping = False
+        self._flush_requested = False
+        self._last_replay = 0.0
+
+    # ==================== 공개 API ====================
+
+    def enqueue(self, row: Dict) -> None:
+        """행을 큐에 추가합니다 (즉시 반환)."""
+        with self._cond:
+            self._ensure_worker()
+            self._pending.append(row)
+            self._cond.notify_all()
+            depth = len(self._pending) + self._in_flight
+        metrics.set_queue_depth(self.label, depth)
+
+    def pending(self) -> int:
+        """아직 저장되지 않은 행 수 (큐 + 전송 중)"""
+        with self._cond:
+            return len(self._pending) + self._in_flight
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """큐가 비워질 때까지 기다립니다. 시간 내에 비워지면 True."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """남은 행을 저장하고 워커를 종료합니다. 저장하지 못한 행은 스풀에 보관합니다."""
+        with self._cond:
+            if self._thread is None or self._pid != os.getpid():
+                return
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        thread.join(timeout)
+
+        with self._cond:
+            leftover = list(self._pending)
+            self._pending.clear()
+            self._thread = None
+            self._stopping = False
+        if leftover:
+            self._spool(leftover)
+
+    def replay_spool(self) -> int:
+        """스풀에 보관된 행을 다시 전송합니다. 전송한 행 수를 반환합니다.
+
+        전송에 실패한 파일은 건너뛰고 다음 파일을 계속 보냅니다. 같은 주기에 다른 파일은 전송되는데
+        계속 실패하는 파일(행 자체의 문제)은 SPOOL_MAX_ATTEMPTS번 후 격리(.failed)합니다.
+        처음 몇 개가 연달아 실패하면 DB 장애로 보고 시도 횟수를 세지 않은 채 다음 주기로 미룹니다.
+        """
+        self._last_replay = time.monotonic()
+        try:
+            names = sorted(n for n in os.listdir(self.spool_dir) if n.endswith('.json'))
+        except OSError:
+            return 0
+
+        sent = 0
+        failed: List[tuple] = []  # (claimed, name)
+        for name in names:
+            if not sent and len(failed) >= SPOOL_OUTAGE_FAILURES:
+                break
+            path = os.path.join(self.spool_dir, name)
+            # 여러 워커 프로세스가 같은 스풀을 중복 전송하지 않도록 이름을 바꿔 선점
+            claimed = f"{path}.{os.getpid()}.claim"
+            try:
+                os.rename(path, claimed)
+            except OSError:
+                continue
+
+            try:
+                if time.time() - os.path.getmtime(claimed) > SPOOL_MAX_AGE:
+                    logger.error(f"오래된 {self.label} 스풀 폐기: {name}")
+                    os.remove(claimed)
+                    continue
+                with open(claimed, 'rb') as f:
+                    rows = fast_json.loads(f.read())
+            except (OSError, ValueError) as e:
+                logger.warning(f"{self.label} 스풀 읽기 실패 ({name}): {e}")
+                self._release(claimed, path)
+                continue
+
+            try:
+                self._insert_rows(rows)
+            except Exception as e:
+                logger.warning(f"{self.label} 스풀 재전송 실패 ({name}): {e}")
+                failed.append((claimed, name))
+                continue
+
+            try:
+                os.remove(claimed)
+            except OSError:
+                pass
+            sent += len(rows)
+
+        for claimed, name in failed:
+            # 다른 파일이 전송됐으면 DB는 정상이므로 이 파일의 실패 횟수를 셈
+            self._release_failed(claimed, name, count_attempt=sent > 0)
+        return sent
+
+    def _release_failed(self, claimed: str, name: str, count_attempt: bool) -> None:
+        """재전송에 실패한 스풀을 되돌리거나 (시도 횟수를 이름에 기록) 격리합니다."""
+        match = _SPOOL_ATTEMPT_RE.match(name)
+        base, attempts = match.group(1), int(match.group(2) or 0)
+        if count_attempt:
+            attempts += 1
+        if attempts >= SPOOL_MAX_ATTEMPTS:
+            quarantined = os.path.join(self.spool_dir, f"{base}.failed")
+            logger.error(f"{self.label} 스풀 {attempts}회 재전송 실패, 격리: {quarantined}")
+            self._release(claimed, quarantined)
+            return
+        suffix = f".r{attempts}" if attempts else ''
+        self._release(claimed, os.path.join(self.spool_dir, f"{base}{suffix}.json"))
+
+    @staticmethod
+    def _release(claimed: str, path: str) -> None:
+        try:
+            os.rename(claimed, path)
+        except OSError:
+            pass
+
+    # ==================== 워커 ====================
+
+    def _ensure_worker(self) -> None:
+        """워커 스레드 시작 (fork된 자식 프로세스에서는 새로 시작)"""
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid and self._thread.is_alive():
+            return
+        if self._pid != pid:
+            # fork 이전 프로세스의 큐는 부모가 처리
+            self._pending.clear()
+            self._in_flight = 0
+        self._pid = pid
+        self._thread = threading.Thread(target=self._run, name=f'write-behind-{self.label}', daemon=True)
+        self._thread.start()
+
+    def _next_batch(self) -> Optional[List[Dict]]:
+        """배치 크기만큼 또는 flush_interval 동안 행을 모읍니다. 종료 시 None."""
+        with self._cond:
+            while not self._pending:
+                if self._stopping:
+                    return None
+                self._cond.wait(SPOOL_REPLAY_INTERVAL)
+                if not self._pending and not self._stopping \
+                        and time.monotonic() - self._last_replay >= SPOOL_REPLAY_INTERVAL:
+                    return []
+
+            deadline = time.monotonic() + self.flush_interval
+            while len(self._pending) < self.batch_size and not (self._stopping or self._flush_requested):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+            self._in_flight = len(batch)
+            if not self._pending:
+                self._flush_requested = False
+            return batch
+
+    def _run(self) -> None:
+        self.replay_spool()
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            if not batch:
+                self.replay_spool()
+                continue
+            try:
+                self._write(batch)
+            finally:
+                with self._cond:
+                    self._in_flight = 0
+                    self._cond.notify_all()
+                    depth = len(self._pending)
+                metrics.set_queue_depth(self.label, depth)
+
+    def _write(self, rows: List[Dict]) -> None:
+        """다중 행 insert (재시도) → 개별 insert → 실패 행은 스풀"""
+        for attempt in range(self.max_retries):
+            try:
+                self._insert_rows(rows)
+                return
+            except Exception as e:
+                logger.warning(f"{self.label} 일괄 저장 실패 ({attempt + 1}/{self.max_retries}): {e}")
+                if attempt + 1 < self.max_retries:
+                    time.sleep(self.retry_backoff * (2 ** attempt))
+
+        if len(rows) == 1:
+            self._spool(rows)
+            return
+
+        # 일부 행 문제로 배치 전체가 실패했을 수 있으므로 개별 저장
+        failed = []
+        for row in rows:
+            try:
+                self._insert_rows([row])
+            except Exception:
+                failed.append(row)
+        self._spool(failed)
+
+    def _spool(self, rows: List[Dict]) -> None:
+        """저장하지 못한 행을 로컬 스풀에 원자적으로 기록합니다."""
+        if not rows:
+            return
+        name = f"{time.time():.6f}-{uuid.uuid4().hex}.json"
+        path = os.path.join(self.spool_dir, name)
+        try:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(fast_json.dumps_bytes(rows))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            logger.warning(f"{self.label} {len(rows)}건 스풀에 보관: {name}")
+        except (OSError, TypeError) as e:
+            logger.error(f"{self.label} 스풀 기록 실패, {len(rows)}건 유실: {e}")
+
+
+__all__ = [
+    'HistoryWriter',
+    'HISTORY_BATCH_SIZE',
+    'HISTORY_FLUSH_INTERVAL',
+    'SPOOL_DIR',
+]
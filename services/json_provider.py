@@ -0,0 +1,86 @@
+"""
+고속 JSON 직렬화 모듈
+orjson이 설치되어 있으면 사용하고, 없으면 표준 json으로 폴백
+"""
+import json
+from typing import Any, Union
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+# datetime은 Flask 기본 형식(HTTP date)과 동일하게 default로 넘김
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if orjson else 0
+)
+
+
+def is_orjson_available() -> bool:
+    """orjson 사용 가능 여부"""
+    return orjson is not None
+
+
+def dumps_bytes(obj: Any, indent: bool = False, default=None) -> bytes:
+    """객체를 UTF-8 JSON 바이트로 직렬화합니다 (비ASCII 문자는 이스케이프하지 않음)."""
+    if orjson is not None:
+        option = _ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=default, option=option)
+
+    if indent:
+        text = json.dumps(obj, ensure_ascii=False, indent=2, default=default)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=default)
+    return text.encode('utf-8')
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """JSON 문자열/바이트를 역직렬화합니다.
+
+    Raises:
+        ValueError: 잘못된 JSON (json.JSONDecodeError / orjson.JSONDecodeError 모두 ValueError 하위)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON 프로바이더 (orjson 우선, 표준 json 폴백)
+
+    - 한국어 등 비ASCII 문자를 \\uXXXX로 이스케이프하지 않아 응답 크기 감소
+    - 키 정렬 생략 (대용량 응답 직렬화 비용 절감)
+    """
+
+    ensure_ascii = False
+    sort_keys = False
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps_bytes(obj, default=self.default).decode('utf-8')
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = dumps_bytes(obj, indent=indent, default=self.default) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+__all__ = [
+    'FastJSONProvider',
+    'is_orjson_available',
+    'dumps_bytes',
+    'loads',
+]
@@ -0,0 +1,232 @@
+"""
+Supabase 액세스 토큰 로컬 검증
+JWKS(비대칭 서명 키) 또는 프로젝트 JWT 시크릿(HS256)으로 서명/만료를 검증하고 결과를 짧게 캐시
+원격 검증(supabase.auth.get_user)은 로컬 검증이 불가능할 때와 폐기 확인 주기에만 수행
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import jwt
+
+from services import metrics
+from services.exceptions import AuthenticationError, TokenExpiredError, TokenInvalidError
+from services.logging_config import auth_logger as logger
+
+TOKEN_AUDIENCE = 'authenticated'
+ASYMMETRIC_ALGORITHMS = frozenset({'RS256', 'ES256'})
+CLOCK_LEEWAY_SECONDS = 5
+JWKS_CACHE_LIFESPAN = 600  # 초
+JWKS_FETCH_TIMEOUT = 5  # 초
+TOKEN_CACHE_MAX_ENTRIES = 1024
+
+# 토큰 해시 -> {'user_id', 'exp', 'verified_at', 'checked_at', 'revoked'}
+_token_cache: "OrderedDict[str, Dict]" = OrderedDict()
+_cache_lock = threading.Lock()
+_jwks_client: Optional[jwt.PyJWKClient] = None
+_jwks_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def is_local_verification_enabled() -> bool:
+    """로컬 JWT 검증 사용 여부 (AUTH_LOCAL_JWT=0이면 매 요청 원격 검증)"""
+    return os.getenv('AUTH_LOCAL_JWT', '1') != '0'
+
+
+def get_token_cache_ttl() -> int:
+    """검증된 토큰을 다시 서명 검증하지 않고 신뢰하는 시간 (초)"""
+    return _env_int('AUTH_TOKEN_CACHE_TTL', 60)
+
+
+def get_revocation_check_interval() -> int:
+    """토큰별 원격 폐기 확인 주기 (초, 0이면 확인하지 않음)"""
+    return _env_int('AUTH_REVOCATION_CHECK_INTERVAL', 300)
+
+
+def _get_jwks_client() -> Optional[jwt.PyJWKClient]:
+    """프로젝트 JWKS 클라이언트 싱글톤 (키 세트는 JWKS_CACHE_LIFESPAN 동안 캐시)"""
+    global _jwks_client
+
+    if _jwks_client is None:
+        url = os.getenv('SUPABASE_URL')
+        if not url:
+            return None
+        with _jwks_lock:
+            if _jwks_client is None:
+                anon_key = os.getenv('SUPABASE_ANON_KEY')
+                _jwks_client = jwt.PyJWKClient(
+                    f"{url.rstrip('/')}/auth/v1/.well-known/jwks.json",
+                    cache_keys=True,
+                    lifespan=JWKS_CACHE_LIFESPAN,
+                    headers={'apikey': anon_key} if anon_key else None,
+                    timeout=JWKS_FETCH_TIMEOUT,
+                )
+    return _jwks_client
+
+
+def _resolve_key(token: str, algorithm: str):
+    """토큰 서명 검증 키를 찾습니다. 로컬 검증이 불가능하면 None."""
+    if algorithm == 'HS256':
+        secret = os.getenv('SUPABASE_JWT_SECRET')
+        return secret if secret else None
+
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        raise TokenInvalidError()
+
+    client = _get_jwks_client()
+    if client is None:
+        return None
+    try:
+        return client.get_signing_key_from_jwt(token).key
+    except jwt.PyJWKClientConnectionError as e:
+        logger.warning(f"JWKS 조회 실패, 원격 검증으로 대체: {e}")
+        return None
+    except jwt.PyJWKClientError as e:
+        logger.debug("서명 키를 찾을 수 없음: %s", e)
+        raise TokenInvalidError()
+
+
+def decode_token(token: str) -> Optional[dict]:
+    """토큰 서명/만료/audience를 로컬에서 검증하고 클레임을 반환합니다.
+
+    Returns:
+        dict: 검증된 클레임, 로컬 검증 키가 없으면 None
+
+    Raises:
+        TokenExpiredError: 만료된 토큰
+        TokenInvalidError: 서명/형식이 잘못된 토큰
+    """
+    try:
+        algorithm = jwt.get_unverified_header(token).get('alg')
+    except jwt.PyJWTError:
+        raise TokenInvalidError()
+
+    key = _resolve_key(token, algorithm)
+    if key is None:
+        return None
+
+    try:
+        return jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            audience=TOKEN_AUDIENCE,
+            leeway=CLOCK_LEEWAY_SECONDS,
+            options={'require': ['exp', 'sub']},
+        )
+    except jwt.ExpiredSignatureError:
+        raise TokenExpiredError()
+    except jwt.PyJWTError as e:
+        logger.debug("토큰 로컬 검증 실패: %s", e)
+        raise TokenInvalidError()
+
+
+def _cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def _store(key: str, entry: Dict) -> None:
+    with _cache_lock:
+        _token_cache[key] = entry
+        _token_cache.move_to_end(key)
+        while len(_token_cache) > TOKEN_CACHE_MAX_ENTRIES:
+            _token_cache.popitem(last=False)
+
+
+def _lookup(key: str) -> Optional[Dict]:
+    with _cache_lock:
+        entry = _token_cache.get(key)
+        if entry is not None:
+            _token_cache.move_to_end(key)
+        return dict(entry) if entry is not None else None
+
+
+def verify_token(token: str, remote_check: Callable[[str], str]) -> str:
+    """토큰을 검증하고 사용자 ID를 반환합니다.
+
+    Args:
+        token: Bearer 액세스 토큰
+        remote_check: 원격 검증 함수 (토큰 -> 사용자 ID, 실패 시 AuthenticationError)
+
+    Raises:
+        AuthenticationError: 검증 실패 (TokenExpiredError, TokenInvalidError 포함)
+    """
+    if not is_local_verification_enabled():
+        return remote_check(token)
+
+    key = _cache_key(token)
+    now = time.time()
+    entry = _lookup(key)
+
+    if entry is not None:
+        if entry['revoked']:
+            raise TokenInvalidError()
+        if entry['exp'] is not None and entry['exp'] + CLOCK_LEEWAY_SECONDS <= now:
+            raise TokenExpiredError()
+
+    fresh = entry is not None and now - entry['verified_at'] < get_token_cache_ttl()
+    metrics.cache_lookup('auth_token', fresh)
+    if not fresh:
+        claims = decode_token(token)
+        if claims is None:
+            # 서명 키가 없으면(시크릿 미설정, JWKS 조회 실패) 원격 검증
+            user_id = remote_check(token)
+            exp, checked_at = None, now
+        else:
+            user_id = claims['sub']
+            exp = claims['exp']
+            checked_at = entry['checked_at'] if entry else now
+        entry = {'user_id': user_id, 'exp': exp, 'verified_at': now,
+                 'checked_at': checked_at, 'revoked': False}
+
+    interval = get_revocation_check_interval()
+    if interval > 0 and now - entry['checked_at'] >= interval:
+        entry['checked_at'] = now
+        try:
+            remote_check(token)
+        except (TokenExpiredError, TokenInvalidError):
+            entry['revoked'] = True
+            _store(key, entry)
+            raise
+        except AuthenticationError as e:
+            # 네트워크 오류 등은 로컬 검증 결과를 유지하고 다음 주기에 재확인
+            logger.warning(f"토큰 폐기 확인 실패, 로컬 검증 결과 사용: {e.message}")
+
+    _store(key, entry)
+    return entry['user_id']
+
+
+def mark_token_revoked(token: str) -> None:
+    """로그아웃된 토큰을 만료 시까지 거부하도록 표시합니다."""
+    if not token:
+        return
+    key = _cache_key(token)
+    entry = _lookup(key) or {'user_id': None, 'exp': None, 'verified_at': 0.0, 'checked_at': 0.0}
+    entry['revoked'] = True
+    _store(key, entry)
+
+
+def clear_token_cache() -> None:
+    """검증된 토큰 캐시를 비웁니다."""
+    with _cache_lock:
+        _token_cache.clear()
+
+
+__all__ = [
+    'decode_token',
+    'verify_token',
+    'mark_token_revoked',
+    'clear_token_cache',
+    'is_local_verification_enabled',
+    'get_token_cache_ttl',
+    'get_revocation_check_interval',
+]
@@ -0,0 +1,117 @@
+"""
+무거운 SDK 지연 로딩
+litellm, googleapiclient, youtube_transcript_api, supabase는 import에만 수 초가 걸려
+앱 시작(헬스 체크, 배포, PyInstaller 실행 파일 기동)을 늦추므로 처음 사용할 때 불러옵니다.
+서버가 요청을 받기 시작한 뒤 백그라운드 스레드로 미리 불러 둘 수 있습니다 (PREWARM).
+"""
+import importlib
+import os
+import threading
+import time
+from types import ModuleType
+from typing import Dict, Iterable, Optional
+
+from services.logging_config import ServiceLogger
+
+logger = ServiceLogger('LazyImports')
+
+# 미리 불러올 순서: 요청마다 쓰이는 것 → 생성 요청에서만 쓰이는 것
+HEAVY_MODULES: tuple = (
+    'cryptography.fernet',
+    'supabase',
+    'youtube_transcript_api',
+    'googleapiclient.discovery',
+    'googleapiclient.errors',
+    'litellm',
+)
+DEFAULT_PREWARM_DELAY: float = 1.0  # 초, 서버가 첫 요청을 받을 여유
+
+_modules: Dict[str, ModuleType] = {}
+# 서로 의존성이 겹치는 패키지를 여러 스레드가 동시에 import하면 모듈 잠금 교착(_DeadlockError)이
+# 날 수 있으므로 지연 import는 한 번에 하나씩
+_import_lock = threading.RLock()
+_prewarm_thread: Optional[threading.Thread] = None
+
+
+def load(name: str) -> ModuleType:
+    """모듈을 불러옵니다 (이미 불러온 모듈은 잠금 없이 반환)."""
+    module = _modules.get(name)
+    if module is not None:
+        return module
+
+    with _import_lock:
+        module = _modules.get(name)
+        if module is None:
+            started = time.perf_counter()
+            module = importlib.import_module(name)
+            _modules[name] = module
+            logger.debug("%s 불러옴 (%.0f ms)", name, (time.perf_counter() - started) * 1000)
+    return module
+
+
+def is_loaded(name: str) -> bool:
+    return name in _modules
+
+
+def prewarm(modules: Iterable[str] = HEAVY_MODULES) -> Dict[str, float]:
+    """모듈을 차례로 불러오고 모듈별 소요 시간(초)을 반환합니다 (설치되지 않은 모듈은 건너뜀)."""
+    elapsed: Dict[str, float] = {}
+    for name in modules:
+        started = time.perf_counter()
+        try:
+            load(name)
+        except ImportError as e:
+            logger.warning("%s 미리 불러오기 실패: %s", name, e)
+            continue
+        elapsed[name] = time.perf_counter() - started
+    return elapsed
+
+
+def _run_prewarm(delay: float) -> None:
+    time.sleep(delay)
+    started = time.perf_counter()
+    elapsed = prewarm()
+    logger.info("SDK 미리 불러오기 완료 (%d개, %.1f초)", len(elapsed), time.perf_counter() - started)
+
+
+def start_prewarm(delay: Optional[float] = None) -> Optional[threading.Thread]:
+    """백그라운드에서 prewarm (PREWARM=0이면 하지 않음, 프로세스당 한 번)
+
+    서버가 소켓을 열고 난 뒤 호출합니다 (gunicorn post_worker_init, run_app_hidden.py).
+    """
+    global _prewarm_thread
+
+    if os.getenv('PREWARM', '1') == '0':
+        return None
+    if delay is None:
+        try:
+            delay = float(os.getenv('PREWARM_DELAY', DEFAULT_PREWARM_DELAY))
+        except ValueError:
+            delay = DEFAULT_PREWARM_DELAY
+
+    with _import_lock:
+        if _prewarm_thread is not None:
+            return _prewarm_thread
+        _prewarm_thread = threading.Thread(target=_run_prewarm, args=(delay,), name='sdk-prewarm', daemon=True)
+        _prewarm_thread.start()
+        return _prewarm_thread
+
+
+def _reset_after_fork() -> None:
+    """fork된 자식에서는 부모의 잠금/스레드 상태를 버림 (불러온 모듈은 그대로 공유)"""
+    global _import_lock, _prewarm_thread
+    _import_lock = threading.RLock()
+    _prewarm_thread = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+__all__ = [
+    'HEAVY_MODULES',
+    'load',
+    'is_loaded',
+    'prewarm',
+    'start_prewarm',
+]
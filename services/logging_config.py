@@ -1,15 +1,44 @@
 """
 Insight Engine 통합 로깅 설정
 Flask 컨텍스트 유무와 관계없이 동작하는 로거 제공
+
+LOG_FORMAT을 설정하면(text | json) 루트 로거에 공용 핸들러를 구성합니다:
+- json: 한 줄에 JSON 객체 하나 (request_id, trace_id 포함)
+- 출력은 QueueHandler → QueueListener 스레드에서 처리 (요청 스레드는 큐에 넣기만 함)
+- LOG_SAMPLE로 로거별 DEBUG/INFO 로그 샘플링 (WARNING 이상은 항상 기록)
 """
+import atexit
+import contextvars
+import copy
 import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
 import sys
+import threading
+import time
+import uuid
 from functools import wraps
-from typing import Optional
+from typing import Callable, Dict, Optional
 
 # 로그 포맷
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+REQUEST_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'
 DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+LOG_FORMATS = ('text', 'json')
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+_REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._:-]{1,64}$')
+
+_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('request_id', default=None)
+
+_configured_format: Optional[str] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_sample_rates: Dict[str, float] = {}
+_configure_lock = threading.Lock()
 
 
 def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
@@ -26,6 +55,10 @@ def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """
     logger = logging.getLogger(name)
 
+    # configure_logging 이후에는 루트의 공용 핸들러로 전달
+    if _configured_format is not None:
+        return logger
+
     # 이미 핸들러가 설정된 경우 중복 방지
     if not logger.handlers:
         logger.setLevel(level)
@@ -34,12 +67,243 @@ def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(level)
         console_handler.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
+        console_handler._insight_default = True
 
         logger.addHandler(console_handler)
 
     return logger
 
 
+# ==================== 요청 ID ====================
+
+def get_request_id() -> Optional[str]:
+    """현재 요청 ID (요청 밖이면 None)"""
+    return _request_id.get()
+
+
+def bind_request_id(func: Callable) -> Callable:
+    """현재 요청 ID를 다른 스레드에서 실행될 함수에 전달합니다 (ThreadPoolExecutor용)."""
+    captured = _request_id.get()
+    if captured is None:
+        return func
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _request_id.set(captured)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _request_id.reset(token)
+    return wrapper
+
+
+class RequestContextFilter(logging.Filter):
+    """레코드에 request_id / trace_id 추가"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get() or '-'
+        if not hasattr(record, 'trace_id'):
+            from services import tracing
+            record.trace_id = tracing.current_trace_id()
+        return True
+
+
+# ==================== 샘플링 ====================
+
+def _parse_sample_rates(value: str) -> Dict[str, float]:
+    """'ContentService=0.1,werkzeug=0' → {'ContentService': 0.1, 'werkzeug': 0.0}"""
+    rates = {}
+    for item in value.split(','):
+        name, _, rate = item.partition('=')
+        try:
+            rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+def _sampled_out(name: str, level: int) -> bool:
+    """샘플링으로 버릴 로그이면 True (WARNING 이상은 버리지 않음)"""
+    if level >= logging.WARNING or not _sample_rates:
+        return False
+    rate = _sample_rates.get(name)
+    return rate is not None and random.random() >= rate
+
+
+class SamplingFilter(logging.Filter):
+    """ServiceLogger를 거치지 않은 로그(werkzeug, litellm 등)의 로거별 샘플링"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if hasattr(record, 'service'):
+            return True  # ServiceLogger에서 이미 샘플링
+        return not _sampled_out(record.name, record.levelno)
+
+
+# ==================== 포맷터 ====================
+
+class JSONFormatter(logging.Formatter):
+    """로그 레코드를 JSON 한 줄로 직렬화"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        from services import json_provider as fast_json
+
+        entry = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f'.{int(record.msecs):03d}Z',
+            'level': record.levelname,
+            'logger': getattr(record, 'service', record.name),
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None),
+            'trace_id': getattr(record, 'trace_id', None),
+            'pid': record.process,
+            'thread': record.threadName,
+        }
+        fields = getattr(record, 'fields', None)
+        if isinstance(fields, dict):
+            entry.update(fields)
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return fast_json.dumps_bytes(entry, default=str).decode('utf-8')
+
+
+def _build_formatter(fmt: str) -> logging.Formatter:
+    if fmt == 'json':
+        return JSONFormatter()
+    return logging.Formatter(REQUEST_LOG_FORMAT, DATE_FORMAT)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """같은 프로세스 안의 큐이므로 메시지만 확정하고 예외 포맷은 리스너 스레드에 맡김"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# ==================== 설정 ====================
+
+def configure_logging(fmt: Optional[str] = None, log_file: Optional[str] = None,
+                      level: Optional[str] = None) -> bool:
+    """루트 로거에 공용 핸들러를 구성합니다. 구성되면 True.
+
+    Args:
+        fmt: text | json (없으면 LOG_FORMAT 환경변수, 둘 다 없으면 구성하지 않음)
+        log_file: 파일로 기록할 경로 (없으면 stdout)
+        level: 로깅 레벨 이름 (없으면 LOG_LEVEL 환경변수, 기본 INFO)
+    """
+    global _configured_format, _listener, _queue_handler, _sample_rates
+
+    fmt = (fmt or os.getenv('LOG_FORMAT', '')).strip().lower()
+    if not fmt:
+        return False
+    if fmt not in LOG_FORMATS:
+        fmt = 'text'
+
+    with _configure_lock:
+        if _configured_format is not None:
+            return True
+
+        level_name = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+        root = logging.getLogger()
+        root.setLevel(getattr(logging, level_name, logging.INFO))
+        _sample_rates = _parse_sample_rates(os.getenv('LOG_SAMPLE', ''))
+
+        if log_file:
+            output = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=5 * 1024 * 1024, backupCount=3, encoding='utf-8'
+            )
+        else:
+            output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(_build_formatter(fmt))
+
+        if os.getenv('LOG_ASYNC', '1') != '0':
+            # 요청 스레드는 큐에 넣기만 하고 포맷/쓰기는 리스너 스레드에서 처리
+            handler = _QueueHandler(queue.SimpleQueue())
+            _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=True)
+            _listener.start()
+            _queue_handler = handler
+            atexit.register(stop_logging)
+        else:
+            handler = output
+        # 필터는 요청 스레드에서 실행되어야 contextvar(request_id, trace)를 읽을 수 있음
+        handler.addFilter(SamplingFilter())
+        handler.addFilter(RequestContextFilter())
+        root.addHandler(handler)
+
+        # 구성 이전에 get_logger가 붙인 콘솔 핸들러 제거 (루트와 중복 출력 방지)
+        for logger in list(logging.root.manager.loggerDict.values()):
+            if isinstance(logger, logging.Logger):
+                for existing in list(logger.handlers):
+                    if getattr(existing, '_insight_default', False):
+                        logger.removeHandler(existing)
+                        logger.setLevel(logging.NOTSET)
+
+        _configured_format = fmt
+        return True
+
+
+def stop_logging() -> None:
+    """큐에 남은 로그를 모두 기록하고 리스너를 종료합니다."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def _restart_listener() -> None:
+    """fork된 자식 프로세스에는 리스너 스레드가 없으므로 새 큐로 다시 시작 (gunicorn --preload)
+
+    fork 시점에 부모 큐에 남아 있던 로그는 부모가 기록하므로, 복사된 큐를 버려 중복 기록을 막습니다.
+    """
+    global _listener
+    if _listener is None or _queue_handler is None:
+        return
+    _queue_handler.queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(
+        _queue_handler.queue, *_listener.handlers, respect_handler_level=_listener.respect_handler_level
+    )
+    _listener.start()
+
+
+def is_configured() -> bool:
+    return _configured_format is not None
+
+
+def init_logging(app) -> None:
+    """LOG_FORMAT 설정 시 공용 핸들러 구성, 요청마다 요청 ID 부여 (X-Request-ID 헤더)"""
+    from flask import g, request
+
+    if configure_logging():
+        # Flask 기본 핸들러 대신 루트의 공용 핸들러 사용
+        from flask.logging import default_handler
+        app.logger.removeHandler(default_handler)
+
+    @app.before_request
+    def _assign_request_id():
+        incoming = request.headers.get(REQUEST_ID_HEADER, '')
+        request_id = incoming if _REQUEST_ID_PATTERN.match(incoming) else uuid.uuid4().hex
+        g._request_id_token = _request_id.set(request_id)
+
+    @app.after_request
+    def _add_request_id_header(response):
+        request_id = _request_id.get()
+        if request_id:
+            response.headers[REQUEST_ID_HEADER] = request_id
+        return response
+
+    @app.teardown_request
+    def _reset_request_id(exc=None):
+        token = g.pop('_request_id_token', None)
+        if token is not None:
+            try:
+                _request_id.reset(token)
+            except ValueError:
+                _request_id.set(None)
+
+
 def with_flask_context(func):
     """
     Flask 컨텍스트에서 current_app.logger 사용, 그 외에는 기본 로거 사용
@@ -62,46 +326,62 @@ class ServiceLogger:
     """
     서비스용 로거 클래스
     Flask 컨텍스트 자동 감지
+
+    메시지 인자는 %-스타일로 넘기면 레벨/샘플링으로 걸러진 로그는 포맷하지 않습니다.
+        logger.debug("캐시 적중: %s", key)
     """
 
     def __init__(self, name: str):
         self.name = name
         self._fallback_logger: Optional[logging.Logger] = None
+        self._extra = {'service': name}
 
     @property
     def _logger(self) -> logging.Logger:
         """현재 컨텍스트에 맞는 로거 반환"""
-        try:
-            from flask import current_app
-            if current_app:
+        # 공용 핸들러가 구성되면 앱 컨텍스트 조회 없이 서비스 이름의 로거 사용
+        if _configured_format is None:
+            from flask import current_app, has_app_context
+            if has_app_context():
                 return current_app.logger
-        except RuntimeError:
-            pass
 
         # Flask 컨텍스트 외부 - 폴백 로거 사용
         if self._fallback_logger is None:
             self._fallback_logger = get_logger(self.name)
         return self._fallback_logger
 
+    def _log(self, level: int, message: str, args, kwargs) -> None:
+        if _sampled_out(self.name, level):
+            return
+        logger = self._logger
+        if not logger.isEnabledFor(level):
+            return
+        if _configured_format != 'json':
+            message = f"[{self.name}] {message}"
+        kwargs.setdefault('extra', self._extra)
+        kwargs.setdefault('stacklevel', 3)
+        logger.log(level, message, *args, **kwargs)
+
     def debug(self, message: str, *args, **kwargs):
         """DEBUG 레벨 로그"""
-        self._logger.debug(f"[{self.name}] {message}", *args, **kwargs)
+        self._log(logging.DEBUG, message, args, kwargs)
 
     def info(self, message: str, *args, **kwargs):
         """INFO 레벨 로그"""
-        self._logger.info(f"[{self.name}] {message}", *args, **kwargs)
+        self._log(logging.INFO, message, args, kwargs)
 
     def warning(self, message: str, *args, **kwargs):
         """WARNING 레벨 로그"""
-        self._logger.warning(f"[{self.name}] {message}", *args, **kwargs)
+        self._log(logging.WARNING, message, args, kwargs)
 
     def error(self, message: str, *args, **kwargs):
         """ERROR 레벨 로그"""
-        self._logger.error(f"[{self.name}] {message}", *args, **kwargs)
+        self._log(logging.ERROR, message, args, kwargs)
 
     def exception(self, message: str, *args, **kwargs):
         """EXCEPTION 레벨 로그 (스택 트레이스 포함)"""
-        self._logger.exception(f"[{self.name}] {message}", *args, **kwargs)
+        kwargs.setdefault('exc_info', True)
+        self._log(logging.ERROR, message, args, kwargs)
 
 
 # 사전 정의된 서비스 로거들
@@ -112,8 +392,20 @@ auth_logger = ServiceLogger('AuthService')
 cache_logger = ServiceLogger('CacheService')
 
 
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_listener)
+
+
 __all__ = [
     'get_logger',
+    'get_request_id',
+    'bind_request_id',
+    'configure_logging',
+    'stop_logging',
+    'is_configured',
+    'init_logging',
+    'JSONFormatter',
+    'REQUEST_ID_HEADER',
     'with_flask_context',
     'ServiceLogger',
     'content_logger',
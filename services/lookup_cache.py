@@ -0,0 +1,103 @@
+"""
+반복 조회 캐시
+요청 범위 메모(flask.g) + 짧은 TTL 프로세스 캐시로 관리자 여부, 권한, 커스텀 스타일 등
+같은 사용자의 반복 Supabase 조회를 줄이고, 쓰기 시 명시적으로 무효화
+"""
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from flask import g, has_app_context
+
+from services import metrics
+
+# 네임스페이스별 프로세스 캐시 TTL (초). 0이면 요청 범위 메모만 사용
+LOOKUP_TTLS: Dict[str, float] = {
+    'is_admin': 60,
+    'admin_permissions': 60,
+    'custom_styles': 30,
+    'api_keys': 30,
+    'usage': 0,
+}
+LOOKUP_CACHE_MAX_ENTRIES = 2048
+
+_MISSING = object()
+
+# (네임스페이스, 키) -> (만료 시각, 값)
+_process_cache: Dict[Tuple[str, Hashable], Tuple[float, Any]] = {}
+_lock = threading.Lock()
+
+
+def _request_memo() -> Dict[Tuple[str, Hashable], Any]:
+    memo = getattr(g, '_lookup_memo', None)
+    if memo is None:
+        memo = g._lookup_memo = {}
+    return memo
+
+
+def get_or_load(namespace: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+    """캐시된 값을 반환하고, 없으면 loader 결과를 캐시합니다.
+
+    loader에서 발생한 예외는 그대로 전파되며 캐시되지 않습니다.
+    반환값은 복사본이므로 호출자가 수정해도 캐시에 영향이 없습니다.
+    """
+    cache_key = (namespace, key)
+    in_request = has_app_context()
+
+    if in_request:
+        value = _request_memo().get(cache_key, _MISSING)
+        metrics.cache_lookup('lookup_request', value is not _MISSING)
+        if value is not _MISSING:
+            return copy.deepcopy(value)
+
+    ttl = LOOKUP_TTLS.get(namespace, 0)
+    if ttl > 0:
+        with _lock:
+            entry = _process_cache.get(cache_key)
+        hit = entry is not None and entry[0] > time.monotonic()
+        metrics.cache_lookup('lookup_process', hit)
+        if hit:
+            if in_request:
+                _request_memo()[cache_key] = entry[1]
+            return copy.deepcopy(entry[1])
+
+    value = loader()
+
+    if in_request:
+        _request_memo()[cache_key] = value
+    if ttl > 0:
+        with _lock:
+            if len(_process_cache) >= LOOKUP_CACHE_MAX_ENTRIES:
+                now = time.monotonic()
+                for expired in [k for k, (expires, _) in _process_cache.items() if expires <= now]:
+                    del _process_cache[expired]
+                if len(_process_cache) >= LOOKUP_CACHE_MAX_ENTRIES:
+                    _process_cache.clear()
+            _process_cache[cache_key] = (time.monotonic() + ttl, value)
+    return copy.deepcopy(value)
+
+
+def invalidate(namespace: str, key: Hashable) -> None:
+    """쓰기 후 해당 항목을 요청 메모와 프로세스 캐시에서 제거합니다."""
+    cache_key = (namespace, key)
+    with _lock:
+        _process_cache.pop(cache_key, None)
+    if has_app_context():
+        _request_memo().pop(cache_key, None)
+
+
+def clear() -> None:
+    """프로세스 캐시 전체를 비웁니다."""
+    with _lock:
+        _process_cache.clear()
+    if has_app_context():
+        _request_memo().clear()
+
+
+__all__ = [
+    'LOOKUP_TTLS',
+    'get_or_load',
+    'invalidate',
+    'clear',
+]
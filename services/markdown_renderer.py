@@ -0,0 +1,94 @@
+"""
+마크다운 렌더링 서비스
+스레드별 렌더러 재사용, 콘텐츠 해시 기반 렌더링 캐시, 선택적 CommonMark(markdown-it-py) 백엔드
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import markdown
+
+try:
+    from markdown_it import MarkdownIt
+except ModuleNotFoundError:
+    MarkdownIt = None
+
+MARKDOWN_EXTENSIONS = ['tables', 'fenced_code']
+
+# 기본은 Python-Markdown (기존 HTML 출력 유지). markdown-it은 명시적으로 선택할 때만 사용
+# ('auto': markdown-it-py가 설치되어 있으면 사용)
+MARKDOWN_BACKEND: str = os.getenv('MARKDOWN_BACKEND', 'python-markdown')
+RENDER_CACHE_MAX_ENTRIES: int = 256
+
+_local = threading.local()
+_cache: "OrderedDict[str, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_backend_name() -> str:
+    """현재 사용 중인 렌더링 백엔드 이름"""
+    if MARKDOWN_BACKEND in ('auto', 'markdown-it') and MarkdownIt is not None:
+        return 'markdown-it'
+    return 'python-markdown'
+
+
+def _get_renderer(backend: str):
+    """스레드별 렌더러 인스턴스 (확장 로딩은 스레드당 한 번)"""
+    renderer = getattr(_local, backend, None)
+    if renderer is None:
+        if backend == 'markdown-it':
+            # CommonMark + GFM 테이블 (fenced code는 CommonMark 기본)
+            renderer = MarkdownIt('commonmark').enable('table')
+        else:
+            renderer = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+        setattr(_local, backend, renderer)
+    return renderer
+
+
+def _render_uncached(text: str, backend: str) -> str:
+    renderer = _get_renderer(backend)
+    if backend == 'markdown-it':
+        return renderer.render(text)
+    try:
+        return renderer.convert(text)
+    finally:
+        renderer.reset()
+
+
+def render_markdown(text: Optional[str]) -> str:
+    """마크다운을 HTML로 렌더링합니다. 동일 콘텐츠는 캐시에서 반환합니다."""
+    if not text:
+        return ''
+
+    backend = get_backend_name()
+    key = f"{backend}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    html = _render_uncached(text, backend)
+
+    with _cache_lock:
+        _cache[key] = html
+        _cache.move_to_end(key)
+        while len(_cache) > RENDER_CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return html
+
+
+def clear_render_cache() -> None:
+    """렌더링 캐시를 비웁니다."""
+    with _cache_lock:
+        _cache.clear()
+
+
+__all__ = [
+    'render_markdown',
+    'clear_render_cache',
+    'get_backend_name',
+]
@@ -0,0 +1,212 @@
+"""
+Prometheus 지표
+라우트별 응답 시간, 모델별 LLM 시간/토큰, 자막 출처별 성공/실패, 캐시 계층별 적중,
+Supabase 호출, 백그라운드 큐 깊이, 진행 중인 생성 수를 /metrics로 노출
+
+gunicorn 여러 워커의 지표는 PROMETHEUS_MULTIPROC_DIR(gunicorn.conf.py에서 설정)에 기록되고
+/metrics 요청 시 합산됩니다. prometheus_client가 없으면 기록은 무시되고 /metrics는 503입니다.
+"""
+import hmac
+import os
+import re
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from flask import Flask, Response, g, request
+
+import config
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+except ModuleNotFoundError:
+    prometheus_client = None
+
+# 요청/LLM/Supabase 응답 시간 버킷 (초)
+REQUEST_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60, 120)
+LLM_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 45, 60, 90, 120)
+DB_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_SUPABASE_PATH_RE = re.compile(r'^/(rest|auth|storage|functions)/v1/([^/?]*)(?:/([^/?]*))?')
+
+if prometheus_client is not None:
+    HTTP_REQUEST_SECONDS = Histogram(
+        'ie_http_request_duration_seconds', '라우트별 응답 시간',
+        ['route', 'method', 'status'], buckets=REQUEST_BUCKETS
+    )
+    LLM_REQUEST_SECONDS = Histogram(
+        'ie_llm_request_duration_seconds', '프로바이더/모델별 LLM 호출 시간',
+        ['provider', 'model', 'outcome'], buckets=LLM_BUCKETS
+    )
+    LLM_TOKENS = Counter(
+        'ie_llm_tokens', '프로바이더/모델별 LLM 토큰 수',
+        ['provider', 'model', 'kind']
+    )
+    TRANSCRIPT_RESULTS = Counter(
+        'ie_transcript_results', '자막 출처별 성공/실패 횟수',
+        ['source', 'outcome']
+    )
+    CACHE_LOOKUPS = Counter(
+        'ie_cache_lookups', '캐시 계층별 조회 (hit/miss)',
+        ['tier', 'result']
+    )
+    SUPABASE_REQUEST_SECONDS = Histogram(
+        'ie_supabase_request_duration_seconds', 'Supabase 호출 시간 (재시도 포함)',
+        ['resource', 'method', 'outcome'], buckets=DB_BUCKETS
+    )
+    QUEUE_DEPTH = Gauge(
+        'ie_write_queue_depth', '백그라운드 저장 큐에 남은 행 수',
+        ['queue'], multiprocess_mode='livesum'
+    )
+    BATCH_URLS_PENDING = Gauge(
+        'ie_batch_urls_pending', '배치에서 아직 처리되지 않은 URL 수',
+        multiprocess_mode='livesum'
+    )
+    GENERATIONS_IN_FLIGHT = Gauge(
+        'ie_generations_in_flight', '진행 중인 생성 요청 수',
+        ['kind'], multiprocess_mode='livesum'
+    )
+
+
+def is_enabled() -> bool:
+    """지표 기록 여부 (prometheus_client 설치, METRICS_ENABLED=0이 아님)"""
+    return prometheus_client is not None and os.getenv('METRICS_ENABLED', '1') != '0'
+
+
+def _known_models() -> frozenset:
+    models = {m['id'] for p in config.SUPPORTED_PROVIDERS.values() for m in p.get('models', [])}
+    return frozenset(models | set(config.MODEL_PRICING))
+
+
+def model_label(model: Optional[str]) -> str:
+    """지표 라벨용 모델 이름 (요청에서 온 임의의 모델명은 other로 묶어 라벨 수를 제한)"""
+    return model if model in _known_models() else 'other'
+
+
+def supabase_resource(path: str) -> str:
+    """Supabase 요청 경로를 라벨로 변환 (/rest/v1/ie_usage -> ie_usage, /rest/v1/rpc/f -> rpc/f)"""
+    match = _SUPABASE_PATH_RE.match(path)
+    if not match:
+        return 'other'
+    api, first, second = match.groups()
+    if api == 'rest':
+        return f'rpc/{second}' if first == 'rpc' and second else first or 'other'
+    return f'{api}/{first}' if first else api
+
+
+# ==================== 기록 ====================
+
+def observe_llm(model: str, seconds: float, usage: Optional[Dict], outcome: str = 'success') -> None:
+    if not is_enabled():
+        return
+    label = model_label(model)
+    provider = config.get_provider_from_model(model or '') if label != 'other' else 'other'
+    LLM_REQUEST_SECONDS.labels(provider, label, outcome).observe(seconds)
+    for kind in ('prompt', 'completion'):
+        tokens = (usage or {}).get(f'{kind}_tokens')
+        if isinstance(tokens, (int, float)) and tokens > 0:
+            LLM_TOKENS.labels(provider, label, kind).inc(tokens)
+
+
+def transcript_result(source: str, success: bool) -> None:
+    if is_enabled():
+        TRANSCRIPT_RESULTS.labels(source, 'success' if success else 'failure').inc()
+
+
+def cache_lookup(tier: str, hit: bool) -> None:
+    if is_enabled():
+        CACHE_LOOKUPS.labels(tier, 'hit' if hit else 'miss').inc()
+
+
+def observe_supabase(path: str, method: str, outcome: str, seconds: float) -> None:
+    if is_enabled():
+        SUPABASE_REQUEST_SECONDS.labels(supabase_resource(path), method, outcome).observe(seconds)
+
+
+def set_queue_depth(queue: str, depth: int) -> None:
+    if is_enabled():
+        QUEUE_DEPTH.labels(queue).set(depth)
+
+
+def batch_urls_pending(delta: int) -> None:
+    if is_enabled():
+        BATCH_URLS_PENDING.inc(delta)
+
+
+@contextmanager
+def track_generation(kind: str) -> Iterator[None]:
+    """생성 요청 진행 중 표시"""
+    if not is_enabled():
+        yield
+        return
+    gauge = GENERATIONS_IN_FLIGHT.labels(kind)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+
+# ==================== 노출 ====================
+
+def render_latest() -> bytes:
+    """현재 지표 (멀티프로세스 디렉터리가 있으면 모든 워커 합산)"""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry)
+
+
+def init_metrics(app: Flask) -> None:
+    """라우트 응답 시간을 기록하고 /metrics 엔드포인트를 등록합니다.
+
+    /metrics는 METRICS_TOKEN Bearer 토큰이 있어야 열리고, 토큰 없이 공개하려면 METRICS_PUBLIC=1이 필요합니다.
+    """
+
+    @app.before_request
+    def _start_request_metrics():
+        g._metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        started = g.pop('_metrics_started', None)
+        if started is not None and is_enabled() and request.endpoint not in (None, 'static', 'metrics'):
+            HTTP_REQUEST_SECONDS.labels(request.endpoint, request.method, str(response.status_code)) \
+                .observe(time.perf_counter() - started)
+        return response
+
+    def metrics():
+        if not is_enabled():
+            return Response('metrics disabled (prometheus_client 미설치 또는 METRICS_ENABLED=0)\n',
+                            status=503, mimetype='text/plain')
+
+        token = os.getenv('METRICS_TOKEN')
+        if token:
+            supplied = request.headers.get('Authorization', '').encode()
+            if not hmac.compare_digest(supplied, f'Bearer {token}'.encode()):
+                return Response('unauthorized\n', status=401, mimetype='text/plain')
+        elif os.getenv('METRICS_PUBLIC', '0') != '1':
+            return Response('forbidden (METRICS_TOKEN 또는 METRICS_PUBLIC=1 필요)\n', status=403, mimetype='text/plain')
+
+        return Response(render_latest(), content_type=prometheus_client.CONTENT_TYPE_LATEST)
+
+    app.add_url_rule('/metrics', 'metrics', metrics, methods=['GET'])
+
+
+__all__ = [
+    'is_enabled',
+    'model_label',
+    'supabase_resource',
+    'observe_llm',
+    'transcript_result',
+    'cache_lookup',
+    'observe_supabase',
+    'set_queue_depth',
+    'batch_urls_pending',
+    'track_generation',
+    'render_latest',
+    'init_metrics',
+]
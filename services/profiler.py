@@ -0,0 +1,211 @@
+"""
+운영 중 진단용 프로파일러 (관리자 API에서 사용)
+- 샘플링 프로파일러: 별도 스레드가 주기적으로 모든 스레드의 스택을 읽어 collapsed stack으로 집계
+  (flamegraph.pl, speedscope, inferno 입력 형식: "thread;함수;함수 샘플수")
+- tracemalloc 스냅샷: 할당 위치별 상위 메모리 사용량과 이전 스냅샷 대비 증가량
+
+프로파일은 요청을 받은 워커 프로세스만 대상으로 합니다.
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional
+
+DEFAULT_INTERVAL: float = 0.005  # 초, 200Hz
+MIN_INTERVAL: float = 0.001
+MAX_SECONDS: float = 60.0
+TRACEMALLOC_FRAMES: int = 10
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 대기 중인 스레드의 마지막 Python 프레임 (파일 이름, 함수) - idle=False일 때 제외
+IDLE_FRAMES = frozenset({
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('selectors.py', 'select'),
+    ('socket.py', 'accept'),
+    ('socket.py', 'readinto'),
+    ('socketserver.py', 'serve_forever'),
+    ('queue.py', 'get'),
+    ('thread.py', '_worker'),
+    ('sync.py', 'wait'),
+    ('gthread.py', 'run'),
+})
+
+_profile_lock = threading.Lock()
+_snapshot_lock = threading.Lock()
+_last_snapshot: Optional[tracemalloc.Snapshot] = None
+
+
+# ==================== 샘플링 프로파일러 ====================
+
+def _frame_label(code) -> str:
+    """'함수 (경로:첫 줄)' - 저장소 안의 파일은 상대 경로, 밖은 파일 이름만"""
+    filename = code.co_filename
+    if filename.startswith(ROOT_DIR):
+        filename = os.path.relpath(filename, ROOT_DIR)
+    elif 'site-packages' in filename:
+        filename = filename.split('site-packages' + os.sep, 1)[1]
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _is_idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES
+
+
+def sample(seconds: float, interval: float = DEFAULT_INTERVAL, include_idle: bool = False) -> Optional[Dict]:
+    """seconds 동안 모든 스레드의 스택을 샘플링합니다.
+
+    이미 다른 프로파일이 실행 중이면 None (프로세스당 하나만 실행).
+
+    Returns:
+        dict: {'stacks': Counter(collapsed stack -> 샘플 수), 'samples', 'duration', 'interval', 'pid'}
+    """
+    seconds = min(max(float(seconds), interval), MAX_SECONDS)
+    interval = max(float(interval), MIN_INTERVAL)
+    if not _profile_lock.acquire(blocking=False):
+        return None
+
+    try:
+        own_thread = threading.get_ident()
+        stacks: Counter = Counter()
+        samples = 0
+        started = time.perf_counter()
+        deadline = started + seconds
+
+        while time.perf_counter() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread or (not include_idle and _is_idle(frame)):
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                labels.append(names.get(thread_id, f'thread-{thread_id}'))
+                stacks[';'.join(reversed(labels))] += 1
+            samples += 1
+            time.sleep(interval)
+
+        return {
+            'stacks': stacks,
+            'samples': samples,
+            'duration': round(time.perf_counter() - started, 3),
+            'interval': interval,
+            'pid': os.getpid(),
+        }
+    finally:
+        _profile_lock.release()
+
+
+def is_running() -> bool:
+    """프로파일 실행 중 여부"""
+    return _profile_lock.locked()
+
+
+def to_collapsed(stacks: Counter) -> str:
+    """flamegraph collapsed 형식 ("프레임;프레임 샘플수" 한 줄씩, 많은 순)"""
+    return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def top_functions(stacks: Counter, limit: int = 20) -> List[Dict]:
+    """샘플이 많은 함수 (self: 스택 맨 위, total: 스택 어디든)"""
+    own: Counter = Counter()
+    total: Counter = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(';')[1:]  # 맨 앞은 스레드 이름
+        if not frames:
+            continue
+        own[frames[-1]] += count
+        for frame in set(frames):
+            total[frame] += count
+    return [{'function': name, 'self': count, 'total': total[name]}
+            for name, count in own.most_common(limit)]
+
+
+# ==================== tracemalloc ====================
+
+def memory_status() -> Dict:
+    traced, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+    return {'tracing': tracemalloc.is_tracing(), 'traced_bytes': traced, 'peak_bytes': peak, 'pid': os.getpid()}
+
+
+def start_tracemalloc(frames: int = TRACEMALLOC_FRAMES) -> Dict:
+    """할당 추적 시작 (추적 중에는 할당마다 비용이 있으므로 진단 후 중지)"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(max(1, min(int(frames), 50)))
+    return memory_status()
+
+
+def stop_tracemalloc() -> Dict:
+    global _last_snapshot
+    with _snapshot_lock:
+        _last_snapshot = None
+    tracemalloc.stop()
+    return memory_status()
+
+
+def _format_stat(stat, key_type: str) -> Dict:
+    frames = stat.traceback.format() if key_type == 'traceback' else [str(stat.traceback[0])]
+    entry = {'location': frames if key_type == 'traceback' else frames[0],
+             'size_bytes': stat.size, 'count': stat.count}
+    if hasattr(stat, 'size_diff'):
+        entry['size_diff_bytes'] = stat.size_diff
+        entry['count_diff'] = stat.count_diff
+    return entry
+
+
+def memory_snapshot(limit: int = 25, key_type: str = 'lineno', compare: bool = False) -> Optional[Dict]:
+    """현재 할당 위치별 상위 항목 (추적 중이 아니면 None)
+
+    Args:
+        key_type: lineno | filename | traceback
+        compare: True면 이전 스냅샷 대비 증가량 순
+    """
+    global _last_snapshot
+    if not tracemalloc.is_tracing():
+        return None
+    if key_type not in ('lineno', 'filename', 'traceback'):
+        key_type = 'lineno'
+
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    ))
+    with _snapshot_lock:
+        previous, _last_snapshot = _last_snapshot, snapshot
+
+    if compare and previous is not None:
+        stats = snapshot.compare_to(previous, key_type)
+    else:
+        stats = snapshot.statistics(key_type)
+
+    limit = max(1, min(int(limit), 200))
+    return {
+        **memory_status(),
+        'key_type': key_type,
+        'compared': bool(compare and previous is not None),
+        'total_bytes': sum(stat.size for stat in snapshot.statistics('filename')),
+        'top': [_format_stat(stat, key_type) for stat in stats[:limit]],
+    }
+
+
+__all__ = [
+    'DEFAULT_INTERVAL',
+    'MAX_SECONDS',
+    'sample',
+    'is_running',
+    'to_collapsed',
+    'top_functions',
+    'memory_status',
+    'start_tracemalloc',
+    'stop_tracemalloc',
+    'memory_snapshot',
+]
@@ -0,0 +1,145 @@
+"""
+리포트 아티팩트 저장소
+/generate 응답에서 분리한 대용량 필드(프롬프트, 자막)를 서버에 보관하고
+/api/reports/<id>/<artifact>로 필요할 때만 내려줍니다.
+조회되지 않은 파일도 저장 시 주기적으로 정리합니다 (만료 파일 삭제 + 전체 크기 상한, ARTIFACT_MAX_MB).
+"""
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from services import json_provider as fast_json
+
+# 응답에서 분리 가능한 대용량 아티팩트
+ARTIFACT_FIELDS: tuple = ('prompt', 'transcript')
+ARTIFACT_TTL_SECONDS: int = 7 * 24 * 3600
+SWEEP_INTERVAL_SECONDS: int = 600
+DEFAULT_MAX_MB: int = 512
+
+ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cache', 'reports')
+_REPORT_ID_RE = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+_sweep_lock = threading.Lock()
+_last_sweep: float = 0.0
+
+
+def _max_bytes() -> int:
+    try:
+        return int(float(os.getenv('ARTIFACT_MAX_MB', DEFAULT_MAX_MB)) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_MAX_MB * 1024 * 1024
+
+
+def sweep(now: Optional[float] = None) -> int:
+    """만료된 아티팩트를 지우고, 전체 크기가 상한을 넘으면 오래된 파일부터 지웁니다.
+
+    Returns:
+        삭제한 파일 수
+    """
+    now = time.time() if now is None else now
+    try:
+        entries = [entry for entry in os.scandir(ARTIFACT_DIR) if entry.name.endswith('.json')]
+    except OSError:
+        return 0
+
+    files = []
+    for entry in entries:
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, entry.path))
+    files.sort()
+
+    total = sum(size for _, size, _ in files)
+    limit = _max_bytes()
+    removed = 0
+    for mtime, size, path in files:
+        if now - mtime <= ARTIFACT_TTL_SECONDS and total <= limit:
+            break  # 오래된 순으로 정렬되어 있으므로 나머지는 유지
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+        total -= size
+    return removed
+
+
+def _maybe_sweep() -> None:
+    """마지막 정리 후 SWEEP_INTERVAL_SECONDS가 지났으면 정리 (다른 스레드가 정리 중이면 건너뜀)"""
+    global _last_sweep
+    now = time.time()
+    if now - _last_sweep < SWEEP_INTERVAL_SECONDS or not _sweep_lock.acquire(blocking=False):
+        return
+    try:
+        if now - _last_sweep >= SWEEP_INTERVAL_SECONDS:
+            _last_sweep = now
+            sweep(now)
+    finally:
+        _sweep_lock.release()
+
+
+def _get_artifact_path(report_id: str) -> Optional[str]:
+    """아티팩트 파일 경로 (report_id가 안전하지 않으면 None)"""
+    if not report_id or not _REPORT_ID_RE.match(report_id):
+        return None
+    return os.path.join(ARTIFACT_DIR, f"{report_id}.json")
+
+
+def save_artifacts(report_id: str, user_id: Optional[str], artifacts: Dict[str, Any]) -> List[str]:
+    """리포트 아티팩트를 저장합니다. 값이 없는 아티팩트는 생략합니다.
+
+    Returns:
+        저장된 아티팩트 이름 목록 (실패 시 빈 리스트)
+    """
+    path = _get_artifact_path(report_id)
+    if not path:
+        return []
+
+    payload = {name: value for name, value in artifacts.items()
+               if name in ARTIFACT_FIELDS and value}
+    if not payload:
+        return []
+
+    try:
+        os.makedirs(ARTIFACT_DIR, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(fast_json.dumps_bytes({'user_id': user_id, 'artifacts': payload}))
+        _maybe_sweep()
+        return list(payload)
+    except (TypeError, IOError):
+        return []  # 저장 실패 시 응답에서 해당 필드를 분리하지 않음
+
+
+def load_artifact(report_id: str, artifact: str, user_id: Optional[str]) -> Optional[Any]:
+    """리포트 아티팩트를 조회합니다. 소유자가 다르거나 만료되었으면 None."""
+    if artifact not in ARTIFACT_FIELDS:
+        return None
+
+    path = _get_artifact_path(report_id)
+    if not path:
+        return None
+
+    try:
+        if time.time() - os.path.getmtime(path) > ARTIFACT_TTL_SECONDS:
+            os.remove(path)
+            return None
+        with open(path, 'rb') as f:
+            stored = fast_json.loads(f.read())
+    except (ValueError, IOError):
+        return None
+
+    if stored.get('user_id') != user_id:
+        return None
+    return stored.get('artifacts', {}).get(artifact)
+
+
+__all__ = [
+    'ARTIFACT_FIELDS',
+    'save_artifacts',
+    'load_artifact',
+    'sweep',
+]
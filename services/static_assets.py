@@ -0,0 +1,94 @@
+"""
+정적 파일 핑거프린팅 및 캐시 헤더
+url_for('static', ...)에 콘텐츠 해시(v=)를 붙이고, 해시가 일치하는 요청은 immutable로 캐시
+"""
+import hashlib
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+from flask import Flask, request, url_for
+from markupsafe import Markup
+
+STATIC_IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+STATIC_REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+# 파일 경로 -> (mtime, 해시)
+_version_cache: Dict[str, Tuple[float, str]] = {}
+
+
+def asset_version(static_folder: str, filename: str) -> Optional[str]:
+    """정적 파일의 콘텐츠 해시(12자)를 반환합니다. 파일이 없으면 None."""
+    path = os.path.realpath(os.path.join(static_folder, filename))
+    if not path.startswith(os.path.realpath(static_folder) + os.sep):
+        return None
+
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    cached = _version_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(65536), b''):
+                digest.update(block)
+    except OSError:
+        return None
+
+    version = digest.hexdigest()[:12]
+    _version_cache[path] = (mtime, version)
+    return version
+
+
+def build_import_map(app: Flask, subdir: str = 'js') -> Dict[str, Dict[str, str]]:
+    """ES 모듈 상대 import도 핑거프린팅된 URL로 로드되도록 import map을 생성합니다."""
+    root = os.path.join(app.static_folder, subdir)
+    imports: Dict[str, str] = {}
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for name in sorted(filenames):
+            if not name.endswith('.js'):
+                continue
+            rel = os.path.relpath(os.path.join(dirpath, name), app.static_folder).replace(os.sep, '/')
+            imports[f"{app.static_url_path}/{rel}"] = url_for('static', filename=rel)
+    return {'imports': imports}
+
+
+def init_static_assets(app: Flask) -> None:
+    """앱에 정적 파일 핑거프린팅과 Cache-Control 헤더를 등록합니다."""
+
+    @app.url_defaults
+    def _add_static_version(endpoint, values):
+        if endpoint != 'static' or 'v' in values or not values.get('filename'):
+            return
+        version = asset_version(app.static_folder, values['filename'])
+        if version:
+            values['v'] = version
+
+    @app.after_request
+    def _set_static_cache_headers(response):
+        if request.endpoint != 'static' or response.status_code not in (200, 304):
+            return response
+
+        filename = (request.view_args or {}).get('filename', '')
+        requested = request.args.get('v')
+        if requested and requested == asset_version(app.static_folder, filename):
+            response.headers['Cache-Control'] = STATIC_IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers['Cache-Control'] = STATIC_REVALIDATE_CACHE_CONTROL
+        return response
+
+    @app.template_global()
+    def static_import_map():
+        return Markup(json.dumps(build_import_map(app)))
+
+
+__all__ = [
+    'asset_version',
+    'build_import_map',
+    'init_static_assets',
+]
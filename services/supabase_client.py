@@ -0,0 +1,262 @@
+"""
+Supabase 클라이언트 수명 관리
+스레드 안전한 지연 생성, fork 후 자식 프로세스에서 재생성,
+스레드 수에 맞춘 HTTP 연결 풀, 타임아웃, 일시적 오류 재시도를 한곳에서 설정
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+import httpx
+
+import config
+from services import lazy_imports, metrics, timing, tracing
+from services.logging_config import supabase_logger as logger
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+# gunicorn --threads 값 + 백그라운드 쓰기 스레드(히스토리, 사용량 원장) + /generate-batch 동시 처리 스레드
+DEFAULT_POOL_SIZE: int = int(os.getenv('GUNICORN_THREADS', 4)) + 2 + config.MAX_BATCH_WORKERS
+DEFAULT_TIMEOUT: float = 10.0  # 초, 응답 읽기/쓰기
+DEFAULT_CONNECT_TIMEOUT: float = 3.0  # 초, 연결 수립
+DEFAULT_POOL_TIMEOUT: float = 10.0  # 초, 풀에 남은 연결이 없을 때 대기
+DEFAULT_RETRIES: int = 2
+RETRY_BACKOFF: float = 0.2  # 초, 재시도마다 2배
+
+# 재시도해도 안전한 요청과 일시적 오류 상태 코드
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+RETRY_STATUS_CODES = frozenset({502, 503, 504, 520})
+
+_client: Optional[Client] = None
+_http_client: Optional[httpx.Client] = None
+_client_pid: Optional[int] = None
+_auth_client: Optional[Client] = None
+_auth_http_client: Optional[httpx.Client] = None
+_auth_client_pid: Optional[int] = None
+_client_lock = threading.Lock()
+
+
+class RetryTransport(httpx.BaseTransport):
+    """일시적 오류 재시도 transport
+
+    - 연결 실패(요청이 전송되지 않음): 모든 요청 재시도
+    - 읽기 타임아웃, 연결 끊김, 502/503/504/520: GET/HEAD 등 멱등 요청만 재시도
+      (consume_usage 같은 RPC POST가 두 번 실행되지 않도록)
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, retries: int = DEFAULT_RETRIES,
+                 backoff: float = RETRY_BACKOFF):
+        self._transport = transport
+        self.retries = retries
+        self.backoff = backoff
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        outcome = 'error'
+        resource = metrics.supabase_resource(request.url.path)
+        try:
+            with timing.span('db'), tracing.client_span(f'supabase {request.method} {resource}', {
+                'http.request.method': request.method,
+                'server.address': request.url.host,
+                'url.path': request.url.path
+            }):
+                tracing.inject_headers(request.headers)
+                response = self._handle_with_retries(request)
+                tracing.annotate({'http.response.status_code': response.status_code})
+            outcome = str(response.status_code)
+            return response
+        finally:
+            metrics.observe_supabase(request.url.path, request.method, outcome, time.perf_counter() - started)
+
+    def _handle_with_retries(self, request: httpx.Request) -> httpx.Response:
+        idempotent = request.method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            try:
+                response = self._transport.handle_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                if attempt >= self.retries:
+                    raise
+            except (httpx.ReadTimeout, httpx.RemoteProtocolError):
+                if not idempotent or attempt >= self.retries:
+                    raise
+            else:
+                if not (idempotent and response.status_code in RETRY_STATUS_CODES and attempt < self.retries):
+                    return response
+                response.close()
+
+            attempt += 1
+            tracing.add_event('retry', {'retry.attempt': attempt})
+            logger.warning(f"Supabase 요청 재시도 ({attempt}/{self.retries}): {request.method} {request.url.path}")
+            time.sleep(self.backoff * (2 ** (attempt - 1)))
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+def _env_number(name: str, default, cast=float):
+    try:
+        return cast(os.getenv(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"{name} 값이 올바르지 않아 기본값 사용: {default}")
+        return default
+
+
+def build_http_client() -> httpx.Client:
+    """연결 풀/타임아웃/재시도가 설정된 httpx 클라이언트 생성
+
+    환경변수: SUPABASE_POOL_SIZE, SUPABASE_TIMEOUT, SUPABASE_CONNECT_TIMEOUT, SUPABASE_POOL_TIMEOUT, SUPABASE_RETRIES
+    """
+    pool_size = max(1, _env_number('SUPABASE_POOL_SIZE', DEFAULT_POOL_SIZE, int))
+    timeout = _env_number('SUPABASE_TIMEOUT', DEFAULT_TIMEOUT)
+    connect_timeout = _env_number('SUPABASE_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT)
+    pool_timeout = _env_number('SUPABASE_POOL_TIMEOUT', DEFAULT_POOL_TIMEOUT)
+    retries = max(0, _env_number('SUPABASE_RETRIES', DEFAULT_RETRIES, int))
+
+    limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+    transport = RetryTransport(httpx.HTTPTransport(limits=limits), retries=retries)
+    return httpx.Client(
+        transport=transport,
+        timeout=httpx.Timeout(timeout, connect=connect_timeout, pool=pool_timeout),
+        follow_redirects=True
+    )
+
+
+def create_client(url: str, key: str, options=None) -> Client:
+    """supabase.create_client (supabase는 첫 클라이언트 생성 때 불러옴, import에 수백 ms)"""
+    return lazy_imports.load('supabase').create_client(url, key, options=options)
+
+
+def _server_key() -> Optional[str]:
+    """서버 데이터 클라이언트가 사용할 API 키 (service_role 키가 있으면 우선)
+
+    관리자 통계/사용량 원장 함수는 service_role에만 실행 권한이 있으므로 SUPABASE_SERVICE_ROLE_KEY가 필요합니다.
+    anon 키만 있으면 해당 기능은 이전 방식으로 동작합니다.
+    """
+    return os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('SUPABASE_ANON_KEY')
+
+
+def has_service_role() -> bool:
+    """서버 클라이언트가 service_role 키를 사용하는지 여부"""
+    return bool(os.getenv('SUPABASE_SERVICE_ROLE_KEY'))
+
+
+def _client_options(http_client: httpx.Client):
+    """서버용 클라이언트 옵션 (사용자 세션을 저장하거나 백그라운드에서 갱신하지 않음)"""
+    return lazy_imports.load('supabase').ClientOptions(
+        httpx_client=http_client, auto_refresh_token=False, persist_session=False
+    )
+
+
+def get_client() -> Optional[Client]:
+    """현재 프로세스의 Supabase 데이터 클라이언트 (설정이 없으면 None)
+
+    처음 호출한 스레드만 생성하고, fork된 자식 프로세스에서는 부모의 연결을 쓰지 않고 새로 만듭니다.
+    로그인 등 인증 흐름은 get_auth_client를 사용합니다 (이 클라이언트에는 사용자 세션이 붙지 않아야 함).
+    """
+    global _client, _http_client, _client_pid
+
+    pid = os.getpid()
+    client = _client
+    if client is not None and _client_pid == pid:
+        return client
+
+    url = os.getenv('SUPABASE_URL')
+    key = _server_key()
+    if not url or not key:
+        return None
+
+    with _client_lock:
+        if _client is not None and _client_pid == pid:
+            return _client
+
+        http_client = build_http_client()
+        _client = create_client(url, key, options=_client_options(http_client))
+        _http_client = http_client
+        _client_pid = pid
+        return _client
+
+
+def get_auth_client() -> Optional[Client]:
+    """사용자 인증 흐름(로그인, OAuth, 토큰 갱신/검증, 로그아웃) 전용 클라이언트 (anon 키, 설정이 없으면 None)
+
+    supabase-py는 로그인/토큰 갱신 이벤트마다 클라이언트의 Authorization 헤더를 해당 사용자 토큰으로 바꾸므로,
+    데이터 클라이언트와 분리해 서버 쿼리가 마지막으로 로그인한 사용자 권한으로 실행되지 않게 합니다.
+    """
+    global _auth_client, _auth_http_client, _auth_client_pid
+
+    pid = os.getpid()
+    client = _auth_client
+    if client is not None and _auth_client_pid == pid:
+        return client
+
+    url = os.getenv('SUPABASE_URL')
+    key = os.getenv('SUPABASE_ANON_KEY')
+    if not url or not key:
+        return None
+
+    with _client_lock:
+        if _auth_client is not None and _auth_client_pid == pid:
+            return _auth_client
+
+        http_client = build_http_client()
+        _auth_client = create_client(url, key, options=_client_options(http_client))
+        _auth_http_client = http_client
+        _auth_client_pid = pid
+        return _auth_client
+
+
+def reset_client() -> None:
+    """클라이언트 참조를 버립니다 (fork 직후 자식 프로세스용, 부모의 소켓은 닫지 않음)."""
+    global _client, _http_client, _client_pid, _client_lock
+    global _auth_client, _auth_http_client, _auth_client_pid
+
+    # fork 시점에 다른 스레드가 잡고 있던 잠금은 자식에서 풀리지 않으므로 새로 만듦
+    _client_lock = threading.Lock()
+    _client = None
+    _http_client = None
+    _client_pid = None
+    _auth_client = None
+    _auth_http_client = None
+    _auth_client_pid = None
+
+
+def close_client() -> None:
+    """현재 프로세스가 만든 연결 풀을 닫습니다 (종료 시)."""
+    global _client, _http_client, _client_pid
+    global _auth_client, _auth_http_client, _auth_client_pid
+
+    with _client_lock:
+        for http_client, owner_pid in ((_http_client, _client_pid), (_auth_http_client, _auth_client_pid)):
+            if http_client is not None and owner_pid == os.getpid():
+                try:
+                    http_client.close()
+                except Exception as e:
+                    logger.debug("Supabase 연결 풀 종료 실패: %s", e)
+        _client = None
+        _http_client = None
+        _client_pid = None
+        _auth_client = None
+        _auth_http_client = None
+        _auth_client_pid = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_client)
+atexit.register(close_client)
+
+
+__all__ = [
+    'RetryTransport',
+    'build_http_client',
+    'get_client',
+    'get_auth_client',
+    'has_service_role',
+    'reset_client',
+    'close_client',
+]
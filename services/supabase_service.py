@@ -2,40 +2,47 @@
 Supabase 서비스 모듈
 데이터베이스 연동 및 사용자 인증 처리
 """
+from __future__ import annotations
+
+import asyncio
 import os
+import atexit
 import base64
 import hashlib
+import inspect
+import json
+import re
+import threading
 from functools import wraps
+from typing import TYPE_CHECKING
 from flask import request, jsonify, g
-from supabase import create_client, Client
-from cryptography.fernet import Fernet
 
+from services import jwt_verifier, lazy_imports, lookup_cache, supabase_client, timing
+from services.history_writer import HistoryWriter
 from services.logging_config import supabase_logger as logger
 from services.exceptions import (
     ConfigurationError, AuthenticationError,
-    TokenExpiredError, TokenInvalidError
+    TokenExpiredError, TokenInvalidError, ValidationError
 )
 
-# Supabase 클라이언트 초기화
-_supabase_client: Client = None
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
+    from supabase import Client
+
 _fernet_instance: Fernet = None
 _encryption_enabled: bool = None  # 암호화 활성화 여부
+_history_writer: HistoryWriter = None
+_history_writer_lock = threading.Lock()
 
 
 def get_supabase() -> Client:
-    """Supabase 클라이언트 싱글톤"""
-    global _supabase_client
-
-    if _supabase_client is None:
-        url = os.getenv('SUPABASE_URL')
-        key = os.getenv('SUPABASE_ANON_KEY')
+    """Supabase 클라이언트 (프로세스별 싱글톤, 연결 풀/재시도는 supabase_client에서 관리)"""
+    return supabase_client.get_client()
 
-        if not url or not key:
-            return None
 
-        _supabase_client = create_client(url, key)
-
-    return _supabase_client
+def get_supabase_auth() -> Client:
+    """사용자 인증 흐름 전용 Supabase 클라이언트 (anon 키, 데이터 클라이언트와 세션이 섞이지 않도록 분리)"""
+    return supabase_client.get_auth_client()
 
 
 def is_supabase_enabled() -> bool:
@@ -72,7 +79,8 @@ def _get_fernet() -> Fernet:
             )
 
         key = hashlib.sha256(secret.encode()).digest()
-        _fernet_instance = Fernet(base64.urlsafe_b64encode(key))
+        fernet = lazy_imports.load('cryptography.fernet')
+        _fernet_instance = fernet.Fernet(base64.urlsafe_b64encode(key))
 
     return _fernet_instance
 
@@ -121,52 +129,94 @@ def _extract_bearer_token() -> str:
     return auth_header[7:] if auth_header.startswith('Bearer ') else None
 
 
-def _validate_token(token: str) -> dict:
-    """토큰 검증 및 g 객체에 사용자 정보 설정
+def _remote_validate(token: str) -> str:
+    """Supabase Auth 서버에서 토큰을 검증하고 사용자 ID를 반환합니다.
 
-    Returns:
-        dict: {'valid': bool, 'error': str|None, 'code': str|None}
+    Raises:
+        TokenExpiredError: 토큰 만료
+        TokenInvalidError: 무효/폐기된 토큰
+        AuthenticationError: 기타 인증 오류 (네트워크 오류 포함)
     """
     try:
-        supabase = get_supabase()
-        user = supabase.auth.get_user(token)
-        g.user_id = user.user.id
-        g.access_token = token
-        return {'valid': True, 'error': None, 'code': None}
+        user = get_supabase_auth().auth.get_user(token)
+        return user.user.id
     except Exception as e:
         error_str = str(e).lower()
 
         # 토큰 만료 감지
         if 'expired' in error_str or 'token has expired' in error_str:
-            logger.debug("토큰 만료")
-            return {'valid': False, 'error': '인증 토큰이 만료되었습니다.', 'code': 'TOKEN_EXPIRED'}
+            raise TokenExpiredError()
 
-        # 무효 토큰 감지
-        if 'invalid' in error_str or 'malformed' in error_str:
-            logger.debug("무효 토큰")
-            return {'valid': False, 'error': '유효하지 않은 토큰입니다.', 'code': 'TOKEN_INVALID'}
+        # 무효 토큰 감지 (로그아웃 등으로 폐기된 세션 포함)
+        status = getattr(e, 'status', None)
+        if 'invalid' in error_str or 'malformed' in error_str or status in (401, 403, 404):
+            raise TokenInvalidError()
 
+        raise AuthenticationError(f'인증 서버 확인 실패: {e}', 'AUTH_FAILED')
+
+
+def _validate_token(token: str) -> dict:
+    """토큰 검증 및 g 객체에 사용자 정보 설정
+
+    서명/만료는 로컬에서 검증하고(jwt_verifier), 원격 검증은 폐기 확인 주기에만 수행합니다.
+
+    Returns:
+        dict: {'valid': bool, 'error': str|None, 'code': str|None}
+    """
+    try:
+        g.user_id = jwt_verifier.verify_token(token, _remote_validate)
+        g.access_token = token
+        return {'valid': True, 'error': None, 'code': None}
+    except TokenExpiredError:
+        logger.debug("토큰 만료")
+        return {'valid': False, 'error': '인증 토큰이 만료되었습니다.', 'code': 'TOKEN_EXPIRED'}
+    except TokenInvalidError:
+        logger.debug("무효 토큰")
+        return {'valid': False, 'error': '유효하지 않은 토큰입니다.', 'code': 'TOKEN_INVALID'}
+    except Exception as e:
         # 기타 인증 오류
         logger.warning(f"토큰 검증 실패: {e}")
         return {'valid': False, 'error': '인증에 실패했습니다.', 'code': 'AUTH_FAILED'}
 
 
-def require_auth(f):
-    """JWT 토큰 검증 데코레이터"""
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        if not is_supabase_enabled():
-            g.user_id = None
-            return f(*args, **kwargs)
+def revoke_token(token: str) -> None:
+    """로그아웃된 토큰을 로컬 검증 캐시에서 거부 처리"""
+    jwt_verifier.mark_token_revoked(token)
 
-        token = _extract_bearer_token()
-        if not token:
-            return jsonify({'error': '인증이 필요합니다.', 'code': 'AUTH_REQUIRED'}), 401
 
+def _authenticate():
+    """require_auth 검사 (통과하면 None, 실패하면 401 응답)"""
+    if not is_supabase_enabled():
+        g.user_id = None
+        return None
+
+    token = _extract_bearer_token()
+    if not token:
+        return jsonify({'error': '인증이 필요합니다.', 'code': 'AUTH_REQUIRED'}), 401
+
+    with timing.span('auth'):
         result = _validate_token(token)
-        if not result['valid']:
-            return jsonify({'error': result['error'], 'code': result['code']}), 401
+    if not result['valid']:
+        return jsonify({'error': result['error'], 'code': result['code']}), 401
+    return None
+
+
+def require_auth(f):
+    """JWT 토큰 검증 데코레이터 (async 뷰는 원격 검증을 스레드 풀에서 실행)"""
+    if inspect.iscoroutinefunction(f):
+        @wraps(f)
+        async def decorated_async(*args, **kwargs):
+            denied = await asyncio.to_thread(_authenticate)
+            if denied is not None:
+                return denied
+            return await f(*args, **kwargs)
+        return decorated_async
 
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        denied = _authenticate()
+        if denied is not None:
+            return denied
         return f(*args, **kwargs)
     return decorated
 
@@ -192,6 +242,28 @@ def optional_auth(f):
 # 히스토리 CRUD
 # =============================================
 
+# 아직 적용되지 않은 마이그레이션 (프로세스별, 처음 실패할 때 기록하고 이후에는 이전 방식 사용)
+_missing_migrations: set = set()
+# 테이블/컬럼/관계/ON CONFLICT 대상 제약이 없을 때의 PostgreSQL·PostgREST 오류 코드
+_SCHEMA_ERROR_CODES: tuple = ('42P01', '42703', '42P10', 'PGRST200', 'PGRST204', 'PGRST205')
+
+
+def _is_schema_error(e: Exception) -> bool:
+    """마이그레이션 미적용으로 인한 오류인지 확인"""
+    text = f"{getattr(e, 'code', '')} {e}"
+    return any(code in text for code in _SCHEMA_ERROR_CODES)
+
+
+def _migration_applied(name: str) -> bool:
+    return name not in _missing_migrations
+
+
+def _mark_migration_missing(name: str, error: Exception) -> None:
+    if name not in _missing_migrations:
+        _missing_migrations.add(name)
+        logger.warning(f"{name} 마이그레이션 미적용, 이전 방식 사용: {error}")
+
+
 def _db_operation(operation_name: str, default_return, operation_func):
     """DB 작업 공통 래퍼 (에러 핸들링 통합)"""
     try:
@@ -201,6 +273,110 @@ def _db_operation(operation_name: str, default_return, operation_func):
         return default_return
 
 
+def is_transcript_dedup_enabled() -> bool:
+    """자막 중복 제거 저장 사용 여부 (supabase/migrations 자막 테이블 필요, 없으면 감지 후 인라인 저장)"""
+    return os.getenv('HISTORY_TRANSCRIPT_DEDUP', '1') != '0' and _migration_applied('transcript_dedup')
+
+
+def _can_store_transcripts() -> bool:
+    """공유 자막 테이블에 쓸 수 있는지 (추가는 service_role만 가능, 아니면 인라인 저장)"""
+    return is_transcript_dedup_enabled() and supabase_client.has_service_role()
+
+
+def transcript_hash(transcript: str) -> str:
+    """자막 콘텐츠 해시 (마이그레이션의 SQL 해시와 동일: UTF-8 SHA-256 hex)"""
+    return hashlib.sha256(transcript.encode('utf-8')).hexdigest()
+
+
+def _history_row(user_id: str, data: dict) -> dict:
+    """히스토리 데이터를 ie_histories 행으로 변환
+
+    자막은 insert 직전에 _split_transcripts에서 ie_transcripts 참조로 바뀝니다.
+    모델은 관리자 통계 롤업(ie_usage_daily)에서 집계하도록 usage에 함께 저장합니다.
+    """
+    usage = data.get('usage')
+    if data.get('model'):
+        usage = {**(usage or {}), 'model': data['model']}
+    row = {
+        'user_id': user_id,
+        'report_id': data.get('id'),
+        'url': data.get('url'),
+        'title': data.get('title'),
+        'style': data.get('style'),
+        'content': data.get('content'),
+        'html': data.get('html'),
+        'transcript': data.get('transcript'),
+        'mindmap_markdown': data.get('mindmapMarkdown'),
+        'usage': usage,
+        'elapsed_time': data.get('elapsed_time')
+    }
+    if data.get('transcript') and data.get('video_id') and _can_store_transcripts():
+        row['transcript_video_id'] = data['video_id']
+    return row
+
+
+def _split_transcripts(rows: list) -> tuple:
+    """히스토리 행의 자막을 (video_id, 해시) 참조로 바꾸고, 저장할 자막 행을 중복 없이 반환
+
+    Returns:
+        tuple: (히스토리 행 목록, 자막 행 목록)
+    """
+    histories, transcripts = [], {}
+    for row in rows:
+        transcript = row.get('transcript')
+        video_id = row.get('transcript_video_id')
+        if not transcript or not video_id:
+            histories.append(row)
+            continue
+        content_hash = transcript_hash(transcript)
+        transcripts[(video_id, content_hash)] = {
+            'video_id': video_id,
+            'content_hash': content_hash,
+            'transcript': transcript
+        }
+        histories.append({**row, 'transcript': None, 'transcript_hash': content_hash})
+    return histories, list(transcripts.values())
+
+
+def _legacy_history_rows(rows: list) -> list:
+    """자막 테이블이 없는 DB용 행 (자막을 ie_histories.transcript에 그대로 저장)"""
+    return [{k: v for k, v in row.items() if k != 'transcript_video_id'} for row in rows]
+
+
+def _write_history_rows(supabase: Client, histories: list, transcripts: list):
+    """자막 upsert(이미 있으면 무시) 후 히스토리 upsert
+
+    (user_id, report_id)가 이미 있는 행은 건너뛰므로 타임아웃 후 재시도/스풀 재전송해도 중복되지 않습니다
+    (supabase/migrations의 histories_report_id_unique 필요, 없으면 일반 insert).
+    """
+    if transcripts:
+        supabase.table('ie_transcripts') \
+            .upsert(transcripts, on_conflict='video_id,content_hash', ignore_duplicates=True) \
+            .execute()
+    if _migration_applied('histories_report_id_unique'):
+        try:
+            return supabase.table('ie_histories') \
+                .upsert(histories, on_conflict='user_id,report_id', ignore_duplicates=True) \
+                .execute()
+        except Exception as e:
+            if not _is_schema_error(e):
+                raise
+            _mark_migration_missing('histories_report_id_unique', e)
+    return supabase.table('ie_histories').insert(histories).execute()
+
+
+def _insert_history_rows(supabase: Client, rows: list):
+    """히스토리 행 저장 (자막 테이블/참조 컬럼이 없으면 한 번 감지한 뒤 인라인 자막으로 저장)"""
+    if _migration_applied('transcript_dedup'):
+        try:
+            return _write_history_rows(supabase, *_split_transcripts(rows))
+        except Exception as e:
+            if not _is_schema_error(e) or 'transcript' not in str(e):
+                raise
+            _mark_migration_missing('transcript_dedup', e)
+    return _write_history_rows(supabase, _legacy_history_rows(rows), [])
+
+
 def save_history(user_id: str, data: dict) -> dict:
     """분석 히스토리 저장"""
     supabase = get_supabase()
@@ -208,40 +384,194 @@ def save_history(user_id: str, data: dict) -> dict:
         return None
 
     def operation():
-        result = supabase.table('ie_histories').insert({
-            'user_id': user_id,
-            'report_id': data.get('id'),
-            'url': data.get('url'),
-            'title': data.get('title'),
-            'style': data.get('style'),
-            'content': data.get('content'),
-            'html': data.get('html'),
-            'transcript': data.get('transcript'),
-            'mindmap_markdown': data.get('mindmapMarkdown'),
-            'usage': data.get('usage'),
-            'elapsed_time': data.get('elapsed_time')
-        }).execute()
+        result = _insert_history_rows(supabase, [_history_row(user_id, data)])
         return result.data[0] if result.data else None
 
     return _db_operation('History save', None, operation)
 
 
-def get_histories(user_id: str, limit: int = 50) -> list:
-    """사용자 히스토리 조회"""
+def insert_histories(rows: list) -> None:
+    """히스토리 행 다중 insert (write-behind 큐용, 실패 시 예외 전파)"""
+    supabase = get_supabase()
+    if not supabase:
+        raise ConfigurationError("Supabase가 설정되지 않았습니다.", config_key='SUPABASE_URL')
+    _insert_history_rows(supabase, rows)
+
+
+def get_history_writer() -> HistoryWriter:
+    """히스토리 write-behind 큐 싱글톤 (종료 시 남은 행 저장)"""
+    global _history_writer
+
+    if _history_writer is None:
+        with _history_writer_lock:
+            if _history_writer is None:
+                _history_writer = HistoryWriter(insert_histories)
+                atexit.register(_history_writer.stop)
+    return _history_writer
+
+
+@timing.timed('history')
+def queue_history(user_id: str, data: dict) -> None:
+    """히스토리를 응답과 분리하여 비동기로 저장
+
+    HISTORY_WRITE_BEHIND=0이면 기존처럼 동기 저장합니다.
+    """
+    if not get_supabase() or not user_id:
+        return
+    if os.getenv('HISTORY_WRITE_BEHIND', '1') == '0':
+        save_history(user_id, data)
+        return
+    get_history_writer().enqueue(_history_row(user_id, data))
+
+
+# 히스토리 목록(패널)에 필요한 요약 컬럼만 조회
+HISTORY_SUMMARY_COLUMNS = 'report_id,url,title,style,created_at'
+HISTORY_PAGE_MAX = 100
+_CURSOR_TIMESTAMP_RE = re.compile(r'^\d{4}-\d{2}-\d{2}[T ][\d:.]+(Z|[+-]\d{2}:?\d{2})?$')
+_CURSOR_REPORT_ID_RE = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+def _encode_cursor(*values: str) -> str:
+    """keyset 페이지네이션 커서 생성 (마지막 항목의 정렬 키 값)"""
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor: str, *patterns) -> tuple:
+    """커서를 정렬 키 값 튜플로 복원
+
+    Raises:
+        ValidationError: 잘못된 커서
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+        # PostgREST 필터 문자열에 들어가므로 형식을 엄격히 제한
+        if not (isinstance(values, list) and len(values) == len(patterns)
+                and all(isinstance(v, str) and p.match(v) for v, p in zip(values, patterns))):
+            raise ValueError(cursor)
+        return tuple(values)
+    except (ValueError, TypeError):
+        raise ValidationError('잘못된 커서입니다.', field='cursor')
+
+
+def encode_history_cursor(created_at: str, report_id: str) -> str:
+    """히스토리 커서 생성 (마지막 항목의 created_at, report_id)"""
+    return _encode_cursor(created_at, report_id)
+
+
+def decode_history_cursor(cursor: str) -> tuple:
+    """커서를 (created_at, report_id)로 복원
+
+    Raises:
+        ValidationError: 잘못된 커서
+    """
+    return _decode_cursor(cursor, _CURSOR_TIMESTAMP_RE, _CURSOR_REPORT_ID_RE)
+
+
+def list_histories(user_id: str, limit: int = 20, cursor: str = None) -> dict:
+    """히스토리 요약 목록 조회 (created_at 기준 keyset 페이지네이션)
+
+    Returns:
+        dict: {'items': [요약 행], 'next_cursor': str|None}
+
+    Raises:
+        ValidationError: 잘못된 커서
+    """
+    empty = {'items': [], 'next_cursor': None}
     supabase = get_supabase()
     if not supabase or not user_id:
-        return []
+        return empty
+
+    limit = max(1, min(int(limit), HISTORY_PAGE_MAX))
+    after = decode_history_cursor(cursor) if cursor else None
 
     def operation():
+        query = supabase.table('ie_histories') \
+            .select(HISTORY_SUMMARY_COLUMNS) \
+            .eq('user_id', user_id)
+        if after:
+            created_at, report_id = after
+            # (created_at, report_id) < 커서: 같은 시각의 행도 누락/중복 없이 이어서 조회
+            query = query.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",report_id.lt."{report_id}")'
+            )
+        result = query \
+            .order('created_at', desc=True) \
+            .order('report_id', desc=True) \
+            .limit(limit + 1) \
+            .execute()
+
+        rows = result.data or []
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_history_cursor(rows[-1]['created_at'], rows[-1]['report_id']) \
+            if has_more and rows else None
+        return {'items': rows, 'next_cursor': next_cursor}
+
+    return _db_operation('History list', empty, operation)
+
+
+def get_history(user_id: str, report_id: str) -> dict:
+    """히스토리 전체 본문 조회 (report_id 기준)"""
+    supabase = get_supabase()
+    if not supabase or not user_id or not report_id:
+        return None
+
+    def select(columns):
         result = supabase.table('ie_histories') \
-            .select('*') \
+            .select(columns) \
             .eq('user_id', user_id) \
-            .order('created_at', desc=True) \
-            .limit(limit) \
+            .eq('report_id', report_id) \
+            .limit(1) \
             .execute()
-        return result.data or []
+        return result.data[0] if result.data else None
+
+    def operation():
+        # 중복 제거된 자막은 같은 요청에서 함께 조회 (외래키 임베딩, 관계가 없으면 인라인 자막만 조회)
+        if is_transcript_dedup_enabled():
+            try:
+                return select('*, ie_transcripts(transcript)')
+            except Exception as e:
+                if not _is_schema_error(e):
+                    raise
+                _mark_migration_missing('transcript_dedup', e)
+        return select('*')
+
+    return _db_operation('History get', None, operation)
 
-    return _db_operation('History fetch', [], operation)
+
+def get_transcript(video_id: str, content_hash: str) -> str:
+    """중복 제거 저장소에서 자막 조회"""
+    supabase = get_supabase()
+    if not supabase or not video_id or not content_hash:
+        return None
+
+    def operation():
+        result = supabase.table('ie_transcripts') \
+            .select('transcript') \
+            .eq('video_id', video_id) \
+            .eq('content_hash', content_hash) \
+            .limit(1) \
+            .execute()
+        return result.data[0]['transcript'] if result.data else None
+
+    return _db_operation('Transcript get', None, operation)
+
+
+def resolve_history_transcript(history: dict) -> str:
+    """히스토리 행의 자막 반환 (이전 행의 인라인 자막, 임베딩된 자막, 참조 순)"""
+    if history.get('transcript'):
+        return history['transcript']
+
+    embedded = history.get('ie_transcripts')
+    if isinstance(embedded, list):
+        embedded = embedded[0] if embedded else None
+    if isinstance(embedded, dict) and embedded.get('transcript'):
+        return embedded['transcript']
+
+    return get_transcript(history.get('transcript_video_id'), history.get('transcript_hash'))
 
 
 def update_history(user_id: str, report_id: str, updates: dict) -> bool:
@@ -261,17 +591,59 @@ def update_history(user_id: str, report_id: str, updates: dict) -> bool:
     return _db_operation('History update', False, operation)
 
 
+def update_histories_mindmap(user_id: str, updates: dict) -> bool:
+    """여러 히스토리의 마인드맵을 한 번에 업데이트
+
+    Args:
+        updates: {report_id: mindmap_markdown}
+
+    update_histories_mindmap RPC(행마다 다른 값, 단일 UPDATE 문)를 사용하고,
+    RPC가 없으면 행별 업데이트로 대체합니다.
+    """
+    supabase = get_supabase()
+    if not supabase or not user_id:
+        return False
+    if not updates:
+        return True
+
+    def operation():
+        supabase.rpc('update_histories_mindmap', {
+            'p_user_id': user_id,
+            'p_updates': [
+                {'report_id': report_id, 'mindmap_markdown': markdown}
+                for report_id, markdown in updates.items()
+            ]
+        }).execute()
+        return True
+
+    if _db_operation('History bulk mindmap update', None, operation):
+        return True
+
+    logger.warning("update_histories_mindmap RPC 사용 불가, 행별 업데이트로 대체")
+    return all([
+        update_history(user_id, report_id, {'mindmap_markdown': markdown})
+        for report_id, markdown in updates.items()
+    ])
+
+
 def delete_history(user_id: str, report_id: str) -> bool:
     """히스토리 삭제"""
+    return delete_histories(user_id, [report_id])
+
+
+def delete_histories(user_id: str, report_ids: list) -> bool:
+    """여러 히스토리를 한 번에 삭제 (단일 DELETE ... IN 문)"""
     supabase = get_supabase()
     if not supabase or not user_id:
         return False
+    if not report_ids:
+        return True
 
     def operation():
         supabase.table('ie_histories') \
             .delete() \
             .eq('user_id', user_id) \
-            .eq('report_id', report_id) \
+            .in_('report_id', list(report_ids)) \
             .execute()
         return True
 
@@ -297,6 +669,7 @@ def save_api_keys(user_id: str, keys: dict) -> bool:
             encrypted_data[f'{field}_key'] = encrypt_api_key(keys.get(field))
 
         supabase.table('ie_api_keys').upsert(encrypted_data).execute()
+        lookup_cache.invalidate('api_keys', user_id)
         return True
 
     return _db_operation('API keys save', False, operation)
@@ -308,17 +681,20 @@ def get_api_keys(user_id: str) -> dict:
     if not supabase or not user_id:
         return {}
 
-    def operation():
+    def fetch_row():
         result = supabase.table('ie_api_keys') \
             .select('*') \
             .eq('user_id', user_id) \
             .limit(1) \
             .execute()
+        return result.data[0] if result.data else None
 
-        if not result.data or len(result.data) == 0:
+    def operation():
+        # 캐시에는 암호화된 행만 보관하고 복호화는 호출마다 수행
+        data = lookup_cache.get_or_load('api_keys', user_id, fetch_row)
+        if not data:
             return {}
 
-        data = result.data[0]
         decrypted = {'selectedProvider': data.get('selected_provider')}
         for field in _API_KEY_FIELDS:
             decrypted[field] = decrypt_api_key(data.get(f'{field}_key'))
@@ -333,18 +709,26 @@ def get_api_keys(user_id: str) -> dict:
 
 def save_custom_style(user_id: str, style: dict) -> bool:
     """커스텀 스타일 저장"""
+    return save_custom_styles(user_id, [style])
+
+
+def save_custom_styles(user_id: str, styles: list) -> bool:
+    """여러 커스텀 스타일을 한 번에 저장 (다중 행 upsert)"""
     supabase = get_supabase()
     if not supabase or not user_id:
         return False
+    if not styles:
+        return True
 
     def operation():
-        supabase.table('ie_custom_styles').upsert({
+        supabase.table('ie_custom_styles').upsert([{
             'user_id': user_id,
             'style_id': style.get('id'),
             'name': style.get('name'),
             'icon': style.get('icon', 'edit_note'),
             'prompt': style.get('prompt')
-        }).execute()
+        } for style in styles], on_conflict='user_id,style_id').execute()
+        lookup_cache.invalidate('custom_styles', user_id)
         return True
 
     return _db_operation('Custom style save', False, operation)
@@ -370,21 +754,30 @@ def get_custom_styles(user_id: str) -> list:
             'prompt': s['prompt']
         } for s in (result.data or [])]
 
-    return _db_operation('Custom styles fetch', [], operation)
+    return _db_operation('Custom styles fetch', [],
+                         lambda: lookup_cache.get_or_load('custom_styles', user_id, operation))
 
 
 def delete_custom_style(user_id: str, style_id: str) -> bool:
     """커스텀 스타일 삭제"""
+    return delete_custom_styles(user_id, [style_id])
+
+
+def delete_custom_styles(user_id: str, style_ids: list) -> bool:
+    """여러 커스텀 스타일을 한 번에 삭제 (단일 DELETE ... IN 문)"""
     supabase = get_supabase()
     if not supabase or not user_id:
         return False
+    if not style_ids:
+        return True
 
     def operation():
         supabase.table('ie_custom_styles') \
             .delete() \
             .eq('user_id', user_id) \
-            .eq('style_id', style_id) \
+            .in_('style_id', list(style_ids)) \
             .execute()
+        lookup_cache.invalidate('custom_styles', user_id)
         return True
 
     return _db_operation('Custom style delete', False, operation)
@@ -454,7 +847,8 @@ def get_usage(user_id: str) -> dict:
             'can_use': True
         }
 
-    return _db_operation('Usage fetch', {'usage_count': 0, 'max_usage': MAX_USAGE_COUNT, 'can_use': False}, operation)
+    return _db_operation('Usage fetch', {'usage_count': 0, 'max_usage': MAX_USAGE_COUNT, 'can_use': False},
+                         lambda: lookup_cache.get_or_load('usage', user_id, operation))
 
 
 def decrement_usage(user_id: str) -> bool:
@@ -483,11 +877,189 @@ def decrement_usage(user_id: str) -> bool:
             }) \
             .eq('user_id', user_id) \
             .execute()
+        lookup_cache.invalidate('usage', user_id)
 
         return True
 
     return _db_operation('Usage decrement', False, operation)
 
+
+def increment_usage(user_id: str) -> bool:
+    """decrement_usage로 차감한 사용량 1 복구 (max_usage를 넘지 않음). 성공 시 True 반환."""
+    supabase = get_supabase()
+    if not supabase or not user_id:
+        return False
+
+    def operation():
+        result = supabase.table('ie_usage') \
+            .select('usage_count, max_usage') \
+            .eq('user_id', user_id) \
+            .limit(1) \
+            .execute()
+
+        if not result.data or len(result.data) == 0:
+            return False
+
+        data = result.data[0]
+        new_count = min(data.get('usage_count', 0) + 1, data.get('max_usage') or MAX_USAGE_COUNT)
+        supabase.table('ie_usage') \
+            .update({
+                'usage_count': new_count,
+                'updated_at': 'now()'
+            }) \
+            .eq('user_id', user_id) \
+            .execute()
+        lookup_cache.invalidate('usage', user_id)
+
+        return True
+
+    return _db_operation('Usage increment', False, operation)
+
+
+def _usage_rpc(function_name: str, user_id: str, amount: int):
+    """사용량 RPC 호출 (supabase/migrations의 consume_usage / refund_usage)
+
+    Returns:
+        dict: {'consumed', 'is_admin', 'usage_count', 'max_usage', 'can_use'},
+              RPC 미설치 또는 오류 시 None
+    """
+    supabase = get_supabase()
+    if not supabase or not user_id:
+        return None
+
+    def operation():
+        result = supabase.rpc(function_name, {
+            'p_user_id': user_id,
+            'p_max_usage': MAX_USAGE_COUNT,
+            'p_amount': amount
+        }).execute()
+        lookup_cache.invalidate('usage', user_id)
+        data = result.data
+        if isinstance(data, list):
+            data = data[0] if data else None
+        return data if isinstance(data, dict) else None
+
+    return _db_operation(f'Usage RPC {function_name}', None, operation)
+
+
+def consume_usage(user_id: str, amount: int = 1):
+    """관리자 확인, 날짜 리셋, 차감을 한 번의 DB 호출로 원자적으로 처리
+
+    Returns:
+        dict: consumed=True면 차감 성공(관리자는 차감 없이 성공), RPC를 사용할 수 없으면 None
+    """
+    return _usage_rpc('consume_usage', user_id, amount)
+
+
+def refund_usage(user_id: str, amount: int = 1):
+    """consume_usage로 차감한 사용량 복구 (요청 실패 시)"""
+    return _usage_rpc('refund_usage', user_id, amount)
+
+
+# =============================================
+# 토큰/비용 사용량 원장
+# =============================================
+
+def insert_usage_events(rows: list) -> None:
+    """사용량 이벤트를 원장에 기록 (supabase/migrations의 record_usage_events)
+
+    write-behind 큐에서 호출되며, 실패 시 예외를 그대로 전달하여 재시도/스풀 처리합니다.
+    """
+    supabase = get_supabase()
+    if not supabase:
+        raise ConfigurationError("Supabase가 설정되지 않았습니다.", config_key='SUPABASE_URL')
+    supabase.rpc('record_usage_events', {'p_events': rows}).execute()
+
+
+def get_metered_usage(user_id: str):
+    """오늘(UTC) 누적 토큰/비용 사용량 조회 (정산되지 않은 예약 포함)
+
+    Returns:
+        dict: {'calls', 'prompt_tokens', 'completion_tokens', 'total_tokens', 'cost_usd', ...},
+              RPC 미설치 또는 오류 시 None
+    """
+    supabase = get_supabase()
+    if not supabase or not user_id:
+        return None
+
+    def operation():
+        result = supabase.rpc('get_metered_usage', {'p_user_id': user_id}).execute()
+        data = result.data
+        if isinstance(data, list):
+            data = data[0] if data else None
+        return data if isinstance(data, dict) else None
+
+    return _db_operation('Metered usage', None, operation)
+
+
+def reserve_metered_usage(user_id: str, reservation_id: str, mode: str, amount: float, limit: float,
+                          ttl: int) -> dict:
+    """오늘 사용량이 한도 미만이면 예상 사용량 예약 (supabase/migrations의 reserve_metered_usage)
+
+    Returns:
+        dict: get_metered_usage 결과 + {'reserved': bool}, RPC 미설치 또는 오류 시 None
+    """
+    supabase = get_supabase()
+    if not supabase or not user_id:
+        return None
+
+    def operation():
+        result = supabase.rpc('reserve_metered_usage', {
+            'p_user_id': user_id,
+            'p_reservation_id': reservation_id,
+            'p_mode': mode,
+            'p_amount': amount,
+            'p_limit': limit,
+            'p_ttl_seconds': ttl
+        }).execute()
+        data = result.data
+        if isinstance(data, list):
+            data = data[0] if data else None
+        return data if isinstance(data, dict) else None
+
+    return _db_operation('Reserve metered usage', None, operation)
+
+
+def release_metered_usage(reservation_id: str) -> bool:
+    """reserve_metered_usage로 예약한 사용량 해제 (요청 실패 시)"""
+    supabase = get_supabase()
+    if not supabase or not reservation_id:
+        return False
+
+    def operation():
+        supabase.rpc('release_metered_usage', {'p_reservation_id': reservation_id}).execute()
+        return True
+
+    return _db_operation('Release metered usage', False, operation)
+
+
+def get_usage_ledger(days: int = 30, user_id: str = None) -> list:
+    """사용자 x 일자 x 모델 x 스타일 누적 원장 조회 (관리자용)
+
+    Raises:
+        ValidationError: 잘못된 사용자 ID
+    """
+    from datetime import date, timedelta
+
+    if user_id and not _UUID_RE.match(user_id):
+        raise ValidationError('잘못된 사용자 ID입니다.', field='user_id')
+
+    supabase = get_supabase()
+    if not supabase:
+        return []
+
+    days = max(1, min(int(days), ADMIN_STATS_DAYS_MAX))
+    since = (date.today() - timedelta(days=days - 1)).isoformat()
+
+    def operation():
+        result = supabase.rpc('get_usage_ledger', {
+            'p_since': since,
+            'p_user_id': user_id
+        }).execute()
+        return result.data or []
+
+    return _db_operation('Usage ledger', [], operation)
+
 # =============================================
 # 관리자 관리
 # =============================================
@@ -506,7 +1078,8 @@ def is_admin(user_id: str) -> bool:
             .execute()
         return bool(result.data and len(result.data) > 0)
 
-    return _db_operation('Admin check', False, operation)
+    return _db_operation('Admin check', False,
+                         lambda: lookup_cache.get_or_load('is_admin', user_id, operation))
 
 
 def get_admin_permissions(user_id: str) -> dict:
@@ -523,23 +1096,76 @@ def get_admin_permissions(user_id: str) -> dict:
             .execute()
         return result.data[0].get('permissions', {}) if result.data and len(result.data) > 0 else {}
 
-    return _db_operation('Admin permissions', {}, operation)
+    return _db_operation('Admin permissions', {},
+                         lambda: lookup_cache.get_or_load('admin_permissions', user_id, operation))
+
+
+ADMIN_USERS_PAGE_MAX = 200
+ADMIN_USER_STATUSES = ('active', 'available', 'exhausted')
+_CURSOR_COUNT_RE = re.compile(r'^-?\d{1,9}$')
+_UUID_RE = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+
+
+def list_users_usage(limit: int = 50, cursor: str = None, status: str = None,
+                     user_id: str = None) -> dict:
+    """사용자 사용량 목록 조회 (관리자용, (usage_count, user_id) 기준 keyset 페이지네이션)
 
+    Args:
+        limit: 페이지 크기 (최대 ADMIN_USERS_PAGE_MAX)
+        cursor: 이전 페이지의 next_cursor
+        status: 'active'(오늘 사용), 'available'(남은 횟수 있음), 'exhausted'(소진)
+        user_id: 특정 사용자만 조회
+
+    Returns:
+        dict: {'items': [ie_usage 행], 'next_cursor': str|None}
+
+    Raises:
+        ValidationError: 잘못된 커서/필터
+    """
+    if status and status not in ADMIN_USER_STATUSES:
+        raise ValidationError('잘못된 상태 필터입니다.', field='status')
+    if user_id and not _UUID_RE.match(user_id):
+        raise ValidationError('잘못된 사용자 ID입니다.', field='user_id')
+    after = _decode_cursor(cursor, _CURSOR_COUNT_RE, _UUID_RE) if cursor else None
 
-def get_all_users_usage() -> list:
-    """모든 사용자의 사용량 조회 (관리자용)"""
+    empty = {'items': [], 'next_cursor': None}
     supabase = get_supabase()
     if not supabase:
-        return []
+        return empty
+
+    limit = max(1, min(int(limit), ADMIN_USERS_PAGE_MAX))
 
     def operation():
-        result = supabase.table('ie_usage') \
-            .select('*') \
-            .order('usage_count', desc=False) \
+        from datetime import date
+        query = supabase.table('ie_usage').select('*')
+        if user_id:
+            query = query.eq('user_id', user_id)
+        if status == 'active':
+            query = query.eq('last_reset_date', date.today().isoformat()).lt('usage_count', MAX_USAGE_COUNT)
+        elif status == 'available':
+            query = query.gt('usage_count', 0)
+        elif status == 'exhausted':
+            query = query.eq('usage_count', 0)
+        if after:
+            usage_count, last_user_id = after
+            query = query.or_(
+                f'usage_count.gt.{usage_count},'
+                f'and(usage_count.eq.{usage_count},user_id.gt.{last_user_id})'
+            )
+        result = query \
+            .order('usage_count') \
+            .order('user_id') \
+            .limit(limit + 1) \
             .execute()
-        return result.data or []
 
-    return _db_operation('All users usage', [], operation)
+        rows = result.data or []
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(str(rows[-1]['usage_count']), rows[-1]['user_id']) \
+            if has_more and rows else None
+        return {'items': rows, 'next_cursor': next_cursor}
+
+    return _db_operation('Users usage list', empty, operation)
 
 
 def reset_user_usage(user_id: str) -> bool:
@@ -558,17 +1184,103 @@ def reset_user_usage(user_id: str) -> bool:
             }) \
             .eq('user_id', user_id) \
             .execute()
+        lookup_cache.invalidate('usage', user_id)
         return True
 
     return _db_operation('Reset user usage', False, operation)
 
 
+ADMIN_STATS_MAX_AGE = int(os.getenv('ADMIN_STATS_MAX_AGE', 300))  # 초, 롤업이 이보다 오래되면 갱신
+ADMIN_STATS_DAYS_MAX = 366
+USAGE_TIMESERIES_MAX_ROWS = 5000  # 일자 x 스타일 x 모델 행, 넘으면 truncated
+ADMIN_STATS_COLUMNS = 'total_users,active_today,exhausted_users,max_usage,refreshed_at'
+USAGE_DAILY_COLUMNS = (
+    'bucket_date,style,model,generations,active_users,'
+    'prompt_tokens,completion_tokens,total_tokens,avg_elapsed_time'
+)
+_TOKEN_FIELDS = ('generations', 'prompt_tokens', 'completion_tokens', 'total_tokens')
+
+
+def refresh_admin_stats(days: int = 2):
+    """관리자 통계 롤업 갱신 (supabase/migrations의 refresh_admin_stats)
+
+    Args:
+        days: 다시 집계할 최근 일수
+
+    Returns:
+        dict: 갱신된 사용자 요약, RPC 미설치 또는 오류 시 None
+    """
+    supabase = get_supabase()
+    if not supabase:
+        return None
+
+    def operation():
+        result = supabase.rpc('refresh_admin_stats', {
+            'p_max_usage': MAX_USAGE_COUNT,
+            'p_days': days
+        }).execute()
+        data = result.data
+        if isinstance(data, list):
+            data = data[0] if data else None
+        return data if isinstance(data, dict) else None
+
+    return _db_operation('Refresh admin stats', None, operation)
+
+
+def _is_stale(refreshed_at) -> bool:
+    """롤업 갱신 시각이 ADMIN_STATS_MAX_AGE보다 오래되었는지 확인"""
+    from datetime import datetime, timezone
+    if not refreshed_at:
+        return True
+    try:
+        refreshed = datetime.fromisoformat(str(refreshed_at).replace('Z', '+00:00'))
+    except ValueError:
+        return True
+    if refreshed.tzinfo is None:
+        refreshed = refreshed.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - refreshed).total_seconds() > ADMIN_STATS_MAX_AGE
+
+
+def _stats_response(stats: dict) -> dict:
+    """롤업 행을 관리자 통계 응답 형식으로 변환"""
+    return {
+        'total_users': stats.get('total_users', 0),
+        'active_today': stats.get('active_today', 0),
+        'exhausted_users': stats.get('exhausted_users', 0),
+        'max_usage': MAX_USAGE_COUNT,
+        'refreshed_at': stats.get('refreshed_at')
+    }
+
+
 def get_usage_stats() -> dict:
-    """사용량 통계 조회 (관리자용)"""
+    """사용량 통계 조회 (관리자용)
+
+    ie_admin_stats 롤업을 읽고, 오래되었으면(pg_cron 미설정 등) 갱신합니다.
+    롤업 마이그레이션이 적용되지 않은 경우 ie_usage를 직접 셉니다.
+    """
     supabase = get_supabase()
     if not supabase:
         return {}
 
+    def operation():
+        result = supabase.table('ie_admin_stats') \
+            .select(ADMIN_STATS_COLUMNS) \
+            .limit(1) \
+            .execute()
+        rows = result.data or []
+        stats = rows[0] if rows else None
+        if stats is None or _is_stale(stats.get('refreshed_at')):
+            stats = refresh_admin_stats() or stats
+        return _stats_response(stats) if stats else None
+
+    stats = _db_operation('Usage stats rollup', None, operation)
+    if stats is not None:
+        return stats
+    return _count_usage_stats(supabase)
+
+
+def _count_usage_stats(supabase) -> dict:
+    """ie_usage를 직접 세는 통계 (롤업 미적용 시)"""
     def operation():
         # 전체 사용자 수
         users_result = supabase.table('ie_usage').select('user_id', count='exact').execute()
@@ -599,3 +1311,51 @@ def get_usage_stats() -> dict:
         }
 
     return _db_operation('Usage stats', {}, operation)
+
+
+def get_usage_timeseries(days: int = 30, style: str = None, model: str = None) -> dict:
+    """일자별 사용량 추이 조회 (관리자용, ie_usage_daily 롤업)
+
+    Args:
+        days: 조회할 최근 일수 (최대 ADMIN_STATS_DAYS_MAX)
+        style: 특정 스타일만 조회
+        model: 특정 모델만 조회
+
+    Returns:
+        dict: {'buckets': [일자 x 스타일 x 모델 행, 최대 USAGE_TIMESERIES_MAX_ROWS개],
+               'by_day': {...}, 'by_style': {...}, 'by_model': {...}, 'truncated': bool}
+    """
+    from datetime import date, timedelta
+
+    empty = {'buckets': [], 'by_day': {}, 'by_style': {}, 'by_model': {}, 'truncated': False}
+    supabase = get_supabase()
+    if not supabase:
+        return empty
+
+    days = max(1, min(int(days), ADMIN_STATS_DAYS_MAX))
+    until = date.today()
+    since = until - timedelta(days=days - 1)
+
+    def operation():
+        query = supabase.table('ie_usage_daily') \
+            .select(USAGE_DAILY_COLUMNS) \
+            .gte('bucket_date', since.isoformat()) \
+            .lte('bucket_date', until.isoformat())
+        if style:
+            query = query.eq('style', style)
+        if model:
+            query = query.eq('model', model)
+        result = query.order('bucket_date').limit(USAGE_TIMESERIES_MAX_ROWS + 1).execute()
+
+        buckets = result.data or []
+        truncated = len(buckets) > USAGE_TIMESERIES_MAX_ROWS
+        buckets = buckets[:USAGE_TIMESERIES_MAX_ROWS]
+        totals = {'by_day': {}, 'by_style': {}, 'by_model': {}}
+        for row in buckets:
+            for group, key in (('by_day', 'bucket_date'), ('by_style', 'style'), ('by_model', 'model')):
+                total = totals[group].setdefault(row[key], dict.fromkeys(_TOKEN_FIELDS, 0))
+                for field in _TOKEN_FIELDS:
+                    total[field] += row.get(field) or 0
+        return {'buckets': buckets, **totals, 'truncated': truncated}
+
+    return _db_operation('Usage timeseries', empty, operation)
@@ -0,0 +1,225 @@
+"""
+요청 단계별 소요 시간 측정
+인증, 사용량 확인, 제목/자막/댓글 수집, LLM 호출, 렌더링, 저장 등 단계별 시간을
+요청 응답(timings 필드, Server-Timing 헤더)과 프로세스 내 집계로 제공
+"""
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Deque, Dict, Iterator, Optional
+
+from flask import Flask, g, request
+
+# 단계별 최근 측정값 보관 개수 (백분위 계산용)
+STATS_WINDOW = 512
+
+
+class Timings:
+    """한 요청(또는 배치의 URL 하나)에서 측정한 단계별 시간"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+        self.descriptions: Dict[str, str] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        """같은 단계가 여러 번 측정되면 합산 (예: 요청 중 여러 DB 호출)"""
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def describe(self, name: str, description: str) -> None:
+        self.descriptions[name] = description
+
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> Dict[str, float]:
+        """단계별 시간 (밀리초)"""
+        return {name: round(seconds * 1000, 1) for name, seconds in self.durations.items()}
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (total 포함)"""
+        parts = []
+        for name, ms in self.as_dict().items():
+            part = f'{name};dur={ms}'
+            if name in self.descriptions:
+                part += f';desc="{self.descriptions[name]}"'
+            parts.append(part)
+        parts.append(f'total;dur={round(self.total() * 1000, 1)}')
+        return ', '.join(parts)
+
+
+class _Stat:
+    __slots__ = ('count', 'total', 'max', 'recent')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: Deque[float] = deque(maxlen=STATS_WINDOW)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.recent)
+
+        def percentile(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000, 1) if ordered else 0.0
+
+        return {
+            'count': self.count,
+            'avg_ms': round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            'p50_ms': percentile(0.5),
+            'p95_ms': percentile(0.95),
+            'max_ms': round(self.max * 1000, 1),
+        }
+
+
+_current: contextvars.ContextVar[Optional[Timings]] = contextvars.ContextVar('timings', default=None)
+_stage_stats: Dict[str, _Stat] = {}
+_route_stats: Dict[str, _Stat] = {}
+_stats_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    """단계별 시간 측정 여부 (REQUEST_TIMINGS=0이면 측정/헤더 없음)"""
+    return os.getenv('REQUEST_TIMINGS', '1') != '0'
+
+
+def _record(stats: Dict[str, _Stat], name: str, seconds: float) -> None:
+    with _stats_lock:
+        stat = stats.get(name)
+        if stat is None:
+            stat = stats[name] = _Stat()
+        stat.add(seconds)
+
+
+def current() -> Optional[Timings]:
+    """현재 컨텍스트의 측정기 (요청 밖이면 None)"""
+    return _current.get()
+
+
+@contextmanager
+def collect() -> Iterator[Timings]:
+    """새 측정 범위를 시작합니다.
+
+    ThreadPoolExecutor 작업은 요청의 컨텍스트를 물려받지 않으므로
+    배치의 URL별 처리처럼 스레드 안에서 따로 측정할 때 사용합니다.
+    """
+    timings = Timings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str, description: Optional[str] = None) -> Iterator[None]:
+    """단계 하나의 시간을 측정해 현재 요청과 프로세스 집계에 기록합니다."""
+    if not is_enabled():
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        _record(_stage_stats, name, elapsed)
+        timings = _current.get()
+        if timings is not None:
+            timings.add(name, elapsed)
+            if description:
+                timings.describe(name, description)
+
+
+def timed(name: str):
+    """함수 전체를 한 단계로 측정하는 데코레이터"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def describe(name: str, description: str) -> None:
+    """현재 요청의 단계에 설명 추가 (예: 자막 출처)"""
+    timings = _current.get()
+    if timings is not None:
+        timings.describe(name, description)
+
+
+def get_timings() -> Dict[str, float]:
+    """현재 요청의 단계별 시간 (밀리초, 응답의 timings 필드용)"""
+    timings = _current.get()
+    return timings.as_dict() if timings is not None else {}
+
+
+def snapshot() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """프로세스 내 집계 (단계별, 라우트별 count/avg/p50/p95/max)"""
+    with _stats_lock:
+        return {
+            'stages': {name: stat.summary() for name, stat in sorted(_stage_stats.items())},
+            'routes': {name: stat.summary() for name, stat in sorted(_route_stats.items())},
+        }
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _stage_stats.clear()
+        _route_stats.clear()
+
+
+def init_timing(app: Flask) -> None:
+    """요청마다 측정 범위를 열고, 응답에 Server-Timing 헤더를 붙이고 라우트 시간을 집계합니다."""
+
+    @app.before_request
+    def _start_timing():
+        if is_enabled():
+            g._timing_token = _current.set(Timings())
+
+    @app.after_request
+    def _finish_timing(response):
+        timings = _current.get()
+        if timings is None or not hasattr(g, '_timing_token'):
+            return response
+
+        if request.endpoint and request.endpoint != 'static':
+            _record(_route_stats, request.endpoint, timings.total())
+        if timings.durations:
+            response.headers['Server-Timing'] = timings.server_timing()
+        return response
+
+    @app.teardown_request
+    def _end_timing(_exc=None):
+        token = g.pop('_timing_token', None)
+        if token is not None:
+            try:
+                _current.reset(token)
+            except ValueError:
+                _current.set(None)  # 다른 컨텍스트에서 정리되는 경우
+
+
+__all__ = [
+    'Timings',
+    'is_enabled',
+    'current',
+    'collect',
+    'span',
+    'timed',
+    'describe',
+    'get_timings',
+    'snapshot',
+    'reset_stats',
+    'init_timing',
+]
@@ -0,0 +1,265 @@
+"""
+분산 추적 (OpenTelemetry)
+요청(server span)과 외부 호출(YouTube, Supadata, LiteLLM, Supabase) span을 기록하고,
+배치의 ThreadPoolExecutor 작업에 추적 컨텍스트를 전달해 URL별 처리를 한 trace로 묶음
+
+TRACING_EXPORTER: console | file | otlp (설정하지 않으면 비활성화, opentelemetry-sdk 필요)
+"""
+import os
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from flask import Flask, g, request
+
+from services.logging_config import ServiceLogger
+
+try:
+    from opentelemetry import context as otel_context
+    from opentelemetry import propagate, trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ModuleNotFoundError:
+    trace = None
+
+logger = ServiceLogger('Tracing')
+
+TRACER_NAME = 'insight-engine'
+EXPORTERS = ('console', 'file', 'otlp')
+TRACE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cache', 'traces.jsonl')
+
+_tracer = None
+_provider = None
+_configure_lock = threading.Lock()
+
+
+def _build_exporter(name: str):
+    """exporter 생성 (지원하지 않거나 패키지가 없으면 None)"""
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    if name == 'console':
+        return ConsoleSpanExporter()
+
+    if name == 'file':
+        # span 하나를 JSON 한 줄로 기록 (여러 워커가 같은 파일에 append)
+        path = os.getenv('TRACING_FILE', TRACE_FILE)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return ConsoleSpanExporter(
+            out=open(path, 'a', encoding='utf-8'),
+            formatter=lambda span: span.to_json(indent=None) + '\n'
+        )
+
+    if name == 'otlp':
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ModuleNotFoundError:
+            logger.warning("opentelemetry-exporter-otlp-proto-http가 설치되지 않아 OTLP 추적을 사용하지 않습니다.")
+            return None
+        return OTLPSpanExporter()  # OTEL_EXPORTER_OTLP_ENDPOINT 등 표준 환경변수 사용
+
+    logger.warning(f"지원하지 않는 TRACING_EXPORTER: {name} ({', '.join(EXPORTERS)})")
+    return None
+
+
+def configure(exporter=None) -> bool:
+    """추적을 설정합니다. 활성화되면 True.
+
+    Args:
+        exporter: SpanExporter 인스턴스 (없으면 TRACING_EXPORTER 환경변수로 생성)
+    """
+    global _tracer, _provider
+
+    name = os.getenv('TRACING_EXPORTER', '').strip().lower()
+    if trace is None or (exporter is None and not name):
+        return False
+
+    with _configure_lock:
+        if _tracer is not None and exporter is None:
+            return True
+
+        try:
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+            from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+        except ModuleNotFoundError:
+            logger.warning("opentelemetry-sdk가 설치되지 않아 추적을 사용하지 않습니다.")
+            return False
+
+        exporter = exporter or _build_exporter(name)
+        if exporter is None:
+            return False
+
+        try:
+            ratio = float(os.getenv('TRACING_SAMPLE_RATIO', '1.0'))
+        except ValueError:
+            ratio = 1.0
+
+        provider = TracerProvider(
+            resource=Resource.create({'service.name': os.getenv('OTEL_SERVICE_NAME', TRACER_NAME)}),
+            sampler=ParentBased(TraceIdRatioBased(ratio))
+        )
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+        if _provider is not None:
+            _provider.shutdown()
+        _provider = provider
+        _tracer = provider.get_tracer(TRACER_NAME)
+        logger.info(f"추적 활성화: {name or type(exporter).__name__} (샘플링 {ratio})")
+        return True
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+def shutdown() -> None:
+    """남은 span을 내보내고 추적을 끕니다."""
+    global _tracer, _provider
+
+    with _configure_lock:
+        if _provider is not None:
+            _provider.shutdown()
+        _tracer = None
+        _provider = None
+
+
+def force_flush(timeout_millis: int = 5000) -> None:
+    """대기 중인 span을 내보냅니다 (테스트, 종료 시)."""
+    if _provider is not None:
+        _provider.force_flush(timeout_millis)
+
+
+# ==================== span ====================
+
+@contextmanager
+def span(name: str, attributes: Optional[Dict[str, Any]] = None, client: bool = False) -> Iterator[Any]:
+    """span을 현재 컨텍스트의 자식으로 기록합니다 (비활성화 시 None).
+
+    Args:
+        client: 외부 호출이면 True (SpanKind.CLIENT)
+    """
+    if _tracer is None:
+        yield None
+        return
+
+    kind = SpanKind.CLIENT if client else SpanKind.INTERNAL
+    with _tracer.start_as_current_span(name, kind=kind, attributes=attributes) as current:
+        yield current
+
+
+def client_span(name: str, attributes: Optional[Dict[str, Any]] = None):
+    """외부 호출 span"""
+    return span(name, attributes, client=True)
+
+
+def annotate(attributes: Dict[str, Any]) -> None:
+    """현재 span에 속성 추가 (None 값은 제외)"""
+    if _tracer is not None:
+        trace.get_current_span().set_attributes({k: v for k, v in attributes.items() if v is not None})
+
+
+def add_event(name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+    """현재 span에 이벤트 추가 (예: 재시도)"""
+    if _tracer is not None:
+        trace.get_current_span().add_event(name, attributes or {})
+
+
+def inject_headers(headers) -> None:
+    """외부 요청 헤더에 traceparent 추가"""
+    if _tracer is not None:
+        propagate.inject(headers)
+
+
+def current_trace_id() -> Optional[str]:
+    """현재 trace ID (16진수 32자, 추적 비활성화 시 None)"""
+    if _tracer is None:
+        return None
+    context = trace.get_current_span().get_span_context()
+    return format(context.trace_id, '032x') if context.is_valid else None
+
+
+def bind(func: Callable) -> Callable:
+    """현재 추적 컨텍스트를 다른 스레드에서 실행될 함수에 전달합니다.
+
+    ThreadPoolExecutor는 contextvars를 전달하지 않으므로 submit 전에 감싸야
+    작업 스레드의 span이 요청 span의 자식이 됩니다.
+    """
+    if _tracer is None:
+        return func
+
+    captured = otel_context.get_current()
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = otel_context.attach(captured)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            otel_context.detach(token)
+    return wrapper
+
+
+# ==================== Flask ====================
+
+def init_tracing(app: Flask) -> None:
+    """요청마다 server span을 열고 들어온 traceparent를 이어받습니다."""
+    configure()
+
+    @app.before_request
+    def _start_server_span():
+        if _tracer is None or request.endpoint in ('static', 'metrics'):
+            return
+        route = request.url_rule.rule if request.url_rule else request.path
+        server_span = _tracer.start_span(
+            f'{request.method} {route}',
+            context=propagate.extract(request.headers),
+            kind=SpanKind.SERVER,
+            attributes={'http.request.method': request.method, 'http.route': route, 'url.path': request.path}
+        )
+        g._trace_span = server_span
+        g._trace_token = otel_context.attach(trace.set_span_in_context(server_span))
+
+    @app.after_request
+    def _finish_server_span(response):
+        server_span = getattr(g, '_trace_span', None)
+        if server_span is not None:
+            server_span.set_attribute('http.response.status_code', response.status_code)
+            if response.status_code >= 500:
+                server_span.set_status(Status(StatusCode.ERROR))
+            trace_id = current_trace_id()
+            if trace_id:
+                response.headers['X-Trace-Id'] = trace_id
+        return response
+
+    @app.teardown_request
+    def _end_server_span(exc=None):
+        server_span = g.pop('_trace_span', None)
+        token = g.pop('_trace_token', None)
+        if server_span is None:
+            return
+        if exc is not None:
+            server_span.record_exception(exc)
+            server_span.set_status(Status(StatusCode.ERROR, str(exc)))
+        server_span.end()
+        if token is not None:
+            try:
+                otel_context.detach(token)
+            except ValueError:
+                pass
+
+
+__all__ = [
+    'EXPORTERS',
+    'configure',
+    'is_enabled',
+    'shutdown',
+    'force_flush',
+    'span',
+    'client_span',
+    'annotate',
+    'add_event',
+    'inject_headers',
+    'current_trace_id',
+    'bind',
+    'init_tracing',
+]
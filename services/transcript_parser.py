@@ -0,0 +1,142 @@
+"""
+자막/플레이어 응답 파서
+watch 페이지 폴백 경로의 CPU 핫스팟(VTT, TimedText XML, ytInitialPlayerResponse) 전담
+"""
+from __future__ import annotations
+
+import html as html_module
+import io
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from xml.etree import ElementTree
+
+# Type aliases
+CaptionSource = Union[str, Iterable[str]]
+
+# 미리 컴파일된 패턴
+_TAG_RE = re.compile(r'<[^>]+>')
+_PLAYER_RESPONSE_RE = re.compile(r'ytInitialPlayerResponse\s*=\s*(?=\{)')
+
+# raw_decode는 시작 위치의 '{'와 짝이 맞는 '}'까지만 파싱하고 멈춤 (C 구현)
+_JSON_DECODER = json.JSONDecoder()
+
+_BOM = '\ufeff'
+
+
+def _iter_lines(source: CaptionSource) -> Iterator[str]:
+    """문자열 또는 라인 이터러블을 한 줄씩 내보냅니다 (전체 리스트를 만들지 않음)."""
+    if isinstance(source, str):
+        source = io.StringIO(source)
+
+    for line in source:
+        yield line.decode('utf-8', 'replace') if isinstance(line, bytes) else line
+
+
+def iter_vtt_lines(source: CaptionSource) -> Iterator[str]:
+    """VTT 자막에서 큐 텍스트 라인만 순서대로 내보냅니다."""
+    for raw in _iter_lines(source):
+        line = raw.strip(_BOM).strip()
+        if not line or '-->' in line:
+            continue
+        if line[:6].upper() == 'WEBVTT':
+            continue
+        if line.isascii() and line.isdigit():
+            continue
+        if '<' in line:
+            line = _TAG_RE.sub('', line).strip()
+            if not line:
+                continue
+        yield line
+
+
+def parse_vtt(source: CaptionSource) -> str:
+    """VTT 형식의 자막을 단일 패스로 파싱합니다.
+
+    Args:
+        source: VTT 문자열 또는 라인 이터러블 (예: response.iter_lines())
+
+    Returns:
+        공백으로 연결된 자막 텍스트 (입력이 비어 있으면 빈 문자열)
+    """
+    if source is None:
+        return ""
+    if isinstance(source, str) and not source.strip():
+        return ""
+    return " ".join(iter_vtt_lines(source))
+
+
+def parse_timedtext_xml(xml_text: str) -> str:
+    """TimedText XML을 파싱합니다."""
+    if not isinstance(xml_text, str) or not xml_text.strip():
+        return ""
+
+    try:
+        root = ElementTree.fromstring(xml_text)
+    except ElementTree.ParseError:
+        return ""
+
+    texts: List[str] = []
+    for node in root.iter('text'):
+        text = node.text
+        if not text:
+            continue
+        if '&' in text:
+            text = html_module.unescape(text)
+        text = text.replace('\n', ' ').strip()
+        if text:
+            texts.append(text)
+
+    return " ".join(texts)
+
+
+def extract_json_object(text: str, start: int) -> Optional[Any]:
+    """text[start]의 '{'부터 짝이 맞는 '}'까지를 JSON으로 디코딩합니다.
+
+    문자열 리터럴 내부의 중괄호/이스케이프를 올바르게 처리하며,
+    객체 뒤에 이어지는 스크립트는 읽지 않습니다. 실패 시 None.
+    """
+    if start >= len(text) or text[start] != '{':
+        return None
+    try:
+        value, _end = _JSON_DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
+        return None
+    return value
+
+
+def extract_yt_initial_player_response(html_text: str) -> Optional[Dict[str, Any]]:
+    """watch 페이지 HTML에서 ytInitialPlayerResponse JSON을 추출합니다.
+
+    마커는 미리 컴파일된 패턴으로 한 번만 스캔하고, 객체 끝은 중괄호 짝으로
+    결정하므로 수 MB 페이지에서도 백트래킹 없이 선형 시간에 동작합니다.
+    """
+    if not isinstance(html_text, str) or not html_text:
+        return None
+
+    for marker in _PLAYER_RESPONSE_RE.finditer(html_text):
+        data = extract_json_object(html_text, marker.end())
+        if isinstance(data, dict):
+            return data
+    return None
+
+
+def parse_caption_text(text: str) -> str:
+    """다운로드한 자막 본문의 형식을 판별하여 텍스트로 변환합니다."""
+    if not text:
+        return ""
+    if text.lstrip().startswith('WEBVTT'):
+        return parse_vtt(text)
+    if '<transcript' in text or '<text' in text:
+        return parse_timedtext_xml(text)
+    return text.strip()
+
+
+__all__ = [
+    'iter_vtt_lines',
+    'parse_vtt',
+    'parse_timedtext_xml',
+    'extract_json_object',
+    'extract_yt_initial_player_response',
+    'parse_caption_text',
+]
@@ -0,0 +1,169 @@
+"""
+토큰/비용 사용량 계측
+LLM 호출마다 prompt/completion 토큰과 추정 비용을 사용자·모델·스타일별 원장에 기록하고,
+토큰 또는 비용 기준 일일 한도(USAGE_QUOTA_MODE) 확인에 쓰는 사용량 정보를 만듭니다.
+"""
+import atexit
+import math
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from flask import g, has_request_context
+
+import config
+from services.history_writer import HistoryWriter
+from services.logging_config import ServiceLogger
+from services.supabase_service import get_supabase, insert_usage_events
+
+logger = ServiceLogger('Metering')
+
+QUOTA_MODES = ('count', 'tokens', 'cost')
+METER_SPOOL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'cache', 'usage_spool')
+
+_meter_writer: Optional[HistoryWriter] = None
+_meter_writer_lock = threading.Lock()
+
+
+def is_metering_enabled() -> bool:
+    """사용량 원장 기록 여부 (USAGE_METERING=0이면 기록하지 않음)"""
+    return os.getenv('USAGE_METERING', '1') != '0'
+
+
+def get_quota_mode() -> str:
+    """사용량 한도 기준 (count | tokens | cost), 알 수 없는 값은 count"""
+    mode = config.USAGE_QUOTA_MODE
+    return mode if mode in QUOTA_MODES else 'count'
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """호출 비용 추정 (USD)
+
+    config.MODEL_PRICING을 먼저 사용하고, 없으면 LiteLLM 가격표를 사용합니다.
+    가격을 알 수 없는 모델은 0으로 기록합니다.
+    """
+    pricing = config.MODEL_PRICING.get(model)
+    if pricing:
+        return (prompt_tokens * pricing.get('prompt', 0)
+                + completion_tokens * pricing.get('completion', 0)) / 1_000_000
+
+    try:
+        from litellm import cost_per_token
+        prompt_cost, completion_cost = cost_per_token(
+            model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
+        return float(prompt_cost + completion_cost)
+    except Exception as e:
+        logger.debug("모델 가격 정보 없음 (%s): %s", model, e)
+        return 0.0
+
+
+def build_event(user_id: str, model: str, style: str, token_usage: Optional[Dict],
+                kind: str = 'generate') -> Optional[Dict]:
+    """create_content의 token_usage로 원장 이벤트 행 생성 (토큰 정보가 없으면 None)"""
+    if not user_id or not token_usage:
+        return None
+
+    prompt_tokens = max(0, int(token_usage.get('prompt_tokens') or 0))
+    completion_tokens = max(0, int(token_usage.get('completion_tokens') or 0))
+    total_tokens = max(0, int(token_usage.get('total_tokens') or prompt_tokens + completion_tokens))
+    return {
+        'event_id': str(uuid.uuid4()),
+        'user_id': user_id,
+        'model': model or 'unknown',
+        'style': style or 'unknown',
+        'kind': kind,
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'total_tokens': total_tokens,
+        'cost_usd': round(estimate_cost(model, prompt_tokens, completion_tokens), 6),
+        'created_at': datetime.now(timezone.utc).isoformat()
+    }
+
+
+def get_meter_writer() -> HistoryWriter:
+    """사용량 원장 write-behind 큐 싱글톤 (종료 시 남은 이벤트 저장)"""
+    global _meter_writer
+
+    if _meter_writer is None:
+        with _meter_writer_lock:
+            if _meter_writer is None:
+                _meter_writer = HistoryWriter(insert_usage_events, spool_dir=METER_SPOOL_DIR, label='사용량 원장')
+                atexit.register(_meter_writer.stop)
+    return _meter_writer
+
+
+def _request_reservation_id() -> Optional[str]:
+    """현재 요청에서 require_usage가 예약한 사용량 ID"""
+    if not has_request_context():
+        return None
+    return (getattr(g, 'usage', None) or {}).get('reservation_id')
+
+
+def record(user_id: str, model: str, style: str, token_usage: Optional[Dict],
+           kind: str = 'generate', reservation_id: Optional[str] = None) -> Optional[Dict]:
+    """LLM 호출 한 번의 토큰/비용을 원장에 기록 (백그라운드 저장, 즉시 반환)
+
+    reservation_id(기본: 현재 요청의 예약)가 있으면 기록할 때 예약분을 실제 사용량으로 정산합니다.
+
+    Returns:
+        dict: 기록한 이벤트 (기록하지 않았으면 None)
+    """
+    if not is_metering_enabled() or not get_supabase():
+        return None
+
+    event = build_event(user_id, model, style, token_usage, kind)
+    if event:
+        reservation_id = reservation_id or _request_reservation_id()
+        if reservation_id:
+            event['reservation_id'] = reservation_id
+        get_meter_writer().enqueue(event)
+    return event
+
+
+def reservation_amount(mode: str) -> Tuple[float, float]:
+    """tokens/cost 모드에서 호출 전에 예약할 예상 사용량과 일일 한도
+
+    Returns:
+        tuple: (예약량, 한도)
+    """
+    if mode == 'tokens':
+        return config.USAGE_RESERVE_TOKENS, config.DAILY_TOKEN_QUOTA
+    return config.USAGE_RESERVE_COST, config.DAILY_COST_QUOTA
+
+
+def metered_to_usage(totals: Dict, mode: str) -> Dict:
+    """오늘 누적 토큰/비용을 사용량 응답 형식으로 변환
+
+    기존 화면과 호환되도록 usage_count/max_usage에는 남은 비율(%)을 넣습니다.
+    """
+    if mode == 'tokens':
+        used, limit = int(totals.get('total_tokens') or 0), config.DAILY_TOKEN_QUOTA
+    else:
+        used, limit = float(totals.get('cost_usd') or 0), config.DAILY_COST_QUOTA
+
+    remaining = max(0.0, 1 - used / limit) if limit > 0 else 0.0
+    return {
+        'usage_count': math.ceil(remaining * 100),
+        'max_usage': 100,
+        'can_use': used < limit,
+        'is_admin': False,
+        'quota_mode': mode,
+        'quota_used': used,
+        'quota_limit': limit
+    }
+
+
+__all__ = [
+    'QUOTA_MODES',
+    'is_metering_enabled',
+    'get_quota_mode',
+    'estimate_cost',
+    'build_event',
+    'get_meter_writer',
+    'record',
+    'reservation_amount',
+    'metered_to_usage',
+]
@@ -2,9 +2,12 @@
 사용량 체크 데코레이터
 blog_routes.py의 중복 코드 제거
 """
+import asyncio
+import inspect
 from functools import wraps
 from flask import g, jsonify
 
+from services import timing
 from services.supabase_service import is_supabase_enabled
 from services.usage.usage_service import UsageService, ADMIN_USAGE
 from services.logging_config import ServiceLogger
@@ -40,7 +43,8 @@ def check_usage(f):
             return f(*args, **kwargs)
 
         # 사용량 체크
-        can_use, usage = UsageService.check_can_use(user_id)
+        with timing.span('usage'):
+            can_use, usage = UsageService.check_can_use(user_id)
         g.usage = usage
         g.is_admin = usage.get('is_admin', False)
 
@@ -64,57 +68,96 @@ def require_usage(f):
         @require_auth
         @require_usage
         def generate():
-            # 함수 실행 후 자동으로 사용량 차감
-            # g.usage에 차감 전 사용량 정보
-            # g.updated_usage에 차감 후 사용량 정보 (함수 실행 후)
+            # 함수 실행 전 사용량 차감 (실패 시 복구)
+            # g.usage, g.updated_usage에 차감 후 사용량 정보
             pass
 
     Note:
         - 관리자는 차감하지 않음
-        - 함수가 성공적으로 완료된 경우에만 차감됨
+        - 함수 실행 전에 원자적으로 차감하고, 예외/에러 응답이면 복구함
         - 응답에 자동으로 usage 필드 추가하려면 _add_usage_to_response 사용
+        - async 뷰에도 사용 가능 (ASGI 모드, 차감/복구는 스레드 풀에서 실행)
     """
+    if inspect.iscoroutinefunction(f):
+        @wraps(f)
+        async def decorated_async(*args, **kwargs):
+            # Supabase 호출은 스레드 풀에서 (이벤트 루프 차단 방지)
+            user_id, usage, denied = await asyncio.to_thread(_consume_usage)
+            if denied is not None:
+                return denied
+            if not user_id:
+                return await f(*args, **kwargs)
+
+            try:
+                result = await f(*args, **kwargs)
+            except Exception:
+                await asyncio.to_thread(UsageService.refund, user_id, usage)
+                raise
+
+            if _is_error_response(result):
+                g.updated_usage = await asyncio.to_thread(UsageService.refund, user_id, usage)
+            return result
+        return decorated_async
+
     @wraps(f)
     def decorated(*args, **kwargs):
-        # Supabase 비활성화 시 통과
-        if not is_supabase_enabled():
-            g.usage = ADMIN_USAGE
-            g.updated_usage = ADMIN_USAGE
-            g.is_admin = False
-            return f(*args, **kwargs)
-
-        user_id = getattr(g, 'user_id', None)
+        user_id, usage, denied = _consume_usage()
+        if denied is not None:
+            return denied
         if not user_id:
-            g.usage = ADMIN_USAGE
-            g.updated_usage = ADMIN_USAGE
-            g.is_admin = False
             return f(*args, **kwargs)
 
-        # 사용량 체크
-        can_use, usage = UsageService.check_can_use(user_id)
-        g.usage = usage
-        g.is_admin = usage.get('is_admin', False)
-
-        if not can_use:
-            return jsonify({
-                'error': '오늘 사용 가능 횟수를 모두 소진했습니다. 내일 다시 시도해주세요.',
-                'code': 'USAGE_LIMIT_EXCEEDED',
-                'usage': usage
-            }), 429
+        # 함수 실행 (실패 시 차감분 복구)
+        try:
+            result = f(*args, **kwargs)
+        except Exception:
+            UsageService.refund(user_id, usage)
+            raise
 
-        # 함수 실행
-        result = f(*args, **kwargs)
-
-        # 성공 시 사용량 차감 (관리자 제외)
-        if not g.is_admin:
-            g.updated_usage = UsageService.decrement(user_id)
-        else:
-            g.updated_usage = ADMIN_USAGE
+        if _is_error_response(result):
+            g.updated_usage = UsageService.refund(user_id, usage)
 
         return result
     return decorated
 
 
+def _consume_usage():
+    """require_usage 차감 단계
+
+    Returns:
+        tuple: (차감한 user_id 또는 None, 사용량, 거부 응답 또는 None)
+    """
+    user_id = getattr(g, 'user_id', None)
+    # Supabase 비활성화 또는 비로그인 시 통과
+    if not is_supabase_enabled() or not user_id:
+        g.usage = ADMIN_USAGE
+        g.updated_usage = ADMIN_USAGE
+        g.is_admin = False
+        return None, ADMIN_USAGE, None
+
+    # 사용량 확인 + 차감 (원자적, 동시 요청에서 중복 사용 방지)
+    with timing.span('usage'):
+        consumed, usage = UsageService.consume(user_id)
+    g.usage = usage
+    g.updated_usage = usage
+    g.is_admin = usage.get('is_admin', False)
+
+    if not consumed:
+        return None, usage, (jsonify({
+            'error': '오늘 사용 가능 횟수를 모두 소진했습니다. 내일 다시 시도해주세요.',
+            'code': 'USAGE_LIMIT_EXCEEDED',
+            'usage': usage
+        }), 429)
+    return user_id, usage, None
+
+
+def _is_error_response(result) -> bool:
+    """뷰 반환값이 에러 응답(4xx/5xx)인지 확인"""
+    if isinstance(result, tuple) and len(result) > 1 and isinstance(result[1], int):
+        return result[1] >= 400
+    return getattr(result, 'status_code', 200) >= 400
+
+
 def get_usage_for_response() -> dict:
     """
     응답에 포함할 사용량 정보 반환
@@ -2,11 +2,16 @@
 사용량 관리 서비스
 비즈니스 로직 캡슐화
 """
+import uuid
+
 from flask import g
 
+import config
 from services.supabase_service import (
-    is_supabase_enabled, get_usage, decrement_usage, is_admin
+    is_supabase_enabled, get_usage, decrement_usage, increment_usage, is_admin,
+    consume_usage, refund_usage, get_metered_usage, reserve_metered_usage, release_metered_usage
 )
+from services.usage import metering
 from services.logging_config import ServiceLogger
 
 logger = ServiceLogger('UsageService')
@@ -20,6 +25,18 @@ ADMIN_USAGE = {
 }
 
 
+def _rpc_to_usage(result: dict) -> dict:
+    """consume_usage/refund_usage RPC 결과를 사용량 dict로 변환"""
+    if result.get('is_admin'):
+        return ADMIN_USAGE
+    return {
+        'usage_count': result.get('usage_count', 0),
+        'max_usage': result.get('max_usage'),
+        'can_use': bool(result.get('can_use')),
+        'is_admin': False
+    }
+
+
 class UsageService:
     """사용량 관리 서비스 클래스"""
 
@@ -39,10 +56,10 @@ class UsageService:
 
         # 관리자는 무제한
         if is_admin(user_id):
-            logger.debug(f"관리자 사용: {user_id[:8]}...")
+            logger.debug("관리자 사용: %.8s...", user_id)
             return True, ADMIN_USAGE
 
-        usage = get_usage(user_id)
+        usage = UsageService.get_metered(user_id) or get_usage(user_id)
         can_use = usage.get('can_use', False)
 
         if not can_use:
@@ -70,6 +87,86 @@ class UsageService:
         decrement_usage(user_id)
         return get_usage(user_id)
 
+    @staticmethod
+    def consume(user_id: str) -> tuple[bool, dict]:
+        """
+        사용 가능 여부 확인과 차감을 원자적으로 처리 (DB 호출 1회)
+
+        consume_usage RPC가 없으면 check_can_use + decrement로 대체합니다.
+
+        Args:
+            user_id: 사용자 ID
+
+        Returns:
+            tuple: (consumed: bool, usage: dict) - usage는 차감 후 사용량
+        """
+        if not is_supabase_enabled() or not user_id:
+            return True, ADMIN_USAGE
+
+        # 토큰/비용 한도: 오늘 누적량(예약 포함)이 한도 미만이면 예상 사용량을 예약하고 허용
+        # (호출 후 원장에 실제 사용량을 기록하면서 정산, 실패하면 refund에서 해제)
+        if metering.get_quota_mode() != 'count':
+            if is_admin(user_id):
+                return True, ADMIN_USAGE
+            reservation = UsageService.reserve_metered(user_id)
+            if reservation is not None:
+                consumed, usage = reservation
+            else:
+                usage = UsageService.get_metered(user_id)
+                consumed = usage is not None and usage['can_use']
+                if usage is not None:
+                    logger.warning("reserve_metered_usage RPC 사용 불가, 예약 없이 누적량으로 확인")
+            if usage is not None:
+                if not consumed:
+                    logger.info(f"사용량 소진: {user_id[:8]}...")
+                return consumed, usage
+            logger.warning("get_metered_usage RPC 사용 불가, 횟수 기준으로 차감")
+
+        result = consume_usage(user_id)
+        if result is None:
+            logger.warning("consume_usage RPC 사용 불가, 기존 방식으로 차감")
+            can_use, usage = UsageService.check_can_use(user_id)
+            if can_use and not usage.get('is_admin'):
+                usage = UsageService.decrement(user_id)
+            return can_use, usage
+
+        usage = _rpc_to_usage(result)
+        consumed = bool(result.get('consumed'))
+        if not consumed:
+            logger.info(f"사용량 소진: {user_id[:8]}...")
+        return consumed, usage
+
+    @staticmethod
+    def refund(user_id: str, usage: dict) -> dict:
+        """
+        consume으로 차감한 사용량 복구 (요청 실패 시)
+
+        Args:
+            user_id: 사용자 ID
+            usage: consume이 반환한 사용량
+
+        Returns:
+            dict: 복구 후 사용량 정보
+        """
+        if not is_supabase_enabled() or not user_id or usage.get('is_admin'):
+            return usage
+
+        # 토큰/비용 한도는 예약분만 해제 (예약 없이 확인한 경우 복구할 것이 없음)
+        if usage.get('quota_mode'):
+            if not usage.get('reservation_id'):
+                return usage
+            release_metered_usage(usage['reservation_id'])
+            return UsageService.get_metered(user_id) or usage
+
+        result = refund_usage(user_id)
+        if result is not None:
+            return _rpc_to_usage(result)
+
+        # RPC가 없으면 consume도 기존 방식(decrement_usage)으로 차감했으므로 같은 방식으로 복구
+        logger.warning("refund_usage RPC 사용 불가, 기존 방식으로 복구")
+        increment_usage(user_id)
+        return get_usage(user_id)
+
     @staticmethod
     def get_current(user_id: str) -> dict:
         """
@@ -87,7 +184,38 @@ class UsageService:
         if is_admin(user_id):
             return ADMIN_USAGE
 
-        return get_usage(user_id)
+        return UsageService.get_metered(user_id) or get_usage(user_id)
+
+    @staticmethod
+    def get_metered(user_id: str):
+        """토큰/비용 한도 모드의 사용량 (count 모드이거나 원장을 조회할 수 없으면 None)"""
+        mode = metering.get_quota_mode()
+        if mode == 'count':
+            return None
+        totals = get_metered_usage(user_id)
+        return metering.metered_to_usage(totals, mode) if totals is not None else None
+
+    @staticmethod
+    def reserve_metered(user_id: str):
+        """토큰/비용 한도 모드에서 예상 사용량 예약
+
+        Returns:
+            tuple: (reserved: bool, usage: dict) - 예약했으면 usage['reservation_id'] 포함,
+                   count 모드이거나 예약 RPC를 사용할 수 없으면 None
+        """
+        mode = metering.get_quota_mode()
+        if mode == 'count':
+            return None
+        reservation_id = str(uuid.uuid4())
+        amount, limit = metering.reservation_amount(mode)
+        totals = reserve_metered_usage(user_id, reservation_id, mode, amount, limit, config.USAGE_RESERVATION_TTL)
+        if totals is None:
+            return None
+        usage = metering.metered_to_usage(totals, mode)
+        reserved = bool(totals.get('reserved'))
+        if reserved:
+            usage['reservation_id'] = reservation_id
+        return reserved, usage
 
     @staticmethod
     def is_admin_user(user_id: str) -> bool:
@@ -46,7 +46,7 @@ class ContentAnalysis {
 
         // 히스토리/사용량 패널 매니저 (간단한 이벤트 에미터 사용)
         this.eventBus = this.createSimpleEventBus();
-        this.historyPanelManager = new HistoryPanelManager(this.storage, this.eventBus);
+        this.historyPanelManager = new HistoryPanelManager(this.storage, this.eventBus, this.authManager);
         this.usagePanelManager = new UsagePanelManager(this.storage, this.eventBus);
 
         // 패널 리사이즈 매니저
@@ -68,6 +68,9 @@ class ContentAnalysis {
         this.eventBus.on('history:view-item', (item) => {
             this.reportManager.displayHistoryItem(item);
         });
+        this.eventBus.on('history:delete-failed', () => {
+            this.ui.showAlert('히스토리 삭제에 실패했습니다. 잠시 후 다시 시도해주세요.', 'error');
+        });
 
         this.init();
     }
@@ -97,9 +100,15 @@ class ContentAnalysis {
         // 인증 초기화 (Supabase 활성화 여부 확인)
         await this.authManager.init();
 
+        // 로그인 상태에서 히스토리/스타일 변경을 bulk API로 클라우드에 반영
+        this.storage.attachCloud(this.authManager);
+
         // 인증 상태 변경 콜백 설정
         this.authManager.onAuthChange = (isLoggedIn, user) => {
             this.updateGenerateButtonState();
+            if (isLoggedIn) {
+                this.storage.syncCustomStylesToCloud();
+            }
         };
 
         await this.providerManager.loadProviders();
@@ -236,6 +245,19 @@ class ContentAnalysis {
 
         const remaining = usage.usage_count || 0;
         const max = usage.max_usage || 5;
+
+        // 토큰/비용 한도 모드: usage_count는 남은 비율(%)
+        if (usage.quota_mode && usage.quota_mode !== 'count') {
+            const colorClass = remaining === 0 ? 'text-red-400' : remaining <= 20 ? 'text-amber-500' : 'text-gray-text';
+            usageDisplay.innerHTML = `
+                <span class="${colorClass} flex items-center gap-1">
+                    <span class="material-symbols-outlined text-sm">bolt</span>
+                    ${remaining}%
+                </span>
+            `;
+            return;
+        }
+
         const colorClass = remaining === 0 ? 'text-red-400' : remaining <= 2 ? 'text-amber-500' : 'text-gray-text';
 
         usageDisplay.innerHTML = `
@@ -449,6 +471,7 @@ class ContentAnalysis {
             const customStyles = this.storage.getCustomStyles() || [];
             customStyles.push(customStyle);
             this.storage.saveCustomStyles(customStyles);
+            this.storage.queueStyleSync({ upsert: [customStyle] });
 
             // 커스텀 스타일 UI 갱신
             this.styleManager.renderCustomStyles();
@@ -16,6 +16,9 @@ export class ContentGenerator {
         this.originalContent = '';
         this.lastPrompt = '';
         this.onUsageUpdate = null; // 사용량 업데이트 콜백
+
+        // 프롬프트/자막은 응답에서 제외되고 필요할 때 조회
+        this.reportManager.setArtifactLoader?.((reportId, artifact) => this.fetchReportArtifact(reportId, artifact));
     }
 
     // 인증 헤더 가져오기
@@ -28,6 +31,20 @@ export class ContentGenerator {
         return headers;
     }
 
+    // 리포트 아티팩트(prompt, transcript) 지연 조회
+    async fetchReportArtifact(reportId, artifact) {
+        try {
+            const response = await fetch(`/api/reports/${encodeURIComponent(reportId)}/${artifact}`, {
+                headers: this._getAuthHeaders()
+            });
+            if (!response.ok) return null;
+            const data = await response.json();
+            return data.content || null;
+        } catch {
+            return null;
+        }
+    }
+
     // ==================== Main Generation ====================
 
     async handleGenerate() {
@@ -92,9 +109,10 @@ export class ContentGenerator {
                     html: data.html,
                     content: data.content,
                     prompt: data.prompt,
+                    reportId: data.id,
+                    artifacts: data.artifacts,
                     usage: data.usage,
-                    elapsed_time: data.elapsed_time,
-                    transcript: data.transcript
+                    elapsed_time: data.elapsed_time
                 });
 
                 // 사용량 업데이트 콜백 호출
@@ -149,6 +167,8 @@ export class ContentGenerator {
                 html: data.html,
                 content: data.content,
                 prompt: data.prompt,
+                reportId: data.id,
+                artifacts: data.artifacts,
                 usage: data.usage,
                 elapsed_time: data.elapsed_time
             });
@@ -188,7 +208,9 @@ export class ContentGenerator {
                         style,
                         html: result.html,
                         content: result.content,
-                        prompt: result.prompt
+                        prompt: result.prompt,
+                        reportId: result.id,
+                        artifacts: result.artifacts
                     });
                 } else {
                     this.reportManager.displayErrorCard({
@@ -1,11 +1,19 @@
 /**
  * HistoryPanelManager - 히스토리 패널 UI 관리
+ * 로그인 시 클라우드 히스토리는 요약 목록만 페이지 단위로 불러오고,
+ * 본문은 항목을 열 때 조회합니다.
  */
+const CLOUD_PAGE_SIZE = 20;
+
 export class HistoryPanelManager {
-    constructor(storageManager, eventBus) {
+    constructor(storageManager, eventBus, authManager = null) {
         this.storageManager = storageManager;
         this.eventBus = eventBus;
+        this.authManager = authManager;
         this.elements = {};
+        this.cloudItems = [];
+        this.nextCursor = null;
+        this.loadingCloud = false;
     }
 
     init() {
@@ -25,8 +33,19 @@ export class HistoryPanelManager {
     }
 
     bindEvents() {
-        // 히스토리 패널 열림 이벤트
-        window.addEventListener('panel:history-opened', () => this.render());
+        // 히스토리 패널 열림 이벤트 (로컬 목록 즉시 표시 후 클라우드 첫 페이지 조회)
+        window.addEventListener('panel:history-opened', () => {
+            this.render();
+            this.loadCloudPage(true);
+        });
+
+        // 목록 끝에 가까워지면 다음 페이지 조회
+        this.elements.list?.addEventListener('scroll', () => {
+            const list = this.elements.list;
+            if (list.scrollTop + list.clientHeight >= list.scrollHeight - 200) {
+                this.loadCloudPage();
+            }
+        });
 
         // 전체 삭제 버튼
         this.elements.clearAllBtn?.addEventListener('click', () => this.confirmClearAll());
@@ -35,8 +54,77 @@ export class HistoryPanelManager {
         this.eventBus?.on('history:updated', () => this.render());
     }
 
+    // ==================== Cloud History ====================
+
+    _isCloudEnabled() {
+        return Boolean(this.authManager?.isLoggedIn?.());
+    }
+
+    _authHeaders() {
+        const token = this.authManager?.getAccessToken();
+        return token ? { 'Authorization': `Bearer ${token}` } : {};
+    }
+
+    async loadCloudPage(reset = false) {
+        if (!this._isCloudEnabled()) {
+            // 로그아웃 후에는 이전 사용자의 클라우드 항목 제거
+            if (reset && this.cloudItems.length > 0) {
+                this.cloudItems = [];
+                this.nextCursor = null;
+                this.render();
+            }
+            return;
+        }
+        if (this.loadingCloud || (!reset && !this.nextCursor)) return;
+
+        this.loadingCloud = true;
+        try {
+            const params = new URLSearchParams({ limit: CLOUD_PAGE_SIZE });
+            if (!reset && this.nextCursor) params.set('cursor', this.nextCursor);
+
+            const response = await fetch(`/api/user/histories?${params}`, { headers: this._authHeaders() });
+            if (!response.ok) return;
+            const data = await response.json();
+
+            const items = (data.histories || []).map(item => ({ ...item, isCloud: true }));
+            this.cloudItems = reset ? items : this.cloudItems.concat(items);
+            this.nextCursor = data.nextCursor || null;
+            this.render();
+        } catch (e) {
+            console.warn('클라우드 히스토리 조회 실패:', e);
+        } finally {
+            this.loadingCloud = false;
+        }
+    }
+
+    async fetchCloudItem(id) {
+        try {
+            const response = await fetch(`/api/user/histories/${encodeURIComponent(id)}`, { headers: this._authHeaders() });
+            if (!response.ok) return null;
+            const data = await response.json();
+            return data.history || null;
+        } catch {
+            return null;
+        }
+    }
+
+    // 로컬 히스토리 + 로컬에 없는 클라우드 요약 항목 (최신순)
+    getMergedHistory() {
+        const local = this.storageManager.getHistory();
+        if (this.cloudItems.length === 0) return local;
+
+        const localIds = new Set();
+        local.forEach(item => {
+            localIds.add(item.id);
+            if (item.reportId) localIds.add(item.reportId);
+        });
+        const cloudOnly = this.cloudItems.filter(item => !localIds.has(item.id));
+        const toTime = item => new Date(item.createdAt || item.timestamp || 0).getTime() || 0;
+        return local.concat(cloudOnly).sort((a, b) => toTime(b) - toTime(a));
+    }
+
     render() {
-        const history = this.storageManager.getHistory();
+        const history = this.getMergedHistory();
         const list = this.elements.list;
         const emptyState = this.elements.emptyState;
         const footer = this.elements.footer;
@@ -143,9 +231,25 @@ export class HistoryPanelManager {
         return div.innerHTML;
     }
 
-    deleteItem(id) {
+    async deleteItem(id) {
         if (!confirm('이 항목을 삭제하시겠습니까?')) return;
+
+        const cloudItem = this.cloudItems.find(h => h.id === id);
+        const localHistory = this.storageManager.getHistory();
+
+        // 로컬 삭제 + 클라우드 삭제 요청 예약 (StorageManager가 bulk API로 전송)
         this.storageManager.removeFromHistory(id);
+
+        // 클라우드 항목은 서버가 삭제를 확인한 뒤에만 목록에서 제거하고, 실패하면 로컬 항목도 복구
+        if (cloudItem) {
+            if (!await this.storageManager.flushCloudSync()) {
+                this.storageManager.saveHistory(localHistory);
+                this.eventBus?.emit('history:delete-failed', id);
+                return;
+            }
+            this.cloudItems = this.cloudItems.filter(h => h.id !== id);
+        }
+
         this.render();
         this.eventBus?.emit('history:updated');
     }
@@ -157,11 +261,17 @@ export class HistoryPanelManager {
         this.eventBus?.emit('history:updated');
     }
 
-    viewItem(id) {
-        const history = this.storageManager.getHistory();
-        const item = history.find(h => h.id === id);
+    async viewItem(id) {
+        let item = this.getMergedHistory().find(h => h.id === id);
         if (!item) return;
 
+        // 클라우드 요약 항목은 본문을 열 때 조회
+        if (item.isCloud) {
+            const full = await this.fetchCloudItem(id);
+            if (!full) return;
+            item = full;
+        }
+
         // Dashboard로 전환
         window.switchPanelView('dashboard');
 
@@ -8,6 +8,7 @@ export class ReportManager {
         this.styleManager = styleManager;
         this.ui = uiManager;
         this.mindmapManager = null;
+        this.artifactLoader = null; // (reportId, artifact) => Promise<string|null>
 
         // DOM 요소 캐싱
         this.elements = {
@@ -21,6 +22,14 @@ export class ReportManager {
         this.mindmapManager = mindmapManager;
     }
 
+    setArtifactLoader(loader) {
+        this.artifactLoader = loader;
+    }
+
+    _hasArtifact(data, artifact) {
+        return Boolean(data.reportId && data.artifacts?.includes(artifact) && this.artifactLoader);
+    }
+
     // ==================== 헬퍼 메서드 ====================
 
     _formatShortUrl(url, maxLength = 40) {
@@ -188,6 +197,8 @@ export class ReportManager {
             html: data.html,
             content: data.content,
             prompt: data.prompt || null,
+            reportId: data.reportId || null,
+            artifacts: data.artifacts || [],
             time: this._getCurrentTimeStr(),
             timestamp: Date.now(),
             usage: data.usage || null,
@@ -420,7 +431,7 @@ export class ReportManager {
 
         // 프롬프트 보기 버튼 이벤트
         if (promptBtn) {
-            if (data.prompt) {
+            if (data.prompt || this._hasArtifact(data, 'prompt')) {
                 promptBtn.addEventListener('click', () => this._handlePromptClick(data));
             } else {
                 // 프롬프트가 없으면 버튼 비활성화
@@ -481,7 +492,7 @@ export class ReportManager {
         }
     }
 
-    _handlePromptClick(data) {
+    async _handlePromptClick(data) {
         const modal = document.getElementById('prompt-modal');
         const content = document.getElementById('prompt-content');
         const stats = document.getElementById('prompt-stats');
@@ -490,6 +501,15 @@ export class ReportManager {
 
         if (!modal || !content) return;
 
+        // 프롬프트는 응답에서 제외되므로 처음 열 때 서버에서 조회
+        if (!data.prompt && this._hasArtifact(data, 'prompt')) {
+            data.prompt = await this.artifactLoader(data.reportId, 'prompt');
+            if (!data.prompt) {
+                this.ui.showAlert('프롬프트를 불러오지 못했습니다.', 'error');
+                return;
+            }
+        }
+
         // 프롬프트 내용 표시
         content.textContent = data.prompt;
 
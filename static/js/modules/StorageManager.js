@@ -1,6 +1,7 @@
 /**
  * StorageManager - LocalStorage 관리 모듈
  * 히스토리, 커스텀 스타일 등의 저장/로드 담당
+ * 로그인 상태에서는 변경 사항을 모아 bulk API 한 번으로 클라우드에 반영합니다.
  * API 키는 서버 환경변수에서 관리됩니다.
  */
 export class StorageManager {
@@ -12,6 +13,12 @@ export class StorageManager {
         };
         this.maxHistoryItems = 50;
         this.maxCustomStyles = 5;
+
+        // 클라우드 동기화 (attachCloud 이후 로그인 상태에서만 사용)
+        this.authManager = null;
+        this.cloudSyncDelay = 300;
+        this.cloudSyncTimer = null;
+        this.pendingCloud = this._emptyCloudQueue();
     }
 
     // ==================== Settings ====================
@@ -102,6 +109,7 @@ export class StorageManager {
         } catch (e) {
             console.warn('히스토리 삭제 실패:', e);
         }
+        this._queueCloud('historyDeletes', reportId);
     }
 
     updateHistoryItem(reportId, updates) {
@@ -111,6 +119,9 @@ export class StorageManager {
             if (index >= 0) {
                 history[index] = { ...history[index], ...updates };
                 this.saveHistory(history);
+                if ('mindmapMarkdown' in updates) {
+                    this._queueCloud('mindmapUpdates', reportId, updates.mindmapMarkdown);
+                }
                 return true;
             }
             return false;
@@ -147,6 +158,7 @@ export class StorageManager {
         styleData.id = 'custom_' + Date.now();
         styles.push(styleData);
         this.saveCustomStyles(styles);
+        this._queueCloud('styleUpserts', styleData.id, styleData);
         return { success: true, id: styleData.id };
     }
 
@@ -156,6 +168,7 @@ export class StorageManager {
         if (index >= 0) {
             styles[index] = { ...styles[index], ...styleData };
             this.saveCustomStyles(styles);
+            this._queueCloud('styleUpserts', styleId, styles[index]);
             return true;
         }
         return false;
@@ -165,5 +178,112 @@ export class StorageManager {
         const styles = this.getCustomStyles();
         const filtered = styles.filter(s => s.id !== styleId);
         this.saveCustomStyles(filtered);
+        this._queueCloud('styleDeletes', styleId);
+    }
+
+    // ==================== Cloud Sync ====================
+    // 항목별 요청 대신 짧은 시간 동안의 변경을 모아 종류별 bulk 요청 한 번으로 보냅니다.
+
+    attachCloud(authManager) {
+        this.authManager = authManager;
+    }
+
+    _isCloudEnabled() {
+        return Boolean(this.authManager?.isLoggedIn?.());
+    }
+
+    _emptyCloudQueue() {
+        return {
+            styleUpserts: new Map(),
+            styleDeletes: new Set(),
+            historyDeletes: new Set(),
+            mindmapUpdates: new Map()
+        };
+    }
+
+    _queueCloud(kind, id, value) {
+        if (!this._isCloudEnabled()) return;
+
+        const pending = this.pendingCloud;
+        // 같은 스타일의 저장/삭제는 마지막 변경만 반영
+        if (kind === 'styleUpserts') pending.styleDeletes.delete(id);
+        if (kind === 'styleDeletes') pending.styleUpserts.delete(id);
+        if (kind === 'historyDeletes') pending.mindmapUpdates.delete(id);
+
+        const target = pending[kind];
+        if (target instanceof Map) {
+            target.set(id, value);
+        } else {
+            target.add(id);
+        }
+
+        clearTimeout(this.cloudSyncTimer);
+        this.cloudSyncTimer = setTimeout(() => this.flushCloudSync(), this.cloudSyncDelay);
+    }
+
+    async _postCloud(url, body) {
+        const token = this.authManager?.getAccessToken?.();
+        if (!token) return false;
+        try {
+            const response = await fetch(url, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json', 'Authorization': `Bearer ${token}` },
+                body: JSON.stringify(body)
+            });
+            return response.ok;
+        } catch (e) {
+            console.warn('클라우드 동기화 실패:', e);
+            return false;
+        }
+    }
+
+    /**
+     * 대기 중인 변경 사항을 즉시 전송
+     * @returns {Promise<boolean>} 모든 요청 성공 여부
+     */
+    async flushCloudSync() {
+        clearTimeout(this.cloudSyncTimer);
+        this.cloudSyncTimer = null;
+
+        const { styleUpserts, styleDeletes, historyDeletes, mindmapUpdates } = this.pendingCloud;
+        this.pendingCloud = this._emptyCloudQueue();
+        if (!this._isCloudEnabled()) return false;
+
+        const requests = [];
+        if (styleUpserts.size || styleDeletes.size) {
+            requests.push(this._postCloud('/api/user/styles/batch', {
+                upsert: [...styleUpserts.values()],
+                delete: [...styleDeletes]
+            }));
+        }
+        if (historyDeletes.size || mindmapUpdates.size) {
+            requests.push(this._postCloud('/api/user/histories/batch', {
+                delete: [...historyDeletes],
+                update: [...mindmapUpdates].map(([id, mindmapMarkdown]) => ({ id, mindmapMarkdown }))
+            }));
+        }
+
+        const results = await Promise.all(requests);
+        return results.every(Boolean);
+    }
+
+    /**
+     * 여러 스타일 변경을 한 번에 예약 (배열 단위로 저장하는 호출자용)
+     * @param {{upsert?: Array, remove?: Array<string>}} changes
+     */
+    queueStyleSync({ upsert = [], remove = [] } = {}) {
+        upsert.forEach(style => this._queueCloud('styleUpserts', style.id, style));
+        remove.forEach(id => this._queueCloud('styleDeletes', id));
+    }
+
+    /**
+     * 로컬 커스텀 스타일 전체를 한 번의 요청으로 클라우드에 저장 (로그인 직후 기기 동기화)
+     * @returns {Promise<boolean>}
+     */
+    async syncCustomStylesToCloud() {
+        for (const style of this.getCustomStyles()) {
+            this._queueCloud('styleUpserts', style.id, style);
+        }
+        return this.flushCloudSync();
     }
 }
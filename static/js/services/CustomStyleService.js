@@ -2,6 +2,7 @@
  * CustomStyleService - 커스텀 스타일 관리 서비스
  * StyleManager ↔ ModalManager 순환 의존 해결
  * EventBus를 통해 모듈 간 통신
+ * 클라우드 반영은 StorageManager가 모아서 bulk API 한 번으로 전송
  */
 import { EVENTS } from '../core/EventBus.js';
 
@@ -54,7 +55,8 @@ export class CustomStyleService {
         };
 
         styles.push(newStyle);
-        this.storage.setCustomStyles(styles);
+        this.storage.saveCustomStyles(styles);
+        this.storage.queueStyleSync({ upsert: [newStyle] });
 
         // 이벤트 발행
         this.eventBus.emit(EVENTS.STYLE_CUSTOM_ADD, newStyle);
@@ -82,7 +84,8 @@ export class CustomStyleService {
         };
 
         styles[index] = updatedStyle;
-        this.storage.setCustomStyles(styles);
+        this.storage.saveCustomStyles(styles);
+        this.storage.queueStyleSync({ upsert: [updatedStyle] });
 
         // 이벤트 발행
         this.eventBus.emit(EVENTS.STYLE_CUSTOM_UPDATE, updatedStyle);
@@ -104,7 +107,8 @@ export class CustomStyleService {
         }
 
         styles.splice(index, 1);
-        this.storage.setCustomStyles(styles);
+        this.storage.saveCustomStyles(styles);
+        this.storage.queueStyleSync({ remove: [id] });
 
         // 이벤트 발행
         this.eventBus.emit(EVENTS.STYLE_CUSTOM_DELETE, { id });
@@ -112,6 +116,55 @@ export class CustomStyleService {
         return true;
     }
 
+    /**
+     * 여러 커스텀 스타일 삭제 (클라우드에는 요청 한 번)
+     * @param {Array<string>} ids - 스타일 ID 목록
+     * @returns {number} 삭제된 개수
+     */
+    deleteMany(ids) {
+        const idSet = new Set(ids);
+        const styles = this.getAll();
+        const removed = styles.filter(s => idSet.has(s.id)).map(s => s.id);
+
+        if (removed.length === 0) {
+            return 0;
+        }
+
+        this.storage.saveCustomStyles(styles.filter(s => !idSet.has(s.id)));
+        this.storage.queueStyleSync({ remove: removed });
+        removed.forEach(id => this.eventBus.emit(EVENTS.STYLE_CUSTOM_DELETE, { id }));
+
+        return removed.length;
+    }
+
+    /**
+     * 여러 커스텀 스타일 저장/교체 (다른 기기에서 가져온 스타일 등, 클라우드에는 요청 한 번)
+     * @param {Array<Object>} incoming - [{ id, name, icon?, prompt }]
+     * @returns {Array<Object>} 저장된 스타일 (최대 개수 초과분 제외)
+     */
+    upsertMany(incoming) {
+        const styles = this.getAll();
+        const saved = [];
+
+        for (const style of incoming) {
+            const index = styles.findIndex(s => s.id === style.id);
+            if (index >= 0) {
+                styles[index] = { ...styles[index], ...style };
+                saved.push(styles[index]);
+            } else if (styles.length < this.maxStyles) {
+                const newStyle = { icon: 'edit_note', ...style };
+                styles.push(newStyle);
+                saved.push(newStyle);
+            }
+        }
+
+        this.storage.saveCustomStyles(styles);
+        this.storage.queueStyleSync({ upsert: saved });
+        saved.forEach(style => this.eventBus.emit(EVENTS.STYLE_CUSTOM_UPDATE, style));
+
+        return saved;
+    }
+
     /**
      * 커스텀 스타일인지 확인
      * @param {string} id - 스타일 ID
@@ -0,0 +1,114 @@
+-- =============================================
+-- 사용량 원자적 차감 함수 (consume_usage / refund_usage)
+-- =============================================
+-- Supabase Dashboard > SQL Editor에서 실행하세요
+-- 관리자 확인, 날짜 변경 시 리셋, 차감을 한 번의 호출(단일 UPDATE)로 처리하여
+-- 동시 요청에서도 사용 횟수가 중복 차감/초과 사용되지 않도록 합니다.
+-- 호출자가 사용자 ID와 횟수를 넘기므로 service_role만 실행할 수 있습니다 (서버에 SUPABASE_SERVICE_ROLE_KEY 필요,
+-- 없으면 서버는 기존 방식으로 차감합니다).
+
+-- ON CONFLICT (user_id)에 필요 (사용자당 사용량 레코드는 하나)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ie_usage_user_id_unique ON ie_usage(user_id);
+
+-- 사용량 1회(p_amount) 차감
+-- 반환: {consumed, is_admin, usage_count, max_usage, can_use}
+CREATE OR REPLACE FUNCTION consume_usage(
+    p_user_id UUID,
+    p_max_usage INT DEFAULT 5,
+    p_amount INT DEFAULT 1
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_row ie_usage%ROWTYPE;
+BEGIN
+    IF p_amount IS NULL OR p_amount < 1 THEN
+        RAISE EXCEPTION 'invalid usage amount: %', p_amount;
+    END IF;
+
+    -- 관리자는 무제한 (차감 없음)
+    IF EXISTS (SELECT 1 FROM ie_admins WHERE user_id = p_user_id) THEN
+        RETURN jsonb_build_object(
+            'consumed', TRUE, 'is_admin', TRUE,
+            'usage_count', 999, 'max_usage', 999, 'can_use', TRUE
+        );
+    END IF;
+
+    -- 새 사용자: 레코드 생성
+    INSERT INTO ie_usage (user_id, usage_count, max_usage, last_reset_date)
+    VALUES (p_user_id, p_max_usage, p_max_usage, CURRENT_DATE)
+    ON CONFLICT (user_id) DO NOTHING;
+
+    -- 날짜가 바뀌었으면 리셋 후 차감, 남은 횟수가 부족하면 갱신하지 않음 (행 잠금으로 직렬화)
+    UPDATE ie_usage
+    SET usage_count = (CASE WHEN last_reset_date IS DISTINCT FROM CURRENT_DATE
+                            THEN p_max_usage ELSE usage_count END) - p_amount,
+        last_reset_date = CURRENT_DATE,
+        updated_at = NOW()
+    WHERE user_id = p_user_id
+      AND (CASE WHEN last_reset_date IS DISTINCT FROM CURRENT_DATE
+                THEN p_max_usage ELSE usage_count END) >= p_amount
+    RETURNING * INTO v_row;
+
+    IF FOUND THEN
+        RETURN jsonb_build_object(
+            'consumed', TRUE, 'is_admin', FALSE,
+            'usage_count', v_row.usage_count,
+            'max_usage', COALESCE(v_row.max_usage, p_max_usage),
+            'can_use', v_row.usage_count > 0
+        );
+    END IF;
+
+    -- 사용량 소진
+    SELECT * INTO v_row FROM ie_usage WHERE user_id = p_user_id;
+    RETURN jsonb_build_object(
+        'consumed', FALSE, 'is_admin', FALSE,
+        'usage_count', COALESCE(v_row.usage_count, 0),
+        'max_usage', COALESCE(v_row.max_usage, p_max_usage),
+        'can_use', FALSE
+    );
+END;
+$$;
+
+-- 요청 실패 시 차감분 복구 (같은 날짜에 차감된 경우만, 저장된 max_usage 초과 없음)
+CREATE OR REPLACE FUNCTION refund_usage(
+    p_user_id UUID,
+    p_max_usage INT DEFAULT 5,
+    p_amount INT DEFAULT 1
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_row ie_usage%ROWTYPE;
+BEGIN
+    IF p_amount IS NULL OR p_amount < 1 THEN
+        RAISE EXCEPTION 'invalid usage amount: %', p_amount;
+    END IF;
+
+    UPDATE ie_usage
+    SET usage_count = LEAST(usage_count + p_amount, COALESCE(max_usage, p_max_usage)),
+        updated_at = NOW()
+    WHERE user_id = p_user_id
+      AND last_reset_date = CURRENT_DATE
+    RETURNING * INTO v_row;
+
+    IF NOT FOUND THEN
+        SELECT * INTO v_row FROM ie_usage WHERE user_id = p_user_id;
+    END IF;
+
+    RETURN jsonb_build_object(
+        'consumed', FALSE, 'is_admin', FALSE,
+        'usage_count', COALESCE(v_row.usage_count, 0),
+        'max_usage', COALESCE(v_row.max_usage, p_max_usage),
+        'can_use', COALESCE(v_row.usage_count, 0) > 0
+    );
+END;
+$$;
+
+-- 권한: 서버(service_role 키)만 실행
+REVOKE EXECUTE ON FUNCTION consume_usage(UUID, INT, INT) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION refund_usage(UUID, INT, INT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION consume_usage(UUID, INT, INT) TO service_role;
+GRANT EXECUTE ON FUNCTION refund_usage(UUID, INT, INT) TO service_role;
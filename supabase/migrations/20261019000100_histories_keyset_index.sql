@@ -0,0 +1,14 @@
+-- =============================================
+-- 히스토리 목록 keyset 페이지네이션 인덱스
+-- =============================================
+-- Supabase Dashboard > SQL Editor에서 실행하세요
+-- /api/user/histories는 (created_at, report_id) 내림차순으로 요약 컬럼만 조회합니다.
+-- 커서 조건과 정렬을 인덱스 하나로 처리하고, 요약 컬럼은 INCLUDE로 힙 접근 없이 반환합니다.
+
+CREATE INDEX IF NOT EXISTS idx_ie_histories_user_keyset
+    ON ie_histories (user_id, created_at DESC, report_id DESC)
+    INCLUDE (url, title, style);
+
+-- report_id로 전체 본문 조회
+CREATE INDEX IF NOT EXISTS idx_ie_histories_user_report
+    ON ie_histories (user_id, report_id);
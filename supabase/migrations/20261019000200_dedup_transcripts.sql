@@ -0,0 +1,79 @@
+-- =============================================
+-- 자막 중복 제거 저장소 (콘텐츠 주소 지정)
+-- =============================================
+-- Supabase Dashboard > SQL Editor에서 실행하세요
+-- 같은 영상의 같은 자막은 ie_transcripts에 한 번만 저장하고,
+-- ie_histories는 (transcript_video_id, transcript_hash)로 참조합니다.
+-- 기존 ie_histories.transcript 컬럼은 이전 행 호환을 위해 유지합니다 (신규 행은 NULL).
+-- 자막 행은 여러 사용자가 공유하므로 추가는 서버(service_role 키)만 할 수 있습니다.
+
+-- 1. 자막 테이블 (video_id + SHA-256 해시)
+CREATE TABLE IF NOT EXISTS ie_transcripts (
+    video_id TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    transcript TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (video_id, content_hash)
+);
+
+-- 2. 히스토리 참조 컬럼
+ALTER TABLE ie_histories ADD COLUMN IF NOT EXISTS transcript_video_id TEXT;
+ALTER TABLE ie_histories ADD COLUMN IF NOT EXISTS transcript_hash TEXT;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'ie_histories_transcript_fkey'
+    ) THEN
+        ALTER TABLE ie_histories
+            ADD CONSTRAINT ie_histories_transcript_fkey
+            FOREIGN KEY (transcript_video_id, transcript_hash)
+            REFERENCES ie_transcripts (video_id, content_hash);
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_ie_histories_transcript_ref
+    ON ie_histories (transcript_video_id, transcript_hash);
+
+-- 3. 기존 행 이전: URL에서 video_id 추출, 해시는 애플리케이션과 동일하게 UTF-8 SHA-256 hex
+CREATE OR REPLACE FUNCTION pg_temp.ie_video_id(p_url TEXT) RETURNS TEXT AS $$
+    SELECT COALESCE(
+        substring(p_url FROM '(?:v=|youtu\.be/|shorts/|embed/|live/)([A-Za-z0-9_-]{11})'),
+        'unknown'
+    );
+$$ LANGUAGE sql IMMUTABLE;
+
+INSERT INTO ie_transcripts (video_id, content_hash, transcript)
+SELECT video_id, content_hash, MIN(transcript)
+FROM (
+    SELECT
+        pg_temp.ie_video_id(url) AS video_id,
+        encode(sha256(convert_to(transcript, 'UTF8')), 'hex') AS content_hash,
+        transcript
+    FROM ie_histories
+    WHERE transcript IS NOT NULL AND transcript_hash IS NULL
+) src
+GROUP BY video_id, content_hash
+ON CONFLICT (video_id, content_hash) DO NOTHING;
+
+UPDATE ie_histories
+SET transcript_video_id = pg_temp.ie_video_id(url),
+    transcript_hash = encode(sha256(convert_to(transcript, 'UTF8')), 'hex'),
+    transcript = NULL
+WHERE transcript IS NOT NULL AND transcript_hash IS NULL;
+
+-- 4. 해시는 항상 자막 내용과 일치 (다른 내용으로 같은 키를 선점하지 못하도록)
+ALTER TABLE ie_transcripts DROP CONSTRAINT IF EXISTS ie_transcripts_hash_matches;
+ALTER TABLE ie_transcripts ADD CONSTRAINT ie_transcripts_hash_matches
+    CHECK (content_hash = encode(sha256(convert_to(transcript, 'UTF8')), 'hex'));
+
+-- 5. RLS: 자막은 공개 영상 데이터이므로 읽기만 허용, 추가는 service_role만 (RLS 우회, 수정/삭제 불가)
+ALTER TABLE ie_transcripts ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Transcripts are readable" ON ie_transcripts;
+CREATE POLICY "Transcripts are readable"
+    ON ie_transcripts FOR SELECT
+    USING (TRUE);
+
+DROP POLICY IF EXISTS "Transcripts are insertable" ON ie_transcripts;
+REVOKE INSERT, UPDATE, DELETE ON ie_transcripts FROM anon, authenticated;
@@ -0,0 +1,131 @@
+-- =============================================
+-- 관리자 통계 롤업 (ie_admin_stats / ie_usage_daily)
+-- =============================================
+-- Supabase Dashboard > SQL Editor에서 실행하세요
+-- 관리자 대시보드가 요청마다 ie_usage / ie_histories 전체를 세지 않도록
+-- 주기적으로 갱신되는 롤업 테이블에서 통계를 읽습니다.
+--   ie_admin_stats : 사용자 수 요약 (단일 행, ie_usage 한 번 스캔으로 계산)
+--   ie_usage_daily : 일자 x 스타일 x 모델별 생성 수/사용자 수/토큰 사용량
+-- 모델은 ie_histories.usage->>'model'에서 읽습니다.
+-- 롤업 함수/테이블은 service_role만 사용할 수 있으므로 서버에 SUPABASE_SERVICE_ROLE_KEY가 필요합니다
+-- (없으면 관리자 통계는 ie_usage를 직접 셉니다).
+
+-- 1. 롤업 테이블
+CREATE TABLE IF NOT EXISTS ie_admin_stats (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    total_users BIGINT NOT NULL DEFAULT 0,
+    active_today BIGINT NOT NULL DEFAULT 0,
+    exhausted_users BIGINT NOT NULL DEFAULT 0,
+    max_usage INT NOT NULL DEFAULT 5,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS ie_usage_daily (
+    bucket_date DATE NOT NULL,
+    style TEXT NOT NULL,
+    model TEXT NOT NULL,
+    generations BIGINT NOT NULL DEFAULT 0,
+    active_users BIGINT NOT NULL DEFAULT 0,
+    prompt_tokens BIGINT NOT NULL DEFAULT 0,
+    completion_tokens BIGINT NOT NULL DEFAULT 0,
+    total_tokens BIGINT NOT NULL DEFAULT 0,
+    avg_elapsed_time DOUBLE PRECISION,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (bucket_date, style, model)
+);
+
+-- 2. 인덱스
+-- 최근 구간만 다시 집계
+CREATE INDEX IF NOT EXISTS idx_ie_histories_created_at ON ie_histories (created_at);
+-- 관리자 사용자 목록: (usage_count, user_id) keyset 페이지네이션
+CREATE INDEX IF NOT EXISTS idx_ie_usage_count_user ON ie_usage (usage_count, user_id);
+-- 오늘 활성 사용자 필터
+CREATE INDEX IF NOT EXISTS idx_ie_usage_reset_date ON ie_usage (last_reset_date, usage_count);
+
+-- 3. 갱신 함수
+-- 최근 p_days일(1~3660일) 버킷을 다시 집계하고 사용자 요약을 갱신합니다. 반환: ie_admin_stats 행 (id 제외)
+-- 다른 갱신이 진행 중이면 기다리지 않고 현재 요약을 그대로 반환합니다.
+CREATE OR REPLACE FUNCTION refresh_admin_stats(
+    p_max_usage INT DEFAULT 5,
+    p_days INT DEFAULT 2
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_since DATE := CURRENT_DATE - LEAST(GREATEST(COALESCE(p_days, 1), 1), 3660) + 1;
+    v_stats ie_admin_stats%ROWTYPE;
+BEGIN
+    IF NOT pg_try_advisory_xact_lock(hashtext('refresh_admin_stats')) THEN
+        SELECT * INTO v_stats FROM ie_admin_stats WHERE id;
+        RETURN to_jsonb(v_stats) - 'id';
+    END IF;
+
+    DELETE FROM ie_usage_daily WHERE bucket_date >= v_since;
+
+    INSERT INTO ie_usage_daily (
+        bucket_date, style, model, generations, active_users,
+        prompt_tokens, completion_tokens, total_tokens, avg_elapsed_time, refreshed_at
+    )
+    SELECT
+        (created_at AT TIME ZONE 'UTC')::DATE,
+        COALESCE(style, 'unknown'),
+        COALESCE(NULLIF(usage->>'model', ''), 'unknown'),
+        COUNT(*),
+        COUNT(DISTINCT user_id),
+        COALESCE(SUM((usage->>'prompt_tokens')::NUMERIC), 0)::BIGINT,
+        COALESCE(SUM((usage->>'completion_tokens')::NUMERIC), 0)::BIGINT,
+        COALESCE(SUM((usage->>'total_tokens')::NUMERIC), 0)::BIGINT,
+        AVG(elapsed_time),
+        NOW()
+    FROM ie_histories
+    WHERE created_at >= (v_since::TIMESTAMP AT TIME ZONE 'UTC')
+    GROUP BY 1, 2, 3;
+
+    INSERT INTO ie_admin_stats (id, total_users, active_today, exhausted_users, max_usage, refreshed_at)
+    SELECT
+        TRUE,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE last_reset_date = CURRENT_DATE AND usage_count < p_max_usage),
+        COUNT(*) FILTER (WHERE usage_count = 0),
+        p_max_usage,
+        NOW()
+    FROM ie_usage
+    ON CONFLICT (id) DO UPDATE SET
+        total_users = EXCLUDED.total_users,
+        active_today = EXCLUDED.active_today,
+        exhausted_users = EXCLUDED.exhausted_users,
+        max_usage = EXCLUDED.max_usage,
+        refreshed_at = EXCLUDED.refreshed_at
+    RETURNING * INTO v_stats;
+
+    RETURN to_jsonb(v_stats) - 'id';
+END;
+$$;
+
+-- 4. 권한: 서버(service_role 키)만 갱신/조회
+-- SECURITY DEFINER 함수와 롤업 테이블은 공개 anon 키로 호출/조회할 수 없게 합니다.
+-- 정책이 없는 RLS 테이블은 anon/authenticated에게 보이지 않고 service_role은 RLS를 우회합니다.
+REVOKE EXECUTE ON FUNCTION refresh_admin_stats(INT, INT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION refresh_admin_stats(INT, INT) TO service_role;
+
+ALTER TABLE ie_admin_stats ENABLE ROW LEVEL SECURITY;
+ALTER TABLE ie_usage_daily ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Admin stats are readable" ON ie_admin_stats;
+DROP POLICY IF EXISTS "Usage rollup is readable" ON ie_usage_daily;
+
+-- 5. 기존 히스토리 전체 백필
+SELECT refresh_admin_stats(5, 3650);
+
+-- 6. pg_cron이 설치되어 있으면 5분마다 갱신
+--    (없으면 서버가 통계 조회 시 ADMIN_STATS_MAX_AGE보다 오래된 롤업을 갱신합니다)
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule('ie-refresh-admin-stats', '*/5 * * * *', 'SELECT refresh_admin_stats()');
+    END IF;
+END;
+$$;
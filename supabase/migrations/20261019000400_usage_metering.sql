@@ -0,0 +1,259 @@
+-- =============================================
+-- 토큰/비용 사용량 원장 (ie_usage_events / ie_usage_ledger)
+-- =============================================
+-- Supabase Dashboard > SQL Editor에서 실행하세요
+-- LLM 호출마다 prompt/completion 토큰과 추정 비용을 사용자·모델·스타일별로 기록합니다.
+--   ie_usage_events : 호출 단위 기록 (event_id로 재전송 중복 방지)
+--   ie_usage_ledger : 사용자 x 일자 x 모델 x 스타일 누적 (한도 확인과 조회는 이 테이블만 읽음)
+--   ie_usage_reservations : 토큰/비용 한도 모드에서 호출 전에 예약한 예상 사용량 (기록 시 정산, 실패 시 해제)
+-- 기록은 record_usage_events()로만 하며, 이벤트 insert와 원장 누적, 예약 정산을 한 트랜잭션에서 처리합니다.
+-- 함수는 service_role만 실행할 수 있으므로 서버에 SUPABASE_SERVICE_ROLE_KEY가 필요합니다.
+
+-- 1. 테이블
+CREATE TABLE IF NOT EXISTS ie_usage_events (
+    id BIGSERIAL PRIMARY KEY,
+    event_id UUID NOT NULL UNIQUE,
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    model TEXT NOT NULL,
+    style TEXT NOT NULL,
+    kind TEXT NOT NULL DEFAULT 'generate',
+    prompt_tokens INT NOT NULL DEFAULT 0,
+    completion_tokens INT NOT NULL DEFAULT 0,
+    total_tokens INT NOT NULL DEFAULT 0,
+    cost_usd NUMERIC(12, 6) NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_ie_usage_events_user_created
+    ON ie_usage_events (user_id, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS ie_usage_ledger (
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    bucket_date DATE NOT NULL,
+    model TEXT NOT NULL,
+    style TEXT NOT NULL,
+    calls BIGINT NOT NULL DEFAULT 0,
+    prompt_tokens BIGINT NOT NULL DEFAULT 0,
+    completion_tokens BIGINT NOT NULL DEFAULT 0,
+    total_tokens BIGINT NOT NULL DEFAULT 0,
+    cost_usd NUMERIC(14, 6) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, bucket_date, model, style)
+);
+
+-- 기간별 조회 (관리자)
+CREATE INDEX IF NOT EXISTS idx_ie_usage_ledger_bucket ON ie_usage_ledger (bucket_date);
+
+-- 토큰/비용은 음수일 수 없음 (음수 이벤트로 원장을 줄여 한도를 우회하지 못하도록)
+ALTER TABLE ie_usage_events DROP CONSTRAINT IF EXISTS ie_usage_events_nonnegative;
+ALTER TABLE ie_usage_events ADD CONSTRAINT ie_usage_events_nonnegative
+    CHECK (prompt_tokens >= 0 AND completion_tokens >= 0 AND total_tokens >= 0 AND cost_usd >= 0);
+ALTER TABLE ie_usage_ledger DROP CONSTRAINT IF EXISTS ie_usage_ledger_nonnegative;
+ALTER TABLE ie_usage_ledger ADD CONSTRAINT ie_usage_ledger_nonnegative
+    CHECK (calls >= 0 AND prompt_tokens >= 0 AND completion_tokens >= 0 AND total_tokens >= 0 AND cost_usd >= 0);
+
+CREATE TABLE IF NOT EXISTS ie_usage_reservations (
+    reservation_id UUID PRIMARY KEY,
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    total_tokens BIGINT NOT NULL DEFAULT 0 CHECK (total_tokens >= 0),
+    cost_usd NUMERIC(12, 6) NOT NULL DEFAULT 0 CHECK (cost_usd >= 0),
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_ie_usage_reservations_user
+    ON ie_usage_reservations (user_id, expires_at);
+
+-- 2. 기록: 이벤트 배열(JSONB)을 insert하고 새로 들어간 이벤트만 원장에 누적, 이벤트의 reservation_id 예약은 정산
+-- 토큰/비용이 음수인 이벤트는 기록하지 않습니다.
+CREATE OR REPLACE FUNCTION record_usage_events(p_events JSONB)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    WITH inserted AS (
+        INSERT INTO ie_usage_events (
+            event_id, user_id, model, style, kind,
+            prompt_tokens, completion_tokens, total_tokens, cost_usd, created_at
+        )
+        SELECT
+            e.event_id, e.user_id, e.model, COALESCE(e.style, 'unknown'), COALESCE(e.kind, 'generate'),
+            COALESCE(e.prompt_tokens, 0), COALESCE(e.completion_tokens, 0),
+            COALESCE(e.total_tokens, 0), COALESCE(e.cost_usd, 0), COALESCE(e.created_at, NOW())
+        FROM jsonb_to_recordset(p_events) AS e(
+            event_id UUID, user_id UUID, model TEXT, style TEXT, kind TEXT,
+            prompt_tokens INT, completion_tokens INT, total_tokens INT,
+            cost_usd NUMERIC, created_at TIMESTAMPTZ
+        )
+        WHERE e.event_id IS NOT NULL
+          AND COALESCE(e.prompt_tokens, 0) >= 0 AND COALESCE(e.completion_tokens, 0) >= 0
+          AND COALESCE(e.total_tokens, 0) >= 0 AND COALESCE(e.cost_usd, 0) >= 0
+        ON CONFLICT (event_id) DO NOTHING
+        RETURNING *
+    )
+    INSERT INTO ie_usage_ledger AS l (
+        user_id, bucket_date, model, style,
+        calls, prompt_tokens, completion_tokens, total_tokens, cost_usd, updated_at
+    )
+    SELECT
+        user_id, (created_at AT TIME ZONE 'UTC')::DATE, model, style,
+        COUNT(*), SUM(prompt_tokens), SUM(completion_tokens), SUM(total_tokens), SUM(cost_usd), NOW()
+    FROM inserted
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT (user_id, bucket_date, model, style) DO UPDATE SET
+        calls = l.calls + EXCLUDED.calls,
+        prompt_tokens = l.prompt_tokens + EXCLUDED.prompt_tokens,
+        completion_tokens = l.completion_tokens + EXCLUDED.completion_tokens,
+        total_tokens = l.total_tokens + EXCLUDED.total_tokens,
+        cost_usd = l.cost_usd + EXCLUDED.cost_usd,
+        updated_at = NOW();
+
+    DELETE FROM ie_usage_reservations
+    WHERE reservation_id IN (
+        SELECT r.reservation_id FROM jsonb_to_recordset(p_events) AS r(reservation_id UUID)
+    );
+END;
+$$;
+
+-- 3. 오늘(UTC) 누적 사용량 + 아직 정산되지 않은 예약 (토큰/비용 한도 확인용, 원장 PK 앞부분으로 조회)
+-- 반환: {calls, prompt_tokens, completion_tokens, total_tokens, cost_usd, reserved_tokens, reserved_cost_usd}
+--       (total_tokens, cost_usd는 예약분 포함)
+CREATE OR REPLACE FUNCTION get_metered_usage(p_user_id UUID)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    WITH ledger AS (
+        SELECT
+            COALESCE(SUM(calls), 0) AS calls,
+            COALESCE(SUM(prompt_tokens), 0) AS prompt_tokens,
+            COALESCE(SUM(completion_tokens), 0) AS completion_tokens,
+            COALESCE(SUM(total_tokens), 0) AS total_tokens,
+            COALESCE(SUM(cost_usd), 0) AS cost_usd
+        FROM ie_usage_ledger
+        WHERE user_id = p_user_id
+          AND bucket_date = (NOW() AT TIME ZONE 'UTC')::DATE
+    ), pending AS (
+        SELECT
+            COALESCE(SUM(total_tokens), 0) AS total_tokens,
+            COALESCE(SUM(cost_usd), 0) AS cost_usd
+        FROM ie_usage_reservations
+        WHERE user_id = p_user_id
+          AND expires_at > NOW()
+    )
+    SELECT jsonb_build_object(
+        'calls', l.calls,
+        'prompt_tokens', l.prompt_tokens,
+        'completion_tokens', l.completion_tokens,
+        'total_tokens', l.total_tokens + p.total_tokens,
+        'cost_usd', l.cost_usd + p.cost_usd,
+        'reserved_tokens', p.total_tokens,
+        'reserved_cost_usd', p.cost_usd
+    )
+    FROM ledger l, pending p;
+$$;
+
+-- 오늘 사용량(예약 포함)이 p_limit 미만이면 p_amount만큼 예약 (p_mode: tokens | cost)
+-- 같은 사용자의 동시 요청은 advisory lock으로 직렬화되어 모두 한도 확인을 통과하지 못합니다.
+-- 예약은 record_usage_events가 실제 사용량으로 정산하거나 release_metered_usage로 해제하며,
+-- 어느 쪽도 호출되지 않으면 p_ttl_seconds(60~3600초) 후 만료됩니다.
+-- 반환: get_metered_usage 결과 + {reserved}
+CREATE OR REPLACE FUNCTION reserve_metered_usage(
+    p_user_id UUID,
+    p_reservation_id UUID,
+    p_mode TEXT,
+    p_amount NUMERIC,
+    p_limit NUMERIC,
+    p_ttl_seconds INT DEFAULT 900
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_totals JSONB;
+    v_reserved BOOLEAN := FALSE;
+BEGIN
+    IF p_mode NOT IN ('tokens', 'cost') OR p_amount IS NULL OR p_amount < 0 THEN
+        RAISE EXCEPTION 'invalid reservation: mode=%, amount=%', p_mode, p_amount;
+    END IF;
+
+    PERFORM pg_advisory_xact_lock(hashtext('ie_usage_reservations:' || p_user_id::TEXT));
+    DELETE FROM ie_usage_reservations WHERE user_id = p_user_id AND expires_at <= NOW();
+
+    v_totals := get_metered_usage(p_user_id);
+    IF (v_totals->>(CASE WHEN p_mode = 'tokens' THEN 'total_tokens' ELSE 'cost_usd' END))::NUMERIC < p_limit THEN
+        INSERT INTO ie_usage_reservations (reservation_id, user_id, total_tokens, cost_usd, expires_at)
+        VALUES (
+            p_reservation_id,
+            p_user_id,
+            CASE WHEN p_mode = 'tokens' THEN CEIL(p_amount) ELSE 0 END,
+            CASE WHEN p_mode = 'cost' THEN p_amount ELSE 0 END,
+            NOW() + make_interval(secs => LEAST(GREATEST(COALESCE(p_ttl_seconds, 900), 60), 3600))
+        )
+        ON CONFLICT (reservation_id) DO NOTHING;
+        v_reserved := TRUE;
+        v_totals := get_metered_usage(p_user_id);
+    END IF;
+
+    RETURN v_totals || jsonb_build_object('reserved', v_reserved);
+END;
+$$;
+
+-- 요청 실패 시 예약 해제
+CREATE OR REPLACE FUNCTION release_metered_usage(p_reservation_id UUID)
+RETURNS VOID
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    DELETE FROM ie_usage_reservations WHERE reservation_id = p_reservation_id;
+$$;
+
+-- 4. 원장 조회 (관리자용, p_user_id가 NULL이면 전체)
+CREATE OR REPLACE FUNCTION get_usage_ledger(p_since DATE, p_user_id UUID DEFAULT NULL)
+RETURNS SETOF ie_usage_ledger
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    SELECT *
+    FROM ie_usage_ledger
+    WHERE bucket_date >= p_since
+      AND (p_user_id IS NULL OR user_id = p_user_id)
+    ORDER BY bucket_date DESC, cost_usd DESC
+    LIMIT 1000;
+$$;
+
+-- 5. 권한: 함수는 서버(service_role 키)만 실행
+-- SECURITY DEFINER 함수는 RLS를 우회하므로 공개 anon 키로 호출할 수 없게 합니다.
+REVOKE EXECUTE ON FUNCTION record_usage_events(JSONB) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION get_metered_usage(UUID) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION reserve_metered_usage(UUID, UUID, TEXT, NUMERIC, NUMERIC, INT) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION release_metered_usage(UUID) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION get_usage_ledger(DATE, UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION record_usage_events(JSONB) TO service_role;
+GRANT EXECUTE ON FUNCTION get_metered_usage(UUID) TO service_role;
+GRANT EXECUTE ON FUNCTION reserve_metered_usage(UUID, UUID, TEXT, NUMERIC, NUMERIC, INT) TO service_role;
+GRANT EXECUTE ON FUNCTION release_metered_usage(UUID) TO service_role;
+GRANT EXECUTE ON FUNCTION get_usage_ledger(DATE, UUID) TO service_role;
+
+-- 6. RLS: 본인 원장만 조회, 쓰기는 record_usage_events로만, 예약은 서버 전용
+ALTER TABLE ie_usage_events ENABLE ROW LEVEL SECURITY;
+ALTER TABLE ie_usage_ledger ENABLE ROW LEVEL SECURITY;
+ALTER TABLE ie_usage_reservations ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view own usage events" ON ie_usage_events;
+CREATE POLICY "Users can view own usage events"
+    ON ie_usage_events FOR SELECT
+    USING (auth.uid() = user_id);
+
+DROP POLICY IF EXISTS "Users can view own usage ledger" ON ie_usage_ledger;
+CREATE POLICY "Users can view own usage ledger"
+    ON ie_usage_ledger FOR SELECT
+    USING (auth.uid() = user_id);
@@ -0,0 +1,27 @@
+-- =============================================
+-- 히스토리 마인드맵 일괄 업데이트 (update_histories_mindmap)
+-- =============================================
+-- Supabase Dashboard > SQL Editor에서 실행하세요
+-- PostgREST의 update는 모든 행에 같은 값만 쓸 수 있으므로,
+-- 행마다 다른 mindmap_markdown을 하나의 UPDATE ... FROM 문으로 반영합니다.
+
+-- p_updates: [{"report_id": "...", "mindmap_markdown": "..."}, ...]
+-- 반환: 갱신된 행 수
+CREATE OR REPLACE FUNCTION update_histories_mindmap(p_user_id UUID, p_updates JSONB)
+RETURNS INT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_count INT;
+BEGIN
+    UPDATE ie_histories AS h
+    SET mindmap_markdown = u.mindmap_markdown,
+        updated_at = NOW()
+    FROM jsonb_to_recordset(p_updates) AS u(report_id TEXT, mindmap_markdown TEXT)
+    WHERE h.user_id = p_user_id
+      AND h.report_id = u.report_id;
+
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$;
@@ -0,0 +1,20 @@
+-- =============================================
+-- 히스토리 report_id 중복 방지
+-- =============================================
+-- Supabase Dashboard > SQL Editor에서 실행하세요
+-- write-behind 큐는 타임아웃 등 결과를 알 수 없는 실패 후 같은 배치를 다시 보내고,
+-- 스풀 재전송도 같은 행을 여러 번 보낼 수 있습니다.
+-- (user_id, report_id) 유니크 인덱스를 만들어 서버가 ON CONFLICT DO NOTHING으로 insert합니다.
+
+-- 1. 이미 중복된 행 정리 (가장 먼저 저장된 행만 유지)
+DELETE FROM ie_histories a
+USING ie_histories b
+WHERE a.user_id = b.user_id
+  AND a.report_id = b.report_id
+  AND (a.created_at, a.ctid) > (b.created_at, b.ctid);
+
+-- 2. 유니크 인덱스 (기존 조회용 인덱스 idx_ie_histories_user_report를 대체)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ie_histories_user_report_unique
+    ON ie_histories (user_id, report_id);
+
+DROP INDEX IF EXISTS idx_ie_histories_user_report;
@@ -0,0 +1,180 @@
+"""
+관리자 통계 테스트
+롤업 조회/갱신, 일자별 추이 집계, 사용자 목록 keyset 페이지네이션 확인
+"""
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from services import supabase_service
+from services.exceptions import ValidationError
+
+USER_A = '00000000-0000-0000-0000-00000000000a'
+USER_B = '00000000-0000-0000-0000-00000000000b'
+
+
+def _stats_row(age_seconds=0):
+    refreshed_at = datetime.now(timezone.utc) - timedelta(seconds=age_seconds)
+    return {
+        'total_users': 120000, 'active_today': 800, 'exhausted_users': 40,
+        'max_usage': 5, 'refreshed_at': refreshed_at.isoformat()
+    }
+
+
+class TestUsageStats(unittest.TestCase):
+    """get_usage_stats 롤업 테스트"""
+
+    def _client(self, rows):
+        client = MagicMock()
+        client.table.return_value.select.return_value.limit.return_value \
+            .execute.return_value.data = rows
+        return client
+
+    def test_reads_fresh_rollup_without_counting(self):
+        client = self._client([_stats_row()])
+
+        with patch.object(supabase_service, 'get_supabase', return_value=client):
+            stats = supabase_service.get_usage_stats()
+
+        self.assertEqual(stats['total_users'], 120000)
+        client.table.assert_called_once_with('ie_admin_stats')
+        client.rpc.assert_not_called()
+
+    def test_stale_rollup_is_refreshed(self):
+        client = self._client([_stats_row(age_seconds=supabase_service.ADMIN_STATS_MAX_AGE + 60)])
+        client.rpc.return_value.execute.return_value.data = dict(_stats_row(), total_users=120001)
+
+        with patch.object(supabase_service, 'get_supabase', return_value=client):
+            stats = supabase_service.get_usage_stats()
+
+        self.assertEqual(stats['total_users'], 120001)
+        self.assertEqual(client.rpc.call_args[0][0], 'refresh_admin_stats')
+
+    def test_falls_back_to_counts_without_rollup(self):
+        """롤업 마이그레이션 미적용 시 ie_usage를 직접 셈"""
+        with patch.object(supabase_service, 'get_supabase', return_value=MagicMock()), \
+                patch.object(supabase_service, '_db_operation', side_effect=[None, {'total_users': 3}]):
+            self.assertEqual(supabase_service.get_usage_stats(), {'total_users': 3})
+
+
+class TestUsageTimeseries(unittest.TestCase):
+    """get_usage_timeseries 테스트"""
+
+    def test_groups_by_day_style_model(self):
+        rows = [
+            {'bucket_date': '2026-10-18', 'style': 'blog', 'model': 'gpt-4o',
+             'generations': 3, 'prompt_tokens': 30, 'completion_tokens': 10, 'total_tokens': 40},
+            {'bucket_date': '2026-10-19', 'style': 'blog', 'model': 'claude',
+             'generations': 2, 'prompt_tokens': 20, 'completion_tokens': 5, 'total_tokens': 25},
+        ]
+        client = MagicMock()
+        query = client.table.return_value.select.return_value.gte.return_value.lte.return_value
+        query.eq.return_value = query
+        query.order.return_value.limit.return_value.execute.return_value.data = rows
+
+        with patch.object(supabase_service, 'get_supabase', return_value=client):
+            series = supabase_service.get_usage_timeseries(days=7, model='gpt-4o')
+
+        query.eq.assert_called_once_with('model', 'gpt-4o')
+        query.order.return_value.limit.assert_called_once_with(supabase_service.USAGE_TIMESERIES_MAX_ROWS + 1)
+        self.assertFalse(series['truncated'])
+        self.assertEqual(series['by_style']['blog']['generations'], 5)
+        self.assertEqual(series['by_model']['claude']['total_tokens'], 25)
+        self.assertEqual(sorted(series['by_day']), ['2026-10-18', '2026-10-19'])
+
+    def test_truncates_to_row_limit(self):
+        client = MagicMock()
+        query = client.table.return_value.select.return_value.gte.return_value.lte.return_value
+        query.order.return_value.limit.return_value.execute.return_value.data = [
+            {'bucket_date': '2026-10-19', 'style': 'blog', 'model': f'm{i}', 'generations': 1} for i in range(4)
+        ]
+
+        with patch.object(supabase_service, 'get_supabase', return_value=client), \
+                patch.object(supabase_service, 'USAGE_TIMESERIES_MAX_ROWS', 3):
+            series = supabase_service.get_usage_timeseries(days=7)
+
+        self.assertEqual(len(series['buckets']), 3)
+        self.assertTrue(series['truncated'])
+
+
+class TestHistoryRowModel(unittest.TestCase):
+    def test_model_is_stored_in_usage(self):
+        row = supabase_service._history_row('user-1', {
+            'id': 'r1', 'model': 'gpt-4o', 'usage': {'total_tokens': 10}
+        })
+        self.assertEqual(row['usage'], {'total_tokens': 10, 'model': 'gpt-4o'})
+
+
+class TestListUsersUsage(unittest.TestCase):
+    """list_users_usage 테스트"""
+
+    def _client(self, rows):
+        client = MagicMock()
+        query = client.table.return_value.select.return_value
+        for method in ('eq', 'lt', 'gt', 'or_', 'order', 'limit'):
+            getattr(query, method).return_value = query
+        query.execute.return_value.data = rows
+        return client, query
+
+    def test_paginates_with_keyset_cursor(self):
+        rows = [{'user_id': USER_A, 'usage_count': 0}, {'user_id': USER_B, 'usage_count': 2}]
+        client, query = self._client(rows)
+
+        with patch.object(supabase_service, 'get_supabase', return_value=client):
+            page = supabase_service.list_users_usage(limit=1)
+            query.limit.assert_called_once_with(2)
+            self.assertEqual(page['items'], rows[:1])
+
+            supabase_service.list_users_usage(limit=1, cursor=page['next_cursor'])
+
+        keyset = query.or_.call_args[0][0]
+        self.assertIn('usage_count.gt.0', keyset)
+        self.assertIn(f'user_id.gt.{USER_A}', keyset)
+
+    def test_status_filter(self):
+        client, query = self._client([])
+
+        with patch.object(supabase_service, 'get_supabase', return_value=client):
+            supabase_service.list_users_usage(status='exhausted')
+
+        query.eq.assert_called_once_with('usage_count', 0)
+
+    def test_rejects_invalid_filters(self):
+        with self.assertRaises(ValidationError):
+            supabase_service.list_users_usage(status='everyone')
+        with self.assertRaises(ValidationError):
+            supabase_service.list_users_usage(user_id='x),or(1.eq.1')
+        with self.assertRaises(ValidationError):
+            supabase_service.list_users_usage(cursor=supabase_service._encode_cursor('1', 'not-a-uuid'))
+
+
+class TestAdminRoutes(unittest.TestCase):
+    """관리자 라우트 테스트"""
+
+    def setUp(self):
+        from app import create_app
+        self.app = create_app({'TESTING': True})
+        self.client = self.app.test_client()
+
+    def test_users_are_paginated(self):
+        page = {'items': [{'user_id': USER_A, 'usage_count': 0}], 'next_cursor': 'next'}
+        with patch('services.supabase_service.is_supabase_enabled', return_value=False), \
+                patch('routes.auth_routes.is_admin', return_value=True), \
+                patch('routes.auth_routes.list_users_usage', return_value=page) as list_mock:
+            res = self.client.get('/api/admin/users?limit=10&status=exhausted')
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.get_json()['nextCursor'], 'next')
+        self.assertEqual(list_mock.call_args.kwargs['status'], 'exhausted')
+        self.assertEqual(list_mock.call_args.kwargs['limit'], 10)
+
+    def test_usage_timeseries_requires_admin(self):
+        with patch('services.supabase_service.is_supabase_enabled', return_value=False), \
+                patch('routes.auth_routes.is_admin', return_value=False):
+            res = self.client.get('/api/admin/stats/usage')
+
+        self.assertEqual(res.status_code, 403)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -175,6 +175,77 @@ class TestCreateContent(unittest.TestCase):
         self.assertIsInstance(prompt, str)
         self.assertIn("테스트", prompt)
 
+    @patch('services.ai_service.completion')
+    def test_create_content_without_html(self, mock_completion):
+        """render_html=False면 HTML 렌더링 생략"""
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "# 제목\n내용"
+        mock_completion.return_value = mock_response
+
+        from services.ai_service import create_content
+
+        result = create_content(
+            content="테스트",
+            model="gpt-4o-mini",
+            render_html=False
+        )
+
+        self.assertNotIn('html', result)
+        self.assertEqual(result['title'], '제목')
+
+    @patch('services.ai_service.acompletion')
+    def test_create_content_async(self, mock_acompletion):
+        """비동기 버전은 acompletion을 사용하고 같은 결과 형식을 반환"""
+        import asyncio
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "# 제목\n내용"
+        mock_acompletion.return_value = mock_response
+
+        from services.ai_service import create_content_async
+
+        result, prompt = asyncio.run(create_content_async(
+            content="테스트",
+            model="gpt-4o-mini",
+            return_prompt=True
+        ))
+
+        self.assertEqual(result['title'], '제목')
+        self.assertIn('html', result)
+        self.assertIn("테스트", prompt)
+        mock_acompletion.assert_awaited_once()
+
+
+class TestResetLLMClients(unittest.TestCase):
+    """fork 후 LiteLLM 클라이언트 재생성 테스트"""
+
+    def test_drops_cached_clients(self):
+        """캐시된 클라이언트를 비우고 지연 생성 클라이언트는 다시 만들게 함"""
+        import sys
+        import types
+        from services.ai_service import reset_llm_clients
+
+        litellm = types.ModuleType('litellm')
+        litellm.in_memory_llm_clients_cache = MagicMock()
+        litellm.module_level_client = object()
+        litellm.__getattr__ = lambda name: 'recreated'
+
+        with patch.dict(sys.modules, {'litellm': litellm}):
+            reset_llm_clients()
+
+        litellm.in_memory_llm_clients_cache.flush_cache.assert_called_once()
+        self.assertEqual(litellm.module_level_client, 'recreated')
+
+    def test_noop_before_litellm_is_loaded(self):
+        import sys
+        from services.ai_service import reset_llm_clients
+
+        with patch.dict(sys.modules):
+            sys.modules.pop('litellm', None)
+            reset_llm_clients()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,284 @@
+"""
+ASGI 모드 테스트
+ASGI 앱을 scope/receive/send로 직접 호출 (uvicorn 불필요): WSGI 라우트 위임, async 뷰, 동시 처리,
+lifespan, 비동기 자막 요청, async 뷰용 데코레이터 확인
+"""
+import asyncio
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from flask import jsonify
+
+from benchmarks.stub_servers import StubConfig, StubServer
+from services import content_service
+from services.asgi_bridge import ASGIBridge, build_environ
+
+LLM_RESPONSE = SimpleNamespace(
+    choices=[SimpleNamespace(message=SimpleNamespace(content='# 제목\n본문'))],
+    usage=None
+)
+
+
+async def call(app, method, path, body=b'', headers=()):
+    """HTTP 요청 하나를 ASGI 앱에 보내고 (상태 코드, 헤더, 본문)을 반환"""
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http', 'http_version': '1.1', 'method': method, 'scheme': 'http',
+        'path': path, 'query_string': query.encode(), 'root_path': '',
+        'headers': [(b'host', b'testserver'), *headers],
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 50000),
+    }
+    requests = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    messages = []
+
+    async def receive():
+        return requests.pop(0) if requests else {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start, body_message = messages
+    return start['status'], dict(start['headers']), body_message['body']
+
+
+def post_json(app, path, payload):
+    import json
+    return call(app, 'POST', path, json.dumps(payload).encode(), [(b'content-type', b'application/json')])
+
+
+class TestBuildEnviron(unittest.TestCase):
+    """ASGI scope → WSGI environ 변환 테스트"""
+
+    def test_headers_query_and_root_path(self):
+        environ = build_environ({
+            'type': 'http', 'method': 'GET', 'path': '/app/api/x', 'root_path': '/app',
+            'query_string': b'a=1', 'headers': [(b'content-type', b'text/plain'), (b'cookie', b'a=1'),
+                                                (b'cookie', b'b=2'), (b'x-request-id', b'r1')],
+        }, b'body')
+
+        self.assertEqual(environ['SCRIPT_NAME'], '/app')
+        self.assertEqual(environ['PATH_INFO'], '/api/x')
+        self.assertEqual(environ['QUERY_STRING'], 'a=1')
+        self.assertEqual(environ['CONTENT_TYPE'], 'text/plain')
+        self.assertEqual(environ['CONTENT_LENGTH'], '4')
+        self.assertEqual(environ['HTTP_COOKIE'], 'a=1; b=2')
+        self.assertEqual(environ['HTTP_X_REQUEST_ID'], 'r1')
+        self.assertEqual(environ['wsgi.input'].read(), b'body')
+
+
+class TestASGIBridge(unittest.TestCase):
+    """브리지 라우팅 / async 뷰 / lifespan 테스트"""
+
+    def setUp(self):
+        from app import create_app
+        from routes.async_routes import ASYNC_VIEWS
+        self.flask_app = create_app({'TESTING': True})
+        self.app = ASGIBridge(self.flask_app, ASYNC_VIEWS)
+        self._artifact_dir = tempfile.TemporaryDirectory()
+        self._patches = [
+            patch('services.report_artifacts.ARTIFACT_DIR', self._artifact_dir.name),
+            patch('services.supabase_service.is_supabase_enabled', return_value=False),
+            patch('services.usage.usage_decorator.is_supabase_enabled', return_value=False),
+        ]
+        for p in self._patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self._patches:
+            p.stop()
+        self._artifact_dir.cleanup()
+
+    def test_wsgi_route_falls_through(self):
+        status, headers, body = asyncio.run(call(self.app, 'GET', '/api/providers'))
+
+        self.assertEqual(status, 200)
+        self.assertIn(b'application/json', headers[b'content-type'])
+        self.assertIn(b'providers', body)
+
+    def test_unknown_route_returns_404(self):
+        status, _, _ = asyncio.run(call(self.app, 'GET', '/no-such-route'))
+
+        self.assertEqual(status, 404)
+
+    def test_declared_oversized_body_rejected_before_reading(self):
+        app = ASGIBridge(self.flask_app, max_body=10)
+        status, headers, _ = asyncio.run(call(app, 'POST', '/regenerate', b'x' * 11, [(b'content-length', b'11')]))
+
+        self.assertEqual(status, 413)
+        self.assertEqual(headers[b'connection'], b'close')
+
+    def test_streamed_body_stops_at_limit(self):
+        """Content-Length 없이 조각으로 보내도 한도를 넘는 순간 413 (남은 조각은 읽지 않음)"""
+        app = ASGIBridge(self.flask_app, max_body=10)
+        requests = [{'type': 'http.request', 'body': b'x' * 6, 'more_body': True} for _ in range(5)]
+        messages = []
+
+        async def receive():
+            return requests.pop(0)
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {'type': 'http', 'method': 'POST', 'path': '/regenerate', 'headers': [(b'host', b'testserver')]}
+        asyncio.run(app(scope, receive, send))
+
+        self.assertEqual(messages[0]['status'], 413)
+        self.assertEqual(len(requests), 3)
+
+    def test_max_body_from_env(self):
+        with patch.dict('os.environ', {'ASGI_MAX_BODY': '1024'}):
+            self.assertEqual(ASGIBridge(self.flask_app).max_body, 1024)
+
+    def test_generate_uses_async_view(self):
+        import json
+        with patch('routes.blog_routes.content_service.get_youtube_title', return_value='TITLE'), \
+                patch('services.content_service._get_transcript_async', AsyncMock(return_value='자막 내용')), \
+                patch('services.content_service._load_cache', return_value=['댓글']), \
+                patch('services.ai_service.completion') as sync_completion, \
+                patch('services.ai_service.acompletion', AsyncMock(return_value=LLM_RESPONSE)):
+            status, headers, body = asyncio.run(post_json(self.app, '/generate', {
+                'url': 'https://www.youtube.com/watch?v=test1234567',
+                'model': 'gpt-4o-mini',
+                'style': 'blog',
+                'fields': 'all'
+            }))
+
+        self.assertEqual(status, 200)
+        data = json.loads(body)
+        self.assertEqual(data['title'], '제목')
+        self.assertEqual(data['youtube_title'], 'TITLE')
+        self.assertEqual(data['transcript'], '자막 내용')
+        self.assertIn(b'llm;dur=', headers[b'server-timing'])
+        sync_completion.assert_not_called()
+
+    def test_generate_validation_error(self):
+        status, _, body = asyncio.run(post_json(self.app, '/generate', {'url': 'https://example.com'}))
+
+        self.assertEqual(status, 400)
+        self.assertIn('YouTube'.encode(), body)
+
+    def test_slow_llm_calls_do_not_hold_threads(self):
+        """스레드 2개로도 LLM 응답을 기다리는 요청 10개가 동시에 끝남"""
+        async def slow_completion(**kwargs):
+            await asyncio.sleep(0.3)
+            return LLM_RESPONSE
+
+        async def scenario():
+            app = ASGIBridge(self.flask_app, self.app.async_views, threads=2)
+            inbox = asyncio.Queue()
+            sent = []
+
+            async def send(message):
+                sent.append(message['type'])
+
+            lifespan = asyncio.create_task(app({'type': 'lifespan'}, inbox.get, send))
+            await inbox.put({'type': 'lifespan.startup'})
+            while not sent:
+                await asyncio.sleep(0.01)
+            started = time.perf_counter()
+            results = await asyncio.gather(*[
+                post_json(app, '/regenerate', {'content': f'본문 {i}', 'model': 'gpt-4o-mini'})
+                for i in range(10)
+            ])
+            elapsed = time.perf_counter() - started
+            await inbox.put({'type': 'lifespan.shutdown'})
+            await lifespan
+            return results, elapsed, sent
+
+        with patch('services.ai_service.acompletion', side_effect=slow_completion), \
+                patch('services.lazy_imports.start_prewarm') as prewarm:
+            results, elapsed, lifespan_messages = asyncio.run(scenario())
+
+        self.assertEqual([status for status, _, _ in results], [200] * 10)
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(lifespan_messages, ['lifespan.startup.complete', 'lifespan.shutdown.complete'])
+        prewarm.assert_called_once()
+
+
+class TestAsyncTranscriptFetchers(unittest.TestCase):
+    """httpx 비동기 자막 요청 테스트 (부하 테스트 대역 서버 사용)"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stub = StubServer(config=StubConfig(youtube_latency=0)).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub.shutdown()
+
+    def _run(self, coro):
+        async def run():
+            try:
+                return await coro
+            finally:
+                await content_service.aclose_async_clients()
+        return asyncio.run(run())
+
+    def test_watch_page_matches_sync_version(self):
+        with patch.object(content_service, 'YOUTUBE_WATCH_URL', f'{self.stub.base_url}/watch'):
+            result = self._run(content_service._get_transcript_from_watch_page_async('abc12345678'))
+            expected = content_service._get_transcript_from_watch_page('abc12345678')
+
+        self.assertIsInstance(result, str)
+        self.assertEqual(result, expected)
+
+    def test_supadata(self):
+        with patch.object(content_service, 'SUPADATA_API_URL', f'{self.stub.base_url}/supadata/transcript'):
+            result = self._run(content_service.get_transcript_via_supadata_async('abc12345678', 'key'))
+
+        self.assertEqual(result, self.stub.transcript_text)
+
+    def test_supadata_connection_error_returns_none(self):
+        with patch.object(content_service, 'SUPADATA_API_URL', 'http://127.0.0.1:9/transcript'):
+            result = self._run(content_service.get_transcript_via_supadata_async('abc12345678', 'key'))
+
+        self.assertIsNone(result)
+
+
+class TestAsyncDecorators(unittest.TestCase):
+    """async 뷰에 적용한 require_usage 테스트"""
+
+    def setUp(self):
+        from app import create_app
+        self.app = create_app({'TESTING': True})
+
+    def _run_view(self, view):
+        from flask import g
+        from services.usage import require_usage
+
+        async def run():
+            with self.app.test_request_context('/'):
+                g.user_id = 'user-1'
+                return await require_usage(view)()
+
+        with patch('services.usage.usage_decorator.is_supabase_enabled', return_value=True), \
+                patch('services.usage.usage_decorator.UsageService') as usage_service:
+            usage_service.consume.return_value = (True, {'is_admin': False})
+            result = asyncio.run(run())
+        return result, usage_service
+
+    def test_refunds_on_error_response(self):
+        async def view():
+            return jsonify({'error': 'x'}), 500
+
+        _, usage_service = self._run_view(view)
+
+        usage_service.consume.assert_called_once_with('user-1')
+        usage_service.refund.assert_called_once()
+
+    def test_keeps_usage_on_success(self):
+        async def view():
+            return jsonify({'ok': True})
+
+        result, usage_service = self._run_view(view)
+
+        self.assertEqual(result.status_code, 200)
+        usage_service.refund.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+히스토리/스타일 bulk API 테스트
+여러 항목이 단일 DB 문으로 처리되는지, 요청 검증 확인
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+
+from services import lookup_cache, supabase_service
+
+
+class TestBulkOperations(unittest.TestCase):
+    """supabase_service bulk 함수 테스트"""
+
+    def setUp(self):
+        lookup_cache.clear()
+
+    def test_styles_upserted_in_one_statement(self):
+        client = MagicMock()
+        styles = [{'id': f's{n}', 'name': f'스타일 {n}', 'prompt': 'p'} for n in range(50)]
+
+        with patch.object(supabase_service, 'get_supabase', return_value=client):
+            self.assertTrue(supabase_service.save_custom_styles('user-1', styles))
+
+        upsert = client.table.return_value.upsert
+        upsert.assert_called_once()
+        self.assertEqual(len(upsert.call_args[0][0]), 50)
+        self.assertEqual(upsert.call_args.kwargs['on_conflict'], 'user_id,style_id')
+
+    def test_histories_deleted_in_one_statement(self):
+        client = MagicMock()
+        query = client.table.return_value.delete.return_value.eq.return_value
+
+        with patch.object(supabase_service, 'get_supabase', return_value=client):
+            self.assertTrue(supabase_service.delete_histories('user-1', ['r1', 'r2', 'r3']))
+
+        query.in_.assert_called_once_with('report_id', ['r1', 'r2', 'r3'])
+        query.in_.return_value.execute.assert_called_once()
+
+    def test_empty_bulk_is_noop(self):
+        client = MagicMock()
+        with patch.object(supabase_service, 'get_supabase', return_value=client):
+            self.assertTrue(supabase_service.delete_custom_styles('user-1', []))
+        client.table.assert_not_called()
+
+    def test_mindmaps_updated_through_rpc(self):
+        client = MagicMock()
+
+        with patch.object(supabase_service, 'get_supabase', return_value=client):
+            self.assertTrue(supabase_service.update_histories_mindmap('user-1', {'r1': '# a', 'r2': '# b'}))
+
+        name, params = client.rpc.call_args[0]
+        self.assertEqual(name, 'update_histories_mindmap')
+        self.assertEqual(len(params['p_updates']), 2)
+        client.table.assert_not_called()
+
+    def test_mindmap_update_falls_back_without_rpc(self):
+        client = MagicMock()
+        client.rpc.side_effect = RuntimeError('function not found')
+
+        with patch.object(supabase_service, 'get_supabase', return_value=client), \
+                patch.object(supabase_service, 'update_history', return_value=True) as update_history:
+            self.assertTrue(supabase_service.update_histories_mindmap('user-1', {'r1': '# a', 'r2': '# b'}))
+
+        self.assertEqual(update_history.call_count, 2)
+
+
+class TestBulkRoutes(unittest.TestCase):
+    """bulk 라우트 테스트"""
+
+    def setUp(self):
+        from app import create_app
+        self.app = create_app({'TESTING': True})
+        self.client = self.app.test_client()
+        self.supabase_disabled = patch('services.supabase_service.is_supabase_enabled', return_value=False)
+        self.supabase_disabled.start()
+
+    def tearDown(self):
+        self.supabase_disabled.stop()
+
+    def test_styles_batch(self):
+        with patch('routes.auth_routes.save_custom_styles', return_value=True) as save, \
+                patch('routes.auth_routes.delete_custom_styles', return_value=True) as delete:
+            res = self.client.post('/api/user/styles/batch', json={
+                'upsert': [{'id': 'custom_1', 'name': '이름', 'prompt': '프롬프트'}],
+                'delete': ['custom_2', 'custom_2']
+            })
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.get_json()['deleted'], 1)
+        save.assert_called_once()
+        self.assertEqual(delete.call_args[0][1], ['custom_2'])
+
+    def test_histories_batch(self):
+        with patch('routes.auth_routes.update_histories_mindmap', return_value=True) as update, \
+                patch('routes.auth_routes.delete_histories', return_value=True) as delete:
+            res = self.client.post('/api/user/histories/batch', json={
+                'delete': ['r1', 'r2'],
+                'update': [{'id': 'r3', 'mindmapMarkdown': '# 맵'}]
+            })
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(update.call_args[0][1], {'r3': '# 맵'})
+        self.assertEqual(delete.call_args[0][1], ['r1', 'r2'])
+
+    def test_rejects_oversized_batch(self):
+        ids = [f'r{n}' for n in range(101)]
+        res = self.client.post('/api/user/histories/batch', json={'delete': ids})
+
+        self.assertEqual(res.status_code, 400)
+
+    def test_rejects_invalid_style(self):
+        res = self.client.post('/api/user/styles/batch', json={'upsert': [{'id': 'custom_1'}]})
+
+        self.assertEqual(res.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -62,6 +62,32 @@ class TestTranscriptFallbackParsing(unittest.TestCase):
         self.assertIn("안녕하세요", parsed)
         self.assertIn("반갑습니다", parsed)
 
+    def test_order_transcript_tracks(self):
+        from types import SimpleNamespace
+
+        from services import content_service
+
+        def track(lang, generated):
+            return SimpleNamespace(language_code=lang, is_generated=generated)
+
+        tracks = [track("ja", True), track("en", True), track("fr", False), track("en", False),
+                  track("ko", True), track("de", False), track("ko", False)]
+
+        ordered = content_service._order_transcript_tracks(tracks)
+        self.assertEqual(
+            [(t.language_code, t.is_generated) for t in ordered],
+            [("ko", False), ("en", False), ("fr", False), ("de", False),
+             ("ko", True), ("en", True), ("ja", True)],
+        )
+
+    def test_truncate_text(self):
+        from services import content_service
+
+        self.assertEqual(content_service.truncate_text("  하나  둘\n셋 넷 ", 2), "하나 둘...")
+        self.assertEqual(content_service.truncate_text("하나 둘 셋", 3), "하나 둘 셋")
+        self.assertEqual(content_service.truncate_text("하나 둘 셋  ", 3), "하나 둘 셋  ")
+        self.assertEqual(content_service.truncate_text(None, 3), "")
+
 
 if __name__ == "__main__":
     unittest.main()
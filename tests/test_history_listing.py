@@ -0,0 +1,139 @@
+"""
+히스토리 목록 API 테스트
+요약 컬럼 projection, keyset 커서, 본문 지연 조회 확인
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+
+from services import supabase_service
+from services.exceptions import ValidationError
+
+
+def _summary_row(n):
+    return {
+        'report_id': f'r{n}',
+        'url': f'https://youtu.be/{n}',
+        'title': f'제목 {n}',
+        'style': 'blog',
+        'created_at': f'2026-01-01T00:00:{n:02d}+00:00'
+    }
+
+
+class TestHistoryCursor(unittest.TestCase):
+    """커서 인코딩/검증 테스트"""
+
+    def test_round_trip(self):
+        cursor = supabase_service.encode_history_cursor('2026-01-01T00:00:00.123+00:00', 'abc-123')
+        self.assertEqual(
+            supabase_service.decode_history_cursor(cursor),
+            ('2026-01-01T00:00:00.123+00:00', 'abc-123')
+        )
+
+    def test_rejects_garbage(self):
+        with self.assertRaises(ValidationError):
+            supabase_service.decode_history_cursor('not-a-cursor')
+
+    def test_rejects_filter_injection(self):
+        """PostgREST 필터 구문을 포함한 값은 거부"""
+        cursor = supabase_service.encode_history_cursor('2026-01-01T00:00:00Z",user_id.neq."x', 'r1')
+        with self.assertRaises(ValidationError):
+            supabase_service.decode_history_cursor(cursor)
+
+
+class TestListHistories(unittest.TestCase):
+    """list_histories 쿼리 테스트"""
+
+    def _client(self, rows):
+        client = MagicMock()
+        query = client.table.return_value.select.return_value.eq.return_value
+        query.or_.return_value = query
+        query.order.return_value = query
+        query.limit.return_value = query
+        query.execute.return_value.data = rows
+        return client, query
+
+    def test_projects_summary_columns_and_sets_next_cursor(self):
+        client, query = self._client([_summary_row(n) for n in (3, 2, 1)])
+
+        with patch.object(supabase_service, 'get_supabase', return_value=client):
+            page = supabase_service.list_histories('user-1', limit=2)
+
+        client.table.return_value.select.assert_called_once_with(supabase_service.HISTORY_SUMMARY_COLUMNS)
+        query.limit.assert_called_once_with(3)
+        self.assertEqual([r['report_id'] for r in page['items']], ['r3', 'r2'])
+        self.assertEqual(
+            supabase_service.decode_history_cursor(page['next_cursor']),
+            ('2026-01-01T00:00:02+00:00', 'r2')
+        )
+
+    def test_last_page_has_no_cursor(self):
+        client, query = self._client([_summary_row(1)])
+
+        with patch.object(supabase_service, 'get_supabase', return_value=client):
+            page = supabase_service.list_histories('user-1', limit=2)
+
+        self.assertIsNone(page['next_cursor'])
+        query.or_.assert_not_called()
+
+    def test_cursor_applies_keyset_filter(self):
+        client, query = self._client([])
+        cursor = supabase_service.encode_history_cursor('2026-01-01T00:00:02+00:00', 'r2')
+
+        with patch.object(supabase_service, 'get_supabase', return_value=client):
+            supabase_service.list_histories('user-1', limit=2, cursor=cursor)
+
+        keyset = query.or_.call_args[0][0]
+        self.assertIn('created_at.lt."2026-01-01T00:00:02+00:00"', keyset)
+        self.assertIn('report_id.lt."r2"', keyset)
+
+
+class TestHistoryRoutes(unittest.TestCase):
+    """히스토리 라우트 테스트"""
+
+    def setUp(self):
+        from app import create_app
+        self.app = create_app({'TESTING': True})
+        self.client = self.app.test_client()
+
+    def test_list_returns_summaries(self):
+        page = {'items': [_summary_row(1)], 'next_cursor': 'abc'}
+        with patch('services.supabase_service.is_supabase_enabled', return_value=False), \
+                patch('routes.auth_routes.list_histories', return_value=page) as list_mock:
+            res = self.client.get('/api/user/histories?limit=5')
+
+        self.assertEqual(res.status_code, 200)
+        data = res.get_json()
+        self.assertEqual(data['nextCursor'], 'abc')
+        self.assertEqual(data['histories'][0]['id'], 'r1')
+        self.assertNotIn('content', data['histories'][0])
+        self.assertEqual(list_mock.call_args.kwargs['limit'], 5)
+
+    def test_invalid_cursor_is_400(self):
+        with patch('services.supabase_service.is_supabase_enabled', return_value=False), \
+                patch('routes.auth_routes.list_histories',
+                      side_effect=ValidationError('잘못된 커서입니다.', field='cursor')):
+            res = self.client.get('/api/user/histories?cursor=bad')
+
+        self.assertEqual(res.status_code, 400)
+
+    def test_get_full_history(self):
+        row = dict(_summary_row(1), content='# 본문', html='', transcript='자막')
+        with patch('services.supabase_service.is_supabase_enabled', return_value=False), \
+                patch('routes.auth_routes.get_history', return_value=row):
+            res = self.client.get('/api/user/histories/r1')
+
+        self.assertEqual(res.status_code, 200)
+        history = res.get_json()['history']
+        self.assertEqual(history['content'], '# 본문')
+        self.assertIn('<h1', history['html'])
+
+    def test_get_missing_history_is_404(self):
+        with patch('services.supabase_service.is_supabase_enabled', return_value=False), \
+                patch('routes.auth_routes.get_history', return_value=None):
+            res = self.client.get('/api/user/histories/none')
+
+        self.assertEqual(res.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
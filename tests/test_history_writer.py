@@ -0,0 +1,188 @@
+"""
+히스토리 write-behind 큐 단위 테스트
+배치 insert, 재시도, 스풀 보관/재전송 확인
+"""
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from services.history_writer import HistoryWriter
+
+
+def _row(n):
+    return {'user_id': 'user-1', 'report_id': f'r{n}', 'content': f'내용 {n}'}
+
+
+class TestHistoryWriter(unittest.TestCase):
+    """HistoryWriter 테스트"""
+
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp()
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+    def _writer(self, insert_rows=None, **kwargs):
+        def record(rows):
+            with self.lock:
+                self.calls.append(list(rows))
+
+        kwargs.setdefault('flush_interval', 0.05)
+        kwargs.setdefault('retry_backoff', 0)
+        writer = HistoryWriter(insert_rows or record, spool_dir=self.spool_dir, **kwargs)
+        self.addCleanup(writer.stop, 1)
+        return writer
+
+    def _spooled_files(self):
+        return [n for n in os.listdir(self.spool_dir) if n.endswith('.json')]
+
+    def test_rows_are_batched_into_multi_row_insert(self):
+        """짧은 시간에 들어온 행은 한 번의 insert로 저장"""
+        writer = self._writer(flush_interval=0.5)
+        for n in range(5):
+            writer.enqueue(_row(n))
+
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual([r['report_id'] for r in self.calls[0]], [f'r{n}' for n in range(5)])
+        self.assertEqual(writer.pending(), 0)
+
+    def test_batch_size_limit(self):
+        writer = self._writer(batch_size=2)
+        for n in range(5):
+            writer.enqueue(_row(n))
+
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertTrue(all(len(batch) <= 2 for batch in self.calls))
+        self.assertEqual(sum(len(batch) for batch in self.calls), 5)
+
+    def test_retry_then_success(self):
+        insert = MagicMock(side_effect=[RuntimeError('timeout'), None])
+        writer = self._writer(insert_rows=insert)
+        writer.enqueue(_row(1))
+
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertEqual(insert.call_count, 2)
+        self.assertEqual(self._spooled_files(), [])
+
+    def test_failed_rows_are_spooled_and_replayed(self):
+        """재시도 실패 시 스풀에 보관, 이후 재전송되면 스풀 삭제"""
+        insert = MagicMock(side_effect=RuntimeError('db down'))
+        writer = self._writer(insert_rows=insert, max_retries=2)
+        writer.enqueue(_row(1))
+        writer.enqueue(_row(2))
+        self.assertTrue(writer.flush(timeout=5))
+
+        self.assertEqual(len(self._spooled_files()), 1)
+
+        insert.side_effect = None
+        insert.reset_mock()
+        self.assertEqual(writer.replay_spool(), 2)
+        self.assertEqual(self._spooled_files(), [])
+        insert.assert_called_once()
+
+    def test_only_bad_rows_are_spooled(self):
+        """배치 실패 시 개별 insert로 정상 행은 저장"""
+        def insert(rows):
+            if any(r['report_id'] == 'bad' for r in rows):
+                raise ValueError('invalid row')
+            self.calls.append(list(rows))
+
+        writer = self._writer(insert_rows=insert, max_retries=1)
+        writer.enqueue(_row(1))
+        writer.enqueue({'user_id': 'user-1', 'report_id': 'bad'})
+        self.assertTrue(writer.flush(timeout=5))
+
+        self.assertEqual([r['report_id'] for batch in self.calls for r in batch], ['r1'])
+        self.assertEqual(len(self._spooled_files()), 1)
+
+    def _spool_rows(self, writer, *batches):
+        for rows in batches:
+            writer._spool(rows)
+
+    def test_failing_spool_does_not_block_newer_files(self):
+        """계속 실패하는 스풀이 있어도 이후 스풀은 전송"""
+        def insert(rows):
+            if rows[0]['report_id'] == 'bad':
+                raise ValueError('invalid row')
+            self.calls.append(list(rows))
+
+        writer = self._writer(insert_rows=insert)
+        self._spool_rows(writer, [{'user_id': 'user-1', 'report_id': 'bad'}], [_row(1)], [_row(2)])
+
+        self.assertEqual(writer.replay_spool(), 2)
+        self.assertEqual(len(self._spooled_files()), 1)
+        self.assertTrue(self._spooled_files()[0].endswith('.r1.json'))
+
+    def test_repeatedly_failing_spool_is_quarantined(self):
+        def insert(rows):
+            if rows[0]['report_id'] == 'bad':
+                raise ValueError('invalid row')
+
+        writer = self._writer(insert_rows=insert)
+        self._spool_rows(writer, [{'user_id': 'user-1', 'report_id': 'bad'}])
+        with patch('services.history_writer.SPOOL_MAX_ATTEMPTS', 2):
+            for n in range(2):
+                self._spool_rows(writer, [_row(n)])
+                writer.replay_spool()
+
+        self.assertEqual(self._spooled_files(), [])
+        self.assertEqual(len([n for n in os.listdir(self.spool_dir) if n.endswith('.failed')]), 1)
+
+    def test_outage_does_not_count_attempts(self):
+        """모든 전송이 실패하면(DB 장애) 시도 횟수를 세지 않고 중단"""
+        insert = MagicMock(side_effect=RuntimeError('db down'))
+        writer = self._writer(insert_rows=insert)
+        self._spool_rows(writer, *[[_row(n)] for n in range(5)])
+
+        self.assertEqual(writer.replay_spool(), 0)
+
+        self.assertEqual(insert.call_count, 3)
+        self.assertEqual(len(self._spooled_files()), 5)
+        self.assertFalse(any('.r' in name for name in self._spooled_files()))
+
+    def test_stop_flushes_pending_rows(self):
+        writer = self._writer(flush_interval=10)
+        writer.enqueue(_row(1))
+        writer.stop(timeout=5)
+
+        self.assertEqual(sum(len(batch) for batch in self.calls), 1)
+
+
+class TestQueueHistory(unittest.TestCase):
+    """supabase_service.queue_history 테스트"""
+
+    def test_sync_mode(self):
+        """HISTORY_WRITE_BEHIND=0이면 동기 저장"""
+        from services import supabase_service
+
+        with patch.dict(os.environ, {'HISTORY_WRITE_BEHIND': '0'}), \
+                patch.object(supabase_service, 'get_supabase', return_value=MagicMock()), \
+                patch.object(supabase_service, 'save_history') as save, \
+                patch.object(supabase_service, 'get_history_writer') as get_writer:
+            supabase_service.queue_history('user-1', {'id': 'r1'})
+
+        save.assert_called_once()
+        get_writer.assert_not_called()
+
+    def test_write_behind_mode(self):
+        from services import supabase_service
+
+        writer = MagicMock()
+        with patch.dict(os.environ, {'HISTORY_WRITE_BEHIND': '1'}), \
+                patch.object(supabase_service, 'get_supabase', return_value=MagicMock()), \
+                patch.object(supabase_service, 'get_history_writer', return_value=writer):
+            supabase_service.queue_history('user-1', {'id': 'r1', 'title': '제목'})
+
+        row = writer.enqueue.call_args[0][0]
+        self.assertEqual(row['report_id'], 'r1')
+        self.assertEqual(row['user_id'], 'user-1')
+
+
+if __name__ == '__main__':
+    unittest.main()
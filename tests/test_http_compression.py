@@ -0,0 +1,91 @@
+"""
+HTTP 압축 및 정적 파일 캐시 헤더 테스트
+"""
+import gzip
+import re
+import unittest
+
+
+class TestCompression(unittest.TestCase):
+    """응답 압축 미들웨어 테스트"""
+
+    def setUp(self):
+        from app import create_app
+        from flask import Response, jsonify
+
+        self.app = create_app({'TESTING': True, 'COMPRESSION_MIN_SIZE': 100})
+
+        @self.app.route('/_test/big')
+        def big():
+            return jsonify({'text': '한국어 자막 ' * 200})
+
+        @self.app.route('/_test/small')
+        def small():
+            return jsonify({'ok': True})
+
+        @self.app.route('/_test/stream')
+        def stream():
+            return Response((f"data: {i}\n\n" for i in range(3)), mimetype='text/event-stream')
+
+        self.client = self.app.test_client()
+
+    def test_large_json_is_gzipped(self):
+        """임계값 이상의 JSON은 gzip 압축"""
+        res = self.client.get('/_test/big', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(res.headers.get('Content-Encoding'), 'gzip')
+        self.assertIn('Accept-Encoding', res.headers.get('Vary', ''))
+        self.assertEqual(int(res.headers['Content-Length']), len(res.data))
+        self.assertIn('한국어 자막'.encode('utf-8'), gzip.decompress(res.data))
+
+    def test_small_or_unaccepted_not_compressed(self):
+        """작은 응답 또는 Accept-Encoding 없으면 압축하지 않음"""
+        res = self.client.get('/_test/small', headers={'Accept-Encoding': 'gzip'})
+        self.assertIsNone(res.headers.get('Content-Encoding'))
+
+        res = self.client.get('/_test/big')
+        self.assertIsNone(res.headers.get('Content-Encoding'))
+
+    def test_stream_compressed_incrementally(self):
+        """SSE 스트리밍 응답도 압축"""
+        res = self.client.get('/_test/stream', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(res.headers.get('Content-Encoding'), 'gzip')
+        self.assertEqual(gzip.decompress(res.data), b"data: 0\n\ndata: 1\n\ndata: 2\n\n")
+
+
+class TestStaticAssets(unittest.TestCase):
+    """정적 파일 핑거프린팅 테스트"""
+
+    def setUp(self):
+        from app import create_app
+        self.app = create_app({'TESTING': True})
+        self.client = self.app.test_client()
+
+    def test_fingerprinted_url_is_immutable(self):
+        """해시가 붙은 URL은 immutable 캐시"""
+        with self.app.test_request_context():
+            from flask import url_for
+            url = url_for('static', filename='js/main.js')
+
+        self.assertRegex(url, r'\?v=[0-9a-f]{12}$')
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('immutable', res.headers['Cache-Control'])
+
+    def test_unversioned_url_revalidates(self):
+        """해시가 없거나 다른 URL은 재검증"""
+        res = self.client.get('/static/js/main.js?v=stale')
+        self.assertEqual(res.headers['Cache-Control'], 'no-cache')
+
+    def test_index_has_import_map(self):
+        """메인 페이지에 모듈 import map 포함"""
+        html = self.client.get('/').get_data(as_text=True)
+        match = re.search(r'<script type="importmap">(.*?)</script>', html, re.S)
+
+        self.assertIsNotNone(match)
+        self.assertIn('/static/js/modules/ContentGenerator.js?v=', match.group(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+JSON 프로바이더 단위 테스트
+orjson 경로와 표준 json 폴백 경로의 동작 일치 확인
+"""
+import datetime
+import unittest
+import uuid
+from unittest.mock import patch
+
+
+class TestFastJSONHelpers(unittest.TestCase):
+    """dumps_bytes / loads 헬퍼 테스트"""
+
+    def test_round_trip_keeps_korean_unescaped(self):
+        """한국어는 이스케이프 없이 UTF-8로 직렬화"""
+        from services import json_provider
+
+        data = {'transcript': '안녕하세요', 'items': [1, 2, 3]}
+        encoded = json_provider.dumps_bytes(data)
+
+        self.assertIn('안녕하세요'.encode('utf-8'), encoded)
+        self.assertEqual(json_provider.loads(encoded), data)
+
+    def test_stdlib_fallback(self):
+        """orjson 미설치 시 표준 json으로 동작"""
+        from services import json_provider
+
+        with patch.object(json_provider, 'orjson', None):
+            encoded = json_provider.dumps_bytes({'a': '가'})
+            self.assertEqual(encoded, '{"a":"가"}'.encode('utf-8'))
+            self.assertEqual(json_provider.loads(encoded), {'a': '가'})
+
+    def test_invalid_json_raises_value_error(self):
+        """잘못된 JSON은 ValueError"""
+        from services import json_provider
+
+        with self.assertRaises(ValueError):
+            json_provider.loads(b'{broken')
+
+
+class TestFastJSONProvider(unittest.TestCase):
+    """Flask 앱 JSON 프로바이더 테스트"""
+
+    def setUp(self):
+        from app import create_app
+        self.app = create_app({'TESTING': True})
+
+    def test_app_uses_fast_provider(self):
+        """create_app이 FastJSONProvider를 설정"""
+        from services.json_provider import FastJSONProvider
+
+        self.assertIsInstance(self.app.json, FastJSONProvider)
+
+    def test_jsonify_matches_flask_types(self):
+        """datetime/UUID 직렬화가 Flask 기본 형식과 일치"""
+        from flask import jsonify
+
+        value = uuid.UUID(int=1)
+        when = datetime.datetime(2024, 1, 2, 3, 4, 5)
+        with self.app.app_context():
+            res = jsonify({'id': value, 'when': when, 'text': '자막'})
+
+        self.assertEqual(res.mimetype, 'application/json')
+        data = res.get_json()
+        self.assertEqual(data['id'], str(value))
+        self.assertEqual(data['when'], 'Tue, 02 Jan 2024 03:04:05 GMT')
+        self.assertIn('자막'.encode('utf-8'), res.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
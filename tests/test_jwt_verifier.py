@@ -0,0 +1,167 @@
+"""
+JWT 로컬 검증 단위 테스트
+서명/만료 검증, 검증 캐시, 폐기 확인 주기, 원격 검증 대체 경로 확인
+"""
+import os
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import jwt
+
+from services import jwt_verifier
+from services.exceptions import AuthenticationError, TokenExpiredError, TokenInvalidError
+
+SECRET = 'test-jwt-secret-with-enough-length-for-hs256'
+
+
+def _make_token(sub='user-1', exp_offset=3600, secret=SECRET, aud='authenticated'):
+    return jwt.encode(
+        {'sub': sub, 'aud': aud, 'exp': int(time.time()) + exp_offset, 'role': 'authenticated'},
+        secret,
+        algorithm='HS256',
+    )
+
+
+class TestJWTVerifier(unittest.TestCase):
+    """verify_token / decode_token 테스트"""
+
+    def setUp(self):
+        jwt_verifier.clear_token_cache()
+        self.env = patch.dict(os.environ, {
+            'SUPABASE_JWT_SECRET': SECRET,
+            'AUTH_TOKEN_CACHE_TTL': '60',
+            'AUTH_REVOCATION_CHECK_INTERVAL': '300',
+            'AUTH_LOCAL_JWT': '1',
+        })
+        self.env.start()
+        self.remote = MagicMock(return_value='user-1')
+
+    def tearDown(self):
+        self.env.stop()
+        jwt_verifier.clear_token_cache()
+
+    def test_valid_token_verified_locally(self):
+        """유효한 토큰은 원격 호출 없이 검증"""
+        user_id = jwt_verifier.verify_token(_make_token(), self.remote)
+
+        self.assertEqual(user_id, 'user-1')
+        self.remote.assert_not_called()
+
+    def test_expired_token(self):
+        with self.assertRaises(TokenExpiredError):
+            jwt_verifier.verify_token(_make_token(exp_offset=-60), self.remote)
+
+    def test_bad_signature(self):
+        with self.assertRaises(TokenInvalidError):
+            jwt_verifier.verify_token(_make_token(secret='another-secret-with-enough-length-x'), self.remote)
+
+    def test_wrong_audience(self):
+        with self.assertRaises(TokenInvalidError):
+            jwt_verifier.verify_token(_make_token(aud='anon'), self.remote)
+
+    def test_malformed_token(self):
+        with self.assertRaises(TokenInvalidError):
+            jwt_verifier.verify_token('not-a-jwt', self.remote)
+
+    def test_cached_token_skips_signature_check(self):
+        """캐시 TTL 내에는 서명 검증을 반복하지 않음"""
+        token = _make_token()
+        with patch.object(jwt_verifier, 'decode_token', wraps=jwt_verifier.decode_token) as decode:
+            jwt_verifier.verify_token(token, self.remote)
+            jwt_verifier.verify_token(token, self.remote)
+
+        self.assertEqual(decode.call_count, 1)
+
+    def test_falls_back_to_remote_without_key(self):
+        """서명 키가 없으면 원격 검증으로 대체"""
+        with patch.dict(os.environ, {'SUPABASE_JWT_SECRET': ''}):
+            user_id = jwt_verifier.verify_token(_make_token(), self.remote)
+
+        self.assertEqual(user_id, 'user-1')
+        self.remote.assert_called_once()
+
+    def test_local_verification_disabled(self):
+        """AUTH_LOCAL_JWT=0이면 매 요청 원격 검증"""
+        token = _make_token()
+        with patch.dict(os.environ, {'AUTH_LOCAL_JWT': '0'}):
+            jwt_verifier.verify_token(token, self.remote)
+            jwt_verifier.verify_token(token, self.remote)
+
+        self.assertEqual(self.remote.call_count, 2)
+
+    def test_revocation_checked_after_interval(self):
+        """폐기 확인 주기가 지나면 원격 확인, 폐기된 토큰은 이후에도 거부"""
+        token = _make_token()
+        jwt_verifier.verify_token(token, self.remote)
+
+        revoked = MagicMock(side_effect=TokenInvalidError())
+        with patch.object(jwt_verifier.time, 'time', return_value=time.time() + 301):
+            with self.assertRaises(TokenInvalidError):
+                jwt_verifier.verify_token(token, revoked)
+            with self.assertRaises(TokenInvalidError):
+                jwt_verifier.verify_token(token, self.remote)
+
+        revoked.assert_called_once()
+        self.remote.assert_not_called()
+
+    def test_revocation_check_network_error_keeps_local_result(self):
+        """폐기 확인 중 네트워크 오류는 로컬 검증 결과 유지"""
+        token = _make_token()
+        jwt_verifier.verify_token(token, self.remote)
+
+        failing = MagicMock(side_effect=AuthenticationError('timeout', 'AUTH_FAILED'))
+        with patch.object(jwt_verifier.time, 'time', return_value=time.time() + 301):
+            self.assertEqual(jwt_verifier.verify_token(token, failing), 'user-1')
+            self.assertEqual(jwt_verifier.verify_token(token, failing), 'user-1')
+
+        failing.assert_called_once()
+
+    def test_mark_token_revoked(self):
+        """로그아웃된 토큰은 거부"""
+        token = _make_token()
+        jwt_verifier.verify_token(token, self.remote)
+        jwt_verifier.mark_token_revoked(token)
+
+        with self.assertRaises(TokenInvalidError):
+            jwt_verifier.verify_token(token, self.remote)
+
+
+class TestValidateToken(unittest.TestCase):
+    """supabase_service._validate_token 연동 테스트"""
+
+    def setUp(self):
+        jwt_verifier.clear_token_cache()
+        from app import create_app
+        self.app = create_app({'TESTING': True})
+
+    def tearDown(self):
+        jwt_verifier.clear_token_cache()
+
+    def test_sets_user_on_g_without_remote_call(self):
+        from flask import g
+        from services import supabase_service
+
+        token = _make_token(sub='user-42')
+        with patch.dict(os.environ, {'SUPABASE_JWT_SECRET': SECRET}), \
+                patch.object(supabase_service, 'get_supabase') as get_supabase, \
+                self.app.test_request_context():
+            result = supabase_service._validate_token(token)
+            self.assertTrue(result['valid'])
+            self.assertEqual(g.user_id, 'user-42')
+
+        get_supabase.assert_not_called()
+
+    def test_expired_token_code(self):
+        from services import supabase_service
+
+        with patch.dict(os.environ, {'SUPABASE_JWT_SECRET': SECRET}), \
+                self.app.test_request_context():
+            result = supabase_service._validate_token(_make_token(exp_offset=-60))
+
+        self.assertFalse(result['valid'])
+        self.assertEqual(result['code'], 'TOKEN_EXPIRED')
+
+
+if __name__ == '__main__':
+    unittest.main()
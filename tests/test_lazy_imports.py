@@ -0,0 +1,60 @@
+"""
+SDK 지연 로딩 테스트
+앱 import 시 무거운 SDK를 불러오지 않는지, 미리 불러오기 설정이 동작하는지 확인
+"""
+import json
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+from services import lazy_imports
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestColdStart(unittest.TestCase):
+    """앱 import 테스트"""
+
+    def test_app_import_does_not_load_heavy_sdks(self):
+        code = ("import json, sys, app; "
+                f"print(json.dumps([m for m in {tuple(lazy_imports.HEAVY_MODULES)!r} if m in sys.modules]))")
+        env = dict(os.environ, PREWARM='0')
+        out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env,
+                             capture_output=True, text=True, timeout=120, check=True).stdout
+
+        self.assertEqual(json.loads(out.strip().splitlines()[-1]), [])
+
+
+class TestLazyImports(unittest.TestCase):
+    """load / prewarm 테스트"""
+
+    def test_load_caches_module(self):
+        module = lazy_imports.load('json')
+
+        self.assertIs(module, json)
+        self.assertTrue(lazy_imports.is_loaded('json'))
+
+    def test_prewarm_skips_missing_modules(self):
+        elapsed = lazy_imports.prewarm(['json', 'module_that_does_not_exist'])
+
+        self.assertEqual(list(elapsed), ['json'])
+
+    def test_prewarm_can_be_disabled(self):
+        with patch.dict(os.environ, {'PREWARM': '0'}):
+            self.assertIsNone(lazy_imports.start_prewarm())
+
+    def test_prewarm_starts_once(self):
+        with patch.object(lazy_imports, '_prewarm_thread', None), \
+                patch.object(lazy_imports, 'prewarm', return_value={}) as prewarm:
+            first = lazy_imports.start_prewarm(delay=0)
+            second = lazy_imports.start_prewarm(delay=0)
+            first.join(timeout=5)
+
+        self.assertIs(first, second)
+        prewarm.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+부하 테스트 하네스 테스트
+대역 서버 응답 형식, 앱의 외부 엔드포인트 교체, 백분위수 계산 확인
+"""
+import json
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from benchmarks.load_test import SCENARIOS, parse_profile, percentile
+from benchmarks.stub_servers import StubConfig, StubServer
+from services import content_service
+
+
+class TestStubServer(unittest.TestCase):
+    """대역 서버 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stub = StubServer(config=StubConfig(llm_latency=0, youtube_latency=0, supabase_latency=0)).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub.shutdown()
+        cls.stub.server_close()
+
+    def test_supadata_through_url_override(self):
+        with patch.object(content_service, 'SUPADATA_API_URL', self.stub.base_url + '/supadata/transcript'):
+            text = content_service.get_transcript_via_supadata('abcdefghijk', 'stub')
+
+        self.assertIn('성능 측정', text)
+
+    def test_watch_page_fallback_through_url_override(self):
+        with patch.object(content_service, 'YOUTUBE_WATCH_URL', self.stub.base_url + '/watch'):
+            text = content_service._get_transcript_from_watch_page('abcdefghijk')
+
+        self.assertIsInstance(text, str)
+        self.assertIn('자막 문장 0', text)
+
+    def test_chat_completion_streaming(self):
+        res = requests.post(self.stub.base_url + '/v1/chat/completions', json={
+            'model': 'gpt-4o-mini', 'stream': True, 'messages': [{'role': 'user', 'content': '요약'}]
+        }, timeout=10)
+
+        events = [line[len('data: '):] for line in res.text.splitlines() if line.startswith('data: ')]
+        self.assertEqual(events[-1], '[DONE]')
+        last = json.loads(events[-2])
+        self.assertEqual(last['choices'][0]['finish_reason'], 'stop')
+        self.assertEqual(last['usage']['completion_tokens'], StubConfig.llm_tokens)
+
+    def test_usage_rpc(self):
+        res = requests.post(self.stub.base_url + '/rest/v1/rpc/consume_usage', json={'p_user_id': 'u'}, timeout=10)
+
+        self.assertTrue(res.json()['consumed'])
+        self.assertEqual(self.stub.counts().get('supabase_rest'), 1)
+
+
+class TestHarnessHelpers(unittest.TestCase):
+    """측정 보조 함수 테스트"""
+
+    def test_percentile_nearest_rank(self):
+        values = sorted(float(i) for i in range(1, 101))
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile(values, 100), 100.0)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_cold_scenario_uses_unique_video_ids(self):
+        build = SCENARIOS['generate-cold'].build
+        urls = {build(i, 'ab12')[2]['url'] for i in range(100)}
+
+        self.assertEqual(len(urls), 100)
+        for url in urls:
+            self.assertEqual(content_service.get_video_id(url)[:4], 'ab12')
+
+    def test_parse_profile(self):
+        self.assertEqual(parse_profile('2x4'), (2, 4))
+        self.assertEqual(parse_profile('3'), (3, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
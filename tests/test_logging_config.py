@@ -0,0 +1,144 @@
+"""
+구조화 로깅 테스트
+JSON 포맷, 요청 ID, 로거별 샘플링, 비동기 핸들러, 지연 포맷 확인
+"""
+import concurrent.futures
+import io
+import json
+import logging
+import unittest
+from unittest.mock import patch
+
+from services import logging_config
+from services.logging_config import ServiceLogger
+
+
+class LoggingTestCase(unittest.TestCase):
+    """stdout을 가로채 공용 핸들러를 구성하고 테스트 후 원상 복구"""
+
+    env = {}
+
+    def setUp(self):
+        self.root = logging.getLogger()
+        self._saved = (list(self.root.handlers), self.root.level)
+        self.output = io.StringIO()
+        with patch('sys.stdout', self.output), patch.dict('os.environ', self.env):
+            logging_config.configure_logging(fmt='json')
+
+    def tearDown(self):
+        logging_config.stop_logging()
+        self.root.handlers[:] = self._saved[0]
+        self.root.setLevel(self._saved[1])
+        logging_config._configured_format = None
+        logging_config._sample_rates = {}
+
+    def lines(self):
+        logging_config.stop_logging()
+        return [json.loads(line) for line in self.output.getvalue().splitlines()]
+
+
+class TestJSONLogging(LoggingTestCase):
+    """JSON 포맷과 비동기 출력 테스트"""
+
+    def test_service_log_is_json_line(self):
+        ServiceLogger('ContentService').info("자막 추출: %s", 'abc')
+
+        entry = self.lines()[0]
+        self.assertEqual(entry['logger'], 'ContentService')
+        self.assertEqual(entry['message'], '자막 추출: abc')
+        self.assertEqual(entry['level'], 'INFO')
+        self.assertEqual(entry['request_id'], '-')
+
+    def test_exception_included(self):
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            ServiceLogger('AIService').exception("생성 실패")
+
+        self.assertIn('ValueError: boom', self.lines()[0]['exc_info'])
+
+    def test_disabled_level_is_not_formatted(self):
+        class Expensive:
+            formatted = 0
+
+            def __str__(self):
+                Expensive.formatted += 1
+                return 'x'
+
+        ServiceLogger('ContentService').debug("상세: %s", Expensive())
+
+        self.assertEqual(Expensive.formatted, 0)
+        self.assertEqual(self.lines(), [])
+
+
+    def test_forked_child_drops_parent_queue(self):
+        """fork 후 자식은 새 큐를 사용해 부모 큐에 남은 로그를 다시 기록하지 않음"""
+        parent = logging_config._listener
+        parent.stop()
+        parent.queue.put(logging.makeLogRecord({'msg': '부모 로그', 'levelno': logging.INFO,
+                                                'levelname': 'INFO'}))
+
+        logging_config._restart_listener()
+        ServiceLogger('ContentService').info("자식 로그")
+
+        self.assertIsNot(logging_config._listener, parent)
+        self.assertEqual([entry['message'] for entry in self.lines()], ['자식 로그'])
+
+class TestSampling(LoggingTestCase):
+    """로거별 샘플링 테스트"""
+
+    env = {'LOG_SAMPLE': 'ContentService=0,werkzeug=0'}
+
+    def test_sampled_logger_keeps_warnings(self):
+        service = ServiceLogger('ContentService')
+        for _ in range(5):
+            service.info("캐시 적중")
+        service.warning("폴백 사용")
+        logging.getLogger('werkzeug').info("GET / 200")
+        ServiceLogger('AIService').info("생성 완료")
+
+        messages = [entry['message'] for entry in self.lines()]
+        self.assertEqual(messages, ['폴백 사용', '생성 완료'])
+
+
+class TestRequestId(LoggingTestCase):
+    """요청 ID 테스트"""
+
+    def setUp(self):
+        from app import create_app
+        super().setUp()
+        self.app = create_app({'TESTING': True})
+        self.client = self.app.test_client()
+
+    def test_incoming_id_is_echoed_and_logged(self):
+        @self.app.route('/_log_probe')
+        def _log_probe():
+            ServiceLogger('ContentService').info("probe")
+            return 'ok'
+
+        res = self.client.get('/_log_probe', headers={'X-Request-ID': 'req-123'})
+
+        self.assertEqual(res.headers['X-Request-ID'], 'req-123')
+        entry = next(e for e in self.lines() if e['message'] == 'probe')
+        self.assertEqual(entry['request_id'], 'req-123')
+
+    def test_invalid_id_replaced(self):
+        res = self.client.get('/api/providers', headers={'X-Request-ID': 'bad id "quoted"'})
+
+        self.assertEqual(len(res.headers['X-Request-ID']), 32)
+
+    def test_bind_request_id_for_worker_threads(self):
+        token = logging_config._request_id.set('batch-1')
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                bound = executor.submit(logging_config.bind_request_id(logging_config.get_request_id)).result()
+                unbound = executor.submit(logging_config.get_request_id).result()
+        finally:
+            logging_config._request_id.reset(token)
+
+        self.assertEqual(bound, 'batch-1')
+        self.assertIsNone(unbound)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+반복 조회 캐시 단위 테스트
+요청 범위 메모, TTL 프로세스 캐시, 쓰기 시 무효화 확인
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+from services import lookup_cache
+
+
+class TestLookupCache(unittest.TestCase):
+    """get_or_load / invalidate 테스트"""
+
+    def setUp(self):
+        lookup_cache.clear()
+        self.app = Flask(__name__)
+
+    def tearDown(self):
+        lookup_cache.clear()
+
+    def test_process_cache_across_requests(self):
+        """TTL 내에는 다른 요청에서도 다시 조회하지 않음"""
+        loader = MagicMock(return_value=True)
+
+        with self.app.test_request_context():
+            self.assertTrue(lookup_cache.get_or_load('is_admin', 'user-1', loader))
+        with self.app.test_request_context():
+            self.assertTrue(lookup_cache.get_or_load('is_admin', 'user-1', loader))
+
+        loader.assert_called_once()
+
+    def test_request_scope_only_namespace(self):
+        """TTL 0 네임스페이스는 요청 안에서만 메모"""
+        loader = MagicMock(return_value={'usage_count': 3})
+
+        with self.app.test_request_context():
+            lookup_cache.get_or_load('usage', 'user-1', loader)
+            lookup_cache.get_or_load('usage', 'user-1', loader)
+        with self.app.test_request_context():
+            lookup_cache.get_or_load('usage', 'user-1', loader)
+
+        self.assertEqual(loader.call_count, 2)
+
+    def test_expired_entry_is_reloaded(self):
+        loader = MagicMock(return_value=['style'])
+
+        lookup_cache.get_or_load('custom_styles', 'user-1', loader)
+        with patch.object(lookup_cache.time, 'monotonic', return_value=lookup_cache.time.monotonic() + 3600):
+            lookup_cache.get_or_load('custom_styles', 'user-1', loader)
+
+        self.assertEqual(loader.call_count, 2)
+
+    def test_invalidate(self):
+        """쓰기 후 무효화하면 다시 조회"""
+        loader = MagicMock(return_value=['style'])
+
+        with self.app.test_request_context():
+            lookup_cache.get_or_load('custom_styles', 'user-1', loader)
+            lookup_cache.invalidate('custom_styles', 'user-1')
+            lookup_cache.get_or_load('custom_styles', 'user-1', loader)
+
+        self.assertEqual(loader.call_count, 2)
+
+    def test_errors_are_not_cached(self):
+        loader = MagicMock(side_effect=[RuntimeError('db down'), True])
+
+        with self.assertRaises(RuntimeError):
+            lookup_cache.get_or_load('is_admin', 'user-1', loader)
+        self.assertTrue(lookup_cache.get_or_load('is_admin', 'user-1', loader))
+
+    def test_returned_value_is_a_copy(self):
+        """호출자가 결과를 수정해도 캐시는 유지"""
+        styles = lookup_cache.get_or_load('custom_styles', 'user-1', lambda: [{'id': 'a'}])
+        styles.append({'id': 'b'})
+
+        self.assertEqual(lookup_cache.get_or_load('custom_styles', 'user-1', MagicMock()), [{'id': 'a'}])
+
+
+class TestSupabaseLookups(unittest.TestCase):
+    """supabase_service 조회 함수 캐시 연동 테스트"""
+
+    def setUp(self):
+        lookup_cache.clear()
+
+    def tearDown(self):
+        lookup_cache.clear()
+
+    def test_is_admin_queried_once(self):
+        from services import supabase_service
+
+        client = MagicMock()
+        client.table.return_value.select.return_value.eq.return_value.limit.return_value \
+            .execute.return_value.data = [{'user_id': 'admin-1'}]
+
+        with patch.object(supabase_service, 'get_supabase', return_value=client):
+            self.assertTrue(supabase_service.is_admin('admin-1'))
+            self.assertTrue(supabase_service.is_admin('admin-1'))
+
+        self.assertEqual(client.table.call_count, 1)
+
+    def test_custom_style_write_invalidates(self):
+        from services import supabase_service
+
+        client = MagicMock()
+        client.table.return_value.select.return_value.eq.return_value.order.return_value \
+            .execute.return_value.data = []
+
+        with patch.object(supabase_service, 'get_supabase', return_value=client):
+            supabase_service.get_custom_styles('user-1')
+            supabase_service.save_custom_style('user-1', {'id': 's1', 'name': 'n', 'prompt': 'p'})
+            supabase_service.get_custom_styles('user-1')
+
+        selects = [c for c in client.table.return_value.select.call_args_list]
+        self.assertEqual(len(selects), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
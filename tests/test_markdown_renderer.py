@@ -0,0 +1,129 @@
+"""
+마크다운 렌더러 단위 테스트
+백엔드 선택, 렌더링 캐시, 스레드 안전성 확인
+"""
+import threading
+import unittest
+from unittest.mock import patch
+
+
+SAMPLE = "# 제목\n\n| a | b |\n|---|---|\n| 1 | 2 |\n\n```python\nprint('x')\n```\n"
+
+
+class TestMarkdownRenderer(unittest.TestCase):
+    """render_markdown 테스트"""
+
+    def setUp(self):
+        from services import markdown_renderer
+        markdown_renderer.clear_render_cache()
+
+    def test_empty_text_returns_empty_string(self):
+        from services.markdown_renderer import render_markdown
+
+        self.assertEqual(render_markdown(''), '')
+        self.assertEqual(render_markdown(None), '')
+
+    def test_python_markdown_backend_renders_tables_and_code(self):
+        """Python-Markdown 백엔드: 테이블/코드 블록 렌더링"""
+        from services import markdown_renderer
+
+        with patch.object(markdown_renderer, 'MARKDOWN_BACKEND', 'python-markdown'):
+            self.assertEqual(markdown_renderer.get_backend_name(), 'python-markdown')
+            html = markdown_renderer.render_markdown(SAMPLE)
+
+        self.assertIn('<h1', html)
+        self.assertIn('<table>', html)
+        self.assertIn('<code', html)
+
+    def test_python_markdown_renderer_is_reset_between_calls(self):
+        """재사용되는 렌더러에 이전 문서 상태가 남지 않음"""
+        from services import markdown_renderer
+
+        with patch.object(markdown_renderer, 'MARKDOWN_BACKEND', 'python-markdown'):
+            first = markdown_renderer.render_markdown('# 첫 문서')
+            second = markdown_renderer.render_markdown('두 번째 문서')
+
+        self.assertIn('첫 문서', first)
+        self.assertNotIn('첫 문서', second)
+
+    @unittest.skipIf(__import__('services.markdown_renderer', fromlist=['MarkdownIt']).MarkdownIt is None,
+                     'markdown-it-py 미설치')
+    def test_markdown_it_backend_renders_tables_and_code(self):
+        """CommonMark(markdown-it-py) 백엔드: 테이블/코드 블록 렌더링"""
+        from services import markdown_renderer
+
+        with patch.object(markdown_renderer, 'MARKDOWN_BACKEND', 'markdown-it'):
+            self.assertEqual(markdown_renderer.get_backend_name(), 'markdown-it')
+            html = markdown_renderer.render_markdown(SAMPLE)
+
+        self.assertIn('<h1>', html)
+        self.assertIn('<table>', html)
+        self.assertIn('<code class="language-python">', html)
+
+    def test_default_backend_is_python_markdown(self):
+        """markdown-it-py가 설치되어 있어도 기본은 Python-Markdown"""
+        import importlib
+        from services import markdown_renderer
+
+        with patch.dict('os.environ'):
+            import os
+            os.environ.pop('MARKDOWN_BACKEND', None)
+            reloaded = importlib.reload(markdown_renderer)
+            try:
+                self.assertEqual(reloaded.MARKDOWN_BACKEND, 'python-markdown')
+                self.assertEqual(reloaded.get_backend_name(), 'python-markdown')
+            finally:
+                importlib.reload(markdown_renderer)
+
+    def test_auto_falls_back_without_markdown_it(self):
+        """markdown-it-py 미설치 시 Python-Markdown 사용"""
+        from services import markdown_renderer
+
+        with patch.object(markdown_renderer, 'MarkdownIt', None), \
+                patch.object(markdown_renderer, 'MARKDOWN_BACKEND', 'auto'):
+            self.assertEqual(markdown_renderer.get_backend_name(), 'python-markdown')
+
+    def test_same_content_is_served_from_cache(self):
+        """동일 콘텐츠는 다시 렌더링하지 않음"""
+        from services import markdown_renderer
+
+        with patch.object(markdown_renderer, '_render_uncached',
+                          wraps=markdown_renderer._render_uncached) as render:
+            first = markdown_renderer.render_markdown(SAMPLE)
+            second = markdown_renderer.render_markdown(SAMPLE)
+
+        self.assertEqual(first, second)
+        self.assertEqual(render.call_count, 1)
+
+    def test_cache_is_bounded(self):
+        """캐시 크기 상한 유지 (오래된 항목부터 제거)"""
+        from services import markdown_renderer
+
+        with patch.object(markdown_renderer, 'RENDER_CACHE_MAX_ENTRIES', 3):
+            for i in range(5):
+                markdown_renderer.render_markdown(f'문서 {i}')
+            self.assertEqual(len(markdown_renderer._cache), 3)
+
+    def test_concurrent_rendering(self):
+        """여러 스레드에서 동시에 렌더링해도 결과가 섞이지 않음"""
+        from services import markdown_renderer
+
+        results = {}
+
+        def worker(n):
+            for _ in range(20):
+                results[n] = markdown_renderer.render_markdown(f'# 문서 {n}\n\n본문 {n}')
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for n, html in results.items():
+            self.assertIn(f'문서 {n}', html)
+            self.assertIn(f'본문 {n}', html)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+토큰/비용 사용량 계측 테스트
+비용 추정, 원장 이벤트 생성, 토큰/비용 기준 한도 확인
+"""
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+import config
+from services.usage import metering
+from services.usage.usage_service import UsageService
+
+
+class TestEstimateCost(unittest.TestCase):
+    """estimate_cost 테스트"""
+
+    def test_configured_pricing(self):
+        with patch.dict(config.MODEL_PRICING, {'test/model': {'prompt': 1.0, 'completion': 2.0}}):
+            cost = metering.estimate_cost('test/model', 1_000_000, 500_000)
+        self.assertAlmostEqual(cost, 2.0)
+
+    def test_litellm_pricing(self):
+        litellm = MagicMock()
+        litellm.cost_per_token.return_value = (0.001, 0.002)
+        with patch.dict(sys.modules, {'litellm': litellm}):
+            self.assertAlmostEqual(metering.estimate_cost('openai/gpt-4o', 100, 100), 0.003)
+
+    def test_unknown_model_is_free(self):
+        litellm = MagicMock()
+        litellm.cost_per_token.side_effect = Exception('unknown model')
+        with patch.dict(sys.modules, {'litellm': litellm}):
+            self.assertEqual(metering.estimate_cost('nobody/knows', 100, 100), 0.0)
+
+
+class TestBuildEvent(unittest.TestCase):
+    """build_event / record 테스트"""
+
+    def test_event_fields(self):
+        with patch.object(metering, 'estimate_cost', return_value=0.0123456789):
+            event = metering.build_event('user-1', 'gpt-4o', 'blog', {
+                'prompt_tokens': 100, 'completion_tokens': 20, 'total_tokens': 120
+            }, kind='batch')
+
+        self.assertEqual(event['user_id'], 'user-1')
+        self.assertEqual((event['model'], event['style'], event['kind']), ('gpt-4o', 'blog', 'batch'))
+        self.assertEqual(event['total_tokens'], 120)
+        self.assertEqual(event['cost_usd'], 0.012346)
+        self.assertTrue(event['event_id'])
+
+    def test_no_event_without_tokens_or_user(self):
+        self.assertIsNone(metering.build_event('user-1', 'gpt-4o', 'blog', None))
+        self.assertIsNone(metering.build_event(None, 'gpt-4o', 'blog', {'total_tokens': 1}))
+
+    def test_record_enqueues_event(self):
+        writer = MagicMock()
+        with patch.object(metering, 'get_supabase', return_value=MagicMock()), \
+                patch.object(metering, 'get_meter_writer', return_value=writer), \
+                patch.object(metering, 'estimate_cost', return_value=0.0):
+            metering.record('user-1', 'gpt-4o', 'blog', {'prompt_tokens': 1, 'completion_tokens': 1})
+
+        self.assertEqual(writer.enqueue.call_args[0][0]['total_tokens'], 2)
+
+    def test_negative_tokens_are_clamped(self):
+        with patch.object(metering, 'estimate_cost', return_value=0.0):
+            event = metering.build_event('user-1', 'gpt-4o', 'blog', {
+                'prompt_tokens': -100, 'completion_tokens': 5, 'total_tokens': -95
+            })
+
+        self.assertEqual((event['prompt_tokens'], event['total_tokens']), (0, 0))
+
+    def test_record_settles_request_reservation(self):
+        """require_usage가 예약한 ID를 이벤트에 담아 기록 시 정산"""
+        from flask import Flask, g
+
+        writer = MagicMock()
+        with Flask(__name__).test_request_context('/'), \
+                patch.object(metering, 'get_supabase', return_value=MagicMock()), \
+                patch.object(metering, 'get_meter_writer', return_value=writer), \
+                patch.object(metering, 'estimate_cost', return_value=0.0):
+            g.usage = {'quota_mode': 'tokens', 'reservation_id': 'res-1'}
+            metering.record('user-1', 'gpt-4o', 'blog', {'total_tokens': 1})
+
+        self.assertEqual(writer.enqueue.call_args[0][0]['reservation_id'], 'res-1')
+
+    def test_record_disabled(self):
+        writer = MagicMock()
+        with patch.dict('os.environ', {'USAGE_METERING': '0'}), \
+                patch.object(metering, 'get_meter_writer', return_value=writer):
+            self.assertIsNone(metering.record('user-1', 'gpt-4o', 'blog', {'total_tokens': 1}))
+
+        writer.enqueue.assert_not_called()
+
+
+class TestMeteredQuota(unittest.TestCase):
+    """토큰/비용 기준 한도 테스트"""
+
+    def test_metered_to_usage_tokens(self):
+        with patch.object(config, 'DAILY_TOKEN_QUOTA', 1000):
+            usage = metering.metered_to_usage({'total_tokens': 750}, 'tokens')
+
+        self.assertTrue(usage['can_use'])
+        self.assertEqual(usage['usage_count'], 25)
+        self.assertEqual(usage['quota_mode'], 'tokens')
+
+    def test_metered_to_usage_cost_exhausted(self):
+        with patch.object(config, 'DAILY_COST_QUOTA', 0.5):
+            usage = metering.metered_to_usage({'cost_usd': 0.5}, 'cost')
+
+        self.assertFalse(usage['can_use'])
+        self.assertEqual(usage['usage_count'], 0)
+
+    def _consume(self, totals, reserved=None, mode='tokens'):
+        reservation = None if reserved is None else {**(totals or {}), 'reserved': reserved}
+        with patch.object(config, 'USAGE_QUOTA_MODE', mode), \
+                patch.object(config, 'DAILY_TOKEN_QUOTA', 1000), \
+                patch.object(config, 'USAGE_RESERVE_TOKENS', 100), \
+                patch('services.usage.usage_service.is_supabase_enabled', return_value=True), \
+                patch('services.usage.usage_service.is_admin', return_value=False), \
+                patch('services.usage.usage_service.reserve_metered_usage', return_value=reservation) as reserve, \
+                patch('services.usage.usage_service.get_metered_usage', return_value=totals), \
+                patch('services.usage.usage_service.consume_usage') as consume_usage:
+            result = UsageService.consume('user-1')
+        self.reserve = reserve
+        return result, consume_usage
+
+    def test_consume_reserves_under_token_quota(self):
+        (consumed, usage), consume_usage = self._consume({'total_tokens': 110}, reserved=True)
+
+        self.assertTrue(consumed)
+        self.assertTrue(usage['reservation_id'])
+        self.assertEqual(self.reserve.call_args[0][2:5], ('tokens', 100, 1000))
+        consume_usage.assert_not_called()
+
+    def test_consume_over_token_quota(self):
+        (consumed, usage), _ = self._consume({'total_tokens': 5000}, reserved=False)
+
+        self.assertFalse(consumed)
+        self.assertNotIn('reservation_id', usage)
+        self.assertEqual(usage['usage_count'], 0)
+
+    def test_checks_totals_without_reservation_rpc(self):
+        """예약 RPC가 없으면 예약 없이 오늘 누적량으로 확인"""
+        (consumed, usage), consume_usage = self._consume({'total_tokens': 10})
+
+        self.assertTrue(consumed)
+        self.assertNotIn('reservation_id', usage)
+        consume_usage.assert_not_called()
+
+    def test_falls_back_to_count_without_ledger(self):
+        """원장 RPC를 사용할 수 없으면 횟수 기준으로 차감"""
+        _, consume_usage = self._consume(None)
+        consume_usage.assert_called_once_with('user-1')
+
+    def test_refund_releases_reservation(self):
+        usage = {'quota_mode': 'tokens', 'can_use': True, 'reservation_id': 'res-1'}
+        with patch.object(config, 'USAGE_QUOTA_MODE', 'tokens'), \
+                patch('services.usage.usage_service.is_supabase_enabled', return_value=True), \
+                patch('services.usage.usage_service.release_metered_usage') as release, \
+                patch('services.usage.usage_service.get_metered_usage', return_value={'total_tokens': 0}), \
+                patch('services.usage.usage_service.refund_usage') as refund_usage:
+            refunded = UsageService.refund('user-1', usage)
+
+        release.assert_called_once_with('res-1')
+        refund_usage.assert_not_called()
+        self.assertTrue(refunded['can_use'])
+
+    def test_metered_refund_is_noop(self):
+        usage = {'quota_mode': 'tokens', 'can_use': True}
+        with patch('services.usage.usage_service.is_supabase_enabled', return_value=True), \
+                patch('services.usage.usage_service.refund_usage') as refund_usage:
+            self.assertIs(UsageService.refund('user-1', usage), usage)
+
+        refund_usage.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Prometheus 지표 테스트
+라벨 변환, LLM/자막/캐시 기록, /metrics 노출과 멀티프로세스 합산 확인
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from services import metrics
+
+try:
+    import prometheus_client
+except ModuleNotFoundError:
+    prometheus_client = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _sample(name, labels):
+    return prometheus_client.REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestLabels(unittest.TestCase):
+    """라벨 변환 테스트"""
+
+    def test_unknown_model_is_other(self):
+        self.assertEqual(metrics.model_label('deepseek/deepseek-chat'), 'deepseek/deepseek-chat')
+        self.assertEqual(metrics.model_label('anything-the-client-sent'), 'other')
+
+    def test_supabase_resource(self):
+        self.assertEqual(metrics.supabase_resource('/rest/v1/ie_usage'), 'ie_usage')
+        self.assertEqual(metrics.supabase_resource('/rest/v1/rpc/consume_usage'), 'rpc/consume_usage')
+        self.assertEqual(metrics.supabase_resource('/auth/v1/user'), 'auth/user')
+        self.assertEqual(metrics.supabase_resource('/elsewhere'), 'other')
+
+
+@unittest.skipIf(prometheus_client is None, 'prometheus_client 미설치')
+class TestRecording(unittest.TestCase):
+    """지표 기록 테스트"""
+
+    def test_llm_tokens_by_provider_and_model(self):
+        labels = {'provider': 'deepseek', 'model': 'deepseek/deepseek-chat', 'kind': 'prompt'}
+        before = _sample('ie_llm_tokens_total', labels)
+
+        metrics.observe_llm('deepseek/deepseek-chat', 1.5, {'prompt_tokens': 100, 'completion_tokens': 20})
+
+        self.assertEqual(_sample('ie_llm_tokens_total', labels) - before, 100)
+
+    def test_transcript_cache_hit_counted(self):
+        labels = {'tier': 'transcript_file', 'result': 'hit'}
+        before = _sample('ie_cache_lookups_total', labels)
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                patch('services.content_service.CACHE_DIR', cache_dir):
+            from services import content_service
+            content_service._save_cache('vid00000001', 'transcript', '자막')
+            self.assertEqual(content_service._load_cache('vid00000001', 'transcript'), '자막')
+
+        self.assertEqual(_sample('ie_cache_lookups_total', labels) - before, 1)
+
+    def test_in_flight_returns_to_zero(self):
+        with metrics.track_generation('generate'):
+            self.assertGreaterEqual(_sample('ie_generations_in_flight', {'kind': 'generate'}), 1)
+        self.assertEqual(_sample('ie_generations_in_flight', {'kind': 'generate'}), 0)
+
+    def test_disabled_records_nothing(self):
+        labels = {'source': 'supadata', 'outcome': 'failure'}
+        before = _sample('ie_transcript_results_total', labels)
+        with patch.dict('os.environ', {'METRICS_ENABLED': '0'}):
+            metrics.transcript_result('supadata', False)
+
+        self.assertEqual(_sample('ie_transcript_results_total', labels), before)
+
+
+@unittest.skipIf(prometheus_client is None, 'prometheus_client 미설치')
+class TestMetricsEndpoint(unittest.TestCase):
+    """/metrics 엔드포인트 테스트"""
+
+    def setUp(self):
+        from app import create_app
+        self.app = create_app({'TESTING': True})
+        self.client = self.app.test_client()
+
+    def test_exposes_route_latency(self):
+        self.client.get('/api/providers')
+        with patch.dict('os.environ', {'METRICS_PUBLIC': '1'}):
+            res = self.client.get('/metrics')
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('ie_http_request_duration_seconds_bucket{', res.get_data(as_text=True))
+        self.assertIn('route="blog.api_providers"', res.get_data(as_text=True))
+
+    def test_token_required_when_configured(self):
+        with patch.dict('os.environ', {'METRICS_TOKEN': 'secret'}):
+            self.assertEqual(self.client.get('/metrics').status_code, 401)
+            res = self.client.get('/metrics', headers={'Authorization': 'Bearer secret'})
+        self.assertEqual(res.status_code, 200)
+
+    def test_wrong_token_rejected(self):
+        with patch.dict('os.environ', {'METRICS_TOKEN': 'secret', 'METRICS_PUBLIC': '1'}):
+            res = self.client.get('/metrics', headers={'Authorization': 'Bearer secre'})
+        self.assertEqual(res.status_code, 401)
+
+    def test_denied_without_token_or_opt_in(self):
+        with patch.dict('os.environ'):
+            os.environ.pop('METRICS_TOKEN', None)
+            os.environ.pop('METRICS_PUBLIC', None)
+            self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+    def test_multiprocess_aggregation(self):
+        """워커 프로세스 두 개의 카운터가 한 번의 조회로 합산됨"""
+        script = (
+            "from services import metrics\n"
+            "metrics.transcript_result('supadata', True)\n"
+        )
+        with tempfile.TemporaryDirectory() as metrics_dir:
+            env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': metrics_dir}
+            for _ in range(2):
+                subprocess.run([sys.executable, '-c', script], cwd=ROOT, env=env, check=True)
+
+            output = subprocess.run(
+                [sys.executable, '-c', "from services import metrics; print(metrics.render_latest().decode())"],
+                cwd=ROOT, env=env, check=True, capture_output=True, text=True
+            ).stdout
+
+        self.assertIn('ie_transcript_results_total{outcome="success",source="supadata"} 2.0', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+운영 진단 프로파일러 테스트
+샘플링 결과의 collapsed stack 형식, 동시 실행 제한, tracemalloc 스냅샷, 관리자 라우트 확인
+"""
+import threading
+import time
+import tracemalloc
+import unittest
+from unittest.mock import patch
+
+from services import profiler
+
+
+def _busy_loop(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+class TestSampler(unittest.TestCase):
+    """샘플링 프로파일러 테스트"""
+
+    def test_collapsed_stacks_include_busy_function(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy_loop, args=(stop,), name='busy-worker')
+        worker.start()
+        try:
+            result = profiler.sample(0.3, interval=0.005)
+        finally:
+            stop.set()
+            worker.join()
+
+        self.assertGreater(result['samples'], 10)
+        collapsed = profiler.to_collapsed(result['stacks'])
+        busy = [line for line in collapsed.splitlines() if line.startswith('busy-worker;')]
+        self.assertTrue(busy)
+        self.assertTrue(any('_busy_loop (tests/test_profiler.py:' in line for line in busy))
+        for line in busy:
+            self.assertGreater(int(line.rsplit(' ', 1)[1]), 0)
+        top = profiler.top_functions(result['stacks'])
+        self.assertTrue(any(f['function'].startswith('<genexpr> (tests/test_profiler.py:') for f in top))
+
+    def test_idle_threads_are_skipped_by_default(self):
+        stop = threading.Event()
+        waiter = threading.Thread(target=stop.wait, name='idle-waiter')
+        waiter.start()
+        try:
+            skipped = profiler.sample(0.05, interval=0.005)
+            included = profiler.sample(0.05, interval=0.005, include_idle=True)
+        finally:
+            stop.set()
+            waiter.join()
+
+        self.assertFalse(any(s.startswith('idle-waiter;') for s in skipped['stacks']))
+        self.assertTrue(any(s.startswith('idle-waiter;') for s in included['stacks']))
+
+    def test_one_profile_at_a_time(self):
+        started = threading.Event()
+        results = []
+
+        def run():
+            started.set()
+            results.append(profiler.sample(0.3, interval=0.01))
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        started.wait()
+        time.sleep(0.05)
+        self.assertTrue(profiler.is_running())
+        self.assertIsNone(profiler.sample(0.05))
+        thread.join()
+
+        self.assertIsNotNone(results[0])
+        self.assertFalse(profiler.is_running())
+
+
+class TestMemorySnapshot(unittest.TestCase):
+    """tracemalloc 스냅샷 테스트"""
+
+    def tearDown(self):
+        profiler.stop_tracemalloc()
+
+    def test_snapshot_requires_tracing(self):
+        self.assertIsNone(profiler.memory_snapshot())
+
+    def test_top_allocation_sites(self):
+        profiler.start_tracemalloc(frames=5)
+        first = profiler.memory_snapshot(limit=5)
+        retained = [bytearray(1024) for _ in range(2000)]  # noqa: F841
+        diff = profiler.memory_snapshot(limit=5, compare=True)
+
+        self.assertTrue(first['tracing'])
+        self.assertLessEqual(len(first['top']), 5)
+        self.assertTrue(diff['compared'])
+        self.assertIn('test_profiler.py', diff['top'][0]['location'])
+        self.assertGreaterEqual(diff['top'][0]['size_diff_bytes'], 2000 * 1024)
+
+        profiler.stop_tracemalloc()
+        self.assertFalse(tracemalloc.is_tracing())
+
+
+class TestProfilerRoutes(unittest.TestCase):
+    """관리자 프로파일 라우트 테스트"""
+
+    def setUp(self):
+        from app import create_app
+        self.app = create_app({'TESTING': True})
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        profiler.stop_tracemalloc()
+
+    def _admin(self, is_admin=True):
+        return patch('routes.auth_routes.is_admin', return_value=is_admin)
+
+    def test_requires_admin(self):
+        with patch('services.supabase_service.is_supabase_enabled', return_value=False), self._admin(False):
+            self.assertEqual(self.client.post('/api/admin/profile?seconds=0.05').status_code, 403)
+            self.assertEqual(self.client.get('/api/admin/profile/memory').status_code, 403)
+
+    def test_cpu_profile_returns_collapsed_text(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy_loop, args=(stop,), name='busy-worker')
+        worker.start()
+        try:
+            with patch('services.supabase_service.is_supabase_enabled', return_value=False), self._admin():
+                res = self.client.post('/api/admin/profile?seconds=0.1&interval=5')
+                invalid = self.client.post('/api/admin/profile?seconds=600')
+        finally:
+            stop.set()
+            worker.join()
+
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.content_type.startswith('text/plain'))
+        self.assertIn('X-Profile-Pid', res.headers)
+        lines = res.get_data(as_text=True).splitlines()
+        self.assertTrue(any(line.startswith('busy-worker;') for line in lines))
+        for line in lines:
+            self.assertRegex(line, r'^[^ ].*;.+ \d+$')
+        self.assertEqual(invalid.status_code, 400)
+
+    def test_memory_snapshot_flow(self):
+        with patch('services.supabase_service.is_supabase_enabled', return_value=False), self._admin():
+            off = self.client.get('/api/admin/profile/memory')
+            started = self.client.post('/api/admin/profile/memory?action=start')
+            snapshot = self.client.get('/api/admin/profile/memory?top=3&group=filename')
+            stopped = self.client.post('/api/admin/profile/memory?action=stop')
+
+        self.assertEqual(off.status_code, 409)
+        self.assertTrue(started.get_json()['tracing'])
+        self.assertEqual(snapshot.get_json()['key_type'], 'filename')
+        self.assertLessEqual(len(snapshot.get_json()['top']), 3)
+        self.assertFalse(stopped.get_json()['tracing'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import tempfile
 import unittest
 from unittest.mock import patch
 
@@ -11,8 +12,31 @@ class TestRoutesSmoke(unittest.TestCase):
         })
         self.client = self.app.test_client()
 
+        self._artifact_dir = tempfile.TemporaryDirectory()
+        self._artifact_patch = patch('services.report_artifacts.ARTIFACT_DIR', self._artifact_dir.name)
+        self._artifact_patch.start()
+
     def tearDown(self):
-        pass
+        self._artifact_patch.stop()
+        self._artifact_dir.cleanup()
+
+    def _post_generate(self, path='/generate', **extra):
+        """/generate 호출 (외부 서비스는 모두 mock)"""
+        fake_result = {'title': 'TT', 'content': 'X', 'html': '<p>X</p>'}
+        with patch('services.supabase_service.is_supabase_enabled', return_value=False), \
+             patch('routes.blog_routes.content_service.is_youtube_url', return_value=True), \
+             patch('routes.blog_routes.content_service.get_video_id', return_value='test123'), \
+             patch('routes.blog_routes.content_service.get_content_title', return_value='TITLE'), \
+             patch('routes.blog_routes.content_service.get_transcript', return_value='테스트 자막 내용'), \
+             patch('routes.blog_routes.content_service.get_top_comments', return_value=['댓글1']), \
+             patch('routes.blog_routes.content_service.truncate_text', side_effect=lambda t, _max: t), \
+             patch('routes.blog_routes.ai_service.create_content', return_value=(fake_result, 'PROMPT')):
+            return self.client.post(path, json={
+                'url': 'https://www.youtube.com/watch?v=test123',
+                'model': 'gpt-4o-mini',
+                'style': 'blog',
+                **extra
+            })
 
     def test_generate_web_smoke(self):
         """YouTube URL로 /generate 엔드포인트 테스트"""
@@ -74,6 +98,111 @@ class TestRoutesSmoke(unittest.TestCase):
             self.assertIn('results', data)
             self.assertEqual(len(data['results']), 2)
 
+    def test_generate_batch_settles_token_reservation(self):
+        """토큰 기준 한도에서 배치 예약분을 첫 원장 기록으로 정산 (이중 차감 없음)"""
+        fake_result = {'title': 'TT', 'content': 'X', 'html': '<p>X</p>', 'usage': {'total_tokens': 10}}
+        usage = {'quota_mode': 'tokens', 'can_use': True, 'reservation_id': 'res-1'}
+        with patch('services.supabase_service.is_supabase_enabled', return_value=False), \
+             patch('services.usage.usage_service.UsageService.consume', return_value=(True, usage)), \
+             patch('services.usage.usage_service.UsageService.refund') as refund, \
+             patch('routes.blog_routes.metering.record') as record, \
+             patch('routes.blog_routes.content_service.get_content_title', return_value='TITLE'), \
+             patch('routes.blog_routes.content_service.get_transcript', return_value='테스트 자막'), \
+             patch('routes.blog_routes.content_service.get_top_comments', return_value=[]), \
+             patch('routes.blog_routes.ai_service.create_content', return_value=(fake_result, 'PROMPT')):
+            res = self.client.post('/generate-batch', json={
+                'urls': ['https://www.youtube.com/watch?v=aaaaaaaaaaa', 'https://www.youtube.com/watch?v=bbbbbbbbbbb'],
+                'model': 'gpt-4o-mini'
+            })
+
+        self.assertEqual(res.status_code, 200)
+        refund.assert_not_called()
+        reservations = [call.kwargs['reservation_id'] for call in record.call_args_list]
+        self.assertEqual(reservations, ['res-1', None])
+
+
+    def test_generate_compact_response_omits_artifacts(self):
+        """기본 응답에서 prompt/transcript 제외, 아티팩트 목록 제공"""
+        res = self._post_generate()
+        self.assertEqual(res.status_code, 200)
+        data = res.get_json()
+        self.assertNotIn('prompt', data)
+        self.assertNotIn('transcript', data)
+        self.assertEqual(sorted(data['artifacts']), ['prompt', 'transcript'])
+
+    def test_generate_fields_all_and_selection(self):
+        """fields=all은 전체, fields 지정 시 해당 필드만 반환"""
+        data = self._post_generate('/generate?fields=all').get_json()
+        self.assertEqual(data['prompt'], 'PROMPT')
+        self.assertEqual(data['transcript'], '테스트 자막 내용')
+
+        data = self._post_generate(fields=['title', 'content']).get_json()
+        self.assertEqual(set(data), {'id', 'artifacts', 'title', 'content'})
+
+    def test_report_artifact_fetch(self):
+        """저장된 아티팩트를 /api/reports/<id>/<artifact>로 조회"""
+        report_id = self._post_generate().get_json()['id']
+
+        with patch('services.supabase_service.is_supabase_enabled', return_value=False):
+            res = self.client.get(f'/api/reports/{report_id}/transcript')
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.get_json()['content'], '테스트 자막 내용')
+
+            self.assertEqual(self.client.get(f'/api/reports/{report_id}/html').status_code, 400)
+            self.assertEqual(self.client.get('/api/reports/missing/prompt').status_code, 404)
+
+
+class TestReportArtifactSweep(unittest.TestCase):
+    """조회되지 않은 아티팩트 정리 (만료 + 전체 크기 상한)"""
+
+    def setUp(self):
+        self._artifact_dir = tempfile.TemporaryDirectory()
+        self._artifact_patch = patch('services.report_artifacts.ARTIFACT_DIR', self._artifact_dir.name)
+        self._artifact_patch.start()
+
+    def tearDown(self):
+        self._artifact_patch.stop()
+        self._artifact_dir.cleanup()
+
+    def _save(self, report_id, age, size=100):
+        import os
+        from services import report_artifacts
+        report_artifacts.save_artifacts(report_id, 'u1', {'prompt': 'x' * size})
+        path = os.path.join(self._artifact_dir.name, f'{report_id}.json')
+        mtime = os.path.getmtime(path) - age
+        os.utime(path, (mtime, mtime))
+
+    def _remaining(self):
+        import os
+        return sorted(name[:-5] for name in os.listdir(self._artifact_dir.name))
+
+    def test_removes_expired_files(self):
+        from services import report_artifacts
+        self._save('old', report_artifacts.ARTIFACT_TTL_SECONDS + 10)
+        self._save('new', 0)
+
+        self.assertEqual(report_artifacts.sweep(), 1)
+        self.assertEqual(self._remaining(), ['new'])
+
+    def test_size_cap_removes_oldest_first(self):
+        from services import report_artifacts
+        for i, report_id in enumerate(('a', 'b', 'c')):
+            self._save(report_id, 300 - i * 100, size=600 * 1024)
+
+        with patch.dict('os.environ', {'ARTIFACT_MAX_MB': '1.5'}):
+            report_artifacts.sweep()
+
+        self.assertEqual(self._remaining(), ['b', 'c'])
+
+    def test_save_sweeps_periodically(self):
+        from services import report_artifacts
+        self._save('old', report_artifacts.ARTIFACT_TTL_SECONDS + 10)
+
+        with patch.object(report_artifacts, '_last_sweep', 0.0):
+            self._save('new', 0)
+
+        self.assertEqual(self._remaining(), ['new'])
+
 
 if __name__ == '__main__':
     unittest.main()
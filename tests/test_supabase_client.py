@@ -0,0 +1,206 @@
+"""
+Supabase 클라이언트 수명 관리 테스트
+동시 생성 방지, fork 후 재생성, 일시적 오류 재시도 확인
+"""
+import os
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from services import supabase_client
+from services.supabase_client import RetryTransport
+
+SUPABASE_ENV = {'SUPABASE_URL': 'https://example.supabase.co', 'SUPABASE_ANON_KEY': 'anon-key'}
+
+
+class TestGetClient(unittest.TestCase):
+    """get_client 테스트"""
+
+    def setUp(self):
+        supabase_client.reset_client()
+
+    def tearDown(self):
+        supabase_client.reset_client()
+
+    def test_returns_none_without_config(self):
+        with patch.dict('os.environ', {'SUPABASE_URL': '', 'SUPABASE_ANON_KEY': ''}):
+            self.assertIsNone(supabase_client.get_client())
+
+    def test_prefers_service_role_key(self):
+        env = {**SUPABASE_ENV, 'SUPABASE_SERVICE_ROLE_KEY': 'service-key'}
+        with patch.dict('os.environ', env), \
+                patch.object(supabase_client, 'create_client', return_value=MagicMock()) as create:
+            supabase_client.get_client()
+
+        self.assertEqual(create.call_args[0][1], 'service-key')
+
+    def test_concurrent_callers_share_one_client(self):
+        created = []
+        barrier = threading.Barrier(8)
+        results = []
+
+        def fake_create(url, key, options=None):
+            created.append(options)
+            return MagicMock()
+
+        def worker():
+            barrier.wait()
+            results.append(supabase_client.get_client())
+
+        with patch.dict('os.environ', SUPABASE_ENV), \
+                patch.object(supabase_client, 'create_client', side_effect=fake_create):
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(created), 1)
+        self.assertEqual(len({id(r) for r in results}), 1)
+        self.assertIsInstance(created[0].httpx_client, httpx.Client)
+
+    def test_recreated_after_fork(self):
+        """다른 pid에서 호출하면 부모의 클라이언트를 쓰지 않음"""
+        with patch.dict('os.environ', SUPABASE_ENV), \
+                patch.object(supabase_client, 'create_client', side_effect=lambda *a, **k: MagicMock()):
+            parent = supabase_client.get_client()
+            with patch('os.getpid', return_value=-1):
+                child = supabase_client.get_client()
+
+        self.assertIsNot(parent, child)
+
+    def test_pool_size_from_env(self):
+        with patch.dict('os.environ', {'SUPABASE_POOL_SIZE': '3', 'SUPABASE_TIMEOUT': '5'}):
+            client = supabase_client.build_http_client()
+
+        pool = client._transport._transport._pool
+        self.assertEqual(pool._max_connections, 3)
+        self.assertEqual(client.timeout.read, 5)
+        client.close()
+
+    def test_default_pool_covers_batch_workers(self):
+        """기본 풀은 요청 스레드, 백그라운드 저장 스레드, 배치 처리 스레드를 모두 수용"""
+        import config
+
+        client = supabase_client.build_http_client()
+
+        self.assertEqual(supabase_client.DEFAULT_POOL_SIZE,
+                         int(os.getenv('GUNICORN_THREADS', 4)) + 2 + config.MAX_BATCH_WORKERS)
+        self.assertEqual(client.timeout.pool, supabase_client.DEFAULT_POOL_TIMEOUT)
+        client.close()
+
+
+
+class TestAuthClientSeparation(unittest.TestCase):
+    """로그인해도 서버 데이터 클라이언트는 사용자 세션을 쓰지 않음"""
+
+    USER_ID = '11111111-1111-1111-1111-111111111111'
+
+    def setUp(self):
+        supabase_client.reset_client()
+        self.rest_authorization = []
+
+    def tearDown(self):
+        supabase_client.reset_client()
+
+    def _auth_server(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith('/auth/v1/token'):
+            return httpx.Response(200, json={
+                'access_token': 'user-access-token', 'refresh_token': 'user-refresh-token',
+                'token_type': 'bearer', 'expires_in': 3600, 'expires_at': 4102444800,
+                'user': {'id': self.USER_ID, 'aud': 'authenticated', 'email': 'user@example.com',
+                         'app_metadata': {}, 'user_metadata': {}, 'created_at': '2026-10-19T00:00:00Z'}
+            })
+        if request.url.path.startswith('/rest/v1/'):
+            self.rest_authorization.append(request.headers.get('Authorization'))
+            return httpx.Response(200, json=[])
+        return httpx.Response(404, json={})
+
+    def test_login_does_not_change_server_client_authorization(self):
+        from app import create_app
+
+        env = {**SUPABASE_ENV, 'SUPABASE_SERVICE_ROLE_KEY': 'service-key'}
+        http_client = lambda: httpx.Client(transport=httpx.MockTransport(self._auth_server))  # noqa: E731
+        with patch.dict('os.environ', env), \
+                patch.object(supabase_client, 'build_http_client', side_effect=http_client):
+            server = supabase_client.get_client()
+            response = create_app({'TESTING': True}).test_client().post(
+                '/api/auth/login', json={'email': 'user@example.com', 'password': 'secret123'})
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()['session']['access_token'], 'user-access-token')
+            self.assertEqual(server.options.headers['Authorization'], 'Bearer service-key')
+            server.table('ie_histories').select('id').execute()
+            self.assertEqual(self.rest_authorization, ['Bearer service-key'])
+            self.assertIsNot(supabase_client.get_auth_client(), server)
+
+class TestRetryTransport(unittest.TestCase):
+    """RetryTransport 테스트"""
+
+    def _client(self, handler, retries=2):
+        transport = RetryTransport(httpx.MockTransport(handler), retries=retries, backoff=0)
+        return httpx.Client(transport=transport, base_url='https://example.supabase.co')
+
+    def test_retries_idempotent_on_503(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503 if len(calls) < 3 else 200)
+
+        res = self._client(handler).get('/rest/v1/ie_usage')
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(calls), 3)
+
+    def test_gives_up_after_retries(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        res = self._client(handler, retries=1).get('/rest/v1/ie_usage')
+
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(len(calls), 2)
+
+    def test_post_not_retried_on_503(self):
+        """RPC POST는 서버에서 실행됐을 수 있으므로 재시도하지 않음"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        res = self._client(handler).post('/rest/v1/rpc/consume_usage', json={})
+
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(len(calls), 1)
+
+    def test_post_retried_on_connect_error(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError('connection refused', request=request)
+            return httpx.Response(200, json={'ok': True})
+
+        res = self._client(handler).post('/rest/v1/rpc/consume_usage', json={'p_user_id': 'u'})
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(calls[1].content, calls[0].content)
+
+    def test_post_not_retried_on_read_timeout(self):
+        def handler(request):
+            raise httpx.ReadTimeout('timed out', request=request)
+
+        with self.assertRaises(httpx.ReadTimeout):
+            self._client(handler).post('/rest/v1/rpc/consume_usage', json={})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+단계별 소요 시간 측정 테스트
+span 합산, 스레드별 측정 범위, 프로세스 집계, Server-Timing 헤더 확인
+"""
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from services import timing
+
+
+class TestTimingSpans(unittest.TestCase):
+    """span / collect / snapshot 테스트"""
+
+    def setUp(self):
+        timing.reset_stats()
+
+    def test_repeated_stage_is_summed(self):
+        with timing.collect() as timings:
+            with timing.span('db'):
+                pass
+            with timing.span('db'):
+                pass
+
+        self.assertEqual(list(timings.durations), ['db'])
+        self.assertEqual(timing.snapshot()['stages']['db']['count'], 2)
+
+    def test_span_outside_request_is_aggregated_only(self):
+        self.assertIsNone(timing.current())
+        with timing.span('history'):
+            pass
+
+        self.assertEqual(timing.get_timings(), {})
+        self.assertEqual(timing.snapshot()['stages']['history']['count'], 1)
+
+    def test_threads_have_separate_scopes(self):
+        results = {}
+
+        def worker(name):
+            with timing.collect() as timings:
+                with timing.span(name):
+                    pass
+            results[name] = set(timings.durations)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in ('a', 'b')]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(results, {'a': {'a'}, 'b': {'b'}})
+
+    def test_server_timing_header_value(self):
+        with timing.collect() as timings:
+            with timing.span('transcript'):
+                timing.describe('transcript', 'cache')
+
+        header = timings.server_timing()
+        self.assertTrue(header.startswith('transcript;dur='))
+        self.assertIn(';desc="cache"', header)
+        self.assertIn('total;dur=', header)
+
+    def test_disabled(self):
+        with patch.dict('os.environ', {'REQUEST_TIMINGS': '0'}), timing.collect() as timings:
+            with timing.span('llm'):
+                pass
+
+        self.assertEqual(timings.durations, {})
+        self.assertEqual(timing.snapshot()['stages'], {})
+
+
+class TestTimingRoutes(unittest.TestCase):
+    """/generate 응답의 timings 필드와 Server-Timing 헤더 테스트"""
+
+    def setUp(self):
+        from app import create_app
+        self.app = create_app({'TESTING': True})
+        self.client = self.app.test_client()
+        self._artifact_dir = tempfile.TemporaryDirectory()
+        self._artifact_patch = patch('services.report_artifacts.ARTIFACT_DIR', self._artifact_dir.name)
+        self._artifact_patch.start()
+        timing.reset_stats()
+
+    def tearDown(self):
+        self._artifact_patch.stop()
+        self._artifact_dir.cleanup()
+
+    def test_generate_reports_stage_timings(self):
+        response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content='# 제목\n본문'))],
+            usage=None
+        )
+        with patch('services.supabase_service.is_supabase_enabled', return_value=False), \
+                patch('routes.blog_routes.content_service.get_youtube_title', return_value='TITLE'), \
+                patch('services.content_service._get_transcript', return_value='자막 내용'), \
+                patch('services.content_service._load_cache', return_value=['댓글']), \
+                patch('services.ai_service.completion', return_value=response):
+            res = self.client.post('/generate', json={
+                'url': 'https://www.youtube.com/watch?v=test1234567',
+                'model': 'gpt-4o-mini',
+                'style': 'blog'
+            })
+
+        self.assertEqual(res.status_code, 200)
+        stages = res.get_json()['timings']
+        for stage in ('title', 'transcript', 'comments', 'truncate', 'llm', 'render', 'artifacts'):
+            self.assertIn(stage, stages)
+        self.assertIn('llm;dur=', res.headers['Server-Timing'])
+        self.assertEqual(timing.snapshot()['routes']['blog.generate']['count'], 1)
+
+    def test_no_header_without_stages(self):
+        res = self.client.get('/api/providers')
+
+        self.assertNotIn('Server-Timing', res.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
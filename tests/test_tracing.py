@@ -0,0 +1,135 @@
+"""
+분산 추적 테스트
+스레드 간 컨텍스트 전달, 배치 fan-out span 구조, Supabase 호출 span과 traceparent 전달 확인
+"""
+import concurrent.futures
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from services import tracing
+
+try:
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+except ModuleNotFoundError:
+    InMemorySpanExporter = None
+
+
+@unittest.skipIf(InMemorySpanExporter is None, 'opentelemetry-sdk 미설치')
+class TracingTestCase(unittest.TestCase):
+    """메모리 exporter로 추적을 켜고 끄는 공통 설정"""
+
+    def setUp(self):
+        self.exporter = InMemorySpanExporter()
+        tracing.configure(exporter=self.exporter)
+
+    def tearDown(self):
+        tracing.shutdown()
+
+    def finished(self):
+        tracing.force_flush()
+        return {span.name: span for span in self.exporter.get_finished_spans()}
+
+
+class TestContextPropagation(TracingTestCase):
+    """bind / span 테스트"""
+
+    def test_bind_carries_parent_into_worker_thread(self):
+        def work():
+            with tracing.span('child'):
+                pass
+
+        with tracing.span('parent'):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                executor.submit(tracing.bind(work)).result()
+
+        spans = self.finished()
+        self.assertEqual(spans['child'].parent.span_id, spans['parent'].context.span_id)
+
+    def test_unbound_worker_starts_new_trace(self):
+        def work():
+            with tracing.span('orphan'):
+                pass
+
+        with tracing.span('parent'):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                executor.submit(work).result()
+
+        self.assertIsNone(self.finished()['orphan'].parent)
+
+    def test_supabase_call_span_and_traceparent(self):
+        from services.supabase_client import RetryTransport
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get('traceparent'))
+            return httpx.Response(200, json=[])
+
+        client = httpx.Client(transport=RetryTransport(httpx.MockTransport(handler), backoff=0),
+                              base_url='https://example.supabase.co')
+        with tracing.span('parent'):
+            client.get('/rest/v1/ie_usage')
+
+        span = self.finished()['supabase GET ie_usage']
+        self.assertEqual(span.attributes['http.response.status_code'], 200)
+        self.assertIn(format(span.context.trace_id, '032x'), seen[0])
+
+
+class TestTracingDisabled(unittest.TestCase):
+    """추적 비활성화 테스트"""
+
+    def test_noop_without_exporter(self):
+        with patch.dict('os.environ', {'TRACING_EXPORTER': ''}):
+            self.assertFalse(tracing.configure())
+
+        func = lambda: None  # noqa: E731
+        self.assertIs(tracing.bind(func), func)
+        with tracing.span('ignored') as span:
+            self.assertIsNone(span)
+
+
+class TestBatchTrace(TracingTestCase):
+    """배치 요청 trace 구조 테스트"""
+
+    def setUp(self):
+        from app import create_app
+        super().setUp()
+        self.app = create_app({'TESTING': True})
+        self.client = self.app.test_client()
+        self._artifact_dir = tempfile.TemporaryDirectory()
+        self._artifact_patch = patch('services.report_artifacts.ARTIFACT_DIR', self._artifact_dir.name)
+        self._artifact_patch.start()
+
+    def tearDown(self):
+        self._artifact_patch.stop()
+        self._artifact_dir.cleanup()
+        super().tearDown()
+
+    def test_batch_urls_are_children_of_request(self):
+        fake_result = {'title': 'TT', 'content': 'X', 'html': '<p>X</p>'}
+        with patch('services.supabase_service.is_supabase_enabled', return_value=False), \
+                patch('routes.blog_routes.content_service.get_content_title', return_value='TITLE'), \
+                patch('routes.blog_routes.content_service.get_transcript', return_value='자막'), \
+                patch('routes.blog_routes.content_service.get_top_comments', return_value=[]), \
+                patch('routes.blog_routes.ai_service.create_content', return_value=(fake_result, 'PROMPT')):
+            res = self.client.post('/generate-batch', json={
+                'urls': ['https://www.youtube.com/watch?v=aaaaaaaaaaa', 'https://www.youtube.com/watch?v=bbbbbbbbbbb'],
+                'model': 'gpt-4o-mini'
+            })
+
+        self.assertEqual(res.status_code, 200)
+        tracing.force_flush()
+        spans = self.exporter.get_finished_spans()
+        server = next(s for s in spans if s.name == 'POST /generate-batch')
+        urls = [s for s in spans if s.name == 'batch.url']
+
+        self.assertEqual(len(urls), 2)
+        for span in urls:
+            self.assertEqual(span.parent.span_id, server.context.span_id)
+        self.assertEqual(res.headers['X-Trace-Id'], format(server.context.trace_id, '032x'))
+
+
+if __name__ == '__main__':
+    unittest.main()
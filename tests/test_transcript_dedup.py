@@ -0,0 +1,150 @@
+"""
+자막 중복 제거 저장 테스트
+히스토리 행의 자막 참조 변환, 저장 순서, 읽기 경로 확인
+"""
+import os
+import unittest
+from unittest.mock import MagicMock, call, patch
+
+from services import supabase_service
+
+
+class TestTranscriptDedup(unittest.TestCase):
+    """_history_row / _split_transcripts / insert 테스트"""
+
+    def setUp(self):
+        self.env = patch.dict(os.environ, {'HISTORY_TRANSCRIPT_DEDUP': '1', 'SUPABASE_SERVICE_ROLE_KEY': 'service-key'})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+
+    def _row(self, report_id, transcript='같은 자막', video_id='vid00000001'):
+        return supabase_service._history_row('user-1', {
+            'id': report_id, 'url': f'https://youtu.be/{video_id}',
+            'transcript': transcript, 'video_id': video_id
+        })
+
+    def test_same_transcript_stored_once(self):
+        """같은 영상/자막은 자막 행 하나로 합쳐짐"""
+        histories, transcripts = supabase_service._split_transcripts(
+            [self._row('r1'), self._row('r2'), self._row('r3', transcript='다른 자막')]
+        )
+
+        self.assertEqual(len(transcripts), 2)
+        self.assertTrue(all(h['transcript'] is None for h in histories))
+        self.assertEqual(histories[0]['transcript_hash'], histories[1]['transcript_hash'])
+        self.assertEqual(histories[0]['transcript_hash'], supabase_service.transcript_hash('같은 자막'))
+
+    def test_rows_without_video_id_keep_inline_transcript(self):
+        """video_id가 없는 행(이전 스풀 등)은 자막을 그대로 저장"""
+        row = {'user_id': 'user-1', 'report_id': 'r1', 'transcript': '자막'}
+        histories, transcripts = supabase_service._split_transcripts([row])
+
+        self.assertEqual(histories, [row])
+        self.assertEqual(transcripts, [])
+
+    def test_disabled_keeps_inline_transcript(self):
+        with patch.dict(os.environ, {'HISTORY_TRANSCRIPT_DEDUP': '0'}):
+            row = self._row('r1')
+
+        self.assertNotIn('transcript_video_id', row)
+        self.assertEqual(row['transcript'], '같은 자막')
+
+    def test_anon_key_keeps_inline_transcript(self):
+        """공유 자막 테이블은 service_role만 쓸 수 있으므로 anon 키로는 인라인 저장"""
+        with patch.dict(os.environ, {'SUPABASE_SERVICE_ROLE_KEY': ''}):
+            row = self._row('r1')
+
+        self.assertNotIn('transcript_video_id', row)
+        self.assertEqual(row['transcript'], '같은 자막')
+
+    def _client(self):
+        tables = {'ie_transcripts': MagicMock(), 'ie_histories': MagicMock()}
+        client = MagicMock()
+        client.table.side_effect = lambda name: tables[name]
+        return client, tables
+
+    def test_transcripts_upserted_before_histories(self):
+        client, tables = self._client()
+        with patch.object(supabase_service, '_missing_migrations', set()):
+            supabase_service._insert_history_rows(client, [self._row('r1'), self._row('r2')])
+
+        self.assertEqual(client.table.call_args_list, [call('ie_transcripts'), call('ie_histories')])
+        upserted = tables['ie_transcripts'].upsert.call_args
+        self.assertEqual(len(upserted[0][0]), 1)
+        self.assertTrue(upserted[1]['ignore_duplicates'])
+        histories = tables['ie_histories'].upsert.call_args
+        self.assertEqual(len(histories[0][0]), 2)
+        self.assertEqual(histories[1], {'on_conflict': 'user_id,report_id', 'ignore_duplicates': True})
+
+    def test_history_insert_without_unique_index(self):
+        """유니크 인덱스 마이그레이션이 없으면 한 번 감지한 뒤 일반 insert 사용"""
+        client, tables = self._client()
+        error = Exception("{'code': '42P10', 'message': 'there is no unique or exclusion constraint'}")
+        tables['ie_histories'].upsert.return_value.execute.side_effect = error
+
+        with patch.object(supabase_service, '_missing_migrations', set()):
+            supabase_service._insert_history_rows(client, [self._row('r1')])
+            supabase_service._insert_history_rows(client, [self._row('r2')])
+
+        self.assertEqual(tables['ie_histories'].upsert.call_count, 1)
+        self.assertEqual(tables['ie_histories'].insert.call_count, 2)
+
+    def test_falls_back_to_inline_transcript_without_table(self):
+        """자막 테이블이 없으면 한 번 감지한 뒤 인라인 자막으로 저장"""
+        client, tables = self._client()
+        error = Exception("{'code': '42P01', 'message': 'relation \"public.ie_transcripts\" does not exist'}")
+        tables['ie_transcripts'].upsert.return_value.execute.side_effect = error
+
+        with patch.object(supabase_service, '_missing_migrations', set()):
+            supabase_service._insert_history_rows(client, [self._row('r1')])
+            self.assertFalse(supabase_service.is_transcript_dedup_enabled())
+            supabase_service._insert_history_rows(client, [self._row('r2')])
+
+        self.assertEqual(tables['ie_transcripts'].upsert.call_count, 1)
+        saved = [c[0][0][0] for c in tables['ie_histories'].upsert.call_args_list]
+        self.assertEqual([row['transcript'] for row in saved], ['같은 자막', '같은 자막'])
+        self.assertTrue(all('transcript_video_id' not in row for row in saved))
+
+    def test_get_history_without_transcript_relation(self):
+        """임베딩 관계가 없으면 인라인 자막 컬럼만 조회"""
+        client, tables = self._client()
+        query = tables['ie_histories'].select.return_value.eq.return_value.eq.return_value.limit.return_value
+        query.execute.side_effect = [
+            Exception("{'code': 'PGRST200', 'message': 'Could not find a relationship'}"),
+            MagicMock(data=[{'report_id': 'r1', 'transcript': '자막'}])
+        ]
+
+        with patch.object(supabase_service, '_missing_migrations', set()), \
+                patch.object(supabase_service, 'get_supabase', return_value=client):
+            history = supabase_service.get_history('user-1', 'r1')
+
+        self.assertEqual(history['transcript'], '자막')
+        self.assertEqual([c[0][0] for c in tables['ie_histories'].select.call_args_list],
+                         ['*, ie_transcripts(transcript)', '*'])
+
+
+class TestResolveHistoryTranscript(unittest.TestCase):
+    """resolve_history_transcript 테스트"""
+
+    def test_inline_transcript(self):
+        self.assertEqual(supabase_service.resolve_history_transcript({'transcript': '인라인'}), '인라인')
+
+    def test_embedded_transcript(self):
+        history = {'transcript': None, 'ie_transcripts': {'transcript': '임베딩'}}
+        self.assertEqual(supabase_service.resolve_history_transcript(history), '임베딩')
+
+    def test_reference_lookup(self):
+        history = {'transcript': None, 'transcript_video_id': 'vid', 'transcript_hash': 'abc'}
+        with patch.object(supabase_service, 'get_transcript', return_value='참조') as get_transcript:
+            self.assertEqual(supabase_service.resolve_history_transcript(history), '참조')
+
+        get_transcript.assert_called_once_with('vid', 'abc')
+
+    def test_no_transcript(self):
+        self.assertIsNone(supabase_service.resolve_history_transcript({'transcript': None}))
+
+
+if __name__ == '__main__':
+    unittest.main()
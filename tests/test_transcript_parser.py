@@ -0,0 +1,99 @@
+"""
+자막 파서 단위 테스트
+VTT 스트리밍 파싱, TimedText XML, ytInitialPlayerResponse 중괄호 매칭
+"""
+import json
+import unittest
+
+
+class TestParseVtt(unittest.TestCase):
+    """VTT 파싱 테스트"""
+
+    def test_skips_header_timings_and_cue_numbers(self):
+        """헤더/타이밍/큐 번호는 제외"""
+        from services.transcript_parser import parse_vtt
+
+        vtt = "\ufeffWEBVTT\n\n1\n00:00:00.000 --> 00:00:01.000\n안녕하세요\n\n2\n00:00:01.000 --> 00:00:02.000\n반갑습니다\n"
+
+        self.assertEqual(parse_vtt(vtt), "안녕하세요 반갑습니다")
+
+    def test_strips_inline_tags(self):
+        """인라인 태그 제거"""
+        from services.transcript_parser import parse_vtt
+
+        vtt = "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\n<c.colorE5E5E5>첫</c><00:00:00.500><c> 문장</c>\n"
+
+        self.assertEqual(parse_vtt(vtt), "첫 문장")
+
+    def test_accepts_line_iterable(self):
+        """라인 이터러블(스트리밍 입력) 지원"""
+        from services.transcript_parser import parse_vtt
+
+        lines = iter([b"WEBVTT", b"", b"00:00:00.000 --> 00:00:01.000", "한 줄".encode('utf-8')])
+
+        self.assertEqual(parse_vtt(lines), "한 줄")
+
+    def test_empty_input(self):
+        """빈 입력은 빈 문자열"""
+        from services.transcript_parser import parse_vtt
+
+        self.assertEqual(parse_vtt(""), "")
+        self.assertEqual(parse_vtt(None), "")
+
+
+class TestParseTimedtextXml(unittest.TestCase):
+    """TimedText XML 파싱 테스트"""
+
+    def test_unescapes_entities(self):
+        """HTML 엔티티 디코딩"""
+        from services.transcript_parser import parse_timedtext_xml
+
+        xml = '<transcript><text start="0">A &amp;amp; B</text><text start="1">줄\n바꿈</text></transcript>'
+
+        self.assertEqual(parse_timedtext_xml(xml), "A & B 줄 바꿈")
+
+    def test_invalid_xml_returns_empty(self):
+        """잘못된 XML은 빈 문자열"""
+        from services.transcript_parser import parse_timedtext_xml
+
+        self.assertEqual(parse_timedtext_xml("<transcript><text>"), "")
+
+
+class TestExtractPlayerResponse(unittest.TestCase):
+    """ytInitialPlayerResponse 추출 테스트"""
+
+    def test_braces_inside_strings_are_ignored(self):
+        """문자열 내부의 중괄호/이스케이프 따옴표 무시"""
+        from services.transcript_parser import extract_yt_initial_player_response
+
+        payload = {"title": "a } b { \"c\"", "captions": {"x": [1, 2, {"y": "}"}]}}
+        html = f"<script>var ytInitialPlayerResponse = {json.dumps(payload)};var other = {{}};</script>"
+
+        self.assertEqual(extract_yt_initial_player_response(html), payload)
+
+    def test_skips_unbalanced_marker_and_uses_next(self):
+        """깨진 첫 마커는 건너뛰고 다음 마커 사용"""
+        from services.transcript_parser import extract_yt_initial_player_response
+
+        html = 'ytInitialPlayerResponse = {"a": ; ytInitialPlayerResponse = {"ok": true};'
+
+        self.assertEqual(extract_yt_initial_player_response(html), {"ok": True})
+
+    def test_missing_marker_returns_none(self):
+        """마커가 없으면 None"""
+        from services.transcript_parser import extract_yt_initial_player_response
+
+        self.assertIsNone(extract_yt_initial_player_response("<html></html>"))
+        self.assertIsNone(extract_yt_initial_player_response(None))
+
+    def test_extract_json_object_stops_at_matching_brace(self):
+        """짝이 맞는 중괄호에서 디코딩 종료"""
+        from services.transcript_parser import extract_json_object
+
+        text = 'x{"a": {"b": "}"}};tail = {}'
+
+        self.assertEqual(extract_json_object(text, 1), {"a": {"b": "}"}})
+        self.assertIsNone(extract_json_object(text, 0))
+
+if __name__ == '__main__':
+    unittest.main()
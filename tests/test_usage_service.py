@@ -152,5 +152,141 @@ class TestUsageServiceDecrement(unittest.TestCase):
         self.assertEqual(result, ADMIN_USAGE)
 
 
+class TestUsageServiceConsume(unittest.TestCase):
+    """UsageService.consume / refund 테스트 (consume_usage RPC)"""
+
+    @patch('services.usage.usage_service.is_supabase_enabled', return_value=True)
+    @patch('services.usage.usage_service.consume_usage')
+    def test_consume_success(self, mock_consume, mock_enabled):
+        """RPC 1회 호출로 차감 후 사용량 반환"""
+        mock_consume.return_value = {
+            'consumed': True, 'is_admin': False,
+            'usage_count': 2, 'max_usage': 5, 'can_use': True
+        }
+
+        from services.usage.usage_service import UsageService
+
+        consumed, usage = UsageService.consume('normal-user')
+
+        self.assertTrue(consumed)
+        self.assertEqual(usage['usage_count'], 2)
+        self.assertFalse(usage['is_admin'])
+        mock_consume.assert_called_once_with('normal-user')
+
+    @patch('services.usage.usage_service.is_supabase_enabled', return_value=True)
+    @patch('services.usage.usage_service.consume_usage')
+    def test_consume_exhausted(self, mock_consume, mock_enabled):
+        """남은 횟수가 없으면 consumed=False"""
+        mock_consume.return_value = {
+            'consumed': False, 'is_admin': False,
+            'usage_count': 0, 'max_usage': 5, 'can_use': False
+        }
+
+        from services.usage.usage_service import UsageService
+
+        consumed, usage = UsageService.consume('exhausted-user')
+
+        self.assertFalse(consumed)
+        self.assertFalse(usage['can_use'])
+
+    @patch('services.usage.usage_service.is_supabase_enabled', return_value=True)
+    @patch('services.usage.usage_service.consume_usage')
+    def test_consume_admin(self, mock_consume, mock_enabled):
+        """관리자는 RPC 결과에 따라 무제한"""
+        mock_consume.return_value = {'consumed': True, 'is_admin': True}
+
+        from services.usage.usage_service import UsageService, ADMIN_USAGE
+
+        consumed, usage = UsageService.consume('admin-user')
+
+        self.assertTrue(consumed)
+        self.assertEqual(usage, ADMIN_USAGE)
+
+    @patch('services.usage.usage_service.is_supabase_enabled', return_value=True)
+    @patch('services.usage.usage_service.consume_usage', return_value=None)
+    @patch('services.usage.usage_service.is_admin', return_value=False)
+    @patch('services.usage.usage_service.get_usage')
+    @patch('services.usage.usage_service.decrement_usage')
+    def test_consume_falls_back_without_rpc(self, mock_decrement, mock_get_usage,
+                                            mock_admin, mock_consume, mock_enabled):
+        """RPC가 없으면 기존 조회 + 차감 방식 사용"""
+        mock_get_usage.return_value = {'usage_count': 3, 'max_usage': 5, 'can_use': True}
+
+        from services.usage.usage_service import UsageService
+
+        consumed, _usage = UsageService.consume('normal-user')
+
+        self.assertTrue(consumed)
+        mock_decrement.assert_called_once_with('normal-user')
+
+    @patch('services.usage.usage_service.is_supabase_enabled', return_value=True)
+    @patch('services.usage.usage_service.refund_usage')
+    def test_refund_skips_admin(self, mock_refund, mock_enabled):
+        """관리자 사용량은 복구 호출 없음"""
+        from services.usage.usage_service import UsageService, ADMIN_USAGE
+
+        self.assertEqual(UsageService.refund('admin-user', ADMIN_USAGE), ADMIN_USAGE)
+        mock_refund.assert_not_called()
+
+    @patch('services.usage.usage_service.is_supabase_enabled', return_value=True)
+    @patch('services.usage.usage_service.refund_usage', return_value=None)
+    @patch('services.usage.usage_service.get_usage')
+    @patch('services.usage.usage_service.increment_usage')
+    def test_refund_falls_back_without_rpc(self, mock_increment, mock_get_usage, mock_refund, mock_enabled):
+        """RPC가 없으면 기존 방식으로 차감한 횟수를 카운터를 올려 복구"""
+        mock_get_usage.return_value = {'usage_count': 3, 'max_usage': 5, 'can_use': True}
+
+        from services.usage.usage_service import UsageService
+
+        usage = UsageService.refund('normal-user', {'usage_count': 2, 'max_usage': 5, 'can_use': True})
+
+        mock_increment.assert_called_once_with('normal-user')
+        self.assertEqual(usage['usage_count'], 3)
+
+
+class TestRequireUsageRefund(unittest.TestCase):
+    """require_usage 차감/복구 테스트"""
+
+    def _run(self, view):
+        from flask import Flask, g
+        from services.usage.usage_decorator import require_usage
+
+        app = Flask(__name__)
+        usage = {'usage_count': 2, 'max_usage': 5, 'can_use': True, 'is_admin': False}
+
+        with patch('services.usage.usage_decorator.is_supabase_enabled', return_value=True), \
+                patch('services.usage.usage_decorator.UsageService.consume',
+                      return_value=(True, usage)) as consume, \
+                patch('services.usage.usage_decorator.UsageService.refund',
+                      return_value=dict(usage, usage_count=3)) as refund, \
+                app.test_request_context():
+            g.user_id = 'normal-user'
+            try:
+                result = require_usage(view)()
+            except RuntimeError:
+                result = None
+            return result, consume, refund
+
+    def test_success_consumes_once_without_refund(self):
+        result, consume, refund = self._run(lambda: {'success': True})
+
+        self.assertEqual(result, {'success': True})
+        consume.assert_called_once_with('normal-user')
+        refund.assert_not_called()
+
+    def test_error_response_is_refunded(self):
+        _result, _consume, refund = self._run(lambda: ({'error': 'bad'}, 500))
+
+        refund.assert_called_once()
+
+    def test_exception_is_refunded(self):
+        def view():
+            raise RuntimeError('boom')
+
+        _result, _consume, refund = self._run(view)
+
+        refund.assert_called_once()
+
+
 if __name__ == '__main__':
     unittest.main()